@@ -0,0 +1,140 @@
+# File: ByteRanges.py
+# Path: AndyGoogle/Source/API/ByteRanges.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  07:14PM
+"""
+Description: HTTP Range / If-Range / ETag evaluation for book file downloads
+Decides between 200, 206, 304 and 416 for a file and a set of request headers, and
+reads byte ranges with pread so no whole file is ever held in memory
+"""
+
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from API.ResponseCache import MatchesIfNoneMatch
+
+READ_CHUNK_SIZE = 256 * 1024
+
+class RangeNotSatisfiable(Exception):
+    """Every requested range starts past the end of the file"""
+
+def BuildFileETag(stat_result: os.stat_result) -> str:
+    """Strong validator from size and nanosecond mtime"""
+    return f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+def ParseRangeHeader(header_value: Optional[str], size: int) -> Optional[List[Tuple[int, int]]]:
+    """Inclusive (start, end) ranges from a Range header
+
+    Returns None when there is no usable header (missing, another unit, or malformed -
+    RFC 9110 says to ignore those and send the whole file) and raises
+    RangeNotSatisfiable when it is well-formed but nothing in it overlaps the file.
+    """
+    if not header_value:
+        return None
+    unit, _, range_set = header_value.partition('=')
+    if unit.strip().lower() != 'bytes' or not range_set.strip():
+        return None
+
+    ranges = []
+    for part in range_set.split(','):
+        first, dash, last = part.strip().partition('-')
+        if not dash:
+            return None
+        try:
+            if first:
+                start = int(first)
+                end = int(last) if last else max(start, size - 1)
+                if start < 0 or end < start:
+                    return None
+            else:
+                suffix_length = int(last)
+                if suffix_length <= 0:
+                    continue
+                start = max(0, size - suffix_length)
+                end = size - 1
+        except ValueError:
+            return None
+
+        if start < size:
+            ranges.append((start, min(end, size - 1)))
+
+    if not ranges:
+        raise RangeNotSatisfiable()
+    return ranges
+
+def IfRangeMatches(header_value: str, etag: str, last_modified: float) -> bool:
+    """If-Range holds only for our strong ETag or our exact Last-Modified date"""
+    header_value = header_value.strip()
+    if header_value.startswith('"') or header_value.startswith('W/'):
+        return header_value == etag
+    try:
+        return int(parsedate_to_datetime(header_value).timestamp()) == int(last_modified)
+    except (TypeError, ValueError):
+        return False
+
+def EvaluateRequest(headers: Dict[str, str], stat_result: os.stat_result) -> Tuple[int, Optional[Tuple[int, int]]]:
+    """(status, byte range) to answer a GET/HEAD for a file with
+
+    Several ranges are answered with the whole file rather than multipart/byteranges;
+    RFC 9110 allows ignoring Range, and viewers request one window at a time.
+    """
+    size = stat_result.st_size
+    etag = BuildFileETag(stat_result)
+
+    if_none_match = headers.get('if-none-match')
+    if if_none_match and MatchesIfNoneMatch(if_none_match, etag):
+        return 304, None
+
+    range_header = headers.get('range')
+    if not range_header:
+        return 200, None
+
+    if_range = headers.get('if-range')
+    if if_range and not IfRangeMatches(if_range, etag, stat_result.st_mtime):
+        return 200, None   # File changed since the client's partial copy - start over
+
+    try:
+        ranges = ParseRangeHeader(range_header, size)
+    except RangeNotSatisfiable:
+        return 416, None
+
+    if not ranges or len(ranges) > 1:
+        return 200, None
+    return 206, ranges[0]
+
+def BuildFileHeaders(stat_result: os.stat_result, status: int, byte_range: Optional[Tuple[int, int]]) -> Dict[str, str]:
+    """Validator, length and range headers for a file response"""
+    size = stat_result.st_size
+    headers = {
+        'accept-ranges': 'bytes',
+        'etag': BuildFileETag(stat_result),
+        'last-modified': formatdate(stat_result.st_mtime, usegmt=True)
+    }
+    if status == 206:
+        start, end = byte_range
+        headers['content-range'] = f"bytes {start}-{end}/{size}"
+        headers['content-length'] = str(end - start + 1)
+    elif status == 416:
+        headers['content-range'] = f"bytes */{size}"
+        headers['content-length'] = "0"
+    elif status == 200:
+        headers['content-length'] = str(size)
+    return headers
+
+def ReadFileRange(path: str, start: int, length: int, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield a byte range in chunks using positional reads"""
+    descriptor = os.open(path, os.O_RDONLY)
+    try:
+        position = start
+        remaining = length
+        while remaining > 0:
+            chunk = os.pread(descriptor, min(chunk_size, remaining), position)
+            if not chunk:
+                break
+            position += len(chunk)
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        os.close(descriptor)
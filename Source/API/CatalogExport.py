@@ -0,0 +1,124 @@
+# File: CatalogExport.py
+# Path: AndyGoogle/Source/API/CatalogExport.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-19  04:10AM
+"""
+Description: Streaming full-catalog export (NDJSON or CSV) for /api/books/export
+Walks a SQLite cursor in fetchmany batches so memory stays bounded regardless of
+catalog size, and gzips each batch on the fly when the client accepts it
+"""
+
+import io
+import re
+import csv
+import zlib
+import sqlite3
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from API.FastJSON import EncodeJSON
+
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'csv': ('text/csv; charset=utf-8', 'csv')
+}
+
+def AcceptsGzip(accept_encoding: Optional[str]) -> bool:
+    """Check whether an Accept-Encoding header allows gzip (honoring q=0; an explicit gzip entry beats *)"""
+    qualities: Dict[str, float] = {}
+    for part in (accept_encoding or "").split(','):
+        coding, *params = [item.strip() for item in part.split(';')]
+        coding = coding.lower()
+        if coding not in ('gzip', '*') or coding in qualities:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    return qualities.get('gzip', qualities.get('*', 0.0)) > 0
+
+def BuildExportQuery(conn: sqlite3.Connection, category: Optional[str],
+                     subject: Optional[str]) -> Tuple[str, List[str], List[str]]:
+    """Build the export query and column list for the database's schema"""
+    book_columns = {row[1] for row in conn.execute("PRAGMA table_info(books)")}
+    columns = ['id', 'title'] + (['author'] if 'author' in book_columns else []) + ['category', 'subject']
+    author_select = "b.author, " if 'author' in book_columns else ""
+
+    query = f"""
+        SELECT b.id, b.title, {author_select}c.category, s.subject
+        FROM books b
+        LEFT JOIN categories c ON b.category_id = c.id
+        LEFT JOIN subjects s ON b.subject_id = s.id
+        WHERE 1=1
+    """
+    params = []
+    if category:
+        query += " AND b.category_id = (SELECT id FROM categories WHERE category = ?)"
+        params.append(category)
+    if subject:
+        query += " AND b.subject_id IN (SELECT id FROM subjects WHERE subject = ?)"
+        params.append(subject)
+    query += " ORDER BY b.title, b.id"
+
+    return query, params, columns
+
+def EncodeBatch(rows: List[tuple], columns: List[str], export_format: str) -> bytes:
+    """Encode one batch of rows as NDJSON lines or CSV records"""
+    if export_format == 'ndjson':
+        return b"".join(EncodeJSON(dict(zip(columns, row))) + b"\n" for row in rows)
+
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue().encode('utf-8')
+
+def IterateExport(conn: sqlite3.Connection, export_format: str = 'ndjson',
+                  category: Optional[str] = None, subject: Optional[str] = None,
+                  compress: bool = False, batch_size: int = 1000) -> Iterator[bytes]:
+    """Yield the encoded (and optionally gzipped) catalog one batch at a time"""
+    query, params, columns = BuildExportQuery(conn, category, subject)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None   # wbits 31 = gzip framing
+
+    def emit(data: bytes) -> bytes:
+        return compressor.compress(data) if compressor else data
+
+    if export_format == 'csv':
+        header = io.StringIO()
+        csv.writer(header, lineterminator="\n").writerow(columns)
+        chunk = emit(header.getvalue().encode('utf-8'))
+        if chunk:
+            yield chunk
+
+    cursor = conn.cursor()
+    cursor.row_factory = None   # Plain tuples - no sqlite3.Row per exported book
+    cursor.execute(query, params)
+    try:
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            chunk = emit(EncodeBatch(rows, columns, export_format))
+            if chunk:
+                yield chunk
+    finally:
+        cursor.close()
+
+    if compressor:
+        yield compressor.flush()
+
+def BuildExportHeaders(export_format: str, compress: bool, category: Optional[str] = None) -> Dict[str, str]:
+    """Response headers for an export stream"""
+    extension = EXPORT_FORMATS[export_format][1]
+    suffix = "_" + re.sub(r"[^A-Za-z0-9_-]+", "_", category) if category else ""
+    headers = {
+        'Content-Disposition': f'attachment; filename="andygoogle_catalog{suffix}.{extension}"',
+        'Vary': 'Accept-Encoding',
+        'Cache-Control': 'no-store'
+    }
+    if compress:
+        headers['Content-Encoding'] = 'gzip'
+    return headers
@@ -0,0 +1,186 @@
+# File: ChunkedDownloader.py
+# Path: AndyGoogle/Source/API/ChunkedDownloader.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  08:54PM
+"""
+Description: Streaming, resumable HTTP Range downloader for AndyGoogle database files
+Writes chunks straight to a .part file, hashes incrementally while streaming and
+resumes from the last completed byte offset after a dropped connection or restart
+"""
+
+import os
+import json
+import time
+import socket
+import hashlib
+import http.client
+import urllib.error
+import urllib.request
+from typing import Callable, Dict, Optional, Any, Tuple
+
+READ_BLOCK_SIZE = 256 * 1024
+
+class DownloadError(Exception):
+    """Raised when a download cannot be completed or verified"""
+
+class ChunkedDownloader:
+    """Download a URL in Range-requested chunks into a resumable temp file"""
+
+    def __init__(self, url: str, headers_provider: Optional[Callable[[], Dict[str, str]]] = None,
+                 chunk_size: int = 8 * 1024 * 1024, timeout: float = 60.0,
+                 max_retries: int = 5, retry_delay: float = 1.0):
+        self.url = url
+        self.headers_provider = headers_provider or (lambda: {})
+        self.chunk_size = max(READ_BLOCK_SIZE, chunk_size)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+    def LoadResumeState(self, state_path: str, source_key: str) -> bool:
+        """Check whether a partial download belongs to the same source file"""
+        try:
+            with open(state_path, 'r') as f:
+                state = json.load(f)
+            # A parallel download's part file is preallocated, so its length is not progress
+            return state.get('source_key') == source_key and 'completed_ranges' not in state
+        except (OSError, ValueError):
+            return False
+
+    def SaveResumeState(self, state_path: str, source_key: str, total_size: Optional[int]):
+        """Record which source file the partial download belongs to"""
+        with open(state_path, 'w') as f:
+            json.dump({'source_key': source_key, 'url': self.url, 'total_size': total_size}, f)
+
+    def HashExistingPart(self, part_path: str, hasher) -> int:
+        """Feed already-downloaded bytes into the hash (only needed when resuming)"""
+        offset = 0
+        with open(part_path, 'rb') as f:
+            for block in iter(lambda: f.read(READ_BLOCK_SIZE), b""):
+                hasher.update(block)
+                offset += len(block)
+        return offset
+
+    def FetchRange(self, start: int, end: int, part_file, hasher) -> Tuple[int, Optional[int], bool]:
+        """Stream one byte range into the part file; returns (bytes_written, total_size, range_honored)"""
+        headers = dict(self.headers_provider())
+        headers['Range'] = f"bytes={start}-{end}"
+        request = urllib.request.Request(self.url, headers=headers)
+
+        try:
+            response = urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            if e.code == 416:
+                return 0, start, True  # Nothing left past start
+            raise
+
+        with response:
+            total_size = None
+            range_honored = response.status == 206
+
+            content_range = response.headers.get('Content-Range', '')
+            if range_honored and '/' in content_range:
+                total_text = content_range.rsplit('/', 1)[1]
+                total_size = int(total_text) if total_text.isdigit() else None
+            elif not range_honored:
+                length = response.headers.get('Content-Length')
+                total_size = int(length) if length and length.isdigit() else None
+
+            written = 0
+            for block in iter(lambda: response.read(READ_BLOCK_SIZE), b""):
+                part_file.write(block)
+                hasher.update(block)
+                written += len(block)
+
+            expected_length = response.headers.get('Content-Length')
+            if expected_length and expected_length.isdigit() and written < int(expected_length):
+                raise http.client.IncompleteRead(b"", int(expected_length) - written)
+
+        return written, total_size, range_honored
+
+    def Download(self, local_path: str, source_key: str = "", expected_size: Optional[int] = None,
+                 expected_md5: Optional[str] = None,
+                 progress_callback: Optional[Callable[[int, Optional[int]], None]] = None) -> Dict[str, Any]:
+        """Download to local_path, resuming a matching .part file if one exists"""
+        part_path = local_path + ".part"
+        state_path = local_path + ".part.json"
+        os.makedirs(os.path.dirname(os.path.abspath(local_path)), exist_ok=True)
+
+        hasher = hashlib.md5()
+        resumed_from = 0
+        if os.path.exists(part_path) and self.LoadResumeState(state_path, source_key):
+            resumed_from = self.HashExistingPart(part_path, hasher)
+        else:
+            open(part_path, 'wb').close()
+            self.SaveResumeState(state_path, source_key, expected_size)
+
+        offset = resumed_from
+        total_size = expected_size
+        attempts = 0
+
+        with open(part_path, 'r+b') as part_file:
+            part_file.seek(offset)
+            part_file.truncate()
+
+            while total_size is None or offset < total_size:
+                end = offset + self.chunk_size - 1
+                if total_size is not None:
+                    end = min(end, total_size - 1)
+
+                chunk_start = offset
+                try:
+                    written, reported_size, range_honored = self.FetchRange(offset, end, part_file, hasher)
+                except (urllib.error.URLError, http.client.HTTPException, ConnectionError, socket.timeout) as e:
+                    if isinstance(e, urllib.error.HTTPError) and e.code < 500 and e.code != 429:
+                        raise DownloadError(f"Download failed with HTTP {e.code}: {e.reason}")
+
+                    # Keep whatever arrived intact; the hash already covers it
+                    part_file.flush()
+                    offset = part_file.tell()
+                    attempts += 1
+                    if attempts > self.max_retries:
+                        raise DownloadError(f"Download failed after {self.max_retries} retries at byte {offset}: {e}")
+                    time.sleep(self.retry_delay * (2 ** (attempts - 1)))
+                    continue
+
+                if not range_honored and chunk_start > 0:
+                    # Server ignored Range - the whole body was just written from chunk_start, restart cleanly
+                    part_file.seek(0)
+                    part_file.truncate()
+                    hasher = hashlib.md5()
+                    offset = 0
+                    resumed_from = 0
+                    continue
+
+                attempts = 0
+                offset = chunk_start + written
+                if reported_size is not None:
+                    total_size = reported_size
+                if not range_honored or written == 0:
+                    total_size = offset  # Whole body delivered in one response (or nothing left)
+
+                part_file.flush()
+                if progress_callback:
+                    progress_callback(offset, total_size)
+
+            part_file.flush()
+            os.fsync(part_file.fileno())
+
+        if expected_size is not None and offset != expected_size:
+            raise DownloadError(f"Downloaded {offset} bytes, expected {expected_size}")
+
+        file_md5 = hasher.hexdigest()
+        if expected_md5 and file_md5 != expected_md5:
+            os.remove(part_path)
+            os.remove(state_path)
+            raise DownloadError(f"MD5 mismatch: got {file_md5}, expected {expected_md5}")
+
+        os.replace(part_path, local_path)
+        if os.path.exists(state_path):
+            os.remove(state_path)
+
+        return {
+            'bytes': offset,
+            'md5': file_md5,
+            'resumed_from': resumed_from
+        }
@@ -0,0 +1,112 @@
+# File: DriveBatch.py
+# Path: AndyGoogle/Source/API/DriveBatch.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  11:41PM
+"""
+Description: Batched Drive metadata requests and fields-mask planning for GoogleDriveAPI
+DriveBatch folds independent Drive API requests into a single batch HTTP round trip
+(retrying only the parts that failed transiently), and PlanFields builds the
+smallest `fields` mask that still covers every consumer of a response.
+"""
+
+from typing import Dict, Iterable, List, Optional, Any
+
+MAX_BATCH_SIZE = 100    # Drive's limit on calls per batch request
+
+def PlanFields(*needs: Iterable[str], collection: Optional[str] = None, paging: bool = False) -> str:
+    """Union of the fields each consumer reads, as a Drive fields mask
+
+    PlanFields(('id', 'name'), ('name', 'size'), collection='files', paging=True)
+    gives "nextPageToken,files(id,name,size)".
+    """
+    fields: List[str] = []
+    for need in needs:
+        for field in need:
+            if field not in fields:
+                fields.append(field)
+    mask = ",".join(fields)
+    if collection:
+        mask = f"{collection}({mask})"
+    if paging:
+        mask = f"nextPageToken,{mask}"
+    return mask
+
+class DriveBatch:
+    """Collect independent Drive requests and send them in as few round trips as possible"""
+
+    def __init__(self, service, transport=None, max_attempts: int = 3):
+        self.service = service
+        self.transport = transport
+        self.max_attempts = max(1, max_attempts)
+        self.requests: Dict[str, Any] = {}
+        self.round_trips = 0
+
+    def Add(self, key: str, request) -> 'DriveBatch':
+        """Queue a request; its response is returned under key"""
+        self.requests[key] = request
+        return self
+
+    def Send(self, call, description: str):
+        """One HTTP round trip, through the transport when there is one"""
+        self.round_trips += 1
+        if self.transport:
+            return self.transport.Execute(call, description=description)
+        return call()
+
+    def SendGroup(self, group: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one group of requests; returns key -> response or exception"""
+        if len(group) == 1:
+            # A lone request gains nothing from the multipart envelope (and the
+            # transport has already retried it, so its errors are final)
+            key, request = next(iter(group.items()))
+            return {key: self.Send(request.execute, key)}
+
+        outcomes: Dict[str, Any] = {}
+
+        def collect(request_id, response, exception):
+            outcomes[request_id] = exception if exception is not None else response
+
+        batch = self.service.new_batch_http_request(callback=collect)
+        for key, request in group.items():
+            batch.add(request, request_id=key)
+        self.Send(batch.execute, f"batch of {len(group)}")
+        return outcomes
+
+    def IsRetryable(self, error: BaseException) -> bool:
+        """Whether a failed part is worth resending"""
+        if self.transport:
+            return self.transport.IsRetryable(error)
+        return False
+
+    def Execute(self) -> Dict[str, Any]:
+        """Send everything queued; raises the first permanent failure"""
+        pending = dict(self.requests)
+        results: Dict[str, Any] = {}
+        last_error: Optional[BaseException] = None
+
+        for attempt in range(1, self.max_attempts + 1):
+            keys = list(pending)
+            outcomes: Dict[str, Any] = {}
+            for start in range(0, len(keys), MAX_BATCH_SIZE):
+                group = {key: pending[key] for key in keys[start:start + MAX_BATCH_SIZE]}
+                outcomes.update(self.SendGroup(group))
+
+            retry = {}
+            for key, outcome in outcomes.items():
+                if not isinstance(outcome, Exception):
+                    results[key] = outcome
+                elif self.IsRetryable(outcome):
+                    retry[key] = pending[key]
+                    last_error = outcome
+                else:
+                    raise outcome
+
+            pending = retry
+            if not pending:
+                return results
+            if attempt < self.max_attempts and self.transport:
+                # Parts rejected inside a successful batch (typically 429) back off like whole calls
+                self.transport.sleep(self.transport.policy.ComputeDelay(attempt))
+
+        raise last_error
@@ -0,0 +1,122 @@
+# File: DriveMetadataCache.py
+# Path: AndyGoogle/Source/API/DriveMetadataCache.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  11:44PM
+"""
+Description: Persistent TTL cache for Google Drive metadata used by GoogleDriveAPI
+Keeps the AndyLibrary folder ID and its file listing on disk so repeated update checks
+cost no round trips; expired listings are revalidated against the Drive changes feed
+and only re-listed when something in the folder actually changed
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Dict, Optional, Any
+
+class DriveMetadataCache:
+    """Small JSON-backed key/value cache with per-entry expiry"""
+
+    def __init__(self, cache_path: str, ttl_seconds: float = 900, folder_ttl_seconds: float = 7 * 24 * 3600):
+        self.cache_path = cache_path
+        self.ttl_seconds = ttl_seconds
+        self.folder_ttl_seconds = folder_ttl_seconds
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0}
+
+        self.Load()
+
+    def Load(self):
+        """Read cached entries from disk (a corrupt file just starts empty)"""
+        try:
+            if os.path.exists(self.cache_path):
+                with open(self.cache_path, 'r') as f:
+                    self.entries = json.load(f).get('entries', {})
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable Drive metadata cache {self.cache_path}: {e}")
+            self.entries = {}
+
+    def Save(self):
+        """Persist entries atomically (caller holds the lock)"""
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+            temp_path = self.cache_path + ".tmp"
+            with open(temp_path, 'w') as f:
+                json.dump({'entries': self.entries}, f, indent=2)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            print(f"Warning: Could not save Drive metadata cache: {e}")
+
+    def Get(self, key: str, allow_expired: bool = False) -> Optional[Any]:
+        """Get a cached value, or None when missing or expired"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and (allow_expired or entry['expires_at'] > time.time()):
+                if not allow_expired:
+                    self.stats['hits'] += 1
+                return entry['value']
+            if not allow_expired:
+                self.stats['misses'] += 1
+            return None
+
+    def Put(self, key: str, value: Any, ttl_seconds: Optional[float] = None, validator: Optional[str] = None):
+        """Store a value with an expiry and an optional revalidation token"""
+        now = time.time()
+        with self.lock:
+            self.entries[key] = {
+                'value': value,
+                'validator': validator,
+                'stored_at': now,
+                'expires_at': now + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+            }
+            self.Save()
+
+    def GetValidator(self, key: str) -> Optional[str]:
+        """Get the revalidation token stored with an entry, even if it has expired"""
+        with self.lock:
+            entry = self.entries.get(key)
+            return entry.get('validator') if entry else None
+
+    def GetAge(self, key: str) -> Optional[float]:
+        """Seconds since the entry was stored (revalidation does not reset this)"""
+        with self.lock:
+            entry = self.entries.get(key)
+            return time.time() - entry['stored_at'] if entry else None
+
+    def Refresh(self, key: str, validator: Optional[str] = None, ttl_seconds: Optional[float] = None) -> bool:
+        """Extend an entry's lifetime after a successful revalidation"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if not entry:
+                return False
+            entry['expires_at'] = time.time() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+            if validator is not None:
+                entry['validator'] = validator
+            self.stats['revalidated'] += 1
+            self.Save()
+            return True
+
+    def Invalidate(self, key: Optional[str] = None):
+        """Drop one entry, or everything when key is None"""
+        with self.lock:
+            if key is None:
+                self.entries = {}
+            else:
+                self.entries.pop(key, None)
+            self.Save()
+
+    def GetStats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and the age of each entry"""
+        now = time.time()
+        with self.lock:
+            return {
+                **self.stats,
+                'entries': {
+                    key: {'age_seconds': round(now - entry['stored_at'], 1),
+                          'expires_in_seconds': round(entry['expires_at'] - now, 1)}
+                    for key, entry in self.entries.items()
+                }
+            }
@@ -0,0 +1,50 @@
+# File: FastJSON.py
+# Path: AndyGoogle/Source/API/FastJSON.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  04:21PM
+"""
+Description: Opt-in fast JSON serialization for large AndyGoogle list responses
+Encodes SQLite rows or prebuilt payloads straight to bytes (orjson when installed,
+the C-accelerated stdlib encoder otherwise) instead of building and re-validating a
+pydantic model per row; endpoints keep their response_model, so OpenAPI is unchanged
+"""
+
+import os
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+FAST_JSON_ENV = "ANDYGOOGLE_FAST_JSON"
+
+# Reused encoder: no circular check, no indentation, no ASCII escaping
+STDLIB_ENCODER = json.JSONEncoder(ensure_ascii=False, check_circular=False, separators=(',', ':'))
+
+def IsFastJSONEnabled(config: Optional[Dict[str, Any]] = None) -> bool:
+    """Fast path is opt-in via ANDYGOOGLE_FAST_JSON=1 or the 'fast_json_enabled' config key"""
+    env_value = os.environ.get(FAST_JSON_ENV)
+    if env_value is not None:
+        return env_value.strip().lower() in ('1', 'true', 'yes', 'on')
+    return bool((config or {}).get('fast_json_enabled', False))
+
+def GetEncoderName() -> str:
+    """Name of the encoder in use, for diagnostics"""
+    return "orjson" if orjson else "json"
+
+def EncodeJSON(payload: Any) -> bytes:
+    """Serialize plain dicts/lists/scalars to UTF-8 JSON bytes"""
+    if orjson:
+        return orjson.dumps(payload)
+    return STDLIB_ENCODER.encode(payload).encode('utf-8')
+
+def RowsToDicts(rows: Iterable, fields: List[str]) -> List[Dict[str, Any]]:
+    """Turn SQLite rows into dicts keyed by a response model's field names (columns in the same order)"""
+    return [dict(zip(fields, row)) for row in rows]
+
+def EncodeRows(rows: Iterable, fields: List[str]) -> bytes:
+    """Encode SQLite rows as a JSON array of objects in one pass"""
+    return EncodeJSON(RowsToDicts(rows, fields))
@@ -2,7 +2,7 @@
 # Path: AndyGoogle/Source/API/GoogleDriveAPI.py
 # Standard: AIDEV-PascalCase-2.1
 # Created: 2025-07-12
-# Last Modified: 2025-07-12  07:30PM
+# Last Modified: 2026-10-19  03:21AM
 """
 Description: Google Drive API integration for AndyGoogle library management
 Handles SQLite database download, upload, and version management with Google Drive
@@ -11,15 +11,63 @@ Handles SQLite database download, upload, and version management with Google Dri
 import os
 import json
 import hashlib
+import sqlite3
+import tempfile
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
 from google_auth_oauthlib.flow import Flow
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload, MediaIoBaseDownload
 from googleapiclient.errors import HttpError
-import io
+import httplib2
+
+from API.ChunkedDownloader import ChunkedDownloader, DownloadError
+from API.ParallelDownloader import ParallelDownloader
+from API.ResumableUploader import ResumableUploader, UploadError
+from API.TransferCodecs import (ResolveCodec, CompressFile, DecompressFile, CodecError,
+                                CODEC_IDENTITY, CODEC_MIMETYPES)
+from API.DriveMetadataCache import DriveMetadataCache
+from API.DriveBatch import DriveBatch, PlanFields
+from Utils.ResilientTransport import ResilientTransport, TransportError, GetErrorStatus
+from Core.DatabaseDelta import GetDeltaFilename, ParseDeltaFilename, CreateDelta
+from Core.DatabaseManifest import BuildManifest, ToAppProperties, FromAppProperties, VerifyDatabase
+
+DRIVE_MEDIA_URL = "https://www.googleapis.com/drive/v3/files/{file_id}?alt=media"
+UPLOAD_FIELDS = "id,name,size,md5Checksum,modifiedTime,appProperties"
+DRIVE_UPLOAD_URL = "https://www.googleapis.com/upload/drive/v3/files?uploadType=resumable&fields=" + UPLOAD_FIELDS
+DRIVE_UPDATE_URL = "https://www.googleapis.com/upload/drive/v3/files/{file_id}?uploadType=resumable&fields=" + UPLOAD_FIELDS
+DATABASE_PREFIX = "AndersonLibrary_v"
+FOLDER_ID_KEY = "andylibrary_folder_id"
+FOLDER_LISTING_KEY = "andylibrary_folder_listing"
+HASH_BLOCK_SIZE = 1024 * 1024
+# Every API failure path handles both Google's errors and the transport's own
+DRIVE_ERRORS = (HttpError, TransportError)
+FOLDER_MIMETYPE = "application/vnd.google-apps.folder"
+FOLDER_QUERY = f"name='AndyLibrary' and mimeType='{FOLDER_MIMETYPE}' and trashed=false"
+LISTING_MAX_AGE_SECONDS = 24 * 3600   # Backstop: re-list at least daily, however often the token says "unchanged"
+
+# What each consumer reads from a file resource; requests ask Drive for exactly the union
+FILE_FIELD_NEEDS = {
+    'version_info': ('id', 'name', 'size', 'md5Checksum', 'modifiedTime', 'description', 'appProperties'),
+    'delta_listing': ('id', 'name', 'size', 'md5Checksum', 'appProperties'),
+    'download': ('name', 'size', 'md5Checksum', 'appProperties'),
+    'upload_dedupe': ('id', 'name', 'md5Checksum', 'appProperties')
+}
+LISTING_FIELDS = PlanFields(*FILE_FIELD_NEEDS.values(), collection='files', paging=True)
+DOWNLOAD_FIELDS = PlanFields(FILE_FIELD_NEEDS['download'])
+
+def GetContentCodec(file: Dict[str, Any]) -> str:
+    """Codec a Drive file was stored with (declared in its appProperties)"""
+    return (file.get('appProperties') or {}).get('content_codec', CODEC_IDENTITY)
+
+def GetContentMd5(file: Dict[str, Any]) -> Optional[str]:
+    """MD5 of a file's original bytes - Drive's own checksum covers the stored (maybe compressed) bytes"""
+    declared = (file.get('appProperties') or {}).get('content_md5')
+    if declared:
+        return declared
+    return file.get('md5Checksum') if GetContentCodec(file) == CODEC_IDENTITY else None
 
 class GoogleDriveAPI:
     """Handle Google Drive operations for AndyGoogle library management"""
@@ -33,6 +81,16 @@ class GoogleDriveAPI:
             'https://www.googleapis.com/auth/drive.metadata.readonly'
         ]
         self.andylibrary_folder_id = None
+        self.credentials = None
+        self.download_chunk_size = 8 * 1024 * 1024
+        self.download_connections = 4
+        self.parallel_download_min_size = 64 * 1024 * 1024
+        self.upload_chunk_size = 8 * 1024 * 1024
+        self.upload_compression = CODEC_IDENTITY
+        self.last_download_hash = None
+        self.metadata_cache = DriveMetadataCache("AndyGoogle/Data/Local/drive_metadata_cache.json")
+        self.request_timeout_seconds = 60
+        self.transport = ResilientTransport('drive', transient_errors=(httplib2.HttpLib2Error,))
         
     def Authenticate(self) -> bool:
         """Authenticate with Google Drive API"""
@@ -79,269 +137,490 @@ class GoogleDriveAPI:
             token_file.write(creds.to_json())
         
         # Build Drive service
-        self.service = build('drive', 'v3', credentials=creds)
+        self.credentials = creds
+        # Bound each attempt; the transport bounds the call as a whole
+        http = AuthorizedHttp(creds, http=httplib2.Http(timeout=self.request_timeout_seconds))
+        self.service = build('drive', 'v3', http=http)
         return True
     
+    def Execute(self, request, description: str = "", idempotent: bool = True):
+        """Run an API request through the retrying, circuit-broken transport"""
+        return self.transport.Execute(request.execute, description=description, idempotent=idempotent)
+    
+    def GetAuthorizationHeaders(self) -> Dict[str, str]:
+        """Get a bearer header for direct media requests, refreshing the token if needed"""
+        if not self.credentials.valid and self.credentials.refresh_token:
+            self.credentials.refresh(Request())
+        return {'Authorization': f"Bearer {self.credentials.token}"}
+    
+    def GetKnownFolderId(self) -> Optional[str]:
+        """AndyLibrary folder ID from memory or the metadata cache, without asking Drive"""
+        if not self.andylibrary_folder_id:
+            self.andylibrary_folder_id = self.metadata_cache.Get(FOLDER_ID_KEY)
+        return self.andylibrary_folder_id
+    
+    def RememberFolder(self, folder_id: str) -> str:
+        """Keep the folder ID in memory and in the long-lived cache"""
+        self.andylibrary_folder_id = folder_id
+        self.metadata_cache.Put(FOLDER_ID_KEY, folder_id, ttl_seconds=self.metadata_cache.folder_ttl_seconds)
+        return folder_id
+    
+    def ForgetFolder(self):
+        """Drop a folder ID Drive no longer knows (folder deleted or recreated) so the next call searches again"""
+        print(f"⚠️ AndyLibrary folder {self.andylibrary_folder_id} is gone - searching for it again")
+        self.andylibrary_folder_id = None
+        self.metadata_cache.Invalidate(FOLDER_ID_KEY)
+        self.metadata_cache.Invalidate(FOLDER_LISTING_KEY)
+    
+    def IsFolderMissing(self, folder_id: str) -> bool:
+        """Check whether a remembered folder was deleted or trashed"""
+        try:
+            folder = self.Execute(self.service.files().get(fileId=folder_id, fields='id,trashed'), "check folder")
+            return bool(folder.get('trashed'))
+        except HttpError as e:
+            if GetErrorStatus(e) == 404:
+                return True
+            raise
+    
+    def BuildFindFolderRequest(self):
+        """Search for the AndyLibrary folder (only its ID is needed)"""
+        return self.service.files().list(q=FOLDER_QUERY, fields=PlanFields(('id',), collection='files'), pageSize=1)
+    
+    def BuildListingRequest(self, folder_id: str, page_token: Optional[str] = None):
+        """One page of the AndyLibrary folder listing"""
+        return self.service.files().list(
+            q=f"'{folder_id}' in parents and trashed=false",
+            fields=LISTING_FIELDS,
+            orderBy="modifiedTime desc",
+            pageSize=1000,
+            pageToken=page_token
+        )
+    
+    def CreateFolder(self) -> str:
+        """Create the AndyLibrary folder"""
+        folder = self.Execute(self.service.files().create(
+            body={'name': 'AndyLibrary', 'mimeType': FOLDER_MIMETYPE}, fields='id'
+        ), "create folder", idempotent=False)
+        print(f"Created AndyLibrary folder: {folder.get('id')}")
+        return self.RememberFolder(folder.get('id'))
+    
+    def AdoptFolderSearch(self, results: Dict[str, Any]) -> Optional[str]:
+        """Folder ID from a folder search response, remembered when found"""
+        folders = results.get('files', [])
+        if not folders:
+            return None
+        print(f"Found existing AndyLibrary folder: {folders[0]['id']}")
+        return self.RememberFolder(folders[0]['id'])
+    
     def GetOrCreateAndyLibraryFolder(self) -> str:
         """Get or create the AndyLibrary folder on Google Drive"""
-        if self.andylibrary_folder_id:
+        if self.GetKnownFolderId():
             return self.andylibrary_folder_id
         
         try:
-            # Search for existing AndyLibrary folder
-            query = "name='AndyLibrary' and mimeType='application/vnd.google-apps.folder' and trashed=false"
-            results = self.service.files().list(q=query, fields="files(id, name)").execute()
-            folders = results.get('files', [])
-            
-            if folders:
-                self.andylibrary_folder_id = folders[0]['id']
-                print(f"Found existing AndyLibrary folder: {self.andylibrary_folder_id}")
-            else:
-                # Create new folder
-                folder_metadata = {
-                    'name': 'AndyLibrary',
-                    'mimeType': 'application/vnd.google-apps.folder'
-                }
-                folder = self.service.files().create(body=folder_metadata, fields='id').execute()
-                self.andylibrary_folder_id = folder.get('id')
-                print(f"Created AndyLibrary folder: {self.andylibrary_folder_id}")
+            folder_id = self.AdoptFolderSearch(self.Execute(self.BuildFindFolderRequest(), "find folder"))
+            return folder_id or self.CreateFolder()
             
-            return self.andylibrary_folder_id
-            
-        except HttpError as e:
+        except DRIVE_ERRORS as e:
             print(f"Error managing AndyLibrary folder: {e}")
             return None
     
-    def UploadDatabase(self, local_db_path: str, version_info: Dict[str, Any]) -> Optional[str]:
-        """Upload SQLite database to Google Drive"""
+    def ListFolderFiles(self, recheck_folder: bool = True) -> Optional[List[Dict[str, Any]]]:
+        """List every file in the AndyLibrary folder, newest first, served from the metadata cache while fresh
+        
+        A remembered folder ID that Drive no longer knows is forgotten and the folder
+        searched for again, once per call.
+        """
+        cached_files = self.metadata_cache.Get(FOLDER_LISTING_KEY)
+        if cached_files is not None:
+            return cached_files
+        
         if not self.service:
             if not self.Authenticate():
                 return None
         
-        folder_id = self.GetOrCreateAndyLibraryFolder()
-        if not folder_id:
-            return None
+        folder_id = self.GetKnownFolderId()
         
         try:
-            # Generate filename with version
-            version = version_info.get('version', '1.0.0')
-            filename = f"AndersonLibrary_v{version.replace('.', '_')}.db"
+            # Conditional revalidation: an expired listing stays valid if nothing in the folder changed
+            stale_files = self.metadata_cache.Get(FOLDER_LISTING_KEY, allow_expired=True)
+            page_token = self.metadata_cache.GetValidator(FOLDER_LISTING_KEY)
+            listing_age = self.metadata_cache.GetAge(FOLDER_LISTING_KEY) or 0
+            if folder_id and stale_files is not None and page_token and listing_age < LISTING_MAX_AGE_SECONDS:
+                changed, new_page_token = self.CheckFolderChanges(folder_id, page_token, stale_files)
+                if not changed:
+                    self.metadata_cache.Refresh(FOLDER_LISTING_KEY, validator=new_page_token)
+                    return stale_files
             
-            # Check if file already exists
-            query = f"name='{filename}' and '{folder_id}' in parents and trashed=false"
-            results = self.service.files().list(q=query, fields="files(id, name)").execute()
-            existing_files = results.get('files', [])
+            # The change token must be taken before the listing, or a version published between
+            # the two would read as "unchanged" at every revalidation. Batch parts run in any
+            # order, so the token can share a round trip with the folder search but not the listing
+            batch = DriveBatch(self.service, self.transport)
+            batch.Add('start_token', self.service.changes().getStartPageToken(fields='startPageToken'))
+            if not folder_id:
+                batch.Add('folder', self.BuildFindFolderRequest())
+            results = batch.Execute()
+            start_token = results['start_token'].get('startPageToken')
             
-            if existing_files:
-                # Update existing file
-                file_id = existing_files[0]['id']
-                media = MediaFileUpload(local_db_path, mimetype='application/x-sqlite3')
-                updated_file = self.service.files().update(
-                    fileId=file_id,
-                    media_body=media,
-                    fields='id,name,size,modifiedTime'
-                ).execute()
-                print(f"Updated database: {updated_file.get('name')}")
-                return file_id
+            remembered_folder = folder_id
+            if not folder_id:
+                folder_id = self.AdoptFolderSearch(results['folder'])
+            if folder_id:
+                page = self.Execute(self.BuildListingRequest(folder_id), "list folder")
+                # A deleted folder lists as empty; only then is it worth a round trip to check
+                if remembered_folder and recheck_folder and not page.get('files') and self.IsFolderMissing(folder_id):
+                    self.ForgetFolder()
+                    return self.ListFolderFiles(recheck_folder=False)
             else:
-                # Create new file
-                file_metadata = {
-                    'name': filename,
-                    'parents': [folder_id],
-                    'description': f"AndyGoogle SQLite Database v{version} - {version_info.get('description', '')}"
-                }
-                
-                media = MediaFileUpload(local_db_path, mimetype='application/x-sqlite3')
-                file = self.service.files().create(
-                    body=file_metadata,
-                    media_body=media,
-                    fields='id,name,size,modifiedTime'
-                ).execute()
+                self.CreateFolder()
+                page = {'files': []}   # A folder created just now is empty
+            
+            files = list(page.get('files', []))
+            while page.get('nextPageToken'):
+                page = self.Execute(self.BuildListingRequest(folder_id, page['nextPageToken']), "list folder")
+                files.extend(page.get('files', []))
+            
+            self.metadata_cache.Put(FOLDER_LISTING_KEY, files, validator=start_token)
+            return files
+            
+        except DRIVE_ERRORS as e:
+            if folder_id and recheck_folder and GetErrorStatus(e) == 404:
+                self.ForgetFolder()
+                return self.ListFolderFiles(recheck_folder=False)
+            print(f"Error listing AndyLibrary folder: {e}")
+            return None
+    
+    def GetListedFile(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """Metadata for a file from the fresh cached folder listing (an update check has just fetched it)"""
+        for file in self.metadata_cache.Get(FOLDER_LISTING_KEY) or []:
+            if file['id'] == file_id:
+                return file
+        return None
+    
+    def CheckFolderChanges(self, folder_id: str, page_token: str,
+                           cached_files: List[Dict[str, Any]]) -> Tuple[bool, Optional[str]]:
+        """Ask the Drive changes feed whether anything in the folder changed since page_token"""
+        cached_ids = {file['id'] for file in cached_files}
+        
+        try:
+            while page_token:
+                results = self.Execute(self.service.changes().list(
+                    pageToken=page_token,
+                    fields="nextPageToken,newStartPageToken,changes(fileId,removed,file(parents,trashed))",
+                    pageSize=1000
+                ), "list changes")
                 
-                print(f"Uploaded database: {file.get('name')} ({file.get('size')} bytes)")
-                return file.get('id')
+                for change in results.get('changes', []):
+                    parents = (change.get('file') or {}).get('parents', [])
+                    if folder_id in parents or change.get('fileId') in cached_ids:
+                        return True, None
                 
-        except HttpError as e:
-            print(f"Error uploading database: {e}")
-            return None
+                if results.get('newStartPageToken'):
+                    return False, results['newStartPageToken']
+                page_token = results.get('nextPageToken')
+        except DRIVE_ERRORS as e:
+            # An expired or invalid token just means a full re-list
+            print(f"Warning: Could not revalidate Drive metadata cache: {e}")
+        
+        return True, None
     
-    def DownloadDatabase(self, file_id: str, local_path: str) -> bool:
-        """Download SQLite database from Google Drive"""
-        if not self.service:
-            if not self.Authenticate():
-                return False
+    def FindFolderFile(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Find a file in the AndyLibrary folder by exact name"""
+        for file in self.ListFolderFiles() or []:
+            if file['name'] == filename:
+                return file
+        return None
+    
+    def BuildVersionInfo(self, file: Dict[str, Any]) -> Dict[str, Any]:
+        """Describe a database file from its Drive metadata"""
+        filename = file['name']
+        try:
+            version_part = filename.split('_v')[1].split('.db')[0]
+            version = version_part.replace('_', '.')
+        except (IndexError, ValueError):
+            version = "unknown"
         
+        return {
+            'file_id': file['id'],
+            'filename': filename,
+            'version': version,
+            'size_bytes': int(file.get('size', 0)),
+            'md5_checksum': GetContentMd5(file),
+            'codec': GetContentCodec(file),
+            'manifest': FromAppProperties(file.get('appProperties')),
+            'modified_time': file['modifiedTime'],
+            'description': file.get('description', ''),
+            'download_url': f"https://drive.google.com/file/d/{file['id']}/view"
+        }
+    
+    def UploadFile(self, local_path: str, filename: str, description: str,
+                   mimetype: str = 'application/x-sqlite3',
+                   extra_properties: Optional[Dict[str, str]] = None,
+                   recheck_folder: bool = True) -> Optional[str]:
+        """Create or replace a named file in the AndyLibrary folder, skipping unchanged content"""
+        # Publishing must see the live folder, and leaves the cached listing out of date.
+        # Listing first also replaces a remembered folder ID that has gone stale
+        self.metadata_cache.Invalidate(FOLDER_LISTING_KEY)
+        existing_file = self.FindFolderFile(filename)
+        self.metadata_cache.Invalidate(FOLDER_LISTING_KEY)
+        
+        folder_id = self.GetOrCreateAndyLibraryFolder()
+        if not folder_id:
+            return None
+        
+        content_md5 = self.CalculateFileHash(local_path)
+        if existing_file and content_md5 and GetContentMd5(existing_file) == content_md5:
+            print(f"Unchanged: {filename} already holds this content - skipping upload")
+            return existing_file['id']
+        
+        codec = ResolveCodec(self.upload_compression)
+        payload_path = local_path
+        if codec != CODEC_IDENTITY:
+            payload_path = f"{local_path}.{codec}.upload"
+            compressed_size = CompressFile(local_path, payload_path, codec)
+            print(f"Compressed {filename} with {codec}: {os.path.getsize(local_path)} → {compressed_size} bytes")
+        
+        app_properties = {
+            'content_md5': content_md5,
+            'content_codec': codec,
+            'content_size': str(os.path.getsize(local_path))
+        }
+        app_properties.update(extra_properties or {})
+        if existing_file:
+            method = 'PATCH'
+            upload_url = DRIVE_UPDATE_URL.format(file_id=existing_file['id'])
+            metadata = {'appProperties': app_properties}
+        else:
+            method = 'POST'
+            upload_url = DRIVE_UPLOAD_URL
+            metadata = {
+                'name': filename,
+                'parents': [folder_id],
+                'description': description,
+                'mimeType': mimetype,
+                'appProperties': app_properties
+            }
+        
+        uploader = ResumableUploader(upload_url, headers_provider=self.GetAuthorizationHeaders,
+                                     chunk_size=self.upload_chunk_size)
         try:
-            # Get file metadata
-            file_metadata = self.service.files().get(fileId=file_id, fields='name,size').execute()
-            print(f"Downloading: {file_metadata.get('name')} ({file_metadata.get('size')} bytes)")
-            
-            # Download file content
-            request = self.service.files().get_media(fileId=file_id)
-            fh = io.BytesIO()
-            downloader = MediaIoBaseDownload(fh, request)
-            
-            done = False
-            while done is False:
-                status, done = downloader.next_chunk()
-                if status:
-                    print(f"Download progress: {int(status.progress() * 100)}%")
-            
-            # Write to local file
-            os.makedirs(os.path.dirname(local_path), exist_ok=True)
-            with open(local_path, 'wb') as f:
-                f.write(fh.getvalue())
-            
-            print(f"Database downloaded successfully: {local_path}")
-            return True
-            
-        except HttpError as e:
-            print(f"Error downloading database: {e}")
-            return False
+            # The session only resumes for the same content going to the same place
+            result = uploader.Upload(
+                payload_path, metadata,
+                mimetype=CODEC_MIMETYPES.get(codec, mimetype),
+                source_key=f"{existing_file['id'] if existing_file else folder_id}:{filename}:{content_md5}:{codec}",
+                method=method
+            )
+        except UploadError as e:
+            # Drive refuses a new file whose parent folder has been deleted since it was listed
+            if e.status == 404 and not existing_file and recheck_folder:
+                self.ForgetFolder()
+                return self.UploadFile(local_path, filename, description, mimetype, extra_properties,
+                                       recheck_folder=False)
+            # Compressed payload and session state stay behind for the next attempt
+            print(f"Error uploading {filename}: {e}")
+            return None
+        
+        if payload_path != local_path:
+            os.remove(payload_path)
+        if result['resumed_from']:
+            print(f"Resumed upload from byte {result['resumed_from']}")
+        
+        file = result['file']
+        print(f"{'Updated' if existing_file else 'Uploaded'}: {file.get('name')} ({file.get('size')} bytes)")
+        return file.get('id')
     
-    def GetLatestDatabaseVersion(self) -> Optional[Dict[str, Any]]:
-        """Get information about the latest database version"""
+    def UploadDatabase(self, local_db_path: str, version_info: Dict[str, Any],
+                       previous_db_path: str = None, previous_version: str = None) -> Optional[str]:
+        """Upload SQLite database to Google Drive, plus a delta from the previous version when given"""
         if not self.service:
             if not self.Authenticate():
                 return None
         
-        folder_id = self.GetOrCreateAndyLibraryFolder()
-        if not folder_id:
+        try:
+            # Generate filename with version
+            version = version_info.get('version', '1.0.0')
+            filename = f"AndersonLibrary_v{version.replace('.', '_')}.db"
+            description = f"AndyGoogle SQLite Database v{version} - {version_info.get('description', '')}"
+            
+            # Clients verify and count the download against this instead of rescanning it
+            manifest = BuildManifest(local_db_path)
+            file_id = self.UploadFile(local_db_path, filename, description,
+                                      extra_properties=ToAppProperties(manifest))
+            if file_id and previous_db_path and previous_version and os.path.exists(previous_db_path):
+                self.UploadDatabaseDelta(previous_db_path, local_db_path, previous_version, version)
+            return file_id
+                
+        except DRIVE_ERRORS + (CodecError, OSError, sqlite3.Error) as e:
+            print(f"Error uploading database: {e}")
             return None
+    
+    def UploadDatabaseDelta(self, previous_db_path: str, local_db_path: str,
+                            previous_version: str, version: str) -> Optional[str]:
+        """Publish the page-level delta between two database versions"""
+        filename = GetDeltaFilename(previous_version, version)
+        delta_path = os.path.join(tempfile.gettempdir(), filename)
         
         try:
-            # Search for database files in AndyLibrary folder
-            query = f"'{folder_id}' in parents and name contains 'AndersonLibrary_v' and trashed=false"
-            results = self.service.files().list(
-                q=query,
-                fields="files(id,name,size,modifiedTime,description)",
-                orderBy="modifiedTime desc"
-            ).execute()
+            header = CreateDelta(previous_db_path, local_db_path, delta_path, previous_version, version)
+            target_size = header['target_size'] or 1
+            print(f"Delta v{previous_version} → v{version}: {header['changed_pages']} pages, "
+                  f"{header['delta_size']} bytes ({header['delta_size'] * 100 // target_size}% of full)")
             
-            files = results.get('files', [])
-            if not files:
+            # Deltas no smaller than half the database are not worth publishing
+            if header['delta_size'] * 2 > header['target_size']:
+                print("Delta too large to be useful - skipping")
                 return None
             
-            latest_file = files[0]
-            
-            # Extract version from filename
-            filename = latest_file['name']
-            try:
-                version_part = filename.split('_v')[1].split('.db')[0]
-                version = version_part.replace('_', '.')
-            except (IndexError, ValueError):
-                version = "unknown"
-            
-            return {
-                'file_id': latest_file['id'],
-                'filename': filename,
-                'version': version,
-                'size_bytes': int(latest_file.get('size', 0)),
-                'modified_time': latest_file['modifiedTime'],
-                'description': latest_file.get('description', ''),
-                'download_url': f"https://drive.google.com/file/d/{latest_file['id']}/view"
-            }
-            
-        except HttpError as e:
-            print(f"Error getting latest database version: {e}")
+            return self.UploadFile(delta_path, filename,
+                                   f"AndyGoogle database delta v{previous_version} → v{version}",
+                                   mimetype='application/octet-stream')
+        except DRIVE_ERRORS + (CodecError, OSError) as e:
+            print(f"Error uploading database delta: {e}")
             return None
+        finally:
+            if os.path.exists(delta_path):
+                os.remove(delta_path)
     
-    def ListDatabaseVersions(self) -> List[Dict[str, Any]]:
-        """List all database versions available on Google Drive"""
+    def DownloadDatabase(self, file_id: str, local_path: str, chunk_size: int = None) -> bool:
+        """Stream a SQLite database from Google Drive straight to disk, resuming partial downloads"""
+        return self.DownloadFile(file_id, local_path, chunk_size)
+    
+    def DownloadFile(self, file_id: str, local_path: str, chunk_size: int = None) -> bool:
+        """Stream any Drive file to disk in resumable chunks, verifying its MD5 on the way"""
         if not self.service:
             if not self.Authenticate():
-                return []
+                return False
         
-        folder_id = self.GetOrCreateAndyLibraryFolder()
-        if not folder_id:
-            return []
+        self.last_download_hash = None
         
         try:
-            # Search for all database files
-            query = f"'{folder_id}' in parents and name contains 'AndersonLibrary_v' and trashed=false"
-            results = self.service.files().list(
-                q=query,
-                fields="files(id,name,size,modifiedTime,description)",
-                orderBy="modifiedTime desc"
-            ).execute()
+            # Files found through the folder listing need no metadata round trip of their own
+            file_metadata = self.GetListedFile(file_id)
+            if file_metadata is None:
+                file_metadata = self.Execute(self.service.files().get(fileId=file_id, fields=DOWNLOAD_FIELDS),
+                                             "file metadata")
+            print(f"Downloading: {file_metadata.get('name')} ({file_metadata.get('size')} bytes)")
+            
+            expected_size = int(file_metadata['size']) if file_metadata.get('size') else None
+            expected_md5 = file_metadata.get('md5Checksum')
             
-            files = results.get('files', [])
-            versions = []
+            # Compressed files are fetched beside the target and decoded into it afterwards
+            codec = GetContentCodec(file_metadata)
+            transfer_path = local_path if codec == CODEC_IDENTITY else f"{local_path}.{codec}"
+            
+            # Large files come down as concurrent ranges; one stream is latency-bound
+            media_url = DRIVE_MEDIA_URL.format(file_id=file_id)
+            if (expected_size and expected_size >= self.parallel_download_min_size
+                    and self.download_connections > 1):
+                downloader = ParallelDownloader(
+                    media_url,
+                    headers_provider=self.GetAuthorizationHeaders,
+                    part_size=chunk_size or self.download_chunk_size,
+                    max_connections=self.download_connections
+                )
+            else:
+                downloader = ChunkedDownloader(
+                    media_url,
+                    headers_provider=self.GetAuthorizationHeaders,
+                    chunk_size=chunk_size or self.download_chunk_size
+                )
             
-            for file in files:
-                filename = file['name']
+            last_reported = [-1]
+            def report_progress(done_bytes: int, total_bytes: Optional[int]):
+                if total_bytes:
+                    percent = int(done_bytes * 100 / total_bytes)
+                    if percent != last_reported[0]:
+                        last_reported[0] = percent
+                        print(f"Download progress: {percent}%")
+            
+            # Resume only a partial file of the same content
+            result = downloader.Download(
+                transfer_path,
+                source_key=f"{file_id}:{expected_md5 or expected_size}",
+                expected_size=expected_size,
+                expected_md5=expected_md5,
+                progress_callback=report_progress
+            )
+            
+            if result['resumed_from']:
+                print(f"Resumed download from byte {result['resumed_from']}")
+            
+            # Hash was computed while streaming - no second pass over the file
+            self.last_download_hash = result['md5']
+            
+            if codec != CODEC_IDENTITY:
                 try:
-                    version_part = filename.split('_v')[1].split('.db')[0]
-                    version = version_part.replace('_', '.')
-                except (IndexError, ValueError):
-                    version = "unknown"
-                
-                versions.append({
-                    'file_id': file['id'],
-                    'filename': filename,
-                    'version': version,
-                    'size_bytes': int(file.get('size', 0)),
-                    'modified_time': file['modifiedTime'],
-                    'description': file.get('description', ''),
-                    'download_url': f"https://drive.google.com/file/d/{file['id']}/view"
-                })
+                    content_md5 = DecompressFile(transfer_path, local_path, codec)
+                finally:
+                    os.remove(transfer_path)
+                declared_md5 = GetContentMd5(file_metadata)
+                if declared_md5 and content_md5 != declared_md5:
+                    os.remove(local_path)
+                    raise CodecError(f"Decompressed MD5 mismatch: got {content_md5}, expected {declared_md5}")
+                print(f"Decompressed {codec} download: {result['bytes']} → {os.path.getsize(local_path)} bytes")
+                self.last_download_hash = content_md5
             
-            return versions
+            print(f"Downloaded successfully: {local_path}")
+            return True
             
-        except HttpError as e:
-            print(f"Error listing database versions: {e}")
-            return []
+        except DRIVE_ERRORS as e:
+            print(f"Error downloading file: {e}")
+            return False
+        except (DownloadError, CodecError) as e:
+            print(f"Error downloading file: {e}")
+            return False
+    
+    def GetLatestDatabaseVersion(self) -> Optional[Dict[str, Any]]:
+        """Get information about the latest database version"""
+        versions = self.ListDatabaseVersions()
+        return versions[0] if versions else None
+    
+    def ListDatabaseVersions(self) -> List[Dict[str, Any]]:
+        """List all database versions available on Google Drive, newest first"""
+        files = self.ListFolderFiles() or []
+        return [
+            self.BuildVersionInfo(file) for file in files
+            if file['name'].startswith(DATABASE_PREFIX) and file['name'].endswith('.db')
+        ]
+    
+    def ListDatabaseDeltas(self) -> List[Dict[str, Any]]:
+        """List published database deltas with their version endpoints"""
+        deltas = []
+        for file in self.ListFolderFiles() or []:
+            versions = ParseDeltaFilename(file['name'])
+            if not versions:
+                continue
+            deltas.append({
+                'file_id': file['id'],
+                'filename': file['name'],
+                'from_version': versions['from_version'],
+                'to_version': versions['to_version'],
+                'size_bytes': int(file.get('size', 0)),
+                'md5_checksum': GetContentMd5(file)
+            })
+        
+        return deltas
     
     def CalculateFileHash(self, file_path: str) -> str:
         """Calculate MD5 hash of a file for integrity checking"""
         hash_md5 = hashlib.md5()
         try:
             with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
+                for chunk in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
                     hash_md5.update(chunk)
             return hash_md5.hexdigest()
         except Exception as e:
             print(f"Error calculating file hash: {e}")
             return ""
     
-    def ValidateDatabaseIntegrity(self, local_path: str) -> bool:
-        """Validate downloaded SQLite database integrity"""
-        if not os.path.exists(local_path):
-            return False
-        
-        try:
-            import sqlite3
-            # Try to open and query the database
-            conn = sqlite3.connect(local_path)
-            cursor = conn.cursor()
-            
-            # Basic integrity checks
-            cursor.execute("PRAGMA integrity_check")
-            result = cursor.fetchone()
-            
-            if result and result[0] == 'ok':
-                # Check for required tables
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-                tables = [row[0] for row in cursor.fetchall()]
-                
-                required_tables = ['books', 'categories', 'subjects']
-                missing_tables = [table for table in required_tables if table not in tables]
-                
-                conn.close()
-                
-                if missing_tables:
-                    print(f"Database missing required tables: {missing_tables}")
-                    return False
-                
-                return True
-            else:
-                conn.close()
-                print(f"Database integrity check failed: {result}")
-                return False
-                
-        except Exception as e:
-            print(f"Error validating database: {e}")
-            return False
+    def ValidateDatabaseIntegrity(self, local_path: str, manifest: Optional[Dict[str, Any]] = None,
+                                  full_check: bool = True) -> bool:
+        """Validate downloaded SQLite database integrity (see Core.DatabaseManifest.VerifyDatabase)"""
+        verification = VerifyDatabase(local_path, manifest, full_check=full_check)
+        for problem in verification['problems']:
+            print(f"Database validation failed: {problem}")
+        return verification['ok']
     
     def GetDriveUsageInfo(self) -> Optional[Dict[str, Any]]:
         """Get Google Drive storage usage information"""
@@ -350,7 +629,7 @@ class GoogleDriveAPI:
                 return None
         
         try:
-            about = self.service.about().get(fields='storageQuota,user').execute()
+            about = self.Execute(self.service.about().get(fields='storageQuota,user'), "storage quota")
             quota = about.get('storageQuota', {})
             user = about.get('user', {})
             
@@ -363,7 +642,7 @@ class GoogleDriveAPI:
                 'usage_percentage': (int(quota.get('usage', 0)) / int(quota.get('limit', 1))) * 100
             }
             
-        except HttpError as e:
+        except DRIVE_ERRORS as e:
             print(f"Error getting drive usage info: {e}")
             return None
 
@@ -2,7 +2,7 @@
 # Path: AndyGoogle/Source/API/MainAPI.py
 # Standard: AIDEV-PascalCase-2.1
 # Created: 2025-07-12
-# Last Modified: 2025-07-12  07:37PM
+# Last Modified: 2026-10-19  03:41AM
 """
 Description: FastAPI main server for AndyGoogle with Google Drive integration
 Provides RESTful API endpoints for library management with cloud synchronization
@@ -11,11 +11,18 @@ Provides RESTful API endpoints for library management with cloud synchronization
 import os
 import sys
 import sqlite3
+import json
+import queue
+import signal
+import mimetypes
+import time
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Any
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Request
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 import uvicorn
 
@@ -24,6 +31,25 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # from Core.DriveManager import DriveManager
 # from Utils.SheetsLogger import SheetsLogger
+from Core.DatabasePool import DatabasePool
+from Core.DatabaseGenerations import GetConfiguredDatabasePath
+from Core.SearchIndex import (SEARCH_SCHEMA, BuildMatchExpression, IsSearchIndexAttached, MatchBookIds, SearchBooks,
+                              SearchBooksByTitle, UnsupportedFilterError)
+from Core.Pagination import InvalidCursorError, BuildSeekClause, GetNextCursor
+from Core.SyncScheduler import SyncScheduler
+from Core.CatalogSnapshot import CatalogSnapshot
+from Core.FacetIndex import FacetIndex
+from Core.SuggestIndex import SuggestIndex, SupersededRequestTracker
+from Core.BookFiles import BookFileResolver
+from Core.BookBatch import (DEFAULT_MAX_IDS, BatchTooLargeError, CheckBatchSize, FetchBooksFromCatalog,
+                             FetchBooksFromDatabase, BuildBatchResult)
+from Core.ThumbnailService import ThumbnailService, ThumbnailUnavailable
+from API.ResponseCache import ResponseCache, ResponseCacheMiddleware
+from API.FastJSON import IsFastJSONEnabled, EncodeJSON, EncodeRows, GetEncoderName
+from API.CatalogExport import EXPORT_FORMATS, AcceptsGzip, IterateExport, BuildExportHeaders
+from API.RangeFileResponse import RangeFileResponse
+from API.WorkerSupervisor import WorkerSupervisor, UsageRelay
+from Utils.TelemetryPipeline import TelemetryPipeline, BuildUsageEvent
 
 # FastAPI app instance
 app = FastAPI(
@@ -35,6 +61,32 @@ app = FastAPI(
 # Global managers (initialized on startup)
 drive_manager = None
 sheets_logger = None
+database_pool = None
+database_pool_lock = threading.Lock()
+telemetry_pipeline = None
+sync_scheduler = None
+catalog_snapshot = None
+catalog_snapshot_lock = threading.Lock()
+facet_index = None
+facet_index_lock = threading.Lock()
+suggest_index = None
+suggest_index_lock = threading.Lock()
+suggest_tracker = SupersededRequestTracker()
+book_files = None
+thumbnail_service = None
+response_cache = ResponseCache()
+response_cache_generation = (None, None)   # (database file stat key, (etag token, last modified))
+fast_json_enabled = IsFastJSONEnabled()
+
+# Multi-worker mode (set in each forked worker by WorkerSupervisor; defaults describe a single process)
+worker_settings = {
+    'worker_index': None,
+    'owns_background_duties': True,
+    'usage_queue': None,
+    'supervisor_pid': None,
+    'ready_fd': None
+}
+usage_relay = None
 
 # Pydantic models for API requests/responses
 class BookResponse(BaseModel):
@@ -66,6 +118,70 @@ class StatsResponse(BaseModel):
     last_sync: Optional[str] = None
     offline_mode: bool
 
+class BookSearchFilters(BaseModel):
+    category: Optional[str] = None
+    subject: Optional[str] = None
+    rating: Optional[int] = None
+
+class BookSearchRequest(BaseModel):
+    query: str
+    page: int = 1
+    limit: int = 50
+    filters: Optional[BookSearchFilters] = None
+
+class BookSearchResult(BookResponse):
+    title_highlight: Optional[str] = None
+    snippet: Optional[str] = None
+    score: Optional[float] = None
+
+class BookSearchResponse(BaseModel):
+    books: List[BookSearchResult]
+    total: int
+    page: int
+    limit: int
+    query: str
+    ranked: bool
+
+class FacetCount(BaseModel):
+    value: Any
+    count: int
+
+class BookFacets(BaseModel):
+    categories: List[FacetCount]
+    subjects: List[FacetCount]
+    ratings: List[FacetCount]
+
+class BookFilterResponse(BaseModel):
+    books: List[BookResponse]
+    total: int
+    page: int
+    limit: int
+    facets: BookFacets
+
+class Suggestion(BaseModel):
+    text: str
+    kind: str
+    book_id: Optional[int] = None
+    count: int
+
+class SuggestResponse(BaseModel):
+    query: str
+    suggestions: List[Suggestion]
+    superseded: bool = False
+
+class BookBatchRequest(BaseModel):
+    ids: List[int]
+
+class BookBatchItem(BaseModel):
+    id: int
+    found: bool
+    book: Optional[BookResponse] = None
+
+class BookBatchResponse(BaseModel):
+    results: List[BookBatchItem]
+    found: int
+    missing: List[int]
+
 class SyncStatusResponse(BaseModel):
     local_database_exists: bool
     local_version: str
@@ -75,10 +191,127 @@ class SyncStatusResponse(BaseModel):
     offline_mode: bool
     auto_sync_enabled: bool
     database_size_mb: float
+    sync_job: Optional[Dict[str, Any]] = None
+    transport: Optional[Dict[str, Any]] = None
+    integrity_check: Optional[Dict[str, Any]] = None
+
+def on_database_swapped(db_path: str, immutable: bool):
+    """Drain pooled connections onto a newly installed database file and reload the catalog"""
+    global catalog_snapshot, facet_index, suggest_index
+    
+    if database_pool:
+        database_pool.SwapDatabase(
+            db_path,
+            immutable=immutable,
+            attachments=drive_manager.GetDatabaseAttachments()
+        )
+    
+    # Cached response bodies belong to the old generation
+    response_cache.SetGeneration(None)
+    
+    # Built off to the side, then published with a single reference swap
+    if catalog_snapshot:
+        try:
+            catalog_snapshot = CatalogSnapshot.Build(db_path, immutable=immutable)
+        except sqlite3.Error as e:
+            print(f"Warning: Could not rebuild catalog snapshot, keeping previous one: {e}")
+        else:
+            if facet_index:
+                facet_index = FacetIndex.Build(catalog_snapshot)
+            if suggest_index:
+                suggest_index = SuggestIndex.Build(catalog_snapshot)
+
+def get_catalog() -> CatalogSnapshot:
+    """Dependency returning the in-memory catalog for the current database generation"""
+    global catalog_snapshot
+    
+    if catalog_snapshot:
+        return catalog_snapshot
+    
+    if not drive_manager:
+        raise HTTPException(status_code=500, detail="Drive manager not initialized")
+    
+    db_path = drive_manager.local_db_path
+    if not os.path.exists(db_path):
+        raise HTTPException(status_code=503, detail="Database not available - sync required")
+    
+    with catalog_snapshot_lock:
+        if not catalog_snapshot:
+            catalog_snapshot = CatalogSnapshot.Build(db_path, immutable=drive_manager.IsDatabaseImmutable())
+            
+            # Make sure swaps rebuild it even if no pooled connection was ever opened
+            drive_manager.RegisterDatabaseSwapListener(on_database_swapped)
+    
+    return catalog_snapshot
+
+def get_facet_index(catalog: CatalogSnapshot = Depends(get_catalog)) -> FacetIndex:
+    """Dependency returning the facet bitmaps for the current catalog snapshot"""
+    global facet_index
+    
+    if facet_index and facet_index.snapshot is catalog:
+        return facet_index
+    
+    with facet_index_lock:
+        if not facet_index or facet_index.snapshot is not catalog:
+            facet_index = FacetIndex.Build(catalog)
+    
+    return facet_index
+
+def get_suggest_index(catalog: CatalogSnapshot = Depends(get_catalog)) -> SuggestIndex:
+    """Dependency returning the autocomplete index for the current catalog snapshot"""
+    global suggest_index
+    
+    if suggest_index and suggest_index.snapshot is catalog:
+        return suggest_index
+    
+    with suggest_index_lock:
+        if not suggest_index or suggest_index.snapshot is not catalog:
+            suggest_index = SuggestIndex.Build(catalog)
+    
+    return suggest_index
+
+def get_database_pool() -> DatabasePool:
+    """Get the per-worker connection pool, creating it on first use"""
+    global database_pool
+    
+    if database_pool:
+        return database_pool
+    
+    with database_pool_lock:
+        if not database_pool:
+            config = drive_manager.config
+            database_pool = DatabasePool(
+                drive_manager.local_db_path,
+                pool_size=config.get('database_pool_size', 4),
+                immutable=drive_manager.IsDatabaseImmutable(),
+                attachments=drive_manager.GetDatabaseAttachments(),
+                mmap_size_mb=config.get('database_mmap_size_mb', 256),
+                cache_size_mb=config.get('database_cache_size_mb', 16),
+                reference_tracker=drive_manager.generation_store
+            )
+            drive_manager.RegisterDatabaseSwapListener(on_database_swapped)
+    
+    return database_pool
+
+def get_sync_scheduler() -> SyncScheduler:
+    """Get the sync scheduler, creating it (without the periodic loop) if startup did not"""
+    global sync_scheduler
+    
+    if not sync_scheduler:
+        config = drive_manager.config
+        sync_scheduler = SyncScheduler(
+            drive_manager,
+            version_check_interval_hours=config.get('version_check_interval_hours', 6),
+            sync_interval_hours=config.get('sync_interval_hours', 24),
+            jitter_fraction=config.get('sync_check_jitter_fraction', 0.1),
+            initial_delay_seconds=config.get('sync_initial_delay_seconds', 60)
+        )
+    
+    return sync_scheduler
 
 # Dependency to get database connection
 def get_database():
-    """Get SQLite database connection"""
+    """Borrow a pooled read-only SQLite connection for the request"""
     if not drive_manager:
         raise HTTPException(status_code=500, detail="Drive manager not initialized")
     
@@ -87,36 +320,174 @@ def get_database():
     if not os.path.exists(db_path):
         raise HTTPException(status_code=503, detail="Database not available - sync required")
     
+    pool = get_database_pool()
+    try:
+        conn = pool.Acquire()
+    except TimeoutError:
+        raise HTTPException(status_code=503, detail="Database busy - please retry")
+    
     try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row  # Enable column access by name
         yield conn
     finally:
-        conn.close()
+        pool.Release(conn)
+
+def get_book_files() -> BookFileResolver:
+    """Resolver for book files under the configured library directory"""
+    global book_files
+    
+    if not book_files:
+        book_files = BookFileResolver(drive_manager.config.get('books_directory', 'AndyGoogle/Data/Books'))
+    
+    return book_files
+
+def get_thumbnail_service() -> ThumbnailService:
+    """Thumbnail cache and worker pool, created on first use"""
+    global thumbnail_service
+    
+    if not thumbnail_service:
+        config = drive_manager.config
+        thumbnail_service = ThumbnailService(
+            config.get('thumbnail_cache_directory', 'AndyGoogle/Data/Cache/Thumbnails'),
+            sizes=config.get('thumbnail_sizes', [120, 240, 480]),
+            max_workers=config.get('thumbnail_workers', 2)
+        )
+    
+    return thumbnail_service
+
+def resolve_book_source(book_id: int, with_thumbnail: bool = False):
+    """Look up a book's record, file path and embedded thumbnail
+    
+    Borrows a pooled connection only for the lookup, so slow renders and long
+    downloads do not hold a pool slot. Blocking (pool wait plus SQLite) - async
+    endpoints call it through run_in_threadpool.
+    """
+    database = get_database()
+    conn = next(database)
+    try:
+        resolver = get_book_files()
+        record = resolver.GetBookRecord(conn, book_id)
+        if not record:
+            raise HTTPException(status_code=404, detail="Book not found")
+        image_bytes = resolver.GetEmbeddedThumbnail(conn, book_id) if with_thumbnail and record['has_thumbnail'] else None
+    finally:
+        database.close()
+    
+    return record, resolver.ResolvePath(record), image_bytes
+
+def query_database(function, *args):
+    """Run function(conn, *args) on a pooled connection borrowed only for the call
+    
+    For endpoints that answer from memory and need SQLite only some of the time.
+    Blocking - async endpoints call it through run_in_threadpool.
+    """
+    database = get_database()
+    conn = next(database)
+    try:
+        return function(conn, *args)
+    finally:
+        database.close()
 
 # Dependency to log API usage
 def log_api_usage(request: Request, action: str, details: str = None):
-    """Log API usage to Google Sheets"""
+    """Tag the request for usage logging (recorded by the telemetry middleware)"""
+    request.state.usage_action = action
+    request.state.usage_details = details
+
+def write_usage_events(events: List[Dict[str, Any]]):
+    """Telemetry sink - runs on a worker thread, never on the event loop"""
     if sheets_logger:
+        sheets_logger.LogUsageBatch(events)
+
+def forward_usage_events(events: List[Dict[str, Any]]):
+    """Telemetry sink for non-owning workers - hand the batch to the owning worker"""
+    try:
+        worker_settings['usage_queue'].put_nowait(events)
+    except queue.Full:
+        print(f"Warning: Usage relay queue full - dropped {len(events)} events")
+
+def notify_supervisor_of_swap(db_path: str, immutable: bool):
+    """Ask the supervisor to roll the other workers onto a newly installed generation"""
+    try:
+        os.kill(worker_settings['supervisor_pid'], signal.SIGUSR1)
+    except OSError as e:
+        print(f"Warning: Could not notify worker supervisor of database swap: {e}")
+
+def preload_catalog(db_path: str, immutable: bool = False):
+    """Build the catalog and its indexes up front (the supervisor does this before forking)"""
+    global catalog_snapshot, facet_index, suggest_index
+    
+    catalog_snapshot = CatalogSnapshot.Build(db_path, immutable=immutable)
+    facet_index = FacetIndex.Build(catalog_snapshot)
+    suggest_index = SuggestIndex.Build(catalog_snapshot)
+
+def configure_worker(worker_index: int, owns_background_duties: bool, usage_queue=None,
+                     supervisor_pid: Optional[int] = None, ready_fd: Optional[int] = None):
+    """Set this process's role before its server starts (called in each forked worker)"""
+    worker_settings.update(
+        worker_index=worker_index,
+        owns_background_duties=owns_background_duties,
+        usage_queue=usage_queue,
+        supervisor_pid=supervisor_pid,
+        ready_fd=ready_fd
+    )
+
+def get_response_cache_generation():
+    """Identify the live database generation for ETags - cheap enough to run per request"""
+    global response_cache_generation
+    
+    if not drive_manager:
+        return None
+    
+    db_path = drive_manager.local_db_path
+    try:
+        stat = os.stat(db_path)
+    except OSError:
+        return None
+    
+    stat_key = (db_path, stat.st_size, stat.st_mtime_ns)
+    cached_key, generation = response_cache_generation
+    if cached_key == stat_key:
+        return generation
+    
+    # Published hash when the file is a synced copy, otherwise the file's identity
+    version_info = drive_manager.GetLocalVersionInfo()
+    file_hash = version_info.get('file_hash') if drive_manager.IsDatabaseImmutable() else None
+    token = f"{os.path.basename(db_path)}:{file_hash or f'{stat.st_size}:{stat.st_mtime_ns}'}"
+    
+    generation = (token, stat.st_mtime)
+    response_cache_generation = (stat_key, generation)
+    return generation
+
+# Conditional GET / response body cache (inside the telemetry middleware, so hits are still logged)
+app.add_middleware(ResponseCacheMiddleware, cache=response_cache, generation_provider=get_response_cache_generation)
+
+# Usage telemetry middleware
+@app.middleware("http")
+async def telemetry_middleware(request: Request, call_next):
+    """Queue one usage event per tagged request after the response is produced"""
+    start_time = time.perf_counter()
+    response = await call_next(request)
+    
+    action = getattr(request.state, 'usage_action', None)
+    if action and telemetry_pipeline:
         try:
-            client_ip = request.client.host if request.client else "unknown"
-            user_agent = request.headers.get("user-agent", "unknown")
-            
-            sheets_logger.LogUsage(
+            await telemetry_pipeline.EmitAsync(BuildUsageEvent(
                 action=action,
-                action_details=details,
-                client_ip=client_ip,
-                user_agent=user_agent,
-                session_id=f"api_{int(datetime.now().timestamp())}"
-            )
+                details=getattr(request.state, 'usage_details', None),
+                client_ip=request.client.host if request.client else "unknown",
+                user_agent=request.headers.get("user-agent", "unknown"),
+                duration=time.perf_counter() - start_time
+            ))
         except Exception as e:
-            print(f"Warning: Failed to log API usage: {e}")
+            print(f"Warning: Failed to queue API usage event: {e}")
+    
+    return response
 
 # Startup event
 @app.on_event("startup")
 async def startup_event():
     """Initialize AndyGoogle components on startup"""
-    global drive_manager, sheets_logger
+    global drive_manager, sheets_logger, telemetry_pipeline, usage_relay
     
     print("🚀 Starting AndyGoogle API server...")
     print("📊 Database ready with local SQLite file")
@@ -125,8 +496,68 @@ async def startup_event():
     # For now, start without Drive/Sheets integration to get basic functionality working
     # These will be None but the API will still work for local database access
     
+    # Usage logging runs off the request path
+    config = drive_manager.config if drive_manager else {}
+    
+    global fast_json_enabled
+    fast_json_enabled = IsFastJSONEnabled(config)
+    if fast_json_enabled:
+        print(f"⚡ Fast JSON serialization enabled ({GetEncoderName()})")
+    
+    response_cache.max_entries = config.get('response_cache_entries', 512)
+    response_cache.max_bytes = int(config.get('response_cache_mb', 32) * 1024 * 1024)
+    # In multi-worker mode only the owning worker writes usage logs; the rest relay to it
+    owns_background_duties = worker_settings['owns_background_duties']
+    multi_worker = worker_settings['worker_index'] is not None
+    telemetry_pipeline = TelemetryPipeline(
+        write_usage_events if owns_background_duties else forward_usage_events,
+        max_queue_size=config.get('telemetry_queue_size', 10000),
+        batch_size=config.get('telemetry_batch_size', 200),
+        flush_interval_seconds=config.get('telemetry_flush_interval_seconds', 2.0),
+        backpressure=config.get('telemetry_backpressure', 'drop'),
+        sample_rate=config.get('telemetry_sample_rate', 0.1)
+    )
+    await telemetry_pipeline.Start()
+    
+    if multi_worker and owns_background_duties:
+        usage_relay = UsageRelay(worker_settings['usage_queue'], write_usage_events)
+        usage_relay.Start()
+    
+    if multi_worker and drive_manager:
+        # Other workers still read the old generation - the supervisor reclaims it after rolling them
+        drive_manager.reclaim_after_sync = False
+        drive_manager.RegisterDatabaseSwapListener(notify_supervisor_of_swap)
+    
+    # Periodic version checks and syncs run inside the API process (the owning worker's)
+    if drive_manager and drive_manager.auto_sync_enabled and owns_background_duties:
+        await get_sync_scheduler().Start()
+    
+    if worker_settings['ready_fd'] is not None:
+        os.write(worker_settings['ready_fd'], b"1")
+        os.close(worker_settings['ready_fd'])
+        worker_settings['ready_fd'] = None
+    
     print("✅ AndyGoogle API server started successfully")
 
+# Shutdown event
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background syncs, flush queued usage events and release pooled connections on shutdown"""
+    if sync_scheduler:
+        await sync_scheduler.Stop()
+    
+    if telemetry_pipeline:
+        await telemetry_pipeline.Stop()
+    
+    if usage_relay:
+        usage_relay.Stop()
+    
+    if thumbnail_service:
+        thumbnail_service.Close()
+    
+    if database_pool:
+        database_pool.Close()
+
 # Health check endpoint
 @app.get("/api/health")
 async def health_check():
@@ -137,6 +568,59 @@ async def health_check():
         "version": "1.0.0"
     }
 
+# Telemetry counters endpoint
+@app.get("/api/telemetry")
+async def get_telemetry_stats():
+    """Usage telemetry queue depth plus enqueued/dropped/flushed counters"""
+    if not telemetry_pipeline:
+        raise HTTPException(status_code=503, detail="Telemetry pipeline not running")
+    return telemetry_pipeline.GetCounters()
+
+# Catalog snapshot diagnostics
+@app.get("/api/catalog/info")
+async def get_catalog_info(catalog: CatalogSnapshot = Depends(get_catalog)):
+    """In-memory catalog size, build time and projected footprint per 100k books"""
+    return catalog.GetInfo()
+
+# Response cache counters
+@app.get("/api/cache/stats")
+async def get_response_cache_stats():
+    """Response cache hits, misses, 304s and occupancy"""
+    return response_cache.GetStats()
+
+# Autocomplete endpoint
+@app.get("/api/suggest", response_model=SuggestResponse)
+async def suggest(
+    request: Request,
+    q: str = "",
+    limit: int = 8,
+    session: Optional[str] = None,
+    seq: Optional[int] = None,
+    index: SuggestIndex = Depends(get_suggest_index)
+):
+    """Ranked completions over titles, authors, categories and subjects
+    
+    Clients send a per-tab `session` id and an increasing keystroke `seq`; a request
+    overtaken by a later keystroke from the same session is answered with
+    `superseded: true` and no suggestions.
+    """
+    if not suggest_tracker.Begin(session, seq) or await request.is_disconnected():
+        return SuggestResponse(query=q, suggestions=[], superseded=True)
+    
+    log_api_usage(request, "suggest", f"q={q}")
+    suggestions = index.Suggest(q, limit)
+    
+    if not suggest_tracker.IsCurrent(session, seq):
+        return SuggestResponse(query=q, suggestions=[], superseded=True)
+    
+    if fast_json_enabled:
+        return Response(
+            content=EncodeJSON({'query': q, 'suggestions': suggestions, 'superseded': False}),
+            media_type="application/json"
+        )
+    
+    return SuggestResponse(query=q, suggestions=[Suggestion(**suggestion) for suggestion in suggestions])
+
 # Sync status endpoint
 @app.get("/api/sync/status", response_model=SyncStatusResponse)
 async def get_sync_status(request: Request):
@@ -147,23 +631,25 @@ async def get_sync_status(request: Request):
         raise HTTPException(status_code=500, detail="Drive manager not available")
     
     status = drive_manager.GetSyncStatus()
+    status['sync_job'] = get_sync_scheduler().GetStatus()
     return SyncStatusResponse(**status)
 
 # Manual sync endpoint
 @app.post("/api/sync/database")
-async def sync_database(request: Request, background_tasks: BackgroundTasks):
-    """Manually trigger database sync from Google Drive"""
+async def sync_database(request: Request):
+    """Manually trigger database sync from Google Drive (joins a sync already in progress)"""
     log_api_usage(request, "manual_sync_requested")
     
     if not drive_manager:
         raise HTTPException(status_code=500, detail="Drive manager not available")
     
-    # Run sync in background
-    background_tasks.add_task(drive_manager.SyncDatabaseFromDrive, True)
+    job = await get_sync_scheduler().RequestSync(force=True, trigger='manual')
+    already_running = job['coalesced_requests'] > 0
     
     return {
-        "status": "sync_started",
-        "message": "Database sync initiated in background",
+        "status": "sync_in_progress" if already_running else "sync_started",
+        "message": "Joined database sync already in progress" if already_running else "Database sync initiated in background",
+        "job": job,
         "timestamp": datetime.now().isoformat()
     }
 
@@ -176,58 +662,89 @@ async def check_for_updates(request: Request):
     if not drive_manager:
         raise HTTPException(status_code=500, detail="Drive manager not available")
     
-    update_info = drive_manager.CheckForUpdates()
+    # Retries with backoff during a Drive outage - keep them off the event loop
+    update_info = await run_in_threadpool(drive_manager.CheckForUpdates)
     return update_info
 
 # Books endpoints
 @app.get("/api/books", response_model=List[BookResponse])
 async def get_books(
     request: Request,
+    response: Response,
     limit: int = 50, 
     offset: int = 0, 
+    cursor: Optional[str] = None,
     search: Optional[str] = None,
     category: Optional[str] = None,
     subject: Optional[str] = None,
     db: sqlite3.Connection = Depends(get_database)
 ):
-    """Get paginated list of books with optional filtering"""
-    log_api_usage(request, "books_list", f"limit={limit}, offset={offset}, search={search}")
+    """Get a page of books with optional filtering
+    
+    Pass the X-Next-Cursor header of the previous page as `cursor` to seek straight
+    to the next page; `offset` is still honored for older clients.
+    """
+    log_api_usage(request, "books_list", f"limit={limit}, offset={offset}, cursor={bool(cursor)}, search={search}")
     
     # Build query - simplified for current database schema
     query = """
         SELECT b.id, b.title, 
-               NULL as author, NULL as category, NULL as subject, 
+               NULL as author, c.category, s.subject, 
                NULL as file_path, NULL as file_size, 
                NULL as page_count, NULL as rating,
                NULL as last_opened
         FROM books b
+        LEFT JOIN categories c ON b.category_id = c.id
+        LEFT JOIN subjects s ON b.subject_id = s.id
         WHERE 1=1
     """
     
     params = []
     
-    # Add search filter
+    # Add search filter - use the FTS5 sidecar when it is attached
     if search:
-        query += " AND b.title LIKE ?"
-        search_param = f"%{search}%"
-        params.append(search_param)
+        match_expression = BuildMatchExpression(search)
+        if match_expression and IsSearchIndexAttached(db):
+            query += f" AND b.id IN (SELECT rowid FROM {SEARCH_SCHEMA}.books_fts WHERE books_fts MATCH ?)"
+            params.append(match_expression)
+        else:
+            query += " AND b.title LIKE ?"
+            search_param = f"%{search}%"
+            params.append(search_param)
     
-    # Add category filter
+    # Add category filter (resolved to an id so idx_books_category_title can seek)
     if category:
-        query += " AND c.category = ?"
+        query += " AND b.category_id = (SELECT id FROM categories WHERE category = ?)"
         params.append(category)
     
     # Add subject filter
     if subject:
-        query += " AND s.subject = ?"
+        query += " AND b.subject_id IN (SELECT id FROM subjects WHERE subject = ?)"
         params.append(subject)
     
-    # Add pagination
-    query += " ORDER BY b.title LIMIT ? OFFSET ?"
-    params.extend([limit, offset])
+    # Add pagination - keyset seek when a cursor is given, OFFSET otherwise
+    try:
+        query += BuildSeekClause(cursor, params)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    cursor = db.execute(query, params)
-    rows = cursor.fetchall()
+    if cursor:
+        query += " ORDER BY b.title, b.id LIMIT ?"
+        params.append(limit)
+    else:
+        query += " ORDER BY b.title, b.id LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+    
+    rows = db.execute(query, params).fetchall()
+    next_cursor = GetNextCursor(rows, limit)
+    
+    # Opt-in: encode rows straight to bytes (column aliases match BookResponse fields)
+    if fast_json_enabled:
+        return Response(
+            content=EncodeRows(rows, rows[0].keys() if rows else []),
+            media_type="application/json",
+            headers={"X-Next-Cursor": next_cursor} if next_cursor else None
+        )
     
     books = []
     for row in rows:
@@ -244,8 +761,174 @@ async def get_books(
             last_opened=row['last_opened']
         ))
     
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    
     return books
 
+@app.post("/api/books/search", response_model=BookSearchResponse)
+async def search_books(request: Request, search_request: BookSearchRequest, db: sqlite3.Connection = Depends(get_database)):
+    """Full-text search across title, author, category and subject ranked by BM25
+    
+    `filters.rating` is a minimum rating, as min_rating is for /api/books/filter.
+    """
+    log_api_usage(request, "books_search", f"query={search_request.query}, page={search_request.page}")
+    
+    page = max(1, search_request.page)
+    limit = max(1, min(search_request.limit, 500))
+    offset = (page - 1) * limit
+    filters = search_request.filters or BookSearchFilters()
+    
+    # Index not built yet - fall back to an unranked title scan with the same filters
+    ranked = IsSearchIndexAttached(db)
+    search = SearchBooks if ranked else SearchBooksByTitle
+    try:
+        rows, total = search(
+            db,
+            search_request.query,
+            limit=limit,
+            offset=offset,
+            category=filters.category or None,
+            subject=filters.subject or None,
+            min_rating=filters.rating or None
+        )
+    except UnsupportedFilterError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return BookSearchResponse(
+        books=[BookSearchResult(**row) for row in rows],
+        total=total,
+        page=page,
+        limit=limit,
+        query=search_request.query,
+        ranked=ranked
+    )
+
+def match_filter_text(conn: sqlite3.Connection, q: str) -> List[int]:
+    """Ids of books matching a filter's text query - the search index, or a title scan until it is built"""
+    if IsSearchIndexAttached(conn):
+        return MatchBookIds(conn, q)
+    return [row[0] for row in conn.execute("SELECT id FROM books WHERE title LIKE ?", (f"%{q}%",))]
+
+@app.get("/api/books/filter", response_model=BookFilterResponse)
+async def filter_books(
+    request: Request,
+    category: Optional[str] = None,
+    subject: Optional[str] = None,
+    min_rating: Optional[int] = None,
+    q: Optional[str] = None,
+    page: int = 1,
+    limit: int = 50,
+    facets: FacetIndex = Depends(get_facet_index)
+):
+    """Combined category/subject/rating/text filter with per-facet counts
+    
+    Answered from the precomputed facet bitmaps; only the text query touches SQLite,
+    and only then is a pooled connection borrowed.
+    """
+    log_api_usage(request, "books_filter", f"category={category}, subject={subject}, min_rating={min_rating}, q={q}, page={page}")
+    
+    page = max(1, page)
+    limit = max(1, min(limit, 500))
+    
+    text_bitmap = None
+    if q and q.strip():
+        matching_ids = await run_in_threadpool(query_database, match_filter_text, q)
+        text_bitmap = facets.BitmapFromBookIds(matching_ids)
+    
+    try:
+        result = facets.Filter(
+            category=category or None,
+            subject=subject or None,
+            min_rating=min_rating,
+            text_bitmap=text_bitmap,
+            offset=(page - 1) * limit,
+            limit=limit
+        )
+    except UnsupportedFilterError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    payload = {
+        'books': [facets.snapshot.GetBookAt(position) for position in result['positions']],
+        'total': result['total'],
+        'page': page,
+        'limit': limit,
+        'facets': {
+            name: [{'value': value, 'count': count} for value, count in counts]
+            for name, counts in result['facets'].items()
+        }
+    }
+    
+    if fast_json_enabled:
+        return Response(content=EncodeJSON(payload), media_type="application/json")
+    
+    return payload
+
+@app.post("/api/books/batch", response_model=BookBatchResponse)
+async def get_books_batch(request: Request, batch_request: BookBatchRequest):
+    """Look up many books in one request; results follow request order and flag unknown ids"""
+    max_ids = (drive_manager.config if drive_manager else {}).get('batch_lookup_max_ids', DEFAULT_MAX_IDS)
+    log_api_usage(request, "books_batch", f"count={len(batch_request.ids)}")
+    
+    try:
+        CheckBatchSize(batch_request.ids, max_ids)
+    except BatchTooLargeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    unique_ids = list(dict.fromkeys(batch_request.ids))
+    
+    # The in-memory catalog answers without a pool slot; only the SQL path borrows one
+    catalog = catalog_snapshot
+    if catalog:
+        books_by_id = FetchBooksFromCatalog(catalog, unique_ids)
+    else:
+        books_by_id = await run_in_threadpool(query_database, FetchBooksFromDatabase, unique_ids)
+    
+    batch = BuildBatchResult(batch_request.ids, books_by_id)
+    return BookBatchResponse(
+        results=[
+            BookBatchItem(id=item['id'], found=item['found'], book=BookResponse(**item['book']) if item['found'] else None)
+            for item in batch['results']
+        ],
+        found=batch['found'],
+        missing=batch['missing']
+    )
+
+@app.get("/api/books/export")
+async def export_books(
+    request: Request,
+    format: str = "ndjson",
+    category: Optional[str] = None,
+    subject: Optional[str] = None
+):
+    """Stream the whole catalog (optionally filtered) as NDJSON or CSV in one request"""
+    log_api_usage(request, "books_export", f"format={format}, category={category}, subject={subject}")
+    
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format '{format}' (use ndjson or csv)")
+    
+    if not drive_manager:
+        raise HTTPException(status_code=500, detail="Drive manager not initialized")
+    if not os.path.exists(drive_manager.local_db_path):
+        raise HTTPException(status_code=503, detail="Database not available - sync required")
+    
+    compress = AcceptsGzip(request.headers.get("accept-encoding"))
+    pool = get_database_pool()
+    
+    def generate():
+        # Dedicated connection: a long download must not hold one of the pool's slots
+        conn = pool.OpenConnection()
+        try:
+            yield from IterateExport(conn, format, category, subject, compress)
+        finally:
+            pool.CloseConnection(conn)
+    
+    return StreamingResponse(
+        generate(),
+        media_type=EXPORT_FORMATS[format][0],
+        headers=BuildExportHeaders(format, compress, category)
+    )
+
 @app.get("/api/books/{book_id}", response_model=BookResponse)
 async def get_book(request: Request, book_id: int, db: sqlite3.Connection = Depends(get_database)):
     """Get detailed information about a specific book"""
@@ -281,68 +964,95 @@ async def get_book(request: Request, book_id: int, db: sqlite3.Connection = Depe
         last_opened=row['last_opened']
     )
 
+@app.api_route("/api/books/{book_id}/file", methods=["GET", "HEAD"])
+async def get_book_file(request: Request, book_id: int, download: bool = False):
+    """Stream a book's file with Range support (206 partial content, If-Range, ETag)"""
+    log_api_usage(request, "book_file", f"book_id={book_id}, range={request.headers.get('range')}")
+    
+    _, file_path, _ = await run_in_threadpool(resolve_book_source, book_id)
+    if not file_path:
+        raise HTTPException(status_code=404, detail="Book file not found in library")
+    
+    media_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+    return RangeFileResponse(
+        file_path,
+        request.headers,
+        method=request.method,
+        media_type=media_type,
+        filename=os.path.basename(file_path),
+        download=download
+    )
+
 @app.get("/api/books/{book_id}/thumbnail")
-async def get_book_thumbnail(request: Request, book_id: int, db: sqlite3.Connection = Depends(get_database)):
-    """Get book thumbnail image"""
-    log_api_usage(request, "thumbnail_view", f"book_id={book_id}")
+async def get_book_thumbnail(request: Request, book_id: int, size: int = 240):
+    """Get book thumbnail image (JPEG, `size` pixels wide, rounded up to a cached width)"""
+    log_api_usage(request, "thumbnail_view", f"book_id={book_id}, size={size}")
+    
+    _, pdf_path, image_bytes = await run_in_threadpool(resolve_book_source, book_id, with_thumbnail=True)
+    if not image_bytes and not pdf_path:
+        raise HTTPException(status_code=404, detail="Thumbnail not available - book file not found")
     
-    # Thumbnail support not available in current database schema
-    raise HTTPException(status_code=404, detail="Thumbnail not available in current database schema")
+    service = get_thumbnail_service()
+    source = {'pdf_path': None if image_bytes else pdf_path, 'image_bytes': image_bytes}
+    
+    # Revalidation against an already indexed thumbnail never waits for a render
+    if_none_match = request.headers.get("if-none-match", "")
+    cached = await run_in_threadpool(service.FindCached, size, **source) if if_none_match else None
+    
+    # Cold renders run in the worker pool; the event loop only awaits them
+    if not cached:
+        try:
+            cached = await service.GetThumbnail(size, **source)
+        except ThumbnailUnavailable as e:
+            raise HTTPException(status_code=404, detail=f"Thumbnail not available - {e}")
+    
+    thumbnail_path, digest = cached
+    headers = {"ETag": f'"{digest}"', "Cache-Control": "public, max-age=604800"}
+    if f'"{digest}"' in if_none_match:
+        return Response(status_code=304, headers=headers)
+    
+    return FileResponse(thumbnail_path, media_type="image/jpeg", headers=headers)
 
 # Categories endpoint
 @app.get("/api/categories", response_model=List[CategoryResponse])
-async def get_categories(request: Request, db: sqlite3.Connection = Depends(get_database)):
+async def get_categories(request: Request, catalog: CatalogSnapshot = Depends(get_catalog)):
     """Get all categories"""
     log_api_usage(request, "categories_list")
     
-    cursor = db.execute("SELECT id, category FROM categories ORDER BY category")
-    rows = cursor.fetchall()
-    
-    return [CategoryResponse(id=row['id'], category=row['category']) for row in rows]
+    if fast_json_enabled:
+        return Response(content=EncodeJSON(catalog.GetCategories()), media_type="application/json")
+    return catalog.GetCategories()
 
 # Subjects endpoint
 @app.get("/api/subjects", response_model=List[SubjectResponse])
 async def get_subjects(
     request: Request, 
     category_id: Optional[int] = None, 
-    db: sqlite3.Connection = Depends(get_database)
+    catalog: CatalogSnapshot = Depends(get_catalog)
 ):
     """Get subjects, optionally filtered by category"""
     log_api_usage(request, "subjects_list", f"category_id={category_id}")
     
-    if category_id:
-        query = "SELECT id, subject, category_id FROM subjects WHERE category_id = ? ORDER BY subject"
-        params = (category_id,)
-    else:
-        query = "SELECT id, subject, category_id FROM subjects ORDER BY subject"
-        params = ()
-    
-    cursor = db.execute(query, params)
-    rows = cursor.fetchall()
-    
-    return [
-        SubjectResponse(id=row['id'], subject=row['subject'], category_id=row['category_id']) 
-        for row in rows
-    ]
+    if fast_json_enabled:
+        return Response(content=EncodeJSON(catalog.GetSubjects(category_id)), media_type="application/json")
+    return catalog.GetSubjects(category_id)
 
 # Statistics endpoint
 @app.get("/api/stats", response_model=StatsResponse)
-async def get_stats(request: Request, db: sqlite3.Connection = Depends(get_database)):
+async def get_stats(request: Request, catalog: CatalogSnapshot = Depends(get_catalog)):
     """Get library statistics"""
     log_api_usage(request, "stats_view")
     
-    # Get counts
-    book_count = db.execute("SELECT COUNT(*) FROM books").fetchone()[0]
-    category_count = db.execute("SELECT COUNT(*) FROM categories").fetchone()[0]
-    subject_count = db.execute("SELECT COUNT(*) FROM subjects").fetchone()[0]
+    # Counts come from the in-memory catalog
+    counts = catalog.GetStats()
     
     # Get sync info
     sync_status = drive_manager.GetSyncStatus() if drive_manager else {}
     
     return StatsResponse(
-        total_books=book_count,
-        total_categories=category_count,
-        total_subjects=subject_count,
+        total_books=counts['total_books'],
+        total_categories=counts['total_categories'],
+        total_subjects=counts['total_subjects'],
         database_version=sync_status.get('local_version', '0.0.0'),
         last_sync=sync_status.get('last_sync'),
         offline_mode=sync_status.get('offline_mode', False)
@@ -390,7 +1100,12 @@ async def general_exception_handler(request: Request, exc: Exception):
     )
 
 def main():
-    """Run the AndyGoogle API server"""
+    """Run the AndyGoogle API server (pass --workers N for the multi-process mode)"""
+    import argparse
+    parser = argparse.ArgumentParser(description="AndyGoogle API server")
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes sharing the port (default: 1)')
+    args = parser.parse_args()
+    
     print("🚀 Starting AndyGoogle API Server")
     print("=" * 40)
     
@@ -415,6 +1130,17 @@ def main():
     print(f"🔧 API Documentation: http://{host}:{port}/docs")
     print("=" * 40)
     
+    if args.workers > 1:
+        WorkerSupervisor(
+            sys.modules[__name__],
+            host=host,
+            port=port,
+            workers=args.workers,
+            # Read from the config like DriveManager: drive_manager only exists after startup
+            database_path=GetConfiguredDatabasePath(drive_manager.config if drive_manager else None)
+        ).Run()
+        return
+    
     # Start server
     uvicorn.run(
         app,
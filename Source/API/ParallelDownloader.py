@@ -0,0 +1,254 @@
+# File: ParallelDownloader.py
+# Path: AndyGoogle/Source/API/ParallelDownloader.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  08:52PM
+"""
+Description: Parallel multi-range downloader for large AndyGoogle database files
+Splits a file of known size into byte ranges, fetches them over a bounded pool of
+connections and writes each one in place with os.pwrite into a preallocated .part
+file. Failed ranges are retried on their own from the last byte received, completed
+ranges are recorded so a restart only fetches what is missing, and the MD5 is
+computed over the contiguous completed prefix while later ranges are still arriving.
+"""
+
+import os
+import json
+import time
+import socket
+import hashlib
+import threading
+import http.client
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, List, Optional, Set, Any, Tuple
+
+from API.ChunkedDownloader import ChunkedDownloader, DownloadError, READ_BLOCK_SIZE
+
+TRANSIENT_ERRORS = (urllib.error.URLError, http.client.HTTPException, ConnectionError, socket.timeout)
+
+class RangeNotHonored(Exception):
+    """The server answered a Range request with the whole file"""
+
+class DownloadCancelled(Exception):
+    """Another range failed for good; stop fetching this one"""
+
+class ParallelDownloader:
+    """Download a URL as concurrent byte ranges written positionally into one file"""
+
+    def __init__(self, url: str, headers_provider: Optional[Callable[[], Dict[str, str]]] = None,
+                 part_size: int = 16 * 1024 * 1024, max_connections: int = 4, timeout: float = 60.0,
+                 max_retries: int = 5, retry_delay: float = 1.0):
+        self.url = url
+        self.headers_provider = headers_provider or (lambda: {})
+        self.part_size = max(READ_BLOCK_SIZE, part_size)
+        self.max_connections = max(1, max_connections)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+        self.stop_event = threading.Event()
+        self.range_retries = 0
+        self.retry_lock = threading.Lock()
+
+    def PlanRanges(self, total_size: int) -> List[Tuple[int, int]]:
+        """Inclusive (start, end) byte ranges covering the file"""
+        return [(start, min(start + self.part_size, total_size) - 1)
+                for start in range(0, total_size, self.part_size)]
+
+    def LoadResumeState(self, state_path: str, source_key: str, total_size: int) -> Set[int]:
+        """Indexes of ranges a previous run finished for the same source and layout"""
+        try:
+            with open(state_path, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return set()
+        if (state.get('source_key') != source_key or state.get('total_size') != total_size
+                or state.get('part_size') != self.part_size):
+            return set()
+        return set(state.get('completed_ranges') or [])
+
+    def SaveResumeState(self, state_path: str, source_key: str, total_size: int, completed: Set[int]):
+        """Record finished ranges; written atomically so a crash never leaves half a file"""
+        temp_path = state_path + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({'source_key': source_key, 'url': self.url, 'total_size': total_size,
+                       'part_size': self.part_size, 'completed_ranges': sorted(completed)}, f)
+        os.replace(temp_path, state_path)
+
+    def Preallocate(self, descriptor: int, total_size: int):
+        """Reserve the full file size up front so positional writes never extend it"""
+        if os.fstat(descriptor).st_size == total_size:
+            return
+        os.ftruncate(descriptor, total_size)
+        if hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(descriptor, 0, total_size)
+            except OSError:
+                pass  # Filesystem without fallocate support; the sparse file still works
+
+    def FetchRange(self, descriptor: int, start: int, end: int, on_written: Callable[[int], None]):
+        """Stream bytes start..end into the file at their own offsets"""
+        headers = dict(self.headers_provider())
+        headers['Range'] = f"bytes={start}-{end}"
+        request = urllib.request.Request(self.url, headers=headers)
+
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            if response.status != 206:
+                raise RangeNotHonored()
+
+            position = start
+            expected_length = end - start + 1
+            for block in iter(lambda: response.read(READ_BLOCK_SIZE), b""):
+                if self.stop_event.is_set():
+                    raise DownloadCancelled()
+                block = block[:end + 1 - position]
+                os.pwrite(descriptor, block, position)
+                position += len(block)
+                on_written(len(block))
+                if position > end:
+                    break
+
+            if position - start < expected_length:
+                raise http.client.IncompleteRead(b"", expected_length - (position - start))
+
+    def DownloadRange(self, descriptor: int, start: int, end: int) -> int:
+        """Fetch one range, retrying from the last byte received; returns bytes written"""
+        position = start
+        attempts = 0
+
+        def advance(count: int):
+            nonlocal position
+            position += count
+
+        while True:
+            try:
+                self.FetchRange(descriptor, position, end, advance)
+                return end - start + 1
+            except urllib.error.HTTPError as e:
+                if e.code < 500 and e.code != 429:
+                    raise DownloadError(f"Range {start}-{end} failed with HTTP {e.code}: {e.reason}")
+                error = e
+            except TRANSIENT_ERRORS as e:
+                error = e
+
+            attempts += 1
+            if attempts > self.max_retries or self.stop_event.is_set():
+                raise DownloadError(f"Range {start}-{end} failed after {self.max_retries} retries at byte {position}: {error}")
+            with self.retry_lock:
+                self.range_retries += 1
+            time.sleep(self.retry_delay * (2 ** (attempts - 1)))
+
+    def HashRange(self, descriptor: int, start: int, end: int, hasher):
+        """Feed a finished range back into the running hash (usually still in the page cache)"""
+        position = start
+        while position <= end:
+            block = os.pread(descriptor, min(READ_BLOCK_SIZE, end + 1 - position), position)
+            if not block:
+                raise DownloadError(f"Short read while hashing at byte {position}")
+            hasher.update(block)
+            position += len(block)
+
+    def Download(self, local_path: str, source_key: str = "", expected_size: Optional[int] = None,
+                 expected_md5: Optional[str] = None,
+                 progress_callback: Optional[Callable[[int, Optional[int]], None]] = None) -> Dict[str, Any]:
+        """Download to local_path; files of unknown size or a single range go sequentially"""
+        if not expected_size or expected_size <= self.part_size or self.max_connections == 1:
+            return self.DownloadSequentially(local_path, source_key, expected_size, expected_md5, progress_callback)
+
+        part_path = local_path + ".part"
+        state_path = local_path + ".part.json"
+        os.makedirs(os.path.dirname(os.path.abspath(local_path)), exist_ok=True)
+
+        ranges = self.PlanRanges(expected_size)
+        completed = self.LoadResumeState(state_path, source_key, expected_size) if os.path.exists(part_path) else set()
+        if not completed:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            self.SaveResumeState(state_path, source_key, expected_size, completed)
+        resumed_from = sum(ranges[index][1] - ranges[index][0] + 1 for index in completed)
+
+        self.stop_event.clear()
+        self.range_retries = 0
+        hasher = hashlib.md5()
+        next_to_hash = 0
+        done_bytes = resumed_from
+
+        descriptor = os.open(part_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            self.Preallocate(descriptor, expected_size)
+            pending = [index for index in range(len(ranges)) if index not in completed]
+
+            with ThreadPoolExecutor(max_workers=self.max_connections,
+                                    thread_name_prefix="andygoogle-range") as executor:
+                futures = {executor.submit(self.DownloadRange, descriptor, *ranges[index]): index
+                           for index in pending}
+                try:
+                    while True:
+                        # Hash whatever prefix is now contiguous while later ranges download
+                        while next_to_hash < len(ranges) and next_to_hash in completed:
+                            self.HashRange(descriptor, *ranges[next_to_hash], hasher)
+                            next_to_hash += 1
+                        if not futures:
+                            break
+
+                        finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            index = futures.pop(future)
+                            done_bytes += future.result()
+                            completed.add(index)
+                        self.SaveResumeState(state_path, source_key, expected_size, completed)
+                        if progress_callback:
+                            progress_callback(done_bytes, expected_size)
+                except RangeNotHonored:
+                    self.stop_event.set()
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    os.close(descriptor)
+                    descriptor = None
+                    return self.FallBackToSequential(local_path, source_key, expected_size, expected_md5, progress_callback)
+                except BaseException:
+                    # Stop the other ranges; finished ones stay recorded for the next run
+                    self.stop_event.set()
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    raise
+
+            os.fsync(descriptor)
+        finally:
+            if descriptor is not None:
+                os.close(descriptor)
+
+        file_md5 = hasher.hexdigest()
+        if expected_md5 and file_md5 != expected_md5:
+            os.remove(part_path)
+            os.remove(state_path)
+            raise DownloadError(f"MD5 mismatch: got {file_md5}, expected {expected_md5}")
+
+        os.replace(part_path, local_path)
+        os.remove(state_path)
+
+        return {
+            'bytes': expected_size,
+            'md5': file_md5,
+            'resumed_from': resumed_from,
+            'ranges': len(ranges),
+            'range_retries': self.range_retries
+        }
+
+    def DownloadSequentially(self, local_path: str, source_key: str, expected_size: Optional[int],
+                             expected_md5: Optional[str], progress_callback) -> Dict[str, Any]:
+        """Single-stream download through ChunkedDownloader"""
+        downloader = ChunkedDownloader(self.url, headers_provider=self.headers_provider,
+                                       chunk_size=self.part_size, timeout=self.timeout,
+                                       max_retries=self.max_retries, retry_delay=self.retry_delay)
+        return downloader.Download(local_path, source_key=source_key, expected_size=expected_size,
+                                   expected_md5=expected_md5, progress_callback=progress_callback)
+
+    def FallBackToSequential(self, local_path: str, source_key: str, expected_size: Optional[int],
+                             expected_md5: Optional[str], progress_callback) -> Dict[str, Any]:
+        """Server ignores Range - discard the sparse part file and stream the whole body"""
+        print("⚠️ Server does not honor Range requests - downloading with a single connection")
+        for path in (local_path + ".part", local_path + ".part.json"):
+            if os.path.exists(path):
+                os.remove(path)
+        return self.DownloadSequentially(local_path, source_key, expected_size, expected_md5, progress_callback)
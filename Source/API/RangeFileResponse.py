@@ -0,0 +1,80 @@
+# File: RangeFileResponse.py
+# Path: AndyGoogle/Source/API/RangeFileResponse.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-19  01:12AM
+"""
+Description: File response with Range, If-Range and ETag support for large book files
+Streams the selected bytes as pread chunks from a worker thread. uvicorn offers no ASGI
+zero-copy or pathsend extension (and the BaseHTTPMiddleware telemetry layer would reject
+those messages), so sendfile is not available under this stack
+"""
+
+import os
+import stat
+from typing import Dict, Optional
+from urllib.parse import quote
+
+import anyio
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+
+from API.ByteRanges import EvaluateRequest, BuildFileHeaders, ReadFileRange
+
+class RangeFileResponse(Response):
+    """Serve one file as 200, 206, 304 or 416 depending on the request headers"""
+
+    def __init__(self, path: str, request_headers: Dict[str, str], method: str = "GET",
+                 media_type: str = "application/octet-stream", filename: Optional[str] = None,
+                 download: bool = False, cache_control: str = "private, max-age=3600",
+                 background: Optional[BackgroundTask] = None):
+        self.path = path
+        self.method = method
+        self.media_type = media_type
+        self.background = background
+        self.stat_result = os.stat(path)
+        if not stat.S_ISREG(self.stat_result.st_mode):
+            raise RuntimeError(f"Not a regular file: {path}")
+
+        headers = {name.lower(): value for name, value in request_headers.items()}
+        self.status_code, self.byte_range = EvaluateRequest(headers, self.stat_result)
+
+        response_headers = BuildFileHeaders(self.stat_result, self.status_code, self.byte_range)
+        response_headers['cache-control'] = cache_control
+        if filename:
+            disposition = "attachment" if download else "inline"
+            response_headers['content-disposition'] = f"{disposition}; filename*=utf-8''{quote(filename)}"
+        if self.status_code in (304, 416):
+            self.media_type = None
+        self.init_headers(response_headers)
+
+    def GetBodyRange(self):
+        """(offset, length) of the bytes to send, or None for no body"""
+        if self.method == "HEAD" or self.status_code not in (200, 206):
+            return None
+        if self.status_code == 206:
+            start, end = self.byte_range
+            return start, end - start + 1
+        return 0, self.stat_result.st_size
+
+    async def __call__(self, scope, receive, send):
+        await send({'type': 'http.response.start', 'status': self.status_code, 'headers': self.raw_headers})
+
+        body_range = self.GetBodyRange()
+        if body_range is None or body_range[1] == 0:
+            await send({'type': 'http.response.body', 'body': b"", 'more_body': False})
+        else:
+            offset, length = body_range
+            chunks = ReadFileRange(self.path, offset, length)
+            try:
+                while True:
+                    chunk = await anyio.to_thread.run_sync(next, chunks, None)
+                    if chunk is None:
+                        break
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            finally:
+                chunks.close()
+            await send({'type': 'http.response.body', 'body': b"", 'more_body': False})
+
+        if self.background is not None:
+            await self.background()
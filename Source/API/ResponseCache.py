@@ -0,0 +1,231 @@
+# File: ResponseCache.py
+# Path: AndyGoogle/Source/API/ResponseCache.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-19  03:50AM
+"""
+Description: Database-generation-aware HTTP response cache for the AndyGoogle API
+Read-only GET responses only change when a new database is installed, so each one gets
+a strong ETag derived from the generation plus the normalized request; conditional
+requests are answered with 304 and full bodies are replayed from a bounded LRU
+"""
+
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Callable, Dict, List, Optional, Any, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+CACHEABLE_PATHS = re.compile(r"^/api/(books|categories|subjects)(/|$)")
+EXCLUDED_PATHS = re.compile(r"^/api/books/export|/(file|thumbnail)$")
+CACHE_CONTROL = "no-cache"   # Always revalidate; revalidation is a 304 with no body
+
+class ResponseCache:
+    """Bounded LRU of serialized response bodies for the current database generation"""
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 32 * 1024 * 1024,
+                 max_entry_bytes: int = 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.total_bytes = 0
+        self.generation_token: Optional[str] = None
+        self.last_modified: Optional[float] = None
+        self.stats = {'hits': 0, 'misses': 0, 'not_modified': 0, 'stored': 0, 'evicted': 0, 'invalidations': 0}
+
+    def SetGeneration(self, generation_token: Optional[str], last_modified: Optional[float] = None):
+        """Switch to a new database generation, dropping every cached body"""
+        with self.lock:
+            if generation_token == self.generation_token:
+                return
+            self.generation_token = generation_token
+            self.last_modified = last_modified
+            self.entries.clear()
+            self.total_bytes = 0
+            self.stats['invalidations'] += 1
+
+    def BuildKey(self, method: str, path: str, query_string: str) -> str:
+        """Normalize a request into a cache key (HEAD shares GET entries; parameter order is ignored)"""
+        params = sorted(parse_qsl(query_string, keep_blank_values=True))
+        return f"{path}?{urlencode(params)}" if params else path
+
+    def BuildETag(self, generation_token: str, key: str) -> str:
+        """Strong ETag for a request under a database generation"""
+        return '"' + hashlib.sha1(f"{generation_token}|{key}".encode('utf-8')).hexdigest() + '"'
+
+    def Get(self, key: str, generation_token: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached response, refreshing its LRU position"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry['generation'] != generation_token:
+                self.stats['misses'] += 1
+                return None
+            self.entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry
+
+    def Put(self, key: str, generation_token: str, status: int, headers: List[Tuple[bytes, bytes]],
+            body: bytes, usage: Optional[Dict[str, Any]] = None):
+        """Store a response body if it belongs to the current generation and fits"""
+        if len(body) > self.max_entry_bytes:
+            return
+
+        with self.lock:
+            if generation_token != self.generation_token:
+                return  # A swap happened while the response was being produced
+
+            previous = self.entries.pop(key, None)
+            if previous:
+                self.total_bytes -= len(previous['body'])
+
+            self.entries[key] = {
+                'generation': generation_token,
+                'status': status,
+                'headers': headers,
+                'body': body,
+                'usage': usage
+            }
+            self.total_bytes += len(body)
+            self.stats['stored'] += 1
+
+            while self.entries and (len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes):
+                _, evicted = self.entries.popitem(last=False)
+                self.total_bytes -= len(evicted['body'])
+                self.stats['evicted'] += 1
+
+    def RecordNotModified(self):
+        """Count a request answered with 304"""
+        with self.lock:
+            self.stats['not_modified'] += 1
+
+    def GetStats(self) -> Dict[str, Any]:
+        """Cache counters and occupancy"""
+        with self.lock:
+            return {
+                **self.stats,
+                'entries': len(self.entries),
+                'bytes': self.total_bytes,
+                'generation': self.generation_token
+            }
+
+def MatchesIfNoneMatch(header_value: str, etag: str, representation_exists: bool = True) -> bool:
+    """Check an If-None-Match header against our ETag (weak comparison, per RFC 9110)
+
+    "*" matches only when a current representation exists; pass representation_exists=False
+    when that is not known yet.
+    """
+    for candidate in header_value.split(','):
+        candidate = candidate.strip()
+        if (candidate == '*' and representation_exists) or candidate.removeprefix('W/') == etag:
+            return True
+    return False
+
+def IsNotModifiedSince(header_value: str, last_modified: Optional[float]) -> bool:
+    """Check If-Modified-Since against the generation install time"""
+    if last_modified is None:
+        return False
+    try:
+        return int(last_modified) <= parsedate_to_datetime(header_value).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+class ResponseCacheMiddleware:
+    """ASGI middleware adding ETag/Last-Modified/Cache-Control to cacheable GETs and serving hits"""
+
+    def __init__(self, app, cache: ResponseCache,
+                 generation_provider: Callable[[], Optional[Tuple[str, float]]]):
+        self.app = app
+        self.cache = cache
+        self.generation_provider = generation_provider
+
+    async def __call__(self, scope, receive, send):
+        if (scope['type'] != 'http' or scope['method'] not in ('GET', 'HEAD')
+                or not CACHEABLE_PATHS.match(scope['path']) or EXCLUDED_PATHS.search(scope['path'])):
+            await self.app(scope, receive, send)
+            return
+
+        generation = self.generation_provider()
+        if not generation:
+            await self.app(scope, receive, send)
+            return
+
+        generation_token, last_modified = generation
+        self.cache.SetGeneration(generation_token, last_modified)
+
+        key = self.cache.BuildKey(scope['method'], scope['path'], scope.get('query_string', b"").decode('latin-1'))
+        etag = self.cache.BuildETag(generation_token, key)
+        validator_headers = [
+            (b"etag", etag.encode('latin-1')),
+            (b"cache-control", CACHE_CONTROL.encode('latin-1')),
+            (b"last-modified", formatdate(last_modified, usegmt=True).encode('latin-1'))
+        ]
+
+        request_headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope['headers']}
+        if_none_match = request_headers.get('if-none-match')
+
+        # Our ETag only ever goes out on a 200, so an exact match proves the resource exists.
+        # "*" and If-Modified-Since do not: without a cached 200 the endpoint must answer
+        # (it may well be a 404 or 422)
+        entry = self.cache.Get(key, generation_token)
+        if ((if_none_match and MatchesIfNoneMatch(if_none_match, etag, representation_exists=entry is not None))
+                or (not if_none_match and entry and 'if-modified-since' in request_headers
+                    and IsNotModifiedSince(request_headers['if-modified-since'], last_modified))):
+            self.ReplayUsage(scope, entry)
+            self.cache.RecordNotModified()
+            await send({'type': 'http.response.start', 'status': 304, 'headers': validator_headers})
+            await send({'type': 'http.response.body', 'body': b""})
+            return
+
+        if entry:
+            self.ReplayUsage(scope, entry)
+            await send({'type': 'http.response.start', 'status': entry['status'],
+                        'headers': entry['headers'] + validator_headers})
+            await send({'type': 'http.response.body', 'body': b"" if scope['method'] == 'HEAD' else entry['body']})
+            return
+
+        await self.CaptureResponse(scope, receive, send, key, generation_token, validator_headers)
+
+    async def CaptureResponse(self, scope, receive, send, key: str, generation_token: str,
+                              validator_headers: List[Tuple[bytes, bytes]]):
+        """Run the endpoint, tagging a 200 with validators and keeping its body for the LRU"""
+        response = {'status': None, 'headers': [], 'chunks': [], 'size': 0, 'cacheable': False}
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                response['status'] = message['status']
+                response['headers'] = [
+                    (name, value) for name, value in message.get('headers', [])
+                    if name.lower() not in (b"etag", b"cache-control", b"last-modified", b"date", b"server")
+                ]
+                response['cacheable'] = message['status'] == 200 and scope['method'] == 'GET'
+                if message['status'] == 200:
+                    message = {**message, 'headers': list(message.get('headers', [])) + validator_headers}
+
+            elif message['type'] == 'http.response.body' and response['cacheable']:
+                body = message.get('body', b"")
+                response['size'] += len(body)
+                if response['size'] > self.cache.max_entry_bytes:
+                    response['cacheable'] = False
+                    response['chunks'] = []
+                else:
+                    response['chunks'].append(body)
+
+                if not message.get('more_body', False) and response['cacheable']:
+                    state = scope.get('state') or {}
+                    usage = {'usage_action': state.get('usage_action'), 'usage_details': state.get('usage_details')}
+                    self.cache.Put(key, generation_token, response['status'], response['headers'],
+                                   b"".join(response['chunks']), usage)
+
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def ReplayUsage(self, scope, entry: Optional[Dict[str, Any]]):
+        """Let the telemetry middleware log a cache hit like the original request"""
+        if entry and entry.get('usage') and entry['usage'].get('usage_action'):
+            scope.setdefault('state', {}).update(entry['usage'])
@@ -0,0 +1,205 @@
+# File: ResumableUploader.py
+# Path: AndyGoogle/Source/API/ResumableUploader.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-19  03:21AM
+"""
+Description: Chunked, resumable uploads to Google Drive for AndyGoogle database files
+Speaks the Drive resumable upload protocol directly: opens an upload session, sends
+the file in fixed-size chunks and persists the session URI next to the file, so a
+failed or interrupted publish asks Drive how much it already has and continues from
+there instead of starting again from byte zero.
+"""
+
+import os
+import json
+import time
+import http.client
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+from typing import Callable, Dict, Optional, Any, Tuple
+
+UPLOAD_GRANULARITY = 256 * 1024          # Drive requires chunks in multiples of 256 KiB
+SESSION_MAX_AGE = timedelta(days=6)      # Drive keeps a session for about a week
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+class UploadError(Exception):
+    """Raised when an upload cannot be completed; status is Drive's HTTP status when it refused the request"""
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+class UploadSessionExpired(Exception):
+    """Drive no longer knows the upload session"""
+
+class ResumableUploader:
+    """Upload one file through a persisted Drive resumable upload session"""
+
+    def __init__(self, upload_url: str, headers_provider: Optional[Callable[[], Dict[str, str]]] = None,
+                 chunk_size: int = 8 * 1024 * 1024, timeout: float = 60.0,
+                 max_retries: int = 5, retry_delay: float = 1.0):
+        self.upload_url = upload_url
+        self.headers_provider = headers_provider or (lambda: {})
+        self.chunk_size = max(UPLOAD_GRANULARITY, chunk_size // UPLOAD_GRANULARITY * UPLOAD_GRANULARITY)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.connection: Optional[http.client.HTTPConnection] = None
+        self.connection_target: Optional[Tuple[str, str]] = None
+
+    def SendRequest(self, method: str, url: str, headers: Dict[str, str],
+                    body: bytes = b"") -> Tuple[int, http.client.HTTPMessage, bytes]:
+        """One request over a kept-alive connection; returns (status, headers, body)"""
+        parts = urlsplit(url)
+        target = (parts.scheme, parts.netloc)
+        if self.connection is None or self.connection_target != target:
+            self.CloseConnection()
+            connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+            self.connection = connection_class(parts.netloc, timeout=self.timeout)
+            self.connection_target = target
+
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        request_headers = dict(self.headers_provider())
+        request_headers.update(headers)
+        request_headers['Content-Length'] = str(len(body))
+        try:
+            self.connection.request(method, path, body=body, headers=request_headers)
+            response = self.connection.getresponse()
+            return response.status, response.headers, response.read()
+        except BaseException:
+            self.CloseConnection()
+            raise
+
+    def CloseConnection(self):
+        """Drop the kept-alive connection (after an error or when finished)"""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def LoadSession(self, state_path: str, source_key: str) -> Optional[str]:
+        """Session URI saved by an earlier attempt at uploading the same content"""
+        try:
+            with open(state_path, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get('source_key') != source_key:
+            return None
+        try:
+            if datetime.now() - datetime.fromisoformat(state['created']) > SESSION_MAX_AGE:
+                return None
+        except (KeyError, ValueError):
+            return None
+        return state.get('session_uri')
+
+    def SaveSession(self, state_path: str, source_key: str, session_uri: str):
+        """Persist the session URI so another run can resume it"""
+        with open(state_path, 'w') as f:
+            json.dump({'source_key': source_key, 'session_uri': session_uri,
+                       'created': datetime.now().isoformat()}, f)
+
+    def StartSession(self, method: str, metadata: Dict[str, Any], mimetype: str, total_size: int) -> str:
+        """Open an upload session and return its URI"""
+        status, headers, body = self.SendRequest(method, self.upload_url, {
+            'Content-Type': 'application/json; charset=UTF-8',
+            'X-Upload-Content-Type': mimetype,
+            'X-Upload-Content-Length': str(total_size)
+        }, json.dumps(metadata).encode('utf-8'))
+        if status in RETRYABLE_STATUSES:
+            raise ConnectionError(f"Upload session request returned HTTP {status}")
+        if status != 200 or not headers.get('Location'):
+            raise UploadError(f"Could not start upload session (HTTP {status}): {body[:200]!r}", status=status)
+        return headers['Location']
+
+    def ParseResponse(self, status: int, headers, body: bytes) -> Tuple[Optional[int], Optional[Dict[str, Any]]]:
+        """(bytes Drive holds, finished file resource) from a chunk or status response"""
+        if status in (200, 201):
+            return None, json.loads(body or b"{}")
+        if status == 308:
+            received = headers.get('Range')
+            if not received:
+                return 0, None
+            return int(received.rsplit('-', 1)[1]) + 1, None
+        if status in (404, 410):
+            raise UploadSessionExpired()
+        if status in RETRYABLE_STATUSES:
+            raise ConnectionError(f"Upload returned HTTP {status}")
+        raise UploadError(f"Upload failed with HTTP {status}: {body[:200]!r}", status=status)
+
+    def QueryOffset(self, session_uri: str, total_size: int) -> Tuple[Optional[int], Optional[Dict[str, Any]]]:
+        """Ask Drive how many bytes of the session it has"""
+        status, headers, body = self.SendRequest('PUT', session_uri, {'Content-Range': f"bytes */{total_size}"})
+        return self.ParseResponse(status, headers, body)
+
+    def SendChunk(self, session_uri: str, descriptor: int, offset: int,
+                  total_size: int) -> Tuple[Optional[int], Optional[Dict[str, Any]]]:
+        """Send the chunk starting at offset"""
+        chunk = os.pread(descriptor, self.chunk_size, offset)
+        if chunk:
+            content_range = f"bytes {offset}-{offset + len(chunk) - 1}/{total_size}"
+        else:
+            content_range = f"bytes */{total_size}"   # Empty file
+        status, headers, body = self.SendRequest('PUT', session_uri, {'Content-Range': content_range}, chunk)
+        return self.ParseResponse(status, headers, body)
+
+    def Upload(self, local_path: str, metadata: Dict[str, Any], mimetype: str, source_key: str,
+               method: str = 'POST', state_path: Optional[str] = None,
+               progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """Upload local_path, resuming a saved session for the same source_key"""
+        state_path = state_path or local_path + ".upload.json"
+        total_size = os.path.getsize(local_path)
+
+        session_uri = self.LoadSession(state_path, source_key)
+        offset: Optional[int] = None
+        resumed_from: Optional[int] = None
+        result: Optional[Dict[str, Any]] = None
+        attempts = 0
+        restarted = False
+
+        descriptor = os.open(local_path, os.O_RDONLY)
+        try:
+            while result is None:
+                try:
+                    if session_uri is None:
+                        session_uri = self.StartSession(method, metadata, mimetype, total_size)
+                        self.SaveSession(state_path, source_key, session_uri)
+                        offset = 0
+                        if resumed_from is None:
+                            resumed_from = 0
+                    elif offset is None:
+                        # Unknown position (saved session or a failed chunk) - ask Drive
+                        offset, result = self.QueryOffset(session_uri, total_size)
+                        if resumed_from is None:
+                            resumed_from = offset if offset is not None else total_size
+                        continue
+
+                    offset, result = self.SendChunk(session_uri, descriptor, offset, total_size)
+                    attempts = 0
+                    if progress_callback and offset is not None:
+                        progress_callback(offset, total_size)
+
+                except UploadSessionExpired:
+                    if restarted:
+                        raise UploadError("Upload session expired twice")
+                    print("⚠️ Upload session expired - starting a new one")
+                    restarted = True
+                    session_uri = None
+                    resumed_from = 0
+                except (http.client.HTTPException, OSError) as e:
+                    attempts += 1
+                    if attempts > self.max_retries:
+                        raise UploadError(f"Upload failed after {self.max_retries} retries: {e}")
+                    offset = None
+                    time.sleep(self.retry_delay * (2 ** (attempts - 1)))
+        finally:
+            os.close(descriptor)
+            self.CloseConnection()
+
+        if os.path.exists(state_path):
+            os.remove(state_path)
+
+        return {
+            'file': result,
+            'bytes': total_size,
+            'resumed_from': resumed_from or 0
+        }
@@ -0,0 +1,89 @@
+# File: TransferCodecs.py
+# Path: AndyGoogle/Source/API/TransferCodecs.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  09:31PM
+"""
+Description: Streaming compression for files published to Google Drive
+Uploads can be stored zstd- or gzip-compressed with the codec declared in the file's
+appProperties; downloads read the declaration and decompress while hashing the
+original bytes, so neither side ever holds a whole database in memory.
+"""
+
+import gzip
+import shutil
+import hashlib
+from typing import Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# gzip.BadGzipFile is an OSError; truncated streams raise EOFError
+DECODE_ERRORS = (OSError, EOFError) + ((zstandard.ZstdError,) if zstandard else ())
+
+CODEC_IDENTITY = "identity"
+CODEC_GZIP = "gzip"
+CODEC_ZSTD = "zstd"
+
+STREAM_BLOCK_SIZE = 1024 * 1024
+
+CODEC_MIMETYPES = {
+    CODEC_GZIP: 'application/gzip',
+    CODEC_ZSTD: 'application/zstd'
+}
+
+class CodecError(Exception):
+    """Raised for an unknown codec or a payload that does not decode"""
+
+def ResolveCodec(requested: Optional[str]) -> str:
+    """Codec to publish with: zstd falls back to gzip when zstandard is not installed"""
+    codec = (requested or CODEC_IDENTITY).lower()
+    if codec in ("", "none", "off"):
+        return CODEC_IDENTITY
+    if codec == CODEC_ZSTD and zstandard is None:
+        print("⚠️ zstandard is not installed - compressing uploads with gzip instead")
+        return CODEC_GZIP
+    if codec not in (CODEC_IDENTITY, CODEC_GZIP, CODEC_ZSTD):
+        raise CodecError(f"Unknown transfer codec: {requested}")
+    return codec
+
+def CompressFile(source_path: str, target_path: str, codec: str, level: Optional[int] = None) -> int:
+    """Write a compressed copy of source_path; returns the compressed size"""
+    with open(source_path, 'rb') as source, open(target_path, 'wb') as target:
+        if codec == CODEC_GZIP:
+            # No name and mtime=0 keep the output identical across runs, so an interrupted upload can resume
+            with gzip.GzipFile(filename="", fileobj=target, mode='wb', compresslevel=level or 6, mtime=0) as stream:
+                shutil.copyfileobj(source, stream, STREAM_BLOCK_SIZE)
+        elif codec == CODEC_ZSTD:
+            if zstandard is None:
+                raise CodecError("zstandard is not installed")
+            compressor = zstandard.ZstdCompressor(level=level or 10, threads=-1, write_content_size=True)
+            compressor.copy_stream(source, target, size=-1, read_size=STREAM_BLOCK_SIZE,
+                                   write_size=STREAM_BLOCK_SIZE)
+        else:
+            raise CodecError(f"Cannot compress with codec: {codec}")
+        return target.tell()
+
+def DecompressFile(source_path: str, target_path: str, codec: str) -> str:
+    """Decode source_path into target_path; returns the MD5 of the decoded bytes"""
+    hasher = hashlib.md5()
+    try:
+        with open(source_path, 'rb') as source, open(target_path, 'wb') as target:
+            if codec == CODEC_GZIP:
+                stream = gzip.GzipFile(fileobj=source, mode='rb')
+            elif codec == CODEC_ZSTD:
+                if zstandard is None:
+                    raise CodecError("zstandard is not installed - cannot read a zstd-compressed file")
+                stream = zstandard.ZstdDecompressor().stream_reader(source, read_size=STREAM_BLOCK_SIZE)
+            else:
+                raise CodecError(f"Cannot decompress codec: {codec}")
+
+            with stream:
+                for block in iter(lambda: stream.read(STREAM_BLOCK_SIZE), b""):
+                    hasher.update(block)
+                    target.write(block)
+    except DECODE_ERRORS as e:
+        raise CodecError(f"Could not decode {codec} payload: {e}")
+    return hasher.hexdigest()
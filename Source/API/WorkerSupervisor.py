@@ -0,0 +1,290 @@
+# File: WorkerSupervisor.py
+# Path: AndyGoogle/Source/API/WorkerSupervisor.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  08:02PM
+"""
+Description: Multi-process serving mode for the AndyGoogle API
+A supervisor binds one listening socket, preloads the read-only catalog and forks N
+uvicorn workers that share both (the catalog copy-on-write). Worker 0 owns sync and
+usage-log flushing; the others relay usage batches to it. When a new database
+generation is installed the supervisor reloads the catalog and restarts workers one
+at a time, so the port never stops accepting connections.
+"""
+
+import gc
+import os
+import time
+import queue
+import select
+import signal
+import socket
+import threading
+import multiprocessing
+from typing import Callable, Dict, List, Optional, Any
+
+import uvicorn
+
+from Core.DatabaseGenerations import GenerationStore
+
+OWNER_INDEX = 0
+
+class UsageRelay:
+    """Thread in the owning worker that flushes usage batches relayed by the others"""
+
+    def __init__(self, usage_queue, sink: Callable[[List[Dict[str, Any]]], None]):
+        self.usage_queue = usage_queue
+        self.sink = sink
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.relayed_batches = 0
+
+    def Start(self):
+        """Begin draining the shared queue"""
+        self.thread = threading.Thread(target=self.Run, name="andygoogle-usage-relay", daemon=True)
+        self.thread.start()
+
+    def Run(self):
+        """Hand each relayed batch to the sink until stopped"""
+        while not self.stop_event.is_set():
+            try:
+                events = self.usage_queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+            try:
+                self.sink(events)
+                self.relayed_batches += 1
+            except Exception as e:
+                print(f"Warning: Relayed usage batch could not be written: {e}")
+
+    def Stop(self, timeout: float = 5.0):
+        """Stop draining (batches still queued are picked up by the next owner)"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout)
+
+class WorkerSupervisor:
+    """Fork, watch and roll a fixed number of uvicorn workers on a shared socket"""
+
+    def __init__(self, main_api, host: str = "127.0.0.1", port: int = 8000, workers: int = 2,
+                 database_path: Optional[str] = None, generation_check_seconds: float = 30.0,
+                 graceful_timeout_seconds: float = 30.0, ready_timeout_seconds: float = 60.0,
+                 log_level: str = "info", access_log: bool = True):
+        self.main_api = main_api
+        self.host = host
+        self.port = port
+        self.worker_count = max(1, workers)
+        self.generation_store = GenerationStore(database_path) if database_path else None
+        self.generation_check_seconds = generation_check_seconds
+        self.graceful_timeout_seconds = graceful_timeout_seconds
+        self.ready_timeout_seconds = ready_timeout_seconds
+        self.log_level = log_level
+        self.access_log = access_log
+
+        self.sock: Optional[socket.socket] = None
+        self.usage_queue = None
+        self.workers: Dict[int, int] = {}          # worker index -> pid
+        self.preloaded_path: Optional[str] = None
+
+        self.stopping = False
+        self.restart_requested = False
+        self.check_requested = False
+        self.restarts = 0
+
+    def BindSocket(self) -> socket.socket:
+        """Listening socket inherited by every worker"""
+        family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def Preload(self):
+        """Build the catalog for the current generation in the supervisor, before forking"""
+        db_path = self.generation_store.GetCurrentPath() if self.generation_store else None
+        if db_path and os.path.exists(db_path):
+            gc.unfreeze()
+            self.main_api.preload_catalog(db_path)
+            self.preloaded_path = db_path
+            print(f"📚 Catalog preloaded for {os.path.basename(db_path)}")
+
+        # Move everything built so far out of the collector's reach so workers'
+        # garbage collections do not touch (and copy) the shared pages
+        gc.collect()
+        gc.freeze()
+
+    def SpawnWorker(self, index: int) -> int:
+        """Fork one worker and wait until it has finished starting up"""
+        ready_read, ready_write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 1
+            try:
+                os.close(ready_read)
+                self.RunWorker(index, ready_write)
+                exit_code = 0
+            finally:
+                os._exit(exit_code)
+
+        os.close(ready_write)
+        self.workers[index] = pid
+        ready = self.WaitReady(ready_read)
+        os.close(ready_read)
+        role = "owner" if index == OWNER_INDEX else "worker"
+        print(f"{'✅' if ready else '⚠️'} {role} {index} (pid {pid}) {'ready' if ready else 'did not report ready'}")
+        return pid
+
+    def WaitReady(self, ready_fd: int) -> bool:
+        """Block until the worker's startup writes to the pipe (or closes it)"""
+        readable, _, _ = select.select([ready_fd], [], [], self.ready_timeout_seconds)
+        return bool(readable) and os.read(ready_fd, 1) == b"1"
+
+    def RunWorker(self, index: int, ready_fd: int):
+        """Child process body: configure the app for its role and serve the shared socket"""
+        for signal_number in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGUSR1, signal.SIGCHLD):
+            signal.signal(signal_number, signal.SIG_DFL)
+
+        self.main_api.configure_worker(
+            worker_index=index,
+            owns_background_duties=index == OWNER_INDEX,
+            usage_queue=self.usage_queue,
+            supervisor_pid=os.getppid(),
+            ready_fd=ready_fd
+        )
+        config = uvicorn.Config(self.main_api.app, log_level=self.log_level, access_log=self.access_log,
+                                timeout_graceful_shutdown=int(self.graceful_timeout_seconds))
+        uvicorn.Server(config).run(sockets=[self.sock])
+
+    def StopWorker(self, index: int):
+        """Stop the worker currently serving as index"""
+        pid = self.workers.pop(index, None)
+        if pid:
+            self.StopProcess(pid, f"Worker {index}")
+
+    def StopProcess(self, pid: int, label: str):
+        """Ask a worker to finish in-flight requests and exit; kill it after the grace period"""
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return
+
+        deadline = time.monotonic() + self.graceful_timeout_seconds + 5
+        while time.monotonic() < deadline:
+            try:
+                finished_pid, _ = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if finished_pid:
+                return
+            time.sleep(0.1)
+
+        print(f"⚠️ {label} (pid {pid}) did not stop in time - killing it")
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+
+    def RollingRestart(self, reason: str):
+        """Reload the catalog, then replace workers one at a time"""
+        print(f"🔄 Rolling restart ({reason})")
+        self.Preload()
+
+        for index in sorted(self.workers):
+            if index == OWNER_INDEX:
+                # Never two owners: stop the old one before its replacement starts
+                self.StopWorker(index)
+                self.SpawnWorker(index)
+            else:
+                # Replacement accepts on the shared socket before the old worker leaves
+                old_pid = self.workers[index]
+                self.SpawnWorker(index)
+                self.StopProcess(old_pid, f"Previous worker {index}")
+
+        self.restarts += 1
+        if self.generation_store:
+            self.generation_store.Reclaim()
+
+    def HasNewGeneration(self) -> bool:
+        """Whether the installed generation differs from the preloaded one"""
+        if not self.generation_store:
+            return False
+        current_path = self.generation_store.GetCurrentPath()
+        return current_path != self.preloaded_path and os.path.exists(current_path)
+
+    def ReapWorkers(self):
+        """Respawn workers that exited without being asked to"""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if not pid:
+                return
+            index = next((i for i, worker_pid in self.workers.items() if worker_pid == pid), None)
+            if index is None:
+                continue
+            del self.workers[index]
+            if not self.stopping:
+                print(f"⚠️ Worker {index} (pid {pid}) exited with status {status} - restarting it")
+                time.sleep(1.0)
+                self.SpawnWorker(index)
+
+    def HandleSignal(self, signal_number, frame):
+        """Record signals; the main loop acts on them"""
+        if signal_number in (signal.SIGTERM, signal.SIGINT):
+            self.stopping = True
+        elif signal_number == signal.SIGHUP:
+            self.restart_requested = True
+        elif signal_number == signal.SIGUSR1:
+            self.check_requested = True
+
+    def Run(self):
+        """Serve until SIGTERM/SIGINT; SIGHUP forces a rolling restart"""
+        if not hasattr(os, "fork"):
+            print("⚠️ Multi-worker mode needs fork() - serving with a single process")
+            uvicorn.run(self.main_api.app, host=self.host, port=self.port,
+                        log_level=self.log_level, access_log=self.access_log)
+            return
+
+        self.sock = self.BindSocket()
+        self.usage_queue = multiprocessing.get_context("fork").Queue(maxsize=1000)
+        self.Preload()
+
+        for signal_number in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGUSR1):
+            signal.signal(signal_number, self.HandleSignal)
+
+        print(f"🧩 Starting {self.worker_count} workers on http://{self.host}:{self.port} (supervisor pid {os.getpid()})")
+        for index in range(self.worker_count):
+            self.SpawnWorker(index)
+
+        next_check = time.monotonic() + self.generation_check_seconds
+        try:
+            while not self.stopping:
+                time.sleep(0.5)
+                self.ReapWorkers()
+
+                if self.restart_requested:
+                    self.restart_requested = False
+                    self.RollingRestart("SIGHUP")
+                elif self.check_requested or time.monotonic() >= next_check:
+                    self.check_requested = False
+                    next_check = time.monotonic() + self.generation_check_seconds
+                    if self.HasNewGeneration():
+                        self.RollingRestart(f"new database generation {os.path.basename(self.generation_store.GetCurrentPath())}")
+        finally:
+            self.stopping = True
+            print("👋 Stopping workers...")
+            for index in sorted(self.workers, reverse=True):
+                self.StopWorker(index)
+            self.sock.close()
+
+    def GetStatus(self) -> Dict[str, Any]:
+        """Supervisor state for diagnostics"""
+        return {
+            'supervisor_pid': os.getpid(),
+            'workers': dict(self.workers),
+            'preloaded_path': self.preloaded_path,
+            'rolling_restarts': self.restarts
+        }
@@ -0,0 +1,57 @@
+# File: BookBatch.py
+# Path: AndyGoogle/Source/Core/BookBatch.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  02:44AM
+"""
+Description: Multi-id book lookups for the /api/books/batch endpoint
+Ids are resolved from the in-memory catalog when one is loaded, otherwise with a
+single json_each query; results follow request order and flag unknown ids
+"""
+
+import json
+import sqlite3
+from typing import Dict, List, Optional, Any
+
+DEFAULT_MAX_IDS = 500
+
+class BatchTooLargeError(ValueError):
+    """Raised when a batch asks for more ids than the configured limit"""
+
+def CheckBatchSize(ids: List[int], max_ids: int = DEFAULT_MAX_IDS):
+    """Reject batches over the limit before any lookup work is done"""
+    if len(ids) > max_ids:
+        raise BatchTooLargeError(f"Too many ids - at most {max_ids} per request")
+
+def FetchBooksFromCatalog(catalog, ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """Books by id from a CatalogSnapshot - one bisect per id, no SQL"""
+    books_by_id = {}
+    for book_id in ids:
+        book = catalog.GetBook(book_id)
+        if book:
+            books_by_id[book_id] = book
+    return books_by_id
+
+def FetchBooksFromDatabase(conn: sqlite3.Connection, ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """Books by id with one query; json_each avoids building an IN (?, ?, ...) list"""
+    cursor = conn.execute("""
+        SELECT b.id, b.title,
+               NULL as author, c.category, s.subject
+        FROM books b
+        LEFT JOIN categories c ON b.category_id = c.id
+        LEFT JOIN subjects s ON b.subject_id = s.id
+        WHERE b.id IN (SELECT value FROM json_each(?))
+    """, (json.dumps(ids),))
+    columns = [column[0] for column in cursor.description]
+    return {row[0]: dict(zip(columns, row)) for row in cursor.fetchall()}
+
+def BuildBatchResult(ids: List[int], books_by_id: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+    """Results in request order (duplicates repeated), plus the found count and missing ids"""
+    results = []
+    missing = []
+    for book_id in ids:
+        book: Optional[Dict[str, Any]] = books_by_id.get(book_id)
+        results.append({'id': book_id, 'found': book is not None, 'book': book})
+        if book is None:
+            missing.append(book_id)
+    return {'results': results, 'found': len(ids) - len(missing), 'missing': missing}
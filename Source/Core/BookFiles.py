@@ -0,0 +1,92 @@
+# File: BookFiles.py
+# Path: AndyGoogle/Source/Core/BookFiles.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  06:31PM
+"""
+Description: Locate book files under the Data/Books library
+Maps a catalog row to a file on disk (FilePath column when the schema has one,
+otherwise the title-named PDF) and refuses anything outside the library directory
+"""
+
+import os
+import sqlite3
+from typing import Dict, List, Optional, Any
+
+FILE_PATH_COLUMNS = ('FilePath', 'file_path')
+THUMBNAIL_COLUMNS = ('ThumbnailImage', 'thumbnail')
+
+class BookFileResolver:
+    """Resolve book ids to files inside one library directory"""
+
+    def __init__(self, books_directory: str):
+        self.books_directory = books_directory
+        self.books_root = os.path.realpath(books_directory)
+
+    @staticmethod
+    def FindColumn(conn: sqlite3.Connection, candidates) -> Optional[str]:
+        """First of the candidate column names present on the books table"""
+        book_columns = {row[1] for row in conn.execute("PRAGMA table_info(books)")}
+        return next((column for column in candidates if column in book_columns), None)
+
+    def GetBookRecord(self, conn: sqlite3.Connection, book_id: int) -> Optional[Dict[str, Any]]:
+        """id, title, category, file_path and whether an embedded thumbnail exists"""
+        file_column = self.FindColumn(conn, FILE_PATH_COLUMNS)
+        thumbnail_column = self.FindColumn(conn, THUMBNAIL_COLUMNS)
+        file_select = f"b.{file_column}" if file_column else "NULL"
+        thumbnail_select = f"b.{thumbnail_column} IS NOT NULL" if thumbnail_column else "0"
+
+        row = conn.execute(f"""
+            SELECT b.id, b.title, c.category,
+                   {file_select} AS file_path, {thumbnail_select} AS has_thumbnail
+            FROM books b
+            LEFT JOIN categories c ON b.category_id = c.id
+            WHERE b.id = ?
+        """, (book_id,)).fetchone()
+
+        if not row:
+            return None
+        return {
+            'id': row[0],
+            'title': row[1],
+            'category': row[2],
+            'file_path': row[3],
+            'has_thumbnail': bool(row[4])
+        }
+
+    def GetEmbeddedThumbnail(self, conn: sqlite3.Connection, book_id: int) -> Optional[bytes]:
+        """Thumbnail image stored in the database row, if the schema carries one"""
+        thumbnail_column = self.FindColumn(conn, THUMBNAIL_COLUMNS)
+        if not thumbnail_column:
+            return None
+        row = conn.execute(f"SELECT {thumbnail_column} FROM books WHERE id = ?", (book_id,)).fetchone()
+        return bytes(row[0]) if row and row[0] else None
+
+    def GetCandidatePaths(self, record: Dict[str, Any]) -> List[str]:
+        """Places a book's file may live, most specific first"""
+        candidates = []
+        file_path = record.get('file_path')
+        if file_path:
+            if not os.path.isabs(file_path):
+                candidates.append(os.path.join(self.books_directory, file_path))
+            # Absolute paths usually come from another machine - keep only the file name
+            candidates.append(os.path.join(self.books_directory, os.path.basename(file_path)))
+
+        title = record.get('title')
+        if title:
+            if record.get('category'):
+                candidates.append(os.path.join(self.books_directory, record['category'], f"{title}.pdf"))
+            candidates.append(os.path.join(self.books_directory, f"{title}.pdf"))
+        return candidates
+
+    def IsInsideLibrary(self, path: str) -> bool:
+        """Guard against ../ and symlinks escaping the library directory"""
+        real_path = os.path.realpath(path)
+        return os.path.commonpath([real_path, self.books_root]) == self.books_root
+
+    def ResolvePath(self, record: Dict[str, Any]) -> Optional[str]:
+        """Real path of the book's file, or None when it is not in the library"""
+        for candidate in self.GetCandidatePaths(record):
+            if os.path.isfile(candidate) and self.IsInsideLibrary(candidate):
+                return os.path.realpath(candidate)
+        return None
@@ -0,0 +1,221 @@
+# File: CatalogSnapshot.py
+# Path: AndyGoogle/Source/Core/CatalogSnapshot.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-19  03:32AM
+"""
+Description: Immutable in-memory snapshot of the AndyGoogle catalog
+Loads books, categories and subjects once per database generation into compact
+column arrays with precomputed sort orders, category→subject maps and counts, so
+list and stats endpoints answer without touching SQLite
+"""
+
+import sys
+import time
+import bisect
+import sqlite3
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+class CatalogSnapshot:
+    """Column-oriented, read-only copy of one library database generation"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.built_at = time.time()
+        self.build_seconds = 0.0
+
+        # Books, stored in id order so lookups can bisect
+        self.book_ids = array('q')
+        self.book_titles: List[str] = []
+        self.book_authors: Optional[List[Optional[str]]] = None
+        self.book_ratings: Optional[List[Optional[int]]] = None
+        self.book_category_ids = array('q')
+        self.book_subject_ids = array('q')
+        self.title_order = array('l')          # Book positions sorted by (title, id)
+
+        # Categories and subjects, also in id order
+        self.category_ids = array('q')
+        self.category_names: List[str] = []
+        self.subject_ids = array('q')
+        self.subject_names: List[str] = []
+        self.subject_category_ids = array('q')
+
+        # Precomputed response payloads and counts
+        self.categories_payload: List[Dict[str, Any]] = []
+        self.subjects_payload: List[Dict[str, Any]] = []
+        self.subjects_by_category: Dict[int, List[Dict[str, Any]]] = {}
+        self.books_per_category: Dict[int, int] = {}
+        self.books_per_subject: Dict[int, int] = {}
+
+    @classmethod
+    def Build(cls, db_path: str, immutable: bool = False) -> "CatalogSnapshot":
+        """Load a snapshot from a library database file"""
+        start_time = time.perf_counter()
+        snapshot = cls(db_path)
+
+        uri = Path(db_path).resolve().as_uri() + "?mode=ro" + ("&immutable=1" if immutable else "")
+        conn = sqlite3.connect(uri, uri=True)
+        try:
+            snapshot.LoadTables(conn)
+        finally:
+            conn.close()
+
+        snapshot.BuildDerived()
+        snapshot.build_seconds = time.perf_counter() - start_time
+        return snapshot
+
+    def LoadTables(self, conn: sqlite3.Connection):
+        """Read the three catalog tables into column arrays"""
+        # SQLite column names are case-insensitive; match SearchIndex's view of the schema
+        book_columns = {row[1].lower() for row in conn.execute("PRAGMA table_info(books)")}
+        has_author = 'author' in book_columns
+        has_rating = 'rating' in book_columns
+        optional_select = (", author" if has_author else "") + (", rating" if has_rating else "")
+        if has_author:
+            self.book_authors = []
+        if has_rating:
+            self.book_ratings = []
+
+        for row in conn.execute(f"SELECT id, title, category_id, subject_id{optional_select} FROM books ORDER BY id"):
+            self.book_ids.append(row[0])
+            self.book_titles.append(sys.intern(row[1] or ""))
+            self.book_category_ids.append(row[2] if row[2] is not None else -1)
+            self.book_subject_ids.append(row[3] if row[3] is not None else -1)
+            if has_author:
+                self.book_authors.append(sys.intern(row[4]) if row[4] else None)
+            if has_rating:
+                self.book_ratings.append(row[-1])
+
+        for category_id, category in conn.execute("SELECT id, category FROM categories ORDER BY id"):
+            self.category_ids.append(category_id)
+            self.category_names.append(sys.intern(category or ""))
+
+        for subject_id, category_id, subject in conn.execute("SELECT id, category_id, subject FROM subjects ORDER BY id"):
+            self.subject_ids.append(subject_id)
+            self.subject_category_ids.append(category_id if category_id is not None else -1)
+            self.subject_names.append(sys.intern(subject or ""))
+
+    def BuildDerived(self):
+        """Precompute sort orders, maps, counts and list payloads"""
+        titles = self.book_titles
+        ids = self.book_ids
+        self.title_order = array('l', sorted(range(len(ids)), key=lambda i: (titles[i], ids[i])))
+
+        for category_id in self.book_category_ids:
+            self.books_per_category[category_id] = self.books_per_category.get(category_id, 0) + 1
+        for subject_id in self.book_subject_ids:
+            self.books_per_subject[subject_id] = self.books_per_subject.get(subject_id, 0) + 1
+
+        category_order = sorted(range(len(self.category_ids)), key=lambda i: self.category_names[i])
+        self.categories_payload = [
+            {'id': self.category_ids[i], 'category': self.category_names[i]} for i in category_order
+        ]
+
+        subject_order = sorted(range(len(self.subject_ids)), key=lambda i: self.subject_names[i])
+        self.subjects_payload = [
+            {'id': self.subject_ids[i], 'subject': self.subject_names[i],
+             'category_id': self.subject_category_ids[i] if self.subject_category_ids[i] != -1 else None}
+            for i in subject_order
+        ]
+
+        # Sorted payload order carries over into each category's list
+        for subject in self.subjects_payload:
+            self.subjects_by_category.setdefault(subject['category_id'], []).append(subject)
+
+    def GetCategories(self) -> List[Dict[str, Any]]:
+        """All categories sorted by name"""
+        return self.categories_payload
+
+    def GetSubjects(self, category_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Subjects sorted by name, optionally limited to one category"""
+        if category_id:
+            return self.subjects_by_category.get(category_id, [])
+        return self.subjects_payload
+
+    def FindBookPosition(self, book_id: int) -> Optional[int]:
+        """Position of a book in the column arrays, or None"""
+        position = bisect.bisect_left(self.book_ids, book_id)
+        if position < len(self.book_ids) and self.book_ids[position] == book_id:
+            return position
+        return None
+
+    def GetCategoryName(self, category_id: int) -> Optional[str]:
+        """Look up a category name by id"""
+        position = bisect.bisect_left(self.category_ids, category_id)
+        if position < len(self.category_ids) and self.category_ids[position] == category_id:
+            return self.category_names[position]
+        return None
+
+    def GetSubjectName(self, subject_id: int) -> Optional[str]:
+        """Look up a subject name by id"""
+        position = bisect.bisect_left(self.subject_ids, subject_id)
+        if position < len(self.subject_ids) and self.subject_ids[position] == subject_id:
+            return self.subject_names[position]
+        return None
+
+    def GetBook(self, book_id: int) -> Optional[Dict[str, Any]]:
+        """Book row with category and subject names resolved"""
+        position = self.FindBookPosition(book_id)
+        if position is None:
+            return None
+        return self.GetBookAt(position)
+
+    def GetBookAt(self, position: int) -> Dict[str, Any]:
+        """Book row at a column-array position"""
+        return {
+            'id': self.book_ids[position],
+            'title': self.book_titles[position],
+            'author': self.book_authors[position] if self.book_authors is not None else None,
+            'category': self.GetCategoryName(self.book_category_ids[position]),
+            'subject': self.GetSubjectName(self.book_subject_ids[position]),
+            'rating': self.book_ratings[position] if self.book_ratings is not None else None
+        }
+
+    def GetStats(self) -> Dict[str, int]:
+        """Catalog counts for /api/stats"""
+        return {
+            'total_books': len(self.book_ids),
+            'total_categories': len(self.category_ids),
+            'total_subjects': len(self.subject_ids)
+        }
+
+    def GetMemoryEstimate(self) -> Dict[str, Any]:
+        """Approximate resident size of the snapshot, and the same scaled to 100k books"""
+        unique_strings = {id(text): text for text in self.book_titles}
+        if self.book_authors:
+            unique_strings.update({id(text): text for text in self.book_authors if text})
+        string_bytes = sum(sys.getsizeof(text) for text in unique_strings.values())
+
+        book_bytes = (
+            sys.getsizeof(self.book_ids) + sys.getsizeof(self.book_titles)
+            + sys.getsizeof(self.book_category_ids) + sys.getsizeof(self.book_subject_ids)
+            + sys.getsizeof(self.title_order) + string_bytes
+            + (sys.getsizeof(self.book_authors) if self.book_authors is not None else 0)
+            + (sys.getsizeof(self.book_ratings) if self.book_ratings is not None else 0)
+        )
+        lookup_bytes = sum(sys.getsizeof(part) for part in (
+            self.category_ids, self.category_names, self.subject_ids, self.subject_names,
+            self.subject_category_ids, self.categories_payload, self.subjects_payload,
+            self.subjects_by_category, self.books_per_category, self.books_per_subject
+        )) + sum(sys.getsizeof(entry) for entry in self.categories_payload + self.subjects_payload)
+
+        book_count = len(self.book_ids)
+        bytes_per_book = book_bytes / book_count if book_count else 0
+        return {
+            'books': book_count,
+            'total_bytes': book_bytes + lookup_bytes,
+            'bytes_per_book': round(bytes_per_book, 1),
+            'estimated_mb_per_100k_books': round(bytes_per_book * 100000 / 1024 / 1024, 1)
+        }
+
+    def GetInfo(self) -> Dict[str, Any]:
+        """Describe the snapshot for diagnostics"""
+        return {
+            'db_path': self.db_path,
+            'built_at': self.built_at,
+            'build_seconds': round(self.build_seconds, 4),
+            **self.GetStats(),
+            'memory': self.GetMemoryEstimate()
+        }
@@ -0,0 +1,211 @@
+# File: DatabaseDelta.py
+# Path: AndyGoogle/Source/Core/DatabaseDelta.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  01:24PM
+"""
+Description: Page-level binary deltas between consecutive AndyGoogle database versions
+The publisher diffs two SQLite files page by page and uploads only the changed pages;
+clients patch their byte-identical local copy and verify the result against the
+published MD5 before installing it
+"""
+
+import os
+import json
+import zlib
+import struct
+import hashlib
+import shutil
+from typing import Dict, List, Optional, Any
+
+DELTA_MAGIC = b"AGDELTA1"
+DELTA_PREFIX = "AndersonLibraryDelta_v"
+DELTA_SUFFIX = ".agdelta"
+DEFAULT_PAGE_SIZE = 4096
+COPY_BLOCK_SIZE = 1024 * 1024
+
+RECORD_HEADER = struct.Struct(">II")   # page number, page length
+
+class DeltaError(Exception):
+    """Raised when a delta cannot be applied or does not verify"""
+
+def GetDeltaFilename(from_version: str, to_version: str) -> str:
+    """Drive filename for the delta between two versions"""
+    return f"{DELTA_PREFIX}{from_version.replace('.', '_')}_to_v{to_version.replace('.', '_')}{DELTA_SUFFIX}"
+
+def ParseDeltaFilename(filename: str) -> Optional[Dict[str, str]]:
+    """Extract from/to versions from a delta filename"""
+    if not filename.startswith(DELTA_PREFIX) or not filename.endswith(DELTA_SUFFIX):
+        return None
+    try:
+        from_part, to_part = filename[len(DELTA_PREFIX):-len(DELTA_SUFFIX)].split('_to_v')
+    except ValueError:
+        return None
+    return {'from_version': from_part.replace('_', '.'), 'to_version': to_part.replace('_', '.')}
+
+def GetSQLitePageSize(path: str) -> int:
+    """Read the page size from a SQLite file header"""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(100)
+        if header[:16] == b"SQLite format 3\x00":
+            page_size = struct.unpack(">H", header[16:18])[0]
+            return 65536 if page_size == 1 else page_size
+    except OSError:
+        pass
+    return DEFAULT_PAGE_SIZE
+
+def CreateDelta(base_path: str, target_path: str, delta_path: str,
+                from_version: str, to_version: str) -> Dict[str, Any]:
+    """Write a delta holding every page of target_path that differs from base_path"""
+    page_size = GetSQLitePageSize(target_path)
+    base_md5 = hashlib.md5()
+    target_md5 = hashlib.md5()
+    compressor = zlib.compressobj(6)
+    body_path = delta_path + ".body"
+    changed_pages = 0
+
+    with open(base_path, 'rb') as base_file, open(target_path, 'rb') as target_file, open(body_path, 'wb') as body:
+        page_number = 0
+        while True:
+            target_page = target_file.read(page_size)
+            base_page = base_file.read(page_size)
+            base_md5.update(base_page)
+            if not target_page:
+                # Drain any extra base bytes into the base hash
+                for block in iter(lambda: base_file.read(COPY_BLOCK_SIZE), b""):
+                    base_md5.update(block)
+                break
+
+            target_md5.update(target_page)
+            if target_page != base_page:
+                body.write(compressor.compress(RECORD_HEADER.pack(page_number, len(target_page)) + target_page))
+                changed_pages += 1
+            page_number += 1
+
+        body.write(compressor.flush())
+
+    header = {
+        'from_version': from_version,
+        'to_version': to_version,
+        'page_size': page_size,
+        'base_md5': base_md5.hexdigest(),
+        'base_size': os.path.getsize(base_path),
+        'target_md5': target_md5.hexdigest(),
+        'target_size': os.path.getsize(target_path),
+        'changed_pages': changed_pages,
+        'codec': 'zlib'
+    }
+    header_bytes = json.dumps(header).encode('utf-8')
+
+    with open(delta_path, 'wb') as delta_file, open(body_path, 'rb') as body:
+        delta_file.write(DELTA_MAGIC)
+        delta_file.write(struct.pack(">I", len(header_bytes)))
+        delta_file.write(header_bytes)
+        shutil.copyfileobj(body, delta_file, COPY_BLOCK_SIZE)
+    os.remove(body_path)
+
+    header['delta_size'] = os.path.getsize(delta_path)
+    return header
+
+def ReadDeltaHeader(delta_path: str) -> Dict[str, Any]:
+    """Read the JSON header of a delta file"""
+    with open(delta_path, 'rb') as f:
+        if f.read(len(DELTA_MAGIC)) != DELTA_MAGIC:
+            raise DeltaError(f"Not a database delta: {delta_path}")
+        header_length = struct.unpack(">I", f.read(4))[0]
+        return json.loads(f.read(header_length).decode('utf-8'))
+
+def HashAndCopy(source_path: str, output_path: str) -> str:
+    """Copy a file while hashing it in the same pass"""
+    hasher = hashlib.md5()
+    with open(source_path, 'rb') as source, open(output_path, 'wb') as output:
+        for block in iter(lambda: source.read(COPY_BLOCK_SIZE), b""):
+            hasher.update(block)
+            output.write(block)
+    return hasher.hexdigest()
+
+def HashFile(path: str) -> str:
+    """MD5 of a file"""
+    hasher = hashlib.md5()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(COPY_BLOCK_SIZE), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+def ApplyDelta(base_path: str, delta_path: str, output_path: str) -> Dict[str, Any]:
+    """Patch a copy of base_path into output_path and verify both ends of the delta"""
+    header = ReadDeltaHeader(delta_path)
+
+    base_md5 = HashAndCopy(base_path, output_path)
+    if base_md5 != header['base_md5']:
+        os.remove(output_path)
+        raise DeltaError(f"Base mismatch for delta {header['from_version']} → {header['to_version']}: "
+                         f"local {base_md5}, expected {header['base_md5']}")
+
+    page_size = header['page_size']
+    decompressor = zlib.decompressobj()
+    pending = bytearray()
+
+    def write_complete_records(output_fd: int):
+        """Write every complete page record buffered so far"""
+        position = 0
+        while len(pending) - position >= RECORD_HEADER.size:
+            page_number, page_length = RECORD_HEADER.unpack_from(pending, position)
+            record_end = position + RECORD_HEADER.size + page_length
+            if len(pending) < record_end:
+                break
+            with memoryview(pending)[position + RECORD_HEADER.size:record_end] as page:
+                os.pwrite(output_fd, page, page_number * page_size)
+            position = record_end
+        del pending[:position]
+
+    with open(delta_path, 'rb') as delta_file, open(output_path, 'r+b') as output:
+        delta_file.seek(len(DELTA_MAGIC))
+        header_length = struct.unpack(">I", delta_file.read(4))[0]
+        delta_file.seek(header_length, os.SEEK_CUR)
+
+        for block in iter(lambda: delta_file.read(COPY_BLOCK_SIZE), b""):
+            pending += decompressor.decompress(block)
+            write_complete_records(output.fileno())
+
+        pending += decompressor.flush()
+        write_complete_records(output.fileno())
+        if pending or not decompressor.eof:
+            os.remove(output_path)
+            raise DeltaError(f"Truncated delta file: {delta_path}")
+
+        output.truncate(header['target_size'])
+
+    target_md5 = HashFile(output_path)
+    if target_md5 != header['target_md5']:
+        os.remove(output_path)
+        raise DeltaError(f"Patched database does not match v{header['to_version']}: "
+                         f"{target_md5} != {header['target_md5']}")
+
+    header['result_md5'] = target_md5
+    return header
+
+def FindDeltaChain(deltas: List[Dict[str, Any]], from_version: str, to_version: str,
+                   max_length: int = 10) -> Optional[List[Dict[str, Any]]]:
+    """Shortest chain of deltas leading from one version to another (breadth-first)"""
+    edges: Dict[str, List[Dict[str, Any]]] = {}
+    for delta in deltas:
+        edges.setdefault(delta['from_version'], []).append(delta)
+
+    frontier = [(from_version, [])]
+    visited = {from_version}
+    while frontier:
+        next_frontier = []
+        for version, chain in frontier:
+            if version == to_version:
+                return chain
+            if len(chain) >= max_length:
+                continue
+            for delta in edges.get(version, []):
+                if delta['to_version'] not in visited:
+                    visited.add(delta['to_version'])
+                    next_frontier.append((delta['to_version'], chain + [delta]))
+        frontier = next_frontier
+
+    return None
@@ -0,0 +1,194 @@
+# File: DatabaseGenerations.py
+# Path: AndyGoogle/Source/Core/DatabaseGenerations.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-19  04:16AM
+"""
+Description: Versioned generation files for the live AndyGoogle library database
+Each synced database is installed as its own immutable generation file and a small
+pointer file is switched atomically to publish it; readers keep using the generation
+they opened, and superseded generations are deleted once nothing references them
+"""
+
+import os
+import re
+import json
+import threading
+from typing import Dict, List, Optional
+
+from Core.SearchIndex import SearchIndex
+
+POINTER_SUFFIX = ".current"
+DEFAULT_CONFIG_PATH = "AndyGoogle/Config/andygoogle_config.json"
+DEFAULT_DATABASE_PATH = "AndyGoogle/Data/Local/cached_library.db"
+
+def GetConfiguredDatabasePath(config: Optional[Dict] = None, config_path: str = DEFAULT_CONFIG_PATH) -> str:
+    """Live database path as DriveManager resolves it (shared by the worker supervisor)"""
+    if config is None:
+        try:
+            with open(config_path, 'r') as f:
+                config = json.load(f)
+        except (OSError, ValueError):
+            config = {}
+    return config.get('local_database_path', DEFAULT_DATABASE_PATH)
+
+class GenerationStore:
+    """Install, publish and reclaim database generations next to the configured database path"""
+
+    def __init__(self, base_path: str):
+        self.base_path = base_path
+        self.directory = os.path.dirname(os.path.abspath(base_path))
+        self.stem = os.path.splitext(os.path.basename(base_path))[0]
+        self.pointer_path = os.path.join(self.directory, self.stem + POINTER_SUFFIX)
+        self.generation_pattern = re.compile(rf"^{re.escape(self.stem)}_gen_(\d+)\.db$")
+
+        self.lock = threading.Lock()
+        self.reference_counts: Dict[str, int] = {}
+        self.cached_pointer = (None, None)   # ((inode, mtime_ns) of the pointer, resolved path)
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def GetGenerationPath(self, generation: int) -> str:
+        """Get the file path of a generation number"""
+        return os.path.join(self.directory, f"{self.stem}_gen_{generation:06d}.db")
+
+    def ListGenerations(self) -> List[int]:
+        """List generation numbers present on disk, oldest first"""
+        generations = []
+        for filename in os.listdir(self.directory):
+            match = self.generation_pattern.match(filename)
+            if match:
+                generations.append(int(match.group(1)))
+        return sorted(generations)
+
+    def GetCurrentPath(self) -> str:
+        """Resolve the published generation, falling back to the legacy single-file path"""
+        try:
+            stat = os.stat(self.pointer_path)
+        except FileNotFoundError:
+            return self.base_path
+
+        # Re-read only when the pointer changed - this runs on every request
+        pointer_key = (stat.st_ino, stat.st_mtime_ns)
+        cached_key, cached_path = self.cached_pointer
+        if cached_key == pointer_key and cached_path:
+            return cached_path
+
+        try:
+            with open(self.pointer_path, 'r') as f:
+                filename = f.read().strip()
+        except OSError:
+            return cached_path or self.base_path
+
+        current_path = os.path.join(self.directory, filename)
+        if not filename or not os.path.exists(current_path):
+            print(f"Warning: Database pointer {self.pointer_path} names a missing generation '{filename}'")
+            return self.base_path
+
+        self.cached_pointer = (pointer_key, current_path)
+        return current_path
+
+    def GetCurrentGeneration(self) -> Optional[int]:
+        """Get the published generation number (None while on the legacy file)"""
+        match = self.generation_pattern.match(os.path.basename(self.GetCurrentPath()))
+        return int(match.group(1)) if match else None
+
+    def Install(self, staged_path: str) -> str:
+        """Turn a validated staged file into the next generation and publish it"""
+        generations = self.ListGenerations()
+        new_path = self.GetGenerationPath((generations[-1] if generations else 0) + 1)
+
+        # Same directory, so this is a rename rather than a copy
+        os.replace(staged_path, new_path)
+        self.SyncFile(new_path)
+
+        # Build the search sidecar before any reader can see the generation
+        SearchIndex(new_path).EnsureBuilt()
+
+        self.WritePointer(os.path.basename(new_path))
+        return new_path
+
+    def WritePointer(self, filename: str):
+        """Atomically switch the pointer file to a generation"""
+        temp_path = self.pointer_path + ".tmp"
+        with open(temp_path, 'w') as f:
+            f.write(filename + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.pointer_path)
+        self.SyncDirectory()
+
+    def SyncFile(self, path: str):
+        """Flush a file's contents to disk"""
+        with open(path, 'rb') as f:
+            os.fsync(f.fileno())
+
+    def SyncDirectory(self):
+        """Flush directory entries so a rename survives a crash (no-op where unsupported)"""
+        try:
+            directory_fd = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(directory_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(directory_fd)
+
+    def Retain(self, path: str):
+        """Record that a reader in this process has the generation open"""
+        with self.lock:
+            self.reference_counts[path] = self.reference_counts.get(path, 0) + 1
+
+    def Release(self, path: str):
+        """Drop a reader reference, reclaiming superseded generations that are now unused"""
+        with self.lock:
+            remaining = self.reference_counts.get(path, 0) - 1
+            if remaining > 0:
+                self.reference_counts[path] = remaining
+                return
+            self.reference_counts.pop(path, None)
+
+        if path != self.GetCurrentPath():
+            self.Reclaim()
+
+    def Reclaim(self) -> int:
+        """Delete superseded generations (and their sidecars) with no readers in this process"""
+        current_generation = self.GetCurrentGeneration()
+        if current_generation is None:
+            return 0
+        removed = 0
+
+        for generation in self.ListGenerations():
+            # Newer files may still be mid-Install (renamed in, pointer not yet switched)
+            if generation >= current_generation:
+                continue
+            path = self.GetGenerationPath(generation)
+
+            # Held across the delete so a Retain() cannot slip in between check and removal
+            with self.lock:
+                if self.reference_counts.get(path, 0) > 0:
+                    continue
+
+                try:
+                    for leftover in (SearchIndex.GetIndexPath(path), path):
+                        if os.path.exists(leftover):
+                            os.remove(leftover)
+                    removed += 1
+                except OSError as e:
+                    # Another process may still hold it open on platforms that lock open files
+                    print(f"Warning: Could not reclaim database generation {path}: {e}")
+
+        return removed
+
+    def GetStats(self) -> Dict[str, object]:
+        """Get generation bookkeeping for status reporting"""
+        with self.lock:
+            references = {os.path.basename(path): count for path, count in self.reference_counts.items()}
+        return {
+            'current_path': self.GetCurrentPath(),
+            'current_generation': self.GetCurrentGeneration(),
+            'generations_on_disk': self.ListGenerations(),
+            'open_references': references
+        }
@@ -0,0 +1,151 @@
+# File: DatabaseManifest.py
+# Path: AndyGoogle/Source/Core/DatabaseManifest.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  12:12AM
+"""
+Description: Published database manifests and single-pass install verification
+The publisher records the schema fingerprint, page count and table row counts of each
+database in its Drive appProperties. Clients verify a download (already MD5-checked
+while streaming) with PRAGMA quick_check plus a schema comparison against that
+manifest, and take record counts from it instead of rescanning the file; the full
+PRAGMA integrity_check is left to an optional background pass.
+"""
+
+import os
+import sqlite3
+import hashlib
+from typing import Dict, List, Optional, Any
+
+MANIFEST_VERSION = "1"
+REQUIRED_TABLES = ('books', 'categories', 'subjects')
+RECORD_TABLE = 'books'
+
+def OpenReadOnly(db_path: str) -> sqlite3.Connection:
+    """Read-only connection that never creates or journals the file"""
+    return sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+
+def GetSchemaHash(conn: sqlite3.Connection) -> str:
+    """SHA-256 over every schema object's definition, in a stable order"""
+    rows = conn.execute(
+        "SELECT type, name, tbl_name, COALESCE(sql, '') FROM sqlite_master "
+        "WHERE name NOT LIKE 'sqlite_%' ORDER BY type, name"
+    ).fetchall()
+    schema = "\n".join("|".join(row) for row in rows)
+    return hashlib.sha256(schema.encode('utf-8')).hexdigest()
+
+def GetTableNames(conn: sqlite3.Connection) -> List[str]:
+    """Names of the tables in a database"""
+    return [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+
+def BuildManifest(db_path: str) -> Dict[str, Any]:
+    """Describe a database for publishing: schema fingerprint, size in pages and row counts"""
+    conn = OpenReadOnly(db_path)
+    try:
+        tables = GetTableNames(conn)
+        table_counts = {
+            table: conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+            for table in REQUIRED_TABLES if table in tables
+        }
+        return {
+            'manifest_version': MANIFEST_VERSION,
+            'schema_sha256': GetSchemaHash(conn),
+            'page_size': conn.execute("PRAGMA page_size").fetchone()[0],
+            'page_count': conn.execute("PRAGMA page_count").fetchone()[0],
+            'table_counts': table_counts,
+            'record_count': table_counts.get(RECORD_TABLE, 0)
+        }
+    finally:
+        conn.close()
+
+def ToAppProperties(manifest: Dict[str, Any]) -> Dict[str, str]:
+    """Manifest as Drive appProperties (string values, 124 bytes per key and value)"""
+    return {
+        'manifest_version': manifest['manifest_version'],
+        'schema_sha256': manifest['schema_sha256'],
+        'page_size': str(manifest['page_size']),
+        'page_count': str(manifest['page_count']),
+        'table_counts': ";".join(f"{table}={count}" for table, count in manifest['table_counts'].items()),
+        'record_count': str(manifest['record_count'])
+    }
+
+def FromAppProperties(app_properties: Optional[Dict[str, str]]) -> Optional[Dict[str, Any]]:
+    """Manifest published with a file, or None for files published before manifests"""
+    app_properties = app_properties or {}
+    if app_properties.get('manifest_version') != MANIFEST_VERSION or not app_properties.get('schema_sha256'):
+        return None
+    try:
+        table_counts = {}
+        for pair in filter(None, app_properties.get('table_counts', '').split(';')):
+            table, count = pair.split('=')
+            table_counts[table] = int(count)
+        return {
+            'manifest_version': MANIFEST_VERSION,
+            'schema_sha256': app_properties['schema_sha256'],
+            'page_size': int(app_properties['page_size']),
+            'page_count': int(app_properties['page_count']),
+            'table_counts': table_counts,
+            'record_count': int(app_properties['record_count'])
+        }
+    except (KeyError, ValueError):
+        return None
+
+def VerifyDatabase(db_path: str, manifest: Optional[Dict[str, Any]] = None,
+                   full_check: bool = False) -> Dict[str, Any]:
+    """Check a database with one read pass; returns {'ok', 'problems', 'record_count', 'check'}
+
+    quick_check reads every page but skips cross-checking index contents against their
+    tables, which is where integrity_check spends most of its time; full_check=True runs
+    the latter. Without a manifest only the required tables are checked and the record
+    count is read from the database.
+    """
+    check = "integrity_check" if full_check else "quick_check"
+    result = {'ok': False, 'problems': [], 'record_count': None, 'check': check}
+    problems = result['problems']
+
+    if not os.path.exists(db_path):
+        problems.append("database file is missing")
+        return result
+
+    try:
+        conn = OpenReadOnly(db_path)
+    except sqlite3.Error as e:
+        problems.append(f"cannot open database: {e}")
+        return result
+
+    try:
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        if os.path.getsize(db_path) != page_size * page_count:
+            problems.append(f"file size does not match its header ({page_count} pages of {page_size} bytes)")
+        if manifest and (page_size, page_count) != (manifest['page_size'], manifest['page_count']):
+            problems.append(f"database has {page_count} pages of {page_size} bytes, manifest says "
+                            f"{manifest['page_count']} of {manifest['page_size']}")
+
+        # Schema checks first: they read a handful of pages and fail fast on the wrong file
+        tables = GetTableNames(conn)
+        missing_tables = [table for table in REQUIRED_TABLES if table not in tables]
+        if missing_tables:
+            problems.append(f"missing required tables: {missing_tables}")
+        if manifest and GetSchemaHash(conn) != manifest['schema_sha256']:
+            problems.append("schema does not match the published manifest")
+        if problems:
+            return result
+
+        messages = [row[0] for row in conn.execute(f"PRAGMA {check}")]
+        if messages != ['ok']:
+            problems.extend(f"{check}: {message}" for message in messages[:10])
+            return result
+
+        if manifest:
+            result['record_count'] = manifest['record_count']
+        else:
+            result['record_count'] = conn.execute(f'SELECT COUNT(*) FROM "{RECORD_TABLE}"').fetchone()[0]
+        result['ok'] = True
+        return result
+
+    except sqlite3.Error as e:
+        problems.append(f"database error: {e}")
+        return result
+    finally:
+        conn.close()
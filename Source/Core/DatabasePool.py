@@ -0,0 +1,248 @@
+# File: DatabasePool.py
+# Path: AndyGoogle/Source/Core/DatabasePool.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-19  04:16AM
+"""
+Description: Fixed-size pool of read-only SQLite connections for the AndyGoogle API
+Keeps connections (and their prepared statement caches) open across requests,
+applies read-tuned PRAGMAs and drains cleanly when DriveManager installs a new database
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+class PooledConnection(sqlite3.Connection):
+    """SQLite connection that remembers which pool generation and file opened it"""
+    pool_generation = 0
+    pool_db_path = None
+
+class DatabasePool:
+    """Manage a fixed number of read-only SQLite connections for one worker process"""
+
+    def __init__(self, db_path: str, pool_size: int = 4, immutable: bool = False,
+                 attachments: Optional[Dict[str, str]] = None,
+                 mmap_size_mb: int = 256, cache_size_mb: int = 16,
+                 statement_cache_size: int = 256, acquire_timeout: float = 10.0,
+                 reference_tracker=None):
+        self.db_path = db_path
+        self.pool_size = max(1, pool_size)
+        self.immutable = immutable
+        self.attachments = dict(attachments or {})
+        self.mmap_size_mb = mmap_size_mb
+        self.cache_size_mb = cache_size_mb
+        self.statement_cache_size = statement_cache_size
+        self.acquire_timeout = acquire_timeout
+        self.reference_tracker = reference_tracker   # Retain(path)/Release(path), e.g. a GenerationStore
+
+        self.condition = threading.Condition()
+        self.idle_connections: List[PooledConnection] = []
+        self.open_count = 0          # Connections of the current generation (idle + in use)
+        self.draining_count = 0      # Connections of older generations still in use
+        self.generation = 0
+        self.closed = False
+
+        self.stats = {
+            'acquired': 0,
+            'waited': 0,
+            'timeouts': 0,
+            'opened': 0,
+            'closed': 0,
+            'swaps': 0
+        }
+
+    def BuildConnectionUri(self, path: str, immutable: bool) -> str:
+        """Build a read-only SQLite URI for a database file"""
+        uri = Path(path).resolve().as_uri() + "?mode=ro"
+        if immutable:
+            uri += "&immutable=1"
+        return uri
+
+    def OpenConnection(self, db_path: Optional[str] = None) -> PooledConnection:
+        """Open and tune a new read-only connection (db_path given = already retained by the caller)"""
+        if db_path is None:
+            with self.condition:
+                db_path = self.db_path
+                self.RetainPath(db_path)
+
+        try:
+            conn = sqlite3.connect(
+                self.BuildConnectionUri(db_path, self.immutable),
+                uri=True,
+                check_same_thread=False,  # Acquired in FastAPI's threadpool, used on the event loop
+                cached_statements=self.statement_cache_size,
+                factory=PooledConnection
+            )
+        except Exception:
+            if self.reference_tracker:
+                self.reference_tracker.Release(db_path)
+            raise
+
+        conn.pool_db_path = db_path
+        conn.row_factory = sqlite3.Row
+
+        try:
+            # Read-optimized tuning - the API never writes to the library database
+            conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size_mb) * 1024 * 1024}")
+            conn.execute(f"PRAGMA cache_size = -{int(self.cache_size_mb) * 1024}")
+            conn.execute("PRAGMA temp_store = MEMORY")
+            conn.execute("PRAGMA query_only = 1")
+
+            for schema_name, attach_path in self.attachments.items():
+                if os.path.exists(attach_path):
+                    conn.execute(
+                        f"ATTACH DATABASE ? AS {schema_name}",
+                        (self.BuildConnectionUri(attach_path, self.immutable),)
+                    )
+        except Exception:
+            self.CloseConnection(conn)
+            raise
+
+        return conn
+
+    def RetainPath(self, db_path: str):
+        """Reference a database file before the pool lock is released, so a swap cannot reclaim it first"""
+        if self.reference_tracker:
+            self.reference_tracker.Retain(db_path)
+
+    def CloseConnection(self, conn: PooledConnection):
+        """Close a connection and drop its reference to the database file"""
+        conn.close()
+        if self.reference_tracker and conn.pool_db_path:
+            self.reference_tracker.Release(conn.pool_db_path)
+
+    def Acquire(self) -> sqlite3.Connection:
+        """Borrow a connection, opening one if the pool has spare capacity"""
+        deadline = time.monotonic() + self.acquire_timeout
+
+        with self.condition:
+            while True:
+                if self.closed:
+                    raise RuntimeError("Database pool is closed")
+
+                if self.idle_connections:
+                    self.stats['acquired'] += 1
+                    return self.idle_connections.pop()
+
+                if self.open_count < self.pool_size:
+                    self.open_count += 1
+                    generation = self.generation
+                    db_path = self.db_path
+                    self.RetainPath(db_path)
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats['timeouts'] += 1
+                    raise TimeoutError(f"No database connection available within {self.acquire_timeout}s")
+
+                self.stats['waited'] += 1
+                self.condition.wait(remaining)
+
+        # Open outside the lock so a slow open does not stall other borrowers
+        try:
+            conn = self.OpenConnection(db_path)
+        except Exception:
+            with self.condition:
+                if generation == self.generation:
+                    self.open_count -= 1
+                else:
+                    self.draining_count -= 1
+                self.condition.notify_all()
+            raise
+
+        conn.pool_generation = generation
+
+        # A swap during the open already counted this connection as draining
+        with self.condition:
+            self.stats['opened'] += 1
+            self.stats['acquired'] += 1
+
+        return conn
+
+    def Release(self, conn: sqlite3.Connection):
+        """Return a borrowed connection to the pool"""
+        with self.condition:
+            if conn.pool_generation == self.generation and not self.closed:
+                self.idle_connections.append(conn)
+                self.condition.notify()
+                return
+
+            # Connection belongs to a drained generation (or the pool is closed)
+            if conn.pool_generation == self.generation:
+                self.open_count -= 1
+            else:
+                self.draining_count -= 1
+            self.stats['closed'] += 1
+            self.condition.notify_all()
+
+        self.CloseConnection(conn)
+
+    def SwapDatabase(self, new_db_path: str, immutable: Optional[bool] = None,
+                     attachments: Optional[Dict[str, str]] = None):
+        """Point the pool at a new database file and drain connections to the old one"""
+        with self.condition:
+            stale_connections = self.idle_connections
+            self.idle_connections = []
+
+            # Borrowed connections finish their request and are closed on release
+            self.draining_count += self.open_count - len(stale_connections)
+            self.open_count = 0
+
+            self.db_path = new_db_path
+            if immutable is not None:
+                self.immutable = immutable
+            if attachments is not None:
+                self.attachments = dict(attachments)
+
+            self.generation += 1
+            self.stats['swaps'] += 1
+            self.stats['closed'] += len(stale_connections)
+            self.condition.notify_all()
+
+        for conn in stale_connections:
+            self.CloseConnection(conn)
+
+    def WaitForDrain(self, timeout: float = 30.0) -> bool:
+        """Wait until no connection to a previous database generation is in use"""
+        deadline = time.monotonic() + timeout
+
+        with self.condition:
+            while self.draining_count > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+
+        return True
+
+    def Close(self):
+        """Close idle connections and refuse new borrowers"""
+        with self.condition:
+            self.closed = True
+            stale_connections = self.idle_connections
+            self.idle_connections = []
+            self.open_count -= len(stale_connections)
+            self.stats['closed'] += len(stale_connections)
+            self.condition.notify_all()
+
+        for conn in stale_connections:
+            self.CloseConnection(conn)
+
+    def GetStats(self) -> Dict[str, Any]:
+        """Get pool usage counters"""
+        with self.condition:
+            return {
+                'db_path': self.db_path,
+                'pool_size': self.pool_size,
+                'generation': self.generation,
+                'open_connections': self.open_count,
+                'idle_connections': len(self.idle_connections),
+                'draining_connections': self.draining_count,
+                'immutable': self.immutable,
+                **self.stats
+            }
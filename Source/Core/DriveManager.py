@@ -2,7 +2,7 @@
 # Path: AndyGoogle/Source/Core/DriveManager.py
 # Standard: AIDEV-PascalCase-2.1
 # Created: 2025-07-12
-# Last Modified: 2025-07-12  07:35PM
+# Last Modified: 2026-10-19  01:21AM
 """
 Description: Central manager for Google Drive database synchronization in AndyGoogle
 Orchestrates database downloads, updates, version checking, and offline mode handling
@@ -16,25 +16,46 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 import hashlib
 import time
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None   # Windows: no cross-process sync lock
 
 # Import AndyGoogle modules
 from API.GoogleDriveAPI import GoogleDriveAPI
 from Utils.SheetsLogger import SheetsLogger
+from Utils.ResilientTransport import ResilientTransport, RetryPolicy, BREAKER_OPEN, BREAKER_CLOSED
+from Core.SearchIndex import SearchIndex, SEARCH_SCHEMA
+from Core.DatabaseDelta import ApplyDelta, FindDeltaChain, DeltaError
+from Core.DatabaseGenerations import GenerationStore, GetConfiguredDatabasePath, DEFAULT_CONFIG_PATH, DEFAULT_DATABASE_PATH
+from Core.DatabaseManifest import VerifyDatabase
 
 class DriveManager:
     """Manage database synchronization with Google Drive"""
     
-    def __init__(self, config_path: str = "AndyGoogle/Config/andygoogle_config.json"):
+    def __init__(self, config_path: str = DEFAULT_CONFIG_PATH):
         self.config_path = config_path
         self.config = self.LoadConfig()
         
         # Initialize API components
         credentials_path = self.config.get('google_credentials_path', 'AndyGoogle/Config/google_credentials.json')
         self.drive_api = GoogleDriveAPI(credentials_path)
+        self.drive_api.download_chunk_size = int(self.config.get('download_chunk_size_mb', 8) * 1024 * 1024)
+        self.drive_api.download_connections = int(self.config.get('download_connections', 4))
+        self.drive_api.parallel_download_min_size = int(self.config.get('parallel_download_min_mb', 64) * 1024 * 1024)
+        self.drive_api.upload_chunk_size = int(self.config.get('upload_chunk_size_mb', 8) * 1024 * 1024)
+        self.drive_api.upload_compression = self.config.get('upload_compression', 'identity')
+        self.drive_api.metadata_cache.ttl_seconds = self.config.get('drive_metadata_ttl_seconds', 900)
         self.sheets_logger = SheetsLogger(credentials_path)
+        self.ConfigureTransport(self.drive_api.transport)
+        self.ConfigureTransport(self.sheets_logger.transport)
         
-        # Local paths
-        self.local_db_path = self.config.get('local_database_path', 'AndyGoogle/Data/Local/cached_library.db')
+        # Local paths - synced databases are installed as generations beside the configured path
+        self.database_path = GetConfiguredDatabasePath(self.config)
+        self.generation_store = GenerationStore(self.database_path)
         self.backup_db_path = self.config.get('backup_database_path', 'AndyGoogle/Data/Local/backup_library.db')
         self.version_info_path = "AndyGoogle/Data/Local/version_info.json"
         
@@ -43,22 +64,104 @@ class DriveManager:
         self.sync_interval_hours = self.config.get('sync_interval_hours', 24)
         self.offline_mode = False
         
+        # Offline mode follows the Drive circuit breaker: entered when it opens, left
+        # as soon as a half-open probe gets through
+        self.drive_api.transport.breaker.AddListener(self.OnDriveBreakerChanged)
+        
+        # Callbacks notified after a new database file is installed
+        self.database_swap_listeners = []
+        
+        # Multi-worker serving turns this off: other processes may still read the old
+        # generation, so the worker supervisor reclaims it after restarting them
+        self.reclaim_after_sync = True
+        
+        # Installs run quick_check only; the full integrity_check runs afterwards off the sync path
+        self.background_integrity_check = self.config.get('background_integrity_check', True)
+        self.integrity_status = None
+        self.integrity_thread = None
+        
         # Ensure directories exist
-        os.makedirs(os.path.dirname(self.local_db_path), exist_ok=True)
+        os.makedirs(os.path.dirname(self.database_path), exist_ok=True)
         os.makedirs(os.path.dirname(self.version_info_path), exist_ok=True)
     
+    def ConfigureTransport(self, transport: ResilientTransport):
+        """Apply the retry, deadline and breaker settings to a Google API transport"""
+        transport.policy = RetryPolicy(
+            max_attempts=self.config.get('api_retry_attempts', 5),
+            base_delay=self.config.get('api_retry_base_delay_seconds', 0.5),
+            max_delay=self.config.get('api_retry_max_delay_seconds', 30.0)
+        )
+        transport.deadline_seconds = self.config.get('api_call_deadline_seconds', 120.0)
+        transport.breaker.failure_threshold = self.config.get('api_breaker_failure_threshold', 5)
+        transport.breaker.base_recovery_seconds = self.config.get('api_breaker_recovery_seconds', 60.0)
+        transport.breaker.recovery_seconds = transport.breaker.base_recovery_seconds
+        transport.breaker.max_recovery_seconds = self.config.get('api_breaker_max_recovery_seconds', 900.0)
+    
+    def OnDriveBreakerChanged(self, old_state: str, new_state: str):
+        """Keep offline_mode in step with the Drive circuit breaker"""
+        if new_state == BREAKER_OPEN and not self.offline_mode:
+            print("📴 Google Drive unavailable - entering offline mode")
+            self.offline_mode = True
+        elif new_state == BREAKER_CLOSED and self.offline_mode:
+            print("📶 Google Drive reachable again - leaving offline mode")
+            self.offline_mode = False
+    
+    def CanReachDrive(self) -> bool:
+        """Whether a Drive call is worth attempting (online, or the breaker is ready for a probe)"""
+        return not self.offline_mode or self.drive_api.transport.breaker.GetState() != BREAKER_OPEN
+    
+    @property
+    def local_db_path(self) -> str:
+        """Path of the database generation readers should open right now"""
+        return self.generation_store.GetCurrentPath()
+    
     def LoadConfig(self) -> Dict[str, Any]:
         """Load AndyGoogle configuration"""
         default_config = {
             'google_credentials_path': 'AndyGoogle/Config/google_credentials.json',
-            'local_database_path': 'AndyGoogle/Data/Local/cached_library.db',
+            'local_database_path': DEFAULT_DATABASE_PATH,
             'backup_database_path': 'AndyGoogle/Data/Local/backup_library.db',
             'auto_sync_enabled': True,
             'sync_interval_hours': 24,
             'offline_grace_period_days': 7,
             'version_check_interval_hours': 6,
+            'sync_check_jitter_fraction': 0.1,
+            'sync_initial_delay_seconds': 60,
             'max_backup_versions': 5,
-            'required_free_space_mb': 100
+            'required_free_space_mb': 100,
+            'download_chunk_size_mb': 8,
+            'download_connections': 4,
+            'parallel_download_min_mb': 64,
+            'upload_chunk_size_mb': 8,
+            'upload_compression': 'identity',   # 'identity', 'gzip' or 'zstd'
+            'api_retry_attempts': 5,
+            'api_retry_base_delay_seconds': 0.5,
+            'api_retry_max_delay_seconds': 30.0,
+            'api_call_deadline_seconds': 120.0,
+            'api_breaker_failure_threshold': 5,
+            'api_breaker_recovery_seconds': 60.0,
+            'api_breaker_max_recovery_seconds': 900.0,
+            'drive_metadata_ttl_seconds': 900,
+            'delta_sync_enabled': True,
+            'max_delta_chain': 10,
+            'background_integrity_check': True,   # Full PRAGMA integrity_check after each install
+            'database_pool_size': 4,
+            'database_mmap_size_mb': 256,
+            'database_cache_size_mb': 16,
+            'telemetry_queue_size': 10000,
+            'telemetry_batch_size': 200,
+            'telemetry_flush_interval_seconds': 2.0,
+            'telemetry_backpressure': 'drop',  # 'drop', 'sample' or 'block'
+            'telemetry_sample_rate': 0.1,
+            'response_cache_entries': 512,
+            'response_cache_mb': 32,
+            'batch_lookup_max_ids': 500,
+            'books_directory': 'AndyGoogle/Data/Books',
+            'thumbnail_cache_directory': 'AndyGoogle/Data/Cache/Thumbnails',
+            'thumbnail_sizes': [120, 240, 480],
+            'thumbnail_workers': 2,
+            'server_workers': 1,
+            'fast_json_enabled': False   # Or set ANDYGOOGLE_FAST_JSON=1
         }
         
         try:
@@ -132,11 +235,15 @@ class DriveManager:
             local_info = self.GetLocalVersionInfo()
             update_info['local_version'] = local_info.get('version', '0.0.0')
             
-            # Try to get remote version
-            if not self.offline_mode:
+            # Try to get remote version (in offline mode this is the recovery probe)
+            if self.CanReachDrive():
                 remote_info = self.drive_api.GetLatestDatabaseVersion()
                 
                 if remote_info:
+                    if self.offline_mode:
+                        print("📶 Google Drive reachable again - leaving offline mode")
+                        self.offline_mode = False
+                    update_info['offline_mode'] = False
                     update_info['remote_version'] = remote_info['version']
                     update_info['download_size'] = remote_info['size_bytes']
                     update_info['change_description'] = remote_info.get('description', '')
@@ -173,7 +280,33 @@ class DriveManager:
             self.offline_mode = True
             return update_info
     
+    @contextmanager
+    def SyncLock(self):
+        """Non-blocking lock so only one process (e.g. one of several workers) syncs at a time"""
+        if fcntl is None:
+            yield True
+            return
+        
+        with open(self.database_path + ".sync.lock", 'a') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
     def SyncDatabaseFromDrive(self, force_download: bool = False) -> bool:
+        """Sync database from Google Drive (skipped if another process is already syncing)"""
+        with self.SyncLock() as acquired:
+            if not acquired:
+                print("⚠️ Database sync already running in another process")
+                return False
+            return self.RunDatabaseSync(force_download)
+    
+    def RunDatabaseSync(self, force_download: bool = False) -> bool:
         """Sync database from Google Drive"""
         print("🔄 Starting database sync from Google Drive...")
         
@@ -199,36 +332,54 @@ class DriveManager:
             if os.path.exists(self.local_db_path):
                 self.CreateBackup()
             
-            # Download new database
-            print(f"📥 Downloading database v{remote_info['version']} ({remote_info['size_bytes']} bytes)...")
+            # Stable staging name so an interrupted download resumes on the next sync
+            temp_path = self.database_path + ".tmp"
             
-            temp_path = self.local_db_path + ".tmp"
-            success = self.drive_api.DownloadDatabase(remote_info['file_id'], temp_path)
+            # Patch forward from the local copy when published deltas cover the gap
+            file_hash = self.SyncViaDeltaChain(remote_info, temp_path)
             
-            if not success:
-                print("❌ Failed to download database")
-                return False
-            
-            # Validate downloaded database
-            if not self.drive_api.ValidateDatabaseIntegrity(temp_path):
-                print("❌ Downloaded database failed integrity check")
+            if not file_hash:
+                # Download new database
+                print(f"📥 Downloading database v{remote_info['version']} ({remote_info['size_bytes']} bytes)...")
+                
+                success = self.drive_api.DownloadDatabase(remote_info['file_id'], temp_path)
+                
+                if not success:
+                    print("❌ Failed to download database")
+                    return False
+                file_hash = self.drive_api.last_download_hash
+            
+            # The content hash was checked while streaming; one quick_check plus the
+            # published manifest's schema covers the rest without another full pass
+            verify_started = time.monotonic()
+            verification = VerifyDatabase(temp_path, remote_info.get('manifest'))
+            if not verification['ok']:
+                print(f"❌ Downloaded database failed verification: {'; '.join(verification['problems'])}")
                 os.remove(temp_path)
                 return False
+            print(f"🔍 Database verified ({verification['check']}) in {time.monotonic() - verify_started:.2f}s")
             
-            # Move temp file to final location
-            shutil.move(temp_path, self.local_db_path)
+            # Install as a new generation; readers on the old one finish undisturbed
+            new_db_path = self.generation_store.Install(temp_path)
             
             # Update version info
             new_version_info = {
                 'version': remote_info['version'],
                 'file_id': remote_info['file_id'],
                 'last_sync': datetime.now().isoformat(),
-                'file_hash': self.drive_api.CalculateFileHash(self.local_db_path),
-                'record_count': self.GetDatabaseRecordCount(),
+                'file_hash': file_hash or self.drive_api.CalculateFileHash(new_db_path),
+                'record_count': verification['record_count'],
                 'sync_status': 'synced'
             }
             
             self.SaveLocalVersionInfo(new_version_info)
+            if self.background_integrity_check:
+                self.StartIntegrityCheck(new_db_path, remote_info['version'])
+            
+            # Let open connection pools drain onto the new generation, then drop unused ones
+            self.NotifyDatabaseSwapped()
+            if self.reclaim_after_sync:
+                self.generation_store.Reclaim()
             
             print(f"✅ Database sync completed successfully (v{remote_info['version']})")
             
@@ -245,6 +396,124 @@ class DriveManager:
             self.sheets_logger.LogError('database_sync_failed', str(e))
             return False
     
+    def SyncViaDeltaChain(self, remote_info: Dict[str, Any], temp_path: str) -> Optional[str]:
+        """Rebuild the remote version at temp_path from the local database plus published deltas; returns its MD5"""
+        if not self.config.get('delta_sync_enabled', True) or not os.path.exists(self.local_db_path):
+            return None
+        
+        local_info = self.GetLocalVersionInfo()
+        local_version = local_info.get('version', '0.0.0')
+        if local_info.get('sync_status') != 'synced' or local_version == remote_info['version']:
+            return None
+        
+        chain = FindDeltaChain(self.drive_api.ListDatabaseDeltas(), local_version, remote_info['version'],
+                               self.config.get('max_delta_chain', 10))
+        if not chain:
+            return None
+        
+        # A long chain of large deltas can cost more than the full file
+        chain_bytes = sum(delta['size_bytes'] for delta in chain)
+        if remote_info.get('size_bytes') and chain_bytes >= remote_info['size_bytes'] // 2:
+            print(f"Delta chain ({chain_bytes} bytes) not worth it - downloading full database")
+            return None
+        
+        print(f"📥 Patching v{local_version} → v{remote_info['version']} with {len(chain)} delta(s) ({chain_bytes} bytes)...")
+        
+        delta_path = temp_path + ".delta"
+        base_path = self.local_db_path
+        result_md5 = None
+        
+        try:
+            for step, delta in enumerate(chain):
+                if not self.drive_api.DownloadFile(delta['file_id'], delta_path):
+                    raise DeltaError(f"Could not download {delta['filename']}")
+                
+                # Alternate between two scratch files so each step patches the previous result
+                output_path = temp_path if (len(chain) - step) % 2 == 1 else temp_path + ".step"
+                result_md5 = ApplyDelta(base_path, delta_path, output_path)['result_md5']
+                if base_path != self.local_db_path:
+                    os.remove(base_path)
+                base_path = output_path
+            
+            # Deltas verify themselves; the final file must also match what Drive published
+            published_md5 = remote_info.get('md5_checksum')
+            if published_md5 and result_md5 != published_md5:
+                raise DeltaError(f"Patched database does not match published MD5 ({result_md5} != {published_md5})")
+            
+            print(f"✅ Database patched to v{remote_info['version']} via delta")
+            return result_md5
+            
+        except (DeltaError, OSError) as e:
+            print(f"⚠️ Delta sync failed, falling back to full download: {e}")
+            for leftover in (temp_path, temp_path + ".step"):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+            return None
+        finally:
+            if os.path.exists(delta_path):
+                os.remove(delta_path)
+    
+    def StartIntegrityCheck(self, db_path: str, version: str):
+        """Run the full integrity_check on an installed database in a background thread"""
+        if self.integrity_thread and self.integrity_thread.is_alive():
+            print("ℹ️ Integrity check already running - skipping")
+            return
+        self.integrity_status = {'version': version, 'state': 'running', 'problems': [], 'checked_at': None}
+        self.integrity_thread = threading.Thread(target=self.RunIntegrityCheck, args=(db_path, version),
+                                                 name="andygoogle-integrity-check", daemon=True)
+        self.integrity_thread.start()
+    
+    def RunIntegrityCheck(self, db_path: str, version: str):
+        """Full integrity_check; a failure schedules a fresh download on the next sync"""
+        started = time.monotonic()
+        verification = VerifyDatabase(db_path, full_check=True)
+        self.integrity_status = {
+            'version': version,
+            'state': 'ok' if verification['ok'] else 'failed',
+            'problems': verification['problems'],
+            'checked_at': datetime.now().isoformat(),
+            'seconds': round(time.monotonic() - started, 2)
+        }
+        if verification['ok']:
+            return
+        
+        print(f"❌ Background integrity check failed for v{version}: {'; '.join(verification['problems'])}")
+        self.sheets_logger.LogError('database_integrity_failed', f"v{version}: {verification['problems'][:3]}")
+        local_info = self.GetLocalVersionInfo()
+        if local_info.get('version') == version:
+            # Not 'synced': no delta patching from this copy, and no "recent sync" shortcut
+            local_info['sync_status'] = 'integrity_failed'
+            local_info.pop('last_sync', None)
+            self.SaveLocalVersionInfo(local_info)
+    
+    def RegisterDatabaseSwapListener(self, listener):
+        """Register a callback(db_path, immutable) run after a new database is installed"""
+        if listener not in self.database_swap_listeners:
+            self.database_swap_listeners.append(listener)
+    
+    def IsDatabaseImmutable(self) -> bool:
+        """Check whether the local database is a synced copy that nothing will modify in place"""
+        return self.GetLocalVersionInfo().get('sync_status') == 'synced'
+    
+    def NotifyDatabaseSwapped(self):
+        """Tell registered listeners that the local database file has been replaced"""
+        immutable = self.IsDatabaseImmutable()
+        for listener in list(self.database_swap_listeners):
+            try:
+                listener(self.local_db_path, immutable)
+            except Exception as e:
+                print(f"Warning: Database swap listener failed: {e}")
+    
+    def EnsureSearchIndex(self) -> bool:
+        """Build or refresh the FTS5 search sidecar for the local database"""
+        if not os.path.exists(self.local_db_path):
+            return False
+        return SearchIndex(self.local_db_path).EnsureBuilt()
+    
+    def GetDatabaseAttachments(self) -> Dict[str, str]:
+        """Get sidecar databases that readers should attach to the local database"""
+        return {SEARCH_SCHEMA: SearchIndex.GetIndexPath(self.local_db_path)}
+    
     def CreateBackup(self) -> bool:
         """Create backup of current database"""
         try:
@@ -394,6 +663,11 @@ class DriveManager:
             'sync_status': local_info.get('sync_status', 'unknown'),
             'offline_mode': self.offline_mode,
             'auto_sync_enabled': self.auto_sync_enabled,
+            'integrity_check': self.integrity_status,
+            'transport': {
+                'drive': self.drive_api.transport.GetMetrics(),
+                'sheets': self.sheets_logger.transport.GetMetrics()
+            },
             'next_check_due': None,
             'database_size_mb': 0
         }
@@ -424,6 +698,7 @@ class DriveManager:
         if os.path.exists(self.local_db_path):
             local_info = self.GetLocalVersionInfo()
             if local_info.get('sync_status') == 'synced':
+                self.EnsureSearchIndex()
                 print("✅ Database already initialized")
                 return True
         
@@ -437,6 +712,7 @@ class DriveManager:
             
             # Check if we have any local database
             if os.path.exists(self.local_db_path):
+                self.EnsureSearchIndex()
                 print("ℹ️ Using existing local database")
                 return True
             else:
@@ -0,0 +1,174 @@
+# File: FacetIndex.py
+# Path: AndyGoogle/Source/Core/FacetIndex.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-19  03:32AM
+"""
+Description: Precomputed bitmap indexes for faceted book filtering
+Each category, subject and rating value gets one bitmap (a Python int) over the
+catalog's title order, so a filter is a few ANDs, a facet count is a popcount and a
+result page is read off the set bits already in display order - no GROUP BY per request
+"""
+
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Any, Tuple
+
+from Core.CatalogSnapshot import CatalogSnapshot
+from Core.SearchIndex import UnsupportedFilterError
+
+class FacetIndex:
+    """Category/subject/rating bitmaps for one catalog snapshot"""
+
+    def __init__(self, snapshot: CatalogSnapshot):
+        self.snapshot = snapshot
+        self.size = len(snapshot.book_ids)
+        self.all_books = (1 << self.size) - 1
+        self.build_seconds = 0.0
+
+        # Bit r stands for the book at title rank r (snapshot.title_order[r])
+        self.rank_of_position = array('l', bytes(array('l').itemsize * self.size))
+        self.category_bitmaps: Dict[str, int] = {}
+        self.subject_bitmaps: Dict[str, int] = {}   # Same subject name in two categories shares a bitmap
+        self.rating_bitmaps: Dict[int, int] = {}
+
+    @classmethod
+    def Build(cls, snapshot: CatalogSnapshot) -> "FacetIndex":
+        """Build the posting lists for a snapshot and pack them into bitmaps"""
+        start_time = time.perf_counter()
+        index = cls(snapshot)
+
+        category_postings: Dict[str, List[int]] = {}
+        subject_postings: Dict[str, List[int]] = {}
+        rating_postings: Dict[int, List[int]] = {}
+        category_names: Dict[int, Optional[str]] = {}
+        subject_names: Dict[int, Optional[str]] = {}
+
+        # Walking in title order keeps every posting list sorted by rank
+        for rank, position in enumerate(snapshot.title_order):
+            index.rank_of_position[position] = rank
+
+            category_id = snapshot.book_category_ids[position]
+            if category_id not in category_names:
+                category_names[category_id] = snapshot.GetCategoryName(category_id)
+            if category_names[category_id] is not None:
+                category_postings.setdefault(category_names[category_id], []).append(rank)
+
+            subject_id = snapshot.book_subject_ids[position]
+            if subject_id not in subject_names:
+                subject_names[subject_id] = snapshot.GetSubjectName(subject_id)
+            if subject_names[subject_id] is not None:
+                subject_postings.setdefault(subject_names[subject_id], []).append(rank)
+
+            if snapshot.book_ratings is not None and snapshot.book_ratings[position] is not None:
+                rating_postings.setdefault(snapshot.book_ratings[position], []).append(rank)
+
+        index.category_bitmaps = {name: index.BitmapFromRanks(ranks) for name, ranks in category_postings.items()}
+        index.subject_bitmaps = {name: index.BitmapFromRanks(ranks) for name, ranks in subject_postings.items()}
+        index.rating_bitmaps = {rating: index.BitmapFromRanks(ranks) for rating, ranks in rating_postings.items()}
+
+        index.build_seconds = time.perf_counter() - start_time
+        return index
+
+    def BitmapFromRanks(self, ranks: Iterable[int]) -> int:
+        """Pack title ranks into a bitmap"""
+        buffer = bytearray((self.size + 7) // 8)
+        for rank in ranks:
+            buffer[rank >> 3] |= 1 << (rank & 7)
+        return int.from_bytes(buffer, 'little')
+
+    def BitmapFromBookIds(self, book_ids: Iterable[int]) -> int:
+        """Bitmap of the given book ids (e.g. full-text matches); unknown ids are ignored"""
+        ranks = []
+        for book_id in book_ids:
+            position = self.snapshot.FindBookPosition(book_id)
+            if position is not None:
+                ranks.append(self.rank_of_position[position])
+        return self.BitmapFromRanks(ranks)
+
+    def GetRatingBitmap(self, min_rating: Optional[int]) -> int:
+        """Books rated at least min_rating (no filter when min_rating is empty)"""
+        if not min_rating:
+            return self.all_books
+        if self.snapshot.book_ratings is None:
+            # Same answer /api/books/search gives, rather than an empty result
+            raise UnsupportedFilterError("This catalog has no ratings - the rating filter is not supported")
+        bitmap = 0
+        for rating, rating_bitmap in self.rating_bitmaps.items():
+            if rating >= min_rating:
+                bitmap |= rating_bitmap
+        return bitmap
+
+    def GetPagePositions(self, bitmap: int, offset: int, limit: int) -> List[int]:
+        """Snapshot positions for one page of a result bitmap, in title order"""
+        if limit <= 0 or not bitmap:
+            return []
+
+        # Skip whole 64-bit words by popcount, then walk bits only inside the page
+        word_count = (self.size + 63) // 64
+        words = array('Q', bitmap.to_bytes(word_count * 8, 'little'))
+        positions = []
+        remaining_skip = offset
+        for word_index, word in enumerate(words):
+            if not word:
+                continue
+            if remaining_skip:
+                bits = word.bit_count()
+                if bits <= remaining_skip:
+                    remaining_skip -= bits
+                    continue
+            while word:
+                low_bit = word & -word
+                word ^= low_bit
+                if remaining_skip:
+                    remaining_skip -= 1
+                    continue
+                positions.append(self.snapshot.title_order[word_index * 64 + low_bit.bit_length() - 1])
+                if len(positions) == limit:
+                    return positions
+        return positions
+
+    def CountFacet(self, bitmaps: Dict[Any, int], base: int) -> List[Tuple[Any, int]]:
+        """Non-zero counts of each facet value within a base bitmap, largest first"""
+        counts = [(value, (bitmap & base).bit_count()) for value, bitmap in bitmaps.items()]
+        counts = [(value, count) for value, count in counts if count]
+        counts.sort(key=lambda item: (-item[1], str(item[0])))
+        return counts
+
+    def Filter(self, category: Optional[str] = None, subject: Optional[str] = None,
+               min_rating: Optional[int] = None, text_bitmap: Optional[int] = None,
+               offset: int = 0, limit: int = 50) -> Dict[str, Any]:
+        """Apply the filters; return one page of book positions, the total and facet counts
+
+        Each facet is counted with every filter except its own applied, so the client
+        can show how many books switching that facet would yield.
+        """
+        text_part = self.all_books if text_bitmap is None else text_bitmap
+        category_part = self.category_bitmaps.get(category, 0) if category else self.all_books
+        subject_part = self.subject_bitmaps.get(subject, 0) if subject else self.all_books
+        rating_part = self.GetRatingBitmap(min_rating)
+
+        result = text_part & category_part & subject_part & rating_part
+
+        return {
+            'positions': self.GetPagePositions(result, offset, limit),
+            'total': result.bit_count(),
+            'facets': {
+                'categories': self.CountFacet(self.category_bitmaps, text_part & subject_part & rating_part),
+                'subjects': self.CountFacet(self.subject_bitmaps, text_part & category_part & rating_part),
+                'ratings': self.CountFacet(self.rating_bitmaps, text_part & category_part & subject_part)
+            }
+        }
+
+    def GetInfo(self) -> Dict[str, Any]:
+        """Describe the index for diagnostics"""
+        bitmap_bytes = (self.size + 7) // 8
+        bitmap_count = len(self.category_bitmaps) + len(self.subject_bitmaps) + len(self.rating_bitmaps)
+        return {
+            'books': self.size,
+            'category_bitmaps': len(self.category_bitmaps),
+            'subject_bitmaps': len(self.subject_bitmaps),
+            'rating_bitmaps': len(self.rating_bitmaps),
+            'approximate_bytes': bitmap_count * bitmap_bytes + self.rank_of_position.itemsize * self.size,
+            'build_seconds': round(self.build_seconds, 4)
+        }
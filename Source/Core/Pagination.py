@@ -0,0 +1,52 @@
+# File: Pagination.py
+# Path: AndyGoogle/Source/Core/Pagination.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  10:34AM
+"""
+Description: Keyset (cursor) pagination helpers for AndyGoogle book listings
+Encodes the (title, id) sort key of the last row into an opaque token so the next
+page seeks through idx_books_title / idx_books_category_title instead of using OFFSET
+"""
+
+import json
+import base64
+from typing import Any, List, Optional, Tuple
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+def EncodeCursor(title: str, book_id: int) -> str:
+    """Encode the sort key of the last row on a page as an opaque URL-safe token"""
+    payload = json.dumps([title, book_id], separators=(',', ':'), ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def DecodeCursor(cursor: str) -> Tuple[str, int]:
+    """Decode a cursor token back into its (title, id) sort key"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        title, book_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+        if not isinstance(title, str) or not isinstance(book_id, int):
+            raise ValueError("unexpected cursor payload")
+        return title, book_id
+    except (ValueError, TypeError, UnicodeError) as e:
+        raise InvalidCursorError(f"Invalid pagination cursor: {e}")
+
+def BuildSeekClause(cursor: Optional[str], params: List[Any], table_alias: str = "b") -> str:
+    """Get the WHERE fragment that resumes after the cursor row (appends its parameters)"""
+    if not cursor:
+        return ""
+
+    title, book_id = DecodeCursor(cursor)
+    params.extend([title, book_id])
+
+    # Row-value comparison lets SQLite range-scan the (title, rowid) index order
+    return f" AND ({table_alias}.title, {table_alias}.id) > (?, ?)"
+
+def GetNextCursor(rows: List[Any], limit: int) -> Optional[str]:
+    """Get the cursor for the page after rows, or None on the last page"""
+    if not rows or len(rows) < limit:
+        return None
+
+    last_row = rows[-1]
+    return EncodeCursor(last_row['title'], last_row['id'])
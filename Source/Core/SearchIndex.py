@@ -0,0 +1,236 @@
+# File: SearchIndex.py
+# Path: AndyGoogle/Source/Core/SearchIndex.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-19  02:14AM
+"""
+Description: SQLite FTS5 full-text index over the AndyGoogle book catalog
+Builds a sidecar search database next to each installed library database (so the
+published file stays byte-identical) and runs BM25-ranked prefix queries against it
+"""
+
+import os
+import re
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+
+SEARCH_SCHEMA = "search"
+SEARCH_INDEX_VERSION = 1
+
+# BM25 column weights: title, author, category, subject
+RANK_FUNCTION = "bm25(10.0, 5.0, 2.0, 2.0)"
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+class UnsupportedFilterError(ValueError):
+    """A search filter refers to data this catalog does not have"""
+
+class SearchIndex:
+    """Build and query the FTS5 sidecar index for a library database"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.index_path = self.GetIndexPath(db_path)
+
+    @staticmethod
+    def GetIndexPath(db_path: str) -> str:
+        """Get the sidecar index path for a library database"""
+        return os.path.splitext(db_path)[0] + ".search.db"
+
+    def GetSourceFingerprint(self) -> str:
+        """Identify the library file the index was built from"""
+        stat = os.stat(self.db_path)
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    def IsCurrent(self) -> bool:
+        """Check whether the sidecar index matches the current library file"""
+        if not os.path.exists(self.index_path) or not os.path.exists(self.db_path):
+            return False
+
+        try:
+            conn = sqlite3.connect(f"file:{self.index_path}?mode=ro", uri=True)
+            try:
+                meta = dict(conn.execute("SELECT key, value FROM search_meta").fetchall())
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return False
+
+        return (meta.get('source_fingerprint') == self.GetSourceFingerprint()
+                and meta.get('index_version') == str(SEARCH_INDEX_VERSION))
+
+    def EnsureBuilt(self) -> bool:
+        """Build the index if it is missing or stale"""
+        if self.IsCurrent():
+            return True
+        return self.Build()
+
+    def Build(self) -> bool:
+        """(Re)build the sidecar FTS5 index from the library database"""
+        if not os.path.exists(self.db_path):
+            return False
+
+        temp_path = self.index_path + ".tmp"
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+        try:
+            start_time = datetime.now()
+            conn = sqlite3.connect(temp_path)
+            conn.execute("PRAGMA journal_mode = OFF")
+            conn.execute("PRAGMA synchronous = OFF")
+            conn.execute("ATTACH DATABASE ? AS library", (f"file:{self.db_path}?mode=ro",))
+
+            conn.executescript("""
+                CREATE VIRTUAL TABLE books_fts USING fts5(
+                    title, author, category, subject,
+                    tokenize = 'unicode61 remove_diacritics 2',
+                    prefix = '2 3'
+                );
+                CREATE TABLE search_meta (key TEXT PRIMARY KEY, value TEXT);
+            """)
+
+            # Older catalogs have no author column
+            book_columns = {row[1].lower() for row in conn.execute("PRAGMA library.table_info(books)")}
+            author_expr = "b.author" if 'author' in book_columns else "NULL"
+
+            conn.execute(f"""
+                INSERT INTO books_fts (rowid, title, author, category, subject)
+                SELECT b.id, b.title, {author_expr}, c.category, s.subject
+                FROM library.books b
+                LEFT JOIN library.categories c ON b.category_id = c.id
+                LEFT JOIN library.subjects s ON b.subject_id = s.id
+            """)
+
+            conn.execute("INSERT INTO books_fts (books_fts, rank) VALUES ('rank', ?)", (RANK_FUNCTION,))
+            conn.execute("INSERT INTO books_fts (books_fts) VALUES ('optimize')")
+
+            document_count = conn.execute("SELECT COUNT(*) FROM books_fts").fetchone()[0]
+            conn.executemany("INSERT INTO search_meta (key, value) VALUES (?, ?)", [
+                ('index_version', str(SEARCH_INDEX_VERSION)),
+                ('source_fingerprint', self.GetSourceFingerprint()),
+                ('document_count', str(document_count)),
+                ('built_at', datetime.now().isoformat())
+            ])
+            conn.commit()
+            conn.execute("DETACH DATABASE library")
+            conn.close()
+
+            # Atomic replace - pooled readers keep the old inode until they drain
+            os.replace(temp_path, self.index_path)
+
+            elapsed = (datetime.now() - start_time).total_seconds()
+            print(f"✅ Search index built: {document_count} books in {elapsed:.2f}s")
+            return True
+
+        except sqlite3.Error as e:
+            print(f"❌ Failed to build search index: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+
+def BuildMatchExpression(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 query that prefix-matches every term"""
+    tokens = TOKEN_PATTERN.findall(query or "")
+    if not tokens:
+        return None
+
+    # Quoting each token keeps FTS5 operators in user input from being interpreted
+    return " ".join(f'"{token}"*' for token in tokens)
+
+def IsSearchIndexAttached(conn: sqlite3.Connection) -> bool:
+    """Check whether a pooled connection has the search sidecar attached"""
+    rows = conn.execute("SELECT name FROM pragma_database_list").fetchall()
+    return any(row[0] == SEARCH_SCHEMA for row in rows)
+
+def MatchBookIds(conn: sqlite3.Connection, query: str) -> List[int]:
+    """Ids of every book matching a query, unranked (for combining with other filters)"""
+    match_expression = BuildMatchExpression(query)
+    if not match_expression:
+        return []
+    return [row[0] for row in conn.execute(
+        f"SELECT rowid FROM {SEARCH_SCHEMA}.books_fts WHERE books_fts MATCH ?", (match_expression,)
+    )]
+
+def BuildFilterClause(conn: sqlite3.Connection, category: Optional[str] = None, subject: Optional[str] = None,
+                      min_rating: Optional[int] = None) -> Tuple[str, List[Any]]:
+    """SQL conditions over the b/c/s aliases for the filters shared by ranked and fallback search"""
+    filters = ""
+    params: List[Any] = []
+    if category:
+        filters += " AND c.category = ?"
+        params.append(category)
+    if subject:
+        filters += " AND s.subject = ?"
+        params.append(subject)
+    if min_rating:
+        book_columns = {row[1].lower() for row in conn.execute("PRAGMA main.table_info(books)")}
+        if 'rating' not in book_columns:
+            raise UnsupportedFilterError("This catalog has no ratings - the rating filter is not supported")
+        filters += " AND b.rating >= ?"
+        params.append(min_rating)
+    return filters, params
+
+def SearchBooks(conn: sqlite3.Connection, query: str, limit: int = 50, offset: int = 0,
+                category: Optional[str] = None, subject: Optional[str] = None,
+                min_rating: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+    """Run a BM25-ranked search and return (rows, total_matches)"""
+    match_expression = BuildMatchExpression(query)
+    if not match_expression:
+        return [], 0
+
+    filters, filter_params = BuildFilterClause(conn, category, subject, min_rating)
+    params: List[Any] = [match_expression] + filter_params
+
+    base_query = f"""
+        FROM {SEARCH_SCHEMA}.books_fts f
+        JOIN books b ON b.id = f.rowid
+        LEFT JOIN categories c ON b.category_id = c.id
+        LEFT JOIN subjects s ON b.subject_id = s.id
+        WHERE f.books_fts MATCH ?{filters}
+    """
+
+    rows = conn.execute(f"""
+        SELECT b.id, b.title, f.author, c.category, s.subject,
+               highlight(books_fts, 0, '<mark>', '</mark>') AS title_highlight,
+               snippet(books_fts, -1, '<mark>', '</mark>', '…', 12) AS snippet,
+               -f.rank AS score
+        {base_query}
+        ORDER BY f.rank
+        LIMIT ? OFFSET ?
+    """, params + [limit, offset]).fetchall()
+
+    # Unfiltered totals come from the doclists alone, without joining every match to books
+    if filters:
+        total = conn.execute(f"SELECT COUNT(*) {base_query}", params).fetchone()[0]
+    else:
+        total = conn.execute(f"SELECT COUNT(*) FROM {SEARCH_SCHEMA}.books_fts WHERE books_fts MATCH ?",
+                             (match_expression,)).fetchone()[0]
+
+    return [dict(row) for row in rows], total
+
+def SearchBooksByTitle(conn: sqlite3.Connection, query: str, limit: int = 50, offset: int = 0,
+                       category: Optional[str] = None, subject: Optional[str] = None,
+                       min_rating: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+    """Unranked title substring search with the same filters (used until the index is built)"""
+    filters, filter_params = BuildFilterClause(conn, category, subject, min_rating)
+    params: List[Any] = [f"%{query}%"] + filter_params
+
+    base_query = f"""
+        FROM books b
+        LEFT JOIN categories c ON b.category_id = c.id
+        LEFT JOIN subjects s ON b.subject_id = s.id
+        WHERE b.title LIKE ?{filters}
+    """
+
+    rows = conn.execute(f"""
+        SELECT b.id, b.title, c.category, s.subject
+        {base_query}
+        ORDER BY b.title
+        LIMIT ? OFFSET ?
+    """, params + [limit, offset]).fetchall()
+
+    total = conn.execute(f"SELECT COUNT(*) {base_query}", params).fetchone()[0]
+
+    return [dict(row) for row in rows], total
@@ -0,0 +1,236 @@
+# File: SuggestIndex.py
+# Path: AndyGoogle/Source/Core/SuggestIndex.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  05:58PM
+"""
+Description: In-memory prefix autocomplete over titles, authors, categories and subjects
+Every word start of every entry is kept in one sorted array, so a keystroke is two
+bisects plus a small top-k; prefixes that match too many entries to rank on the fly
+get their top-k precomputed when the index is built for a database generation
+"""
+
+import time
+import heapq
+import bisect
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple
+
+from Core.CatalogSnapshot import CatalogSnapshot
+
+KIND_NAMES = ('title', 'author', 'category', 'subject')
+OFFSET_BITS = 10                       # Word offsets past 1023 characters are not indexed
+OFFSET_MASK = (1 << OFFSET_BITS) - 1
+SCAN_LIMIT = 2048                      # Larger prefix ranges use precomputed top-k lists
+MAX_SUGGESTIONS = 20
+MAX_PRECOMPUTED_DEPTH = 24
+
+def NormalizeText(text: str) -> str:
+    """Case- and accent-insensitive form used for matching"""
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+def GetWordStarts(text: str) -> List[int]:
+    """Offsets where a word begins (the first alphanumeric after a non-alphanumeric)"""
+    starts = []
+    previous_alnum = False
+    for offset, char in enumerate(text):
+        is_alnum = char.isalnum()
+        if is_alnum and not previous_alnum and offset <= OFFSET_MASK:
+            starts.append(offset)
+        previous_alnum = is_alnum
+    return starts
+
+class SuggestIndex:
+    """Sorted word-suffix array with precomputed top-k for dense prefixes"""
+
+    def __init__(self, snapshot: CatalogSnapshot):
+        self.snapshot = snapshot
+        self.build_seconds = 0.0
+
+        # One entry per distinct (kind, text); weight is how many books it covers
+        self.texts: List[str] = []
+        self.normalized: List[str] = []
+        self.kinds = array('b')
+        self.weights = array('l')
+        self.book_ids = array('q')                     # First matching book for titles, -1 otherwise
+
+        # entry << OFFSET_BITS | word offset, sorted by the normalized suffix at that offset
+        self.refs = array('q')
+        self.top_by_prefix: Dict[str, List[int]] = {}
+
+    @classmethod
+    def Build(cls, snapshot: CatalogSnapshot) -> "SuggestIndex":
+        """Collect entries from a catalog snapshot and sort their word suffixes"""
+        start_time = time.perf_counter()
+        index = cls(snapshot)
+        index.CollectEntries()
+        index.SortSuffixes()
+        index.PrecomputeDensePrefixes()
+        index.build_seconds = time.perf_counter() - start_time
+        return index
+
+    def CollectEntries(self):
+        """Deduplicate titles, authors, categories and subjects into weighted entries"""
+        snapshot = self.snapshot
+        entries: Dict[Tuple[int, str], int] = {}
+
+        def add(kind: int, text: Optional[str], weight: int, book_id: int = -1):
+            if not text:
+                return
+            key = (kind, text)
+            entry = entries.get(key)
+            if entry is None:
+                entries[key] = len(self.texts)
+                self.texts.append(text)
+                self.normalized.append(NormalizeText(text))
+                self.kinds.append(kind)
+                self.weights.append(weight)
+                self.book_ids.append(book_id)
+            else:
+                self.weights[entry] += weight
+
+        for position, title in enumerate(snapshot.book_titles):
+            add(0, title, 1, snapshot.book_ids[position])
+        if snapshot.book_authors is not None:
+            for author in snapshot.book_authors:
+                add(1, author, 1)
+        for position, category in enumerate(snapshot.category_names):
+            add(2, category, snapshot.books_per_category.get(snapshot.category_ids[position], 0))
+        for position, subject in enumerate(snapshot.subject_names):
+            add(3, subject, snapshot.books_per_subject.get(snapshot.subject_ids[position], 0))
+
+    def SortSuffixes(self):
+        """Sort every (entry, word start) reference by the text from that word on"""
+        refs = [
+            (entry << OFFSET_BITS) | offset
+            for entry, text in enumerate(self.normalized)
+            for offset in GetWordStarts(text)
+        ]
+        normalized = self.normalized
+        refs.sort(key=lambda ref: normalized[ref >> OFFSET_BITS][ref & OFFSET_MASK:])
+        self.refs = array('q', refs)
+
+    def GetSuffix(self, ref: int) -> str:
+        """Normalized text from a reference's word start"""
+        return self.normalized[ref >> OFFSET_BITS][ref & OFFSET_MASK:]
+
+    def ScoreRef(self, ref: int) -> Tuple[bool, int, int]:
+        """Whole-entry prefix matches first, then the most books, then the shortest text"""
+        entry = ref >> OFFSET_BITS
+        return ((ref & OFFSET_MASK) == 0, self.weights[entry], -len(self.texts[entry]))
+
+    def RankRefs(self, refs, limit: int) -> List[int]:
+        """Best entries among some references, one reference per entry"""
+        best: Dict[int, int] = {}
+        for ref in refs:
+            entry = ref >> OFFSET_BITS
+            if entry not in best or (ref & OFFSET_MASK) == 0:
+                best[entry] = ref
+        return heapq.nlargest(limit, best.values(), key=self.ScoreRef)
+
+    def PrecomputeDensePrefixes(self):
+        """Store top-k for every prefix whose range is too large to rank per keystroke"""
+        dense_ranges = [(0, len(self.refs))]
+        for depth in range(1, MAX_PRECOMPUTED_DEPTH + 1):
+            next_ranges = []
+            for range_start, range_end in dense_ranges:
+                group_start = range_start
+                while group_start < range_end:
+                    suffix = self.GetSuffix(self.refs[group_start])
+                    if len(suffix) < depth:
+                        group_start += 1
+                        continue
+                    prefix = suffix[:depth]
+                    group_end = self.FindRange(prefix, group_start, range_end)[1]
+                    if group_end - group_start > SCAN_LIMIT:
+                        self.top_by_prefix[prefix] = self.RankRefs(
+                            self.refs[group_start:group_end], MAX_SUGGESTIONS
+                        )
+                        next_ranges.append((group_start, group_end))
+                    group_start = group_end
+            if not next_ranges:
+                break
+            dense_ranges = next_ranges
+
+    def FindRange(self, prefix: str, low: int = 0, high: Optional[int] = None) -> Tuple[int, int]:
+        """Reference range whose suffixes start with prefix"""
+        high = len(self.refs) if high is None else high
+        start = bisect.bisect_left(self.refs, prefix, low, high, key=self.GetSuffix)
+        end = bisect.bisect_left(self.refs, prefix + "\U0010ffff", start, high, key=self.GetSuffix)
+        return start, end
+
+    def Suggest(self, query: str, limit: int = 8) -> List[Dict[str, Any]]:
+        """Top completions for a (partial) query"""
+        prefix = NormalizeText(query)
+        limit = max(1, min(limit, MAX_SUGGESTIONS))
+        if not prefix:
+            return []
+
+        if prefix in self.top_by_prefix:
+            ranked = self.top_by_prefix[prefix][:limit]
+        else:
+            start, end = self.FindRange(prefix)
+            ranked = self.RankRefs(self.refs[start:min(end, start + SCAN_LIMIT)], limit)
+
+        suggestions = []
+        for ref in ranked:
+            entry = ref >> OFFSET_BITS
+            suggestions.append({
+                'text': self.texts[entry],
+                'kind': KIND_NAMES[self.kinds[entry]],
+                'book_id': self.book_ids[entry] if self.book_ids[entry] != -1 else None,
+                'count': self.weights[entry]
+            })
+        return suggestions
+
+    def GetInfo(self) -> Dict[str, Any]:
+        """Describe the index for diagnostics"""
+        return {
+            'entries': len(self.texts),
+            'word_refs': len(self.refs),
+            'precomputed_prefixes': len(self.top_by_prefix),
+            'build_seconds': round(self.build_seconds, 4)
+        }
+
+class SupersededRequestTracker:
+    """Latest keystroke sequence number per client session
+
+    A suggest request carrying an older sequence number than one already seen for its
+    session has been superseded by a later keystroke and can be answered empty.
+    """
+
+    def __init__(self, max_sessions: int = 4096):
+        self.max_sessions = max_sessions
+        self.latest: "OrderedDict[str, int]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.superseded_count = 0
+
+    def Begin(self, session: Optional[str], sequence: Optional[int]) -> bool:
+        """Record a request; False if a newer one from the same session was already seen"""
+        if not session or sequence is None:
+            return True
+        with self.lock:
+            latest = self.latest.get(session)
+            if latest is not None and sequence < latest:
+                self.superseded_count += 1
+                return False
+            self.latest[session] = sequence
+            self.latest.move_to_end(session)
+            while len(self.latest) > self.max_sessions:
+                self.latest.popitem(last=False)
+            return True
+
+    def IsCurrent(self, session: Optional[str], sequence: Optional[int]) -> bool:
+        """Whether a request is still the newest for its session"""
+        if not session or sequence is None:
+            return True
+        with self.lock:
+            current = self.latest.get(session, sequence) <= sequence
+            if not current:
+                self.superseded_count += 1
+            return current
@@ -0,0 +1,187 @@
+# File: SyncScheduler.py
+# Path: AndyGoogle/Source/Core/SyncScheduler.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  02:52PM
+"""
+Description: Background database sync scheduler for the AndyGoogle API process
+Runs jittered periodic version checks on the event loop, hands the blocking Drive work
+to a dedicated worker thread and coalesces concurrent sync requests into one job
+"""
+
+import asyncio
+import random
+import time
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional, Any
+
+class SyncScheduler:
+    """Own periodic update checks and the single in-flight sync job for a DriveManager"""
+
+    def __init__(self, drive_manager, version_check_interval_hours: float = 6,
+                 sync_interval_hours: float = 24, jitter_fraction: float = 0.1,
+                 initial_delay_seconds: float = 60, retry_delay_seconds: float = 300):
+        self.drive_manager = drive_manager
+        self.version_check_interval = version_check_interval_hours * 3600
+        self.sync_interval = sync_interval_hours * 3600
+        self.jitter_fraction = max(0.0, min(jitter_fraction, 0.5))
+        self.initial_delay_seconds = initial_delay_seconds
+        self.retry_delay_seconds = retry_delay_seconds
+
+        # One thread: Drive calls and file installs never overlap
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="andygoogle-sync")
+        self.loop_task: Optional[asyncio.Task] = None
+        self.job_task: Optional[asyncio.Task] = None
+        self.job_ids = itertools.count(1)
+
+        self.current_job: Optional[Dict[str, Any]] = None
+        self.last_job: Optional[Dict[str, Any]] = None
+        self.consecutive_failures = 0
+        self.last_check: Optional[Dict[str, Any]] = None
+        self.next_check_at: Optional[float] = None
+
+    async def Start(self):
+        """Start the periodic check loop on the running event loop"""
+        if self.loop_task:
+            return
+        self.loop_task = asyncio.create_task(self.RunLoop())
+
+    async def Stop(self, timeout: float = 30.0):
+        """Stop scheduling and give a running sync a chance to finish"""
+        if self.loop_task:
+            self.loop_task.cancel()
+            try:
+                await self.loop_task
+            except asyncio.CancelledError:
+                pass
+            self.loop_task = None
+
+        if self.job_task and not self.job_task.done():
+            # The worker thread cannot be interrupted; a sync writes to temp files until install
+            try:
+                await asyncio.wait_for(asyncio.shield(self.job_task), timeout)
+            except asyncio.TimeoutError:
+                print("⚠️ Database sync still running at shutdown - abandoning it")
+
+        self.executor.shutdown(wait=False)
+
+    def GetJitteredDelay(self, interval: float) -> float:
+        """Spread checks out so many clients do not hit Drive in lockstep"""
+        return interval * (1 + random.uniform(-self.jitter_fraction, self.jitter_fraction))
+
+    def GetNextDelay(self) -> float:
+        """Regular interval after success, capped exponential backoff after failures"""
+        if self.consecutive_failures:
+            backoff = self.retry_delay_seconds * (2 ** (self.consecutive_failures - 1))
+            return self.GetJitteredDelay(min(backoff, self.version_check_interval))
+        return self.GetJitteredDelay(self.version_check_interval)
+
+    async def RunLoop(self):
+        """Periodically check Drive for a newer database and sync when needed"""
+        delay = self.GetJitteredDelay(self.initial_delay_seconds)
+        while True:
+            self.next_check_at = time.time() + delay
+            await asyncio.sleep(delay)
+
+            try:
+                await self.RunScheduledCheck()
+            except Exception as e:
+                print(f"⚠️ Scheduled sync check failed: {e}")
+                self.consecutive_failures += 1
+
+            delay = self.GetNextDelay()
+
+    async def RunScheduledCheck(self):
+        """One scheduled pass: version check, then sync if an update or the sync interval is due"""
+        loop = asyncio.get_running_loop()
+        update_info = await loop.run_in_executor(self.executor, self.drive_manager.CheckForUpdates)
+
+        self.last_check = {
+            'checked_at': datetime.now().isoformat(),
+            'update_available': update_info.get('update_available', False),
+            'local_version': update_info.get('local_version'),
+            'remote_version': update_info.get('remote_version'),
+            'offline_mode': update_info.get('offline_mode', False)
+        }
+
+        if update_info.get('offline_mode'):
+            self.consecutive_failures += 1
+            return
+
+        self.consecutive_failures = 0
+        if not self.drive_manager.auto_sync_enabled:
+            return
+
+        if update_info.get('update_available'):
+            await self.RequestSync(force=True, trigger='update_available')
+        elif self.IsSyncDue():
+            await self.RequestSync(force=False, trigger='interval')
+
+    def IsSyncDue(self) -> bool:
+        """Check whether the last successful sync is older than the sync interval"""
+        last_sync = self.drive_manager.GetLocalVersionInfo().get('last_sync')
+        if not last_sync:
+            return True
+        try:
+            elapsed = (datetime.now() - datetime.fromisoformat(last_sync)).total_seconds()
+        except ValueError:
+            return True
+        return elapsed >= self.sync_interval
+
+    async def RequestSync(self, force: bool = True, trigger: str = 'manual') -> Dict[str, Any]:
+        """Start a sync, or join the one already in flight (single-flight)"""
+        if self.current_job:
+            self.current_job['coalesced_requests'] += 1
+            return dict(self.current_job)
+
+        self.current_job = {
+            'job_id': next(self.job_ids),
+            'state': 'running',
+            'trigger': trigger,
+            'force': force,
+            'requested_at': datetime.now().isoformat(),
+            'finished_at': None,
+            'duration_seconds': None,
+            'coalesced_requests': 0,
+            'error': None
+        }
+        self.job_task = asyncio.create_task(self.RunSyncJob(self.current_job, force))
+        return dict(self.current_job)
+
+    async def RunSyncJob(self, job: Dict[str, Any], force: bool):
+        """Run DriveManager.SyncDatabaseFromDrive on the worker thread and record the outcome"""
+        loop = asyncio.get_running_loop()
+        start_time = time.monotonic()
+
+        try:
+            succeeded = await loop.run_in_executor(self.executor, self.drive_manager.SyncDatabaseFromDrive, force)
+            job['state'] = 'succeeded' if succeeded else 'failed'
+            if not succeeded:
+                job['error'] = 'Sync did not complete - see server log'
+        except Exception as e:
+            job['state'] = 'failed'
+            job['error'] = str(e)
+        finally:
+            job['finished_at'] = datetime.now().isoformat()
+            job['duration_seconds'] = round(time.monotonic() - start_time, 3)
+            self.last_job = job
+            self.current_job = None
+
+    async def WaitForJob(self) -> Optional[Dict[str, Any]]:
+        """Wait for the in-flight job (if any) and return the most recent job record"""
+        if self.job_task and not self.job_task.done():
+            await asyncio.shield(self.job_task)
+        return dict(self.last_job) if self.last_job else None
+
+    def GetStatus(self) -> Dict[str, Any]:
+        """Scheduler and job state for /api/sync/status"""
+        return {
+            'scheduler_running': bool(self.loop_task and not self.loop_task.done()),
+            'current_job': dict(self.current_job) if self.current_job else None,
+            'last_job': dict(self.last_job) if self.last_job else None,
+            'last_check': self.last_check,
+            'next_check_at': datetime.fromtimestamp(self.next_check_at).isoformat() if self.next_check_at else None,
+            'consecutive_failures': self.consecutive_failures
+        }
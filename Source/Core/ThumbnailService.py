@@ -0,0 +1,242 @@
+# File: ThumbnailService.py
+# Path: AndyGoogle/Source/Core/ThumbnailService.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-19  03:41AM
+"""
+Description: Book cover thumbnails rendered off the event loop and cached on disk
+First pages (or thumbnails embedded in the database) are rendered in a process pool
+into every configured width at once, stored content-addressed under the cache
+directory, and looked up through small per-source pointer files afterwards
+"""
+
+import io
+import os
+import asyncio
+import hashlib
+import tempfile
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+try:
+    import fitz   # PyMuPDF
+except ImportError:
+    fitz = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+DEFAULT_SIZES = (120, 240, 480)     # Widths in pixels
+JPEG_QUALITY = 82
+MAX_RECORDED_FAILURES = 1024
+
+class ThumbnailUnavailable(Exception):
+    """No thumbnail can be produced for this source"""
+
+def RenderThumbnails(pdf_path: Optional[str], image_bytes: Optional[bytes],
+                     sizes: Iterable[int], quality: int = JPEG_QUALITY) -> Dict[int, bytes]:
+    """Render one source into JPEG thumbnails of each width (runs in a worker process)"""
+    if Image is None:
+        raise ThumbnailUnavailable("Pillow is not installed")
+
+    sizes = sorted(sizes)
+    if image_bytes is not None:
+        try:
+            image = Image.open(io.BytesIO(image_bytes))
+            image.load()
+        except (OSError, Image.DecompressionBombError) as e:   # Includes UnidentifiedImageError
+            raise ThumbnailUnavailable(f"Could not decode embedded thumbnail: {e}")
+    else:
+        if fitz is None:
+            raise ThumbnailUnavailable("PyMuPDF is not installed")
+        try:
+            with fitz.open(pdf_path) as document:
+                if document.page_count == 0:
+                    raise ThumbnailUnavailable("Document has no pages")
+                page = document.load_page(0)
+                scale = sizes[-1] / page.rect.width
+                pixmap = page.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False)
+                image = Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+        except (RuntimeError, ValueError) as e:   # fitz raises these for damaged or encrypted files
+            raise ThumbnailUnavailable(f"Could not render first page: {e}")
+
+    image = image.convert("RGB")
+    rendered = {}
+    for width in sizes:
+        thumbnail = image.copy()
+        thumbnail.thumbnail((width, width * 2), Image.LANCZOS)
+        buffer = io.BytesIO()
+        thumbnail.save(buffer, "JPEG", quality=quality, optimize=True, progressive=True)
+        rendered[width] = buffer.getvalue()
+    return rendered
+
+class ThumbnailService:
+    """Content-addressed thumbnail cache with single-flight background rendering"""
+
+    def __init__(self, cache_directory: str, sizes: Iterable[int] = DEFAULT_SIZES,
+                 max_workers: int = 2, executor: Optional[Executor] = None,
+                 renderer: Callable[..., Dict[int, bytes]] = RenderThumbnails):
+        self.cache_directory = cache_directory
+        self.objects_directory = os.path.join(cache_directory, "objects")
+        self.index_directory = os.path.join(cache_directory, "index")
+        self.sizes = tuple(sorted(set(sizes)))
+        self.max_workers = max_workers
+        self.executor = executor
+        self.owns_executor = executor is None
+        self.renderer = renderer
+
+        # Renders in progress and sources known to be unrenderable, by source key
+        self.in_flight: Dict[str, asyncio.Future] = {}
+        self.failures: Dict[str, str] = {}
+
+        self.hits = 0
+        self.renders = 0
+        self.render_errors = 0
+
+        os.makedirs(self.objects_directory, exist_ok=True)
+        os.makedirs(self.index_directory, exist_ok=True)
+
+    def GetExecutor(self) -> Executor:
+        """Worker pool, started on first cold render"""
+        if self.executor is None:
+            # spawn: the API process has running threads, which fork would copy mid-state
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self.executor
+
+    @staticmethod
+    def GetSourceKey(pdf_path: Optional[str] = None, image_bytes: Optional[bytes] = None) -> str:
+        """Identify a source cheaply: embedded image by content, file by path, size and mtime"""
+        if image_bytes is not None:
+            return "blob-" + hashlib.sha256(image_bytes).hexdigest()
+        stat = os.stat(pdf_path)
+        fingerprint = f"{os.path.realpath(pdf_path)}\0{stat.st_size}\0{stat.st_mtime_ns}"
+        return "file-" + hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()
+
+    def PickSize(self, requested: int) -> int:
+        """Smallest configured width that covers the requested one"""
+        for size in self.sizes:
+            if size >= requested:
+                return size
+        return self.sizes[-1]
+
+    def GetObjectPath(self, digest: str) -> str:
+        """Where a thumbnail with this content hash is stored"""
+        return os.path.join(self.objects_directory, digest[:2], f"{digest}.jpg")
+
+    def GetIndexPath(self, source_key: str, size: int) -> str:
+        """Pointer file mapping (source, width) to a content hash"""
+        return os.path.join(self.index_directory, f"{source_key}_{size}")
+
+    def LookupCached(self, source_key: str, size: int) -> Optional[Tuple[str, str]]:
+        """(path, content hash) of an already rendered thumbnail"""
+        try:
+            with open(self.GetIndexPath(source_key, size), 'r') as f:
+                digest = f.read().strip()
+        except OSError:
+            return None
+        object_path = self.GetObjectPath(digest)
+        return (object_path, digest) if os.path.exists(object_path) else None
+
+    @staticmethod
+    def WriteAtomically(path: str, data: bytes):
+        """Write via a temp file and rename so readers never see partial files"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def Store(self, source_key: str, rendered: Dict[int, bytes]) -> Dict[int, Tuple[str, str]]:
+        """Write rendered thumbnails (deduplicated by content) and their pointer files"""
+        stored = {}
+        for size, data in rendered.items():
+            digest = hashlib.sha256(data).hexdigest()
+            object_path = self.GetObjectPath(digest)
+            if not os.path.exists(object_path):
+                self.WriteAtomically(object_path, data)
+            self.WriteAtomically(self.GetIndexPath(source_key, size), digest.encode('ascii'))
+            stored[size] = (object_path, digest)
+        return stored
+
+    async def RenderAndStore(self, source_key: str, pdf_path: Optional[str],
+                             image_bytes: Optional[bytes]) -> Dict[int, Tuple[str, str]]:
+        """Render every size in the worker pool, then write them from a thread"""
+        loop = asyncio.get_running_loop()
+        try:
+            rendered = await loop.run_in_executor(
+                self.GetExecutor(), self.renderer, pdf_path, image_bytes, self.sizes, JPEG_QUALITY
+            )
+            self.renders += 1
+            return await loop.run_in_executor(None, self.Store, source_key, rendered)
+        except ThumbnailUnavailable as e:
+            self.render_errors += 1
+            if len(self.failures) >= MAX_RECORDED_FAILURES:
+                self.failures.pop(next(iter(self.failures)))
+            self.failures[source_key] = str(e)
+            raise
+        finally:
+            self.in_flight.pop(source_key, None)
+
+    def LocateCached(self, size: int, pdf_path: Optional[str],
+                     image_bytes: Optional[bytes]) -> Tuple[str, Optional[Tuple[str, str]]]:
+        """(source key, cached thumbnail or None); stats or hashes the source and reads the pointer file"""
+        source_key = self.GetSourceKey(pdf_path, image_bytes)
+        return source_key, self.LookupCached(source_key, size)
+
+    def FindCached(self, size: int, pdf_path: Optional[str] = None,
+                   image_bytes: Optional[bytes] = None) -> Optional[Tuple[str, str]]:
+        """(path, content hash) if this thumbnail is already rendered - never renders, but blocks on disk"""
+        _, cached = self.LocateCached(self.PickSize(size), pdf_path, image_bytes)
+        if cached:
+            self.hits += 1
+        return cached
+
+    async def GetThumbnail(self, size: int, pdf_path: Optional[str] = None,
+                           image_bytes: Optional[bytes] = None) -> Tuple[str, str]:
+        """(path, content hash) of a thumbnail, rendering it on first request"""
+        size = self.PickSize(size)
+        loop = asyncio.get_running_loop()
+        source_key, cached = await loop.run_in_executor(None, self.LocateCached, size, pdf_path, image_bytes)
+
+        if cached:
+            self.hits += 1
+            return cached
+
+        if source_key in self.failures:
+            raise ThumbnailUnavailable(self.failures[source_key])
+
+        # Concurrent requests for the same book share one render
+        task = self.in_flight.get(source_key)
+        if task is None:
+            task = asyncio.ensure_future(self.RenderAndStore(source_key, pdf_path, image_bytes))
+            self.in_flight[source_key] = task
+        stored = await asyncio.shield(task)
+        return stored[size]
+
+    def Close(self):
+        """Stop the worker pool"""
+        if self.executor is not None and self.owns_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def GetStats(self) -> Dict[str, int]:
+        """Cache and render counters"""
+        return {
+            'hits': self.hits,
+            'renders': self.renders,
+            'render_errors': self.render_errors,
+            'in_flight': len(self.in_flight),
+            'known_failures': len(self.failures),
+            'sizes': list(self.sizes)
+        }
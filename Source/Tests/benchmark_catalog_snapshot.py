@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# File: benchmark_catalog_snapshot.py
+# Path: AndyGoogle/Source/Tests/benchmark_catalog_snapshot.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  03:33PM
+"""
+Description: Build time, memory footprint and lookup latency of the in-memory catalog
+Reports the snapshot size for a synthetic library of the requested size (100k books
+by default) and compares list/stats lookups against the equivalent SQL queries
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Core.CatalogSnapshot import CatalogSnapshot
+from benchmark_database_pool import build_sample_database
+
+def time_call(function, repeats):
+    """Average latency (µs) of a call"""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) * 1e6 / repeats
+
+def main():
+    """Build a snapshot for a synthetic library and report its cost"""
+    parser = argparse.ArgumentParser(description="Catalog snapshot benchmark")
+    parser.add_argument('--books', type=int, default=100000)
+    parser.add_argument('--repeats', type=int, default=2000)
+    args = parser.parse_args()
+
+    print("🧪 Catalog snapshot benchmark")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "benchmark_library.db")
+        build_sample_database(db_path, args.books)
+
+        tracemalloc.start()
+        snapshot = CatalogSnapshot.Build(db_path)
+        traced_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        estimate = snapshot.GetMemoryEstimate()
+        print(f"Books:                  {estimate['books']}")
+        print(f"Build time:             {snapshot.build_seconds * 1000:.1f} ms")
+        print(f"Estimated size:         {estimate['total_bytes'] / 1024 / 1024:.1f} MB "
+              f"({estimate['bytes_per_book']} bytes/book)")
+        print(f"Traced allocations:     {traced_bytes / 1024 / 1024:.1f} MB")
+        print(f"Projected per 100k:     {estimate['estimated_mb_per_100k_books']} MB")
+
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+
+        checks = [
+            ("categories",
+             lambda: [dict(row) for row in conn.execute("SELECT id, category FROM categories ORDER BY category")],
+             snapshot.GetCategories),
+            ("subjects (one category)",
+             lambda: [dict(row) for row in conn.execute(
+                 "SELECT id, subject, category_id FROM subjects WHERE category_id = ? ORDER BY subject", (1,))],
+             lambda: snapshot.GetSubjects(1)),
+            ("stats",
+             lambda: [conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                      for table in ('books', 'categories', 'subjects')],
+             snapshot.GetStats)
+        ]
+
+        print(f"\n{'lookup':<24} {'sql (µs)':>10} {'snapshot (µs)':>14}")
+        for name, sql_call, snapshot_call in checks:
+            print(f"{name:<24} {time_call(sql_call, args.repeats):>10.1f} "
+                  f"{time_call(snapshot_call, args.repeats):>14.2f}")
+
+        conn.close()
+
+if __name__ == "__main__":
+    main()
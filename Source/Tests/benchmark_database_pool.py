@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# File: benchmark_database_pool.py
+# Path: AndyGoogle/Source/Tests/benchmark_database_pool.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  09:41AM
+"""
+Description: Latency benchmark for the pooled SQLite dependency versus connect-per-request
+Runs the /api/books page query from concurrent threads and reports p50/p99 per strategy
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import tempfile
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Core.DatabasePool import DatabasePool
+
+BOOKS_QUERY = "SELECT b.id, b.title FROM books b ORDER BY b.title LIMIT ? OFFSET ?"
+
+def build_sample_database(path, book_count=50000):
+    """Create a library database shaped like cached_library.db"""
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE categories (id INTEGER PRIMARY KEY, category TEXT NOT NULL UNIQUE);
+        CREATE TABLE subjects (id INTEGER PRIMARY KEY, category_id INTEGER, subject TEXT NOT NULL);
+        CREATE TABLE books (id INTEGER PRIMARY KEY, title TEXT NOT NULL, category_id INTEGER, subject_id INTEGER);
+        CREATE INDEX idx_books_title ON books (title);
+    """)
+    conn.executemany("INSERT INTO categories VALUES (?, ?)", [(i, f"Category {i}") for i in range(1, 27)])
+    conn.executemany("INSERT INTO subjects VALUES (?, ?, ?)", [(i, i % 26 + 1, f"Subject {i}") for i in range(1, 119)])
+    conn.executemany(
+        "INSERT INTO books VALUES (?, ?, ?, ?)",
+        [(i, f"Book Title {i * 7919 % book_count:07d}", i % 26 + 1, i % 118 + 1) for i in range(1, book_count + 1)]
+    )
+    conn.commit()
+    conn.close()
+
+def connect_per_request(db_path):
+    """Replicates the original get_database dependency"""
+    def run(offset):
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            return conn.execute(BOOKS_QUERY, (50, offset)).fetchall()
+        finally:
+            conn.close()
+    return run
+
+def pooled(pool):
+    """Pooled dependency as used by MainAPI.get_database"""
+    def run(offset):
+        conn = pool.Acquire()
+        try:
+            return conn.execute(BOOKS_QUERY, (50, offset)).fetchall()
+        finally:
+            pool.Release(conn)
+    return run
+
+def measure(strategy, requests, concurrency):
+    """Run the strategy from a thread pool and collect per-request latencies (ms)"""
+    def timed(offset):
+        start = time.perf_counter()
+        strategy(offset)
+        return (time.perf_counter() - start) * 1000
+
+    offsets = [(i * 50) % 2000 for i in range(requests)]
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = sorted(executor.map(timed, offsets))
+
+    return {
+        'p50': statistics.median(latencies),
+        'p99': latencies[int(len(latencies) * 0.99) - 1],
+        'mean': statistics.fmean(latencies)
+    }
+
+def main():
+    """Compare connect-per-request against the pool under concurrent load"""
+    parser = argparse.ArgumentParser(description="DatabasePool latency benchmark")
+    parser.add_argument('--books', type=int, default=50000)
+    parser.add_argument('--requests', type=int, default=4000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--pool-size', type=int, default=4)
+    args = parser.parse_args()
+
+    print("🧪 DatabasePool benchmark")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "benchmark_library.db")
+        build_sample_database(db_path, args.books)
+
+        pool = DatabasePool(db_path, pool_size=args.pool_size, immutable=True)
+        strategies = [
+            ("connect-per-request", connect_per_request(db_path)),
+            (f"pool (size={args.pool_size})", pooled(pool))
+        ]
+
+        for name, strategy in strategies:
+            strategy(0)  # Warm up the OS page cache for both strategies
+            result = measure(strategy, args.requests, args.concurrency)
+            print(f"{name:<24} p50={result['p50']:.3f}ms  p99={result['p99']:.3f}ms  mean={result['mean']:.3f}ms")
+
+        pool.Close()
+        print(f"Pool stats: {pool.GetStats()}")
+
+if __name__ == "__main__":
+    main()
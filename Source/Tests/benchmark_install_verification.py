@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# File: benchmark_install_verification.py
+# Path: AndyGoogle/Source/Tests/benchmark_install_verification.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  12:52AM
+"""
+Description: Install-time benchmark for manifest-driven verification versus the old post-hoc passes
+Both pipelines stream the "download" from a local file with the MD5 computed on the way;
+the old one then runs integrity_check, re-hashes the file in 4 KB reads and counts books,
+the new one runs quick_check plus a schema check against the published manifest
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import hashlib
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Core.DatabaseManifest import BuildManifest, VerifyDatabase
+
+def build_sample_database(path, book_count):
+    """Create a library database with indexed text columns, like cached_library.db"""
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE categories (id INTEGER PRIMARY KEY, category TEXT NOT NULL UNIQUE);
+        CREATE TABLE subjects (id INTEGER PRIMARY KEY, category_id INTEGER, subject TEXT NOT NULL);
+        CREATE TABLE books (id INTEGER PRIMARY KEY, title TEXT NOT NULL, author TEXT, category_id INTEGER,
+                            subject_id INTEGER, description TEXT);
+        CREATE INDEX idx_books_title ON books (title);
+        CREATE INDEX idx_books_author ON books (author);
+        CREATE INDEX idx_books_category ON books (category_id, subject_id);
+    """)
+    conn.executemany("INSERT INTO categories VALUES (?, ?)", [(i, f"Category {i}") for i in range(1, 27)])
+    conn.executemany("INSERT INTO subjects VALUES (?, ?, ?)", [(i, i % 26 + 1, f"Subject {i}") for i in range(1, 119)])
+    conn.executemany(
+        "INSERT INTO books VALUES (?, ?, ?, ?, ?, ?)",
+        [(i, f"Book Title {i * 7919 % book_count:07d}", f"Author {i % 5003}", i % 26 + 1, i % 118 + 1,
+          f"Description of book {i} " * 8) for i in range(1, book_count + 1)]
+    )
+    conn.commit()
+    conn.close()
+
+def stream_download(source_path, target_path):
+    """Stand-in for the downloaders: copy in 8 MB chunks, hashing as the bytes arrive"""
+    md5 = hashlib.md5()
+    with open(source_path, 'rb') as source, open(target_path, 'wb') as target:
+        for chunk in iter(lambda: source.read(8 * 1024 * 1024), b""):
+            md5.update(chunk)
+            target.write(chunk)
+    return md5.hexdigest()
+
+def old_pipeline(path):
+    """integrity_check + required tables, then a 4 KB re-hash, then a fresh connection to count"""
+    conn = sqlite3.connect(path)
+    assert conn.execute("PRAGMA integrity_check").fetchone()[0] == 'ok'
+    tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+    assert all(table in tables for table in ('books', 'categories', 'subjects'))
+    conn.close()
+
+    md5 = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(4096), b""):
+            md5.update(chunk)
+
+    conn = sqlite3.connect(path)
+    count = conn.execute("SELECT COUNT(*) FROM books WHERE 1=1").fetchone()[0]
+    conn.close()
+    return count
+
+def new_pipeline(path, manifest):
+    """quick_check plus schema verification; the count comes from the manifest"""
+    verification = VerifyDatabase(path, manifest)
+    assert verification['ok'], verification['problems']
+    return verification['record_count']
+
+def measure(source_path, target_path, pipeline, rounds):
+    """Best-of-rounds wall time for download + verification"""
+    best = None
+    for _ in range(rounds):
+        if os.path.exists(target_path):
+            os.remove(target_path)
+        started = time.perf_counter()
+        stream_download(source_path, target_path)
+        download_seconds = time.perf_counter() - started
+        pipeline(target_path)
+        total = time.perf_counter() - started
+        if best is None or total < best[0]:
+            best = (total, download_seconds)
+    return best
+
+def main():
+    """Compare install verification pipelines on a generated library database"""
+    parser = argparse.ArgumentParser(description="Install verification benchmark")
+    parser.add_argument('--books', type=int, default=200000)
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    print("🧪 Install verification benchmark")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        published = os.path.join(temp_dir, "published.db")
+        build_sample_database(published, args.books)
+        manifest = BuildManifest(published)
+        installed = os.path.join(temp_dir, "installed.db")
+        print(f"Database: {os.path.getsize(published) / 1024 / 1024:.1f} MB, {manifest['record_count']} books")
+
+        results = {}
+        for name, pipeline in (("old (integrity_check + rehash + count)", old_pipeline),
+                               ("new (quick_check + manifest)", lambda path: new_pipeline(path, manifest))):
+            total, download = measure(published, installed, pipeline, args.rounds)
+            results[name] = total
+            print(f"{name:<40} total={total:.3f}s  download={download:.3f}s  verify={total - download:.3f}s")
+
+        old_total, new_total = results.values()
+        print(f"Install time reduced by {(1 - new_total / old_total) * 100:.0f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# File: benchmark_json_serialization.py
+# Path: AndyGoogle/Source/Tests/benchmark_json_serialization.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  04:34PM
+"""
+Description: Rows/sec microbenchmark for /api/books response serialization
+Compares the pydantic path (one BookResponse per row, then dump and json.dumps, as
+FastAPI does with a response_model) against the FastJSON byte encoders
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import tempfile
+from typing import Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from API.FastJSON import EncodeRows, RowsToDicts, STDLIB_ENCODER, orjson
+from benchmark_database_pool import build_sample_database
+
+try:
+    from pydantic import BaseModel
+except ImportError:
+    BaseModel = None
+
+BOOKS_QUERY = """
+    SELECT b.id, b.title,
+           NULL as author, c.category, s.subject,
+           NULL as file_path, NULL as file_size,
+           NULL as page_count, NULL as rating,
+           NULL as last_opened
+    FROM books b
+    LEFT JOIN categories c ON b.category_id = c.id
+    LEFT JOIN subjects s ON b.subject_id = s.id
+    ORDER BY b.title, b.id LIMIT ?
+"""
+
+if BaseModel:
+    class BookResponse(BaseModel):
+        id: int
+        title: str
+        author: Optional[str] = None
+        category: Optional[str] = None
+        subject: Optional[str] = None
+        file_path: Optional[str] = None
+        file_size: Optional[int] = None
+        page_count: Optional[int] = None
+        rating: Optional[int] = None
+        last_opened: Optional[str] = None
+
+def pydantic_path(rows):
+    """Per-row model construction, then FastAPI-style validation and serialization"""
+    books = [BookResponse(**dict(row)) for row in rows]
+    return json.dumps([book.model_dump(mode='json') for book in books]).encode('utf-8')
+
+def stdlib_fast_path(rows):
+    """FastJSON encoding with the reusable stdlib encoder"""
+    fields = rows[0].keys() if rows else []
+    return STDLIB_ENCODER.encode(RowsToDicts(rows, fields)).encode('utf-8')
+
+def fast_path(rows):
+    """FastJSON default encoding (orjson when installed)"""
+    return EncodeRows(rows, rows[0].keys() if rows else [])
+
+def rows_per_second(encoder, rows, repeats):
+    """Best-of-N rows/sec for one encoder"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        encoder(rows)
+        best = min(best, time.perf_counter() - start)
+    return len(rows) / best
+
+def main():
+    """Compare serialization throughput at typical response sizes"""
+    parser = argparse.ArgumentParser(description="JSON serialization benchmark")
+    parser.add_argument('--repeats', type=int, default=20)
+    args = parser.parse_args()
+
+    print("🧪 JSON serialization benchmark")
+    print("=" * 60)
+
+    encoders = []
+    if BaseModel:
+        encoders.append(("pydantic (current)", pydantic_path))
+    else:
+        print("ℹ️ pydantic not installed - skipping the current-path baseline")
+    encoders.append(("fast: stdlib json", stdlib_fast_path))
+    if orjson:
+        encoders.append(("fast: orjson", fast_path))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "benchmark_library.db")
+        build_sample_database(db_path, 10000)
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+
+        print(f"{'rows':>6} " + " ".join(f"{name:>20}" for name, _ in encoders) + "   (rows/sec)")
+        for row_count in (50, 500, 5000):
+            rows = conn.execute(BOOKS_QUERY, (row_count,)).fetchall()
+            results = [rows_per_second(encoder, rows, args.repeats) for _, encoder in encoders]
+            print(f"{row_count:>6} " + " ".join(f"{rate:>20,.0f}" for rate in results))
+
+        # All paths must produce the same document
+        rows = conn.execute(BOOKS_QUERY, (50,)).fetchall()
+        documents = [json.loads(encoder(rows)) for _, encoder in encoders]
+        assert all(document == documents[0] for document in documents), "encoders disagree"
+
+        conn.close()
+
+if __name__ == "__main__":
+    main()
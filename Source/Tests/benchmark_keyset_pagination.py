@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# File: benchmark_keyset_pagination.py
+# Path: AndyGoogle/Source/Tests/benchmark_keyset_pagination.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  10:55AM
+"""
+Description: Deep-page latency benchmark for /api/books pagination strategies
+Compares LIMIT/OFFSET against cursor seeks at increasing page depths to show that
+keyset pagination stays flat while OFFSET cost grows with the page number
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import tempfile
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Core.Pagination import BuildSeekClause, EncodeCursor
+from benchmark_database_pool import build_sample_database
+
+PAGE_SIZE = 50
+
+OFFSET_QUERY = "SELECT b.id, b.title FROM books b WHERE 1=1 ORDER BY b.title, b.id LIMIT ? OFFSET ?"
+
+def time_query(conn, query, params, repeats):
+    """Median latency (ms) of a query"""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        conn.execute(query, params).fetchall()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def main():
+    """Measure page latency at increasing depths for OFFSET and cursor pagination"""
+    parser = argparse.ArgumentParser(description="Keyset pagination benchmark")
+    parser.add_argument('--books', type=int, default=200000)
+    parser.add_argument('--repeats', type=int, default=20)
+    args = parser.parse_args()
+
+    print("🧪 Keyset pagination benchmark")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "benchmark_library.db")
+        build_sample_database(db_path, args.books)
+
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+
+        # Sort keys in page order so each depth gets the cursor a client would hold
+        sort_keys = conn.execute("SELECT title, id FROM books ORDER BY title, id").fetchall()
+
+        last_page = args.books // PAGE_SIZE - 1
+        depths = [page for page in (1, 10, 100, 1000, 2000, 4000) if page <= last_page]
+
+        print(f"{'page':>6} {'offset (ms)':>12} {'cursor (ms)':>12}")
+        for page in depths:
+            offset = page * PAGE_SIZE
+            offset_ms = time_query(conn, OFFSET_QUERY, (PAGE_SIZE, offset), args.repeats)
+
+            previous = sort_keys[offset - 1]
+            params = []
+            seek_query = ("SELECT b.id, b.title FROM books b WHERE 1=1"
+                          + BuildSeekClause(EncodeCursor(previous['title'], previous['id']), params)
+                          + " ORDER BY b.title, b.id LIMIT ?")
+            params.append(PAGE_SIZE)
+            cursor_ms = time_query(conn, seek_query, params, args.repeats)
+
+            print(f"{page:>6} {offset_ms:>12.3f} {cursor_ms:>12.3f}")
+
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# File: benchmark_parallel_download.py
+# Path: AndyGoogle/Source/Tests/benchmark_parallel_download.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  09:14PM
+"""
+Description: Database download throughput, one stream versus parallel byte ranges
+Serves a payload from a local Range-capable stand-in that adds a fixed delay before
+every response and caps each connection's bandwidth, roughly what a single Drive
+media stream looks like over a high-latency link
+"""
+
+import os
+import sys
+import time
+import hashlib
+import argparse
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from API.ChunkedDownloader import ChunkedDownloader
+from API.ParallelDownloader import ParallelDownloader
+
+SEND_BLOCK_SIZE = 64 * 1024
+
+class SlowRangeHandler(BaseHTTPRequestHandler):
+    """Range-capable media endpoint with per-request latency and a per-stream rate cap"""
+    payload = b""
+    latency_seconds = 0.0
+    stream_bytes_per_second = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(self.latency_seconds)
+        size = len(self.payload)
+        start, end = 0, size - 1
+        range_header = self.headers.get('Range')
+        if range_header:
+            start_text, end_text = range_header.replace('bytes=', '').split('-')
+            start = int(start_text)
+            end = min(int(end_text), size - 1) if end_text else size - 1
+            self.send_response(206)
+            self.send_header('Content-Range', f"bytes {start}-{end}/{size}")
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', str(end - start + 1))
+        self.end_headers()
+
+        began = time.perf_counter()
+        sent = 0
+        view = memoryview(self.payload)
+        for offset in range(start, end + 1, SEND_BLOCK_SIZE):
+            block = view[offset:min(offset + SEND_BLOCK_SIZE, end + 1)]
+            self.wfile.write(block)
+            sent += len(block)
+            if self.stream_bytes_per_second:
+                ahead = sent / self.stream_bytes_per_second - (time.perf_counter() - began)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+def start_server(payload: bytes, latency_seconds: float, stream_bytes_per_second: int):
+    """Start the stand-in on a free port"""
+    SlowRangeHandler.payload = payload
+    SlowRangeHandler.latency_seconds = latency_seconds
+    SlowRangeHandler.stream_bytes_per_second = stream_bytes_per_second
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowRangeHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/drive/v3/files/bench?alt=media"
+
+def time_download(downloader, target: str, size: int, md5: str) -> float:
+    """Seconds for one verified download"""
+    began = time.perf_counter()
+    result = downloader.Download(target, source_key="bench", expected_size=size, expected_md5=md5)
+    elapsed = time.perf_counter() - began
+    assert result['md5'] == md5
+    os.remove(target)
+    return elapsed
+
+def main():
+    """Compare sequential and parallel downloads of one database-sized payload"""
+    parser = argparse.ArgumentParser(description="Parallel range download benchmark")
+    parser.add_argument('--size-mb', type=int, default=64)
+    parser.add_argument('--part-mb', type=int, default=4)
+    parser.add_argument('--latency-ms', type=float, default=80.0)
+    parser.add_argument('--stream-mbps', type=float, default=16.0, help="per-connection cap, MB/s")
+    parser.add_argument('--connections', type=int, nargs='+', default=[2, 4, 8])
+    args = parser.parse_args()
+
+    size = args.size_mb * 1024 * 1024
+    part_size = args.part_mb * 1024 * 1024
+    payload = os.urandom(size)
+    md5 = hashlib.md5(payload).hexdigest()
+
+    print("🧪 Parallel range download benchmark")
+    print(f"   {args.size_mb} MB payload, {args.part_mb} MB ranges, "
+          f"{args.latency_ms:.0f} ms per request, {args.stream_mbps:.0f} MB/s per connection")
+    print("=" * 60)
+
+    server, url = start_server(payload, args.latency_ms / 1000, int(args.stream_mbps * 1024 * 1024))
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = os.path.join(temp_dir, "library.db.tmp")
+
+            baseline = time_download(ChunkedDownloader(url, chunk_size=part_size), target, size, md5)
+            print(f"{'sequential (ChunkedDownloader)':<34} {baseline:>7.2f} s {size / baseline / 1e6:>8.1f} MB/s")
+
+            for connections in args.connections:
+                downloader = ParallelDownloader(url, part_size=part_size, max_connections=connections)
+                elapsed = time_download(downloader, target, size, md5)
+                print(f"{f'parallel x{connections}':<34} {elapsed:>7.2f} s {size / elapsed / 1e6:>8.1f} MB/s"
+                      f"   ({baseline / elapsed:.1f}x)")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
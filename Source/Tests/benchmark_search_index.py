@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# File: benchmark_search_index.py
+# Path: AndyGoogle/Source/Tests/benchmark_search_index.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  02:12AM
+"""
+Description: Query latency of the FTS5 search sidecar on a generated catalog
+Builds a library of --books titles drawn from a Zipf-distributed vocabulary, builds its
+sidecar index, then times ranked searches (one page plus the total) against the LIKE title
+scan. Ranking scores every match, so latency follows how many books a query matches.
+"""
+
+import os
+import sys
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Core.SearchIndex import SearchIndex, SearchBooks, SearchBooksByTitle, SEARCH_SCHEMA
+
+# Named terms are placed at fixed ranks of a Zipf-distributed vocabulary, so the queries
+# below range from a very common word (~4% of titles) down to a rare one
+NAMED_WORDS = {10: "history", 60: "garden", 300: "astronomy", 1500: "castle", 6000: "chemistry"}
+SYLLABLES = ("ba", "ce", "di", "fo", "gu", "ka", "le", "mi", "no", "pu", "ra", "se", "ti", "vo", "za", "ru")
+
+def build_vocabulary(size):
+    """Pseudo-words with the named terms at their ranks, and Zipf (s=1) cumulative weights"""
+    words = []
+    for n in range(size):
+        if n in NAMED_WORDS:
+            words.append(NAMED_WORDS[n])
+            continue
+        word, value = "", n
+        for _ in range(4):
+            word += SYLLABLES[value % len(SYLLABLES)]
+            value //= len(SYLLABLES)
+        words.append(word)
+    cum_weights, total = [], 0.0
+    for rank in range(1, size + 1):
+        total += 1.0 / rank
+        cum_weights.append(total)
+    return words, cum_weights
+
+def build_sample_database(path, book_count, vocabulary_size=20000):
+    """Library with four-word titles, authors, categories, subjects and ratings"""
+    generator = random.Random(42)
+    words, cum_weights = build_vocabulary(vocabulary_size)
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE categories (id INTEGER PRIMARY KEY, category TEXT NOT NULL UNIQUE);
+        CREATE TABLE subjects (id INTEGER PRIMARY KEY, category_id INTEGER, subject TEXT NOT NULL);
+        CREATE TABLE books (id INTEGER PRIMARY KEY, title TEXT NOT NULL, author TEXT, category_id INTEGER,
+                            subject_id INTEGER, rating INTEGER);
+    """)
+    conn.executemany("INSERT INTO categories VALUES (?, ?)", [(i, f"Category {i}") for i in range(1, 27)])
+    conn.executemany("INSERT INTO subjects VALUES (?, ?, ?)", [(i, i % 26 + 1, f"Subject {i}") for i in range(1, 119)])
+    conn.executemany(
+        "INSERT INTO books VALUES (?, ?, ?, ?, ?, ?)",
+        ((i, " ".join(generator.choices(words, cum_weights=cum_weights, k=4)), f"Author {i % 5003}",
+          i % 26 + 1, i % 118 + 1, i % 5 + 1) for i in range(1, book_count + 1))
+    )
+    conn.commit()
+    conn.close()
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def measure(search, rounds):
+    """p50 / p99 wall time in milliseconds"""
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        search()
+        samples.append((time.perf_counter() - started) * 1000)
+    return percentile(samples, 0.5), percentile(samples, 0.99)
+
+def main():
+    """Time ranked searches against the title scan on a generated catalog"""
+    parser = argparse.ArgumentParser(description="Search index benchmark")
+    parser.add_argument('--books', type=int, default=1000000)
+    parser.add_argument('--rounds', type=int, default=50)
+    args = parser.parse_args()
+
+    print("🧪 Search index benchmark")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "cached_library.db")
+        build_sample_database(db_path, args.books)
+        SearchIndex(db_path).Build()
+        print(f"Library: {os.path.getsize(db_path) / 1024 / 1024:.1f} MB, "
+              f"index: {os.path.getsize(SearchIndex.GetIndexPath(db_path)) / 1024 / 1024:.1f} MB, {args.books} books")
+
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"ATTACH DATABASE ? AS {SEARCH_SCHEMA}", (SearchIndex.GetIndexPath(db_path),))
+
+        cases = (
+            ("rare term", lambda: SearchBooks(conn, "chemistry")),
+            ("uncommon term", lambda: SearchBooks(conn, "castle")),
+            ("prefix", lambda: SearchBooks(conn, "astro")),
+            ("two terms", lambda: SearchBooks(conn, "garden history")),
+            ("two terms + filters", lambda: SearchBooks(conn, "garden history", category="Category 3", min_rating=4)),
+            ("common term", lambda: SearchBooks(conn, "history")),
+            ("LIKE title scan", lambda: SearchBooksByTitle(conn, "astronomy")),
+        )
+        for name, search in cases:
+            total = search()[1]
+            p50, p99 = measure(search, args.rounds)
+            print(f"{name:<22} matches={total:<8} p50={p50:8.2f} ms  p99={p99:8.2f} ms")
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# File: test_book_batch.py
+# Path: AndyGoogle/Source/Tests/test_book_batch.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  02:50AM
+"""
+Description: Tests for the multi-id lookups behind /api/books/batch
+Checks request order, duplicates and misses on both the in-memory catalog path and
+the json_each SQL path, and the batch size limit
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Core.BookBatch import (DEFAULT_MAX_IDS, BatchTooLargeError, CheckBatchSize, FetchBooksFromCatalog,
+                            FetchBooksFromDatabase, BuildBatchResult)
+from Core.CatalogSnapshot import CatalogSnapshot
+from Tests.benchmark_database_pool import build_sample_database
+
+REQUEST_IDS = [42, 7, 99999, 42, 1, -3]
+
+def lookup(fetch, source, ids):
+    return BuildBatchResult(ids, fetch(source, list(dict.fromkeys(ids))))
+
+def test_both_paths_answer_in_request_order_and_flag_misses():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "library.db")
+        build_sample_database(db_path, 500)
+        conn = sqlite3.connect(db_path)
+        try:
+            batches = [lookup(FetchBooksFromCatalog, CatalogSnapshot.Build(db_path), REQUEST_IDS),
+                       lookup(FetchBooksFromDatabase, conn, REQUEST_IDS)]
+            expected_titles = dict(conn.execute("SELECT id, title FROM books WHERE id IN (1, 7, 42)").fetchall())
+        finally:
+            conn.close()
+
+        for batch in batches:
+            assert [item['id'] for item in batch['results']] == REQUEST_IDS
+            assert [item['found'] for item in batch['results']] == [True, True, False, True, True, False]
+            # Duplicates are answered at each position they were asked for
+            assert batch['results'][0] == batch['results'][3]
+            assert {item['id']: item['book']['title'] for item in batch['results'] if item['found']} == expected_titles
+            assert batch['results'][2]['book'] is None
+            assert batch['found'] == 4
+            assert batch['missing'] == [99999, -3]
+
+        catalog_book, sql_book = (batch['results'][1]['book'] for batch in batches)
+        for field in ('id', 'title', 'category', 'subject'):
+            assert catalog_book[field] == sql_book[field]
+
+def test_empty_batch_and_size_limit():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "library.db")
+        build_sample_database(db_path, 10)
+        conn = sqlite3.connect(db_path)
+        try:
+            assert lookup(FetchBooksFromDatabase, conn, []) == {'results': [], 'found': 0, 'missing': []}
+        finally:
+            conn.close()
+
+    CheckBatchSize(list(range(DEFAULT_MAX_IDS)))
+    with pytest.raises(BatchTooLargeError, match=f"at most {DEFAULT_MAX_IDS}"):
+        CheckBatchSize(list(range(DEFAULT_MAX_IDS + 1)))
+    with pytest.raises(BatchTooLargeError):
+        CheckBatchSize([1, 2, 3], max_ids=2)
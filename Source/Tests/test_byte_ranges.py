@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# File: test_byte_ranges.py
+# Path: AndyGoogle/Source/Tests/test_byte_ranges.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  07:35PM
+"""
+Description: Tests for Range/If-Range/ETag handling behind /api/books/{id}/file
+"""
+
+import os
+import sys
+import tempfile
+from email.utils import formatdate
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from API.ByteRanges import (ParseRangeHeader, RangeNotSatisfiable, EvaluateRequest,
+                            BuildFileETag, BuildFileHeaders, ReadFileRange)
+
+def make_file(temp_dir, size=1000):
+    path = os.path.join(temp_dir, "book.pdf")
+    with open(path, 'wb') as f:
+        f.write(bytes(i % 251 for i in range(size)))
+    return path, os.stat(path)
+
+def test_parse_range_forms():
+    assert ParseRangeHeader("bytes=0-99", 1000) == [(0, 99)]
+    assert ParseRangeHeader("bytes=900-", 1000) == [(900, 999)]
+    assert ParseRangeHeader("bytes=-100", 1000) == [(900, 999)]
+    assert ParseRangeHeader("bytes=-5000", 1000) == [(0, 999)]
+    assert ParseRangeHeader("bytes=990-2000", 1000) == [(990, 999)]
+    assert ParseRangeHeader("bytes=0-1, 5-9", 1000) == [(0, 1), (5, 9)]
+
+    # Malformed or foreign units are ignored (whole file)
+    for header in (None, "", "items=0-1", "bytes=abc", "bytes=5-1", "bytes=0"):
+        assert ParseRangeHeader(header, 1000) is None
+
+    with pytest.raises(RangeNotSatisfiable):
+        ParseRangeHeader("bytes=1000-", 1000)
+
+def test_status_selection():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        _, stat_result = make_file(temp_dir)
+        etag = BuildFileETag(stat_result)
+        last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+
+        assert EvaluateRequest({}, stat_result) == (200, None)
+        assert EvaluateRequest({'range': "bytes=100-199"}, stat_result) == (206, (100, 199))
+        assert EvaluateRequest({'range': "bytes=5000-"}, stat_result) == (416, None)
+        assert EvaluateRequest({'range': "bytes=0-1,10-11"}, stat_result) == (200, None)
+        assert EvaluateRequest({'if-none-match': etag}, stat_result) == (304, None)
+
+        # If-Range: resume only while the file is unchanged
+        assert EvaluateRequest({'range': "bytes=100-", 'if-range': etag}, stat_result) == (206, (100, 999))
+        assert EvaluateRequest({'range': "bytes=100-", 'if-range': last_modified}, stat_result) == (206, (100, 999))
+        assert EvaluateRequest({'range': "bytes=100-", 'if-range': '"stale"'}, stat_result) == (200, None)
+        assert EvaluateRequest({'range': "bytes=100-", 'if-range': "W/" + etag}, stat_result) == (200, None)
+
+def test_headers_and_chunked_reads():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path, stat_result = make_file(temp_dir, size=10000)
+
+        headers = BuildFileHeaders(stat_result, 206, (1000, 4999))
+        assert headers['content-range'] == "bytes 1000-4999/10000"
+        assert headers['content-length'] == "4000"
+        assert headers['accept-ranges'] == "bytes"
+        assert BuildFileHeaders(stat_result, 416, None)['content-range'] == "bytes */10000"
+
+        chunks = list(ReadFileRange(path, 1000, 4000, chunk_size=1024))
+        with open(path, 'rb') as f:
+            f.seek(1000)
+            assert b"".join(chunks) == f.read(4000)
+        assert max(len(chunk) for chunk in chunks) == 1024
+
+def test_etag_changes_with_file_contents():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path, stat_result = make_file(temp_dir)
+        with open(path, 'ab') as f:
+            f.write(b"appendix")
+        assert BuildFileETag(os.stat(path)) != BuildFileETag(stat_result)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# File: test_catalog_export.py
+# Path: AndyGoogle/Source/Tests/test_catalog_export.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-19  04:11AM
+"""
+Description: Tests for the streaming catalog export used by /api/books/export
+"""
+
+import os
+import sys
+import csv
+import gzip
+import json
+import sqlite3
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from API.CatalogExport import IterateExport, AcceptsGzip
+from Tests.benchmark_database_pool import build_sample_database
+
+def open_sample(temp_dir, book_count=2500):
+    db_path = os.path.join(temp_dir, "library.db")
+    build_sample_database(db_path, book_count)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def test_ndjson_streams_every_book_in_batches():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        conn = open_sample(temp_dir)
+        chunks = list(IterateExport(conn, 'ndjson', batch_size=500))
+        records = [json.loads(line) for line in b"".join(chunks).splitlines()]
+
+        assert len(chunks) == 5
+        assert len(records) == 2500
+        assert set(records[0]) == {'id', 'title', 'category', 'subject'}
+        assert [r['title'] for r in records] == sorted(r['title'] for r in records)
+        conn.close()
+
+def test_gzip_output_matches_plain_output():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        conn = open_sample(temp_dir)
+        plain = b"".join(IterateExport(conn, 'ndjson'))
+        compressed = b"".join(IterateExport(conn, 'ndjson', compress=True))
+        assert gzip.decompress(compressed) == plain
+        assert len(compressed) < len(plain) // 3
+        conn.close()
+
+def test_csv_with_category_filter():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        conn = open_sample(temp_dir)
+        text = b"".join(IterateExport(conn, 'csv', category="Category 3")).decode('utf-8')
+        rows = list(csv.reader(text.splitlines()))
+
+        assert rows[0] == ['id', 'title', 'category', 'subject']
+        assert len(rows) > 1
+        assert all(row[2] == "Category 3" for row in rows[1:])
+        conn.close()
+
+def test_accept_encoding_parsing():
+    assert AcceptsGzip("gzip, deflate, br")
+    assert AcceptsGzip("*")
+    assert not AcceptsGzip("gzip;q=0")
+    assert not AcceptsGzip("identity")
+    assert not AcceptsGzip(None)
+    # An explicit gzip entry wins over the wildcard, whichever comes first
+    assert not AcceptsGzip("*;q=1, gzip;q=0")
+    assert not AcceptsGzip("gzip;q=0, *")
+    assert AcceptsGzip("*;q=0, gzip;q=0.5")
+    assert AcceptsGzip("identity, *;q=0.1")
+    assert not AcceptsGzip("gzip;q=bogus")
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# File: test_chunked_download.py
+# Path: AndyGoogle/Source/Tests/test_chunked_download.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  01:03PM
+"""
+Description: Tests for the streaming, resumable ChunkedDownloader
+Serves a database-sized payload from a local fake Drive media endpoint that honors
+Range requests and can drop connections mid-chunk to exercise resume
+"""
+
+import os
+import sys
+import hashlib
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from API.ChunkedDownloader import ChunkedDownloader, DownloadError
+
+PAYLOAD = os.urandom(3 * 1024 * 1024 + 12345)
+PAYLOAD_MD5 = hashlib.md5(PAYLOAD).hexdigest()
+
+class FakeDriveHandler(BaseHTTPRequestHandler):
+    """Minimal stand-in for GET /drive/v3/files/{id}?alt=media"""
+    drop_after_bytes = None    # Cut the connection after sending this many body bytes (once)
+    ignore_range = False
+    requests_seen = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        FakeDriveHandler.requests_seen.append((self.headers.get('Range'), self.headers.get('Authorization')))
+
+        start, end = 0, len(PAYLOAD) - 1
+        range_header = self.headers.get('Range')
+        if range_header and not self.ignore_range:
+            start_text, end_text = range_header.replace('bytes=', '').split('-')
+            start = int(start_text)
+            end = min(int(end_text), len(PAYLOAD) - 1) if end_text else len(PAYLOAD) - 1
+            if start >= len(PAYLOAD):
+                self.send_response(416)
+                self.send_header('Content-Range', f"bytes */{len(PAYLOAD)}")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header('Content-Range', f"bytes {start}-{end}/{len(PAYLOAD)}")
+        else:
+            self.send_response(200)
+
+        body = PAYLOAD[start:end + 1]
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        if FakeDriveHandler.drop_after_bytes is not None:
+            cut = FakeDriveHandler.drop_after_bytes
+            FakeDriveHandler.drop_after_bytes = None
+            self.wfile.write(body[:cut])
+            self.wfile.flush()
+            self.connection.shutdown(2)
+            return
+
+        self.wfile.write(body)
+
+def start_server():
+    """Start the fake Drive server on a free port"""
+    FakeDriveHandler.drop_after_bytes = None
+    FakeDriveHandler.ignore_range = False
+    FakeDriveHandler.requests_seen = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeDriveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/drive/v3/files/abc?alt=media"
+
+def test_streams_in_chunks_and_hashes_incrementally():
+    server, url = start_server()
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = os.path.join(temp_dir, "library.db.tmp")
+            downloader = ChunkedDownloader(url, headers_provider=lambda: {'Authorization': 'Bearer test'},
+                                           chunk_size=1024 * 1024)
+            result = downloader.Download(target, source_key="abc", expected_size=len(PAYLOAD),
+                                         expected_md5=PAYLOAD_MD5)
+
+            assert result['md5'] == PAYLOAD_MD5
+            assert result['bytes'] == len(PAYLOAD)
+            with open(target, 'rb') as f:
+                assert f.read() == PAYLOAD
+            assert not os.path.exists(target + ".part")
+            assert len(FakeDriveHandler.requests_seen) == 4
+            assert all(auth == 'Bearer test' for _, auth in FakeDriveHandler.requests_seen)
+    finally:
+        server.shutdown()
+
+def test_resumes_after_dropped_connection():
+    server, url = start_server()
+    try:
+        FakeDriveHandler.drop_after_bytes = 700 * 1024
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = os.path.join(temp_dir, "library.db.tmp")
+            downloader = ChunkedDownloader(url, chunk_size=1024 * 1024, retry_delay=0.01)
+            result = downloader.Download(target, source_key="abc", expected_md5=PAYLOAD_MD5)
+
+            assert result['md5'] == PAYLOAD_MD5
+            ranges = [requested for requested, _ in FakeDriveHandler.requests_seen]
+            assert ranges[1] == f"bytes={700 * 1024}-{700 * 1024 + 1024 * 1024 - 1}"
+    finally:
+        server.shutdown()
+
+def test_resumes_partial_file_from_previous_run():
+    server, url = start_server()
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = os.path.join(temp_dir, "library.db.tmp")
+            downloader = ChunkedDownloader(url, chunk_size=1024 * 1024, max_retries=0)
+
+            # First run dies part way through
+            FakeDriveHandler.drop_after_bytes = 100
+            try:
+                downloader.Download(target, source_key="abc")
+                assert False, "expected the first run to fail"
+            except DownloadError:
+                pass
+            assert os.path.getsize(target + ".part") == 100
+
+            result = downloader.Download(target, source_key="abc", expected_md5=PAYLOAD_MD5)
+            assert result['resumed_from'] == 100
+            assert result['md5'] == PAYLOAD_MD5
+    finally:
+        server.shutdown()
+
+def test_partial_file_for_other_source_is_discarded():
+    server, url = start_server()
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = os.path.join(temp_dir, "library.db.tmp")
+            with open(target + ".part", 'wb') as f:
+                f.write(b"stale bytes from another version")
+
+            result = ChunkedDownloader(url).Download(target, source_key="new-version", expected_md5=PAYLOAD_MD5)
+            assert result['resumed_from'] == 0
+            assert result['md5'] == PAYLOAD_MD5
+    finally:
+        server.shutdown()
+
+def test_server_without_range_support():
+    server, url = start_server()
+    try:
+        FakeDriveHandler.ignore_range = True
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = os.path.join(temp_dir, "library.db.tmp")
+            result = ChunkedDownloader(url, chunk_size=1024 * 1024).Download(target, expected_md5=PAYLOAD_MD5)
+            assert result['bytes'] == len(PAYLOAD)
+    finally:
+        server.shutdown()
+
+def test_md5_mismatch_is_rejected():
+    server, url = start_server()
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = os.path.join(temp_dir, "library.db.tmp")
+            try:
+                ChunkedDownloader(url).Download(target, expected_md5="0" * 32)
+                assert False, "expected an MD5 mismatch"
+            except DownloadError:
+                pass
+            assert not os.path.exists(target)
+            assert not os.path.exists(target + ".part")
+    finally:
+        server.shutdown()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# File: test_database_delta.py
+# Path: AndyGoogle/Source/Tests/test_database_delta.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  01:44PM
+"""
+Description: Tests for page-level database deltas
+Builds two versions of a small library database, diffs them and checks that patching
+reproduces the target byte for byte, and that bad bases and truncated deltas are refused
+"""
+
+import os
+import sys
+import shutil
+import sqlite3
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Core.DatabaseDelta import (CreateDelta, ApplyDelta, FindDeltaChain, DeltaError, HashFile,
+                                GetDeltaFilename, ParseDeltaFilename)
+
+def build_versions(temp_dir: str):
+    """Write v1.0.0 and a v1.0.1 that renames a few books and adds one"""
+    base_path = os.path.join(temp_dir, "v1.db")
+    target_path = os.path.join(temp_dir, "v2.db")
+
+    conn = sqlite3.connect(base_path)
+    conn.execute("CREATE TABLE books (id INTEGER PRIMARY KEY, title TEXT, category_id INTEGER, subject_id INTEGER)")
+    conn.executemany("INSERT INTO books (title, category_id, subject_id) VALUES (?, ?, ?)",
+                     [(f"Book {i:05d} " + "x" * 200, i % 20, i % 90) for i in range(2000)])
+    conn.commit()
+    conn.close()
+
+    shutil.copyfile(base_path, target_path)
+    conn = sqlite3.connect(target_path)
+    conn.execute("UPDATE books SET title = 'Revised ' || title WHERE id IN (5, 900, 1500)")
+    conn.execute("INSERT INTO books (title, category_id, subject_id) VALUES ('A New Book', 1, 1)")
+    conn.commit()
+    conn.close()
+    return base_path, target_path
+
+def test_round_trip_reproduces_target():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        base_path, target_path = build_versions(temp_dir)
+        delta_path = os.path.join(temp_dir, GetDeltaFilename("1.0.0", "1.0.1"))
+
+        header = CreateDelta(base_path, target_path, delta_path, "1.0.0", "1.0.1")
+        assert 0 < header['changed_pages'] < 20
+        assert header['delta_size'] < os.path.getsize(target_path) // 10
+
+        output_path = os.path.join(temp_dir, "patched.db")
+        result = ApplyDelta(base_path, delta_path, output_path)
+        assert result['result_md5'] == HashFile(target_path)
+        with open(output_path, 'rb') as patched, open(target_path, 'rb') as target:
+            assert patched.read() == target.read()
+
+def test_wrong_base_is_refused():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        base_path, target_path = build_versions(temp_dir)
+        delta_path = os.path.join(temp_dir, "delta.agdelta")
+        CreateDelta(base_path, target_path, delta_path, "1.0.0", "1.0.1")
+
+        output_path = os.path.join(temp_dir, "patched.db")
+        try:
+            ApplyDelta(target_path, delta_path, output_path)
+            assert False, "expected a base mismatch"
+        except DeltaError:
+            pass
+        assert not os.path.exists(output_path)
+
+def test_truncated_delta_is_refused():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        base_path, target_path = build_versions(temp_dir)
+        delta_path = os.path.join(temp_dir, "delta.agdelta")
+        CreateDelta(base_path, target_path, delta_path, "1.0.0", "1.0.1")
+        with open(delta_path, 'r+b') as f:
+            f.truncate(os.path.getsize(delta_path) - 50)
+
+        try:
+            ApplyDelta(base_path, delta_path, os.path.join(temp_dir, "patched.db"))
+            assert False, "expected a truncated delta error"
+        except DeltaError:
+            pass
+
+def test_filename_round_trip_and_chain_search():
+    assert ParseDeltaFilename(GetDeltaFilename("1.2.0", "1.3.0")) == {'from_version': '1.2.0', 'to_version': '1.3.0'}
+    assert ParseDeltaFilename("AndersonLibrary_v1_0_0.db") is None
+
+    deltas = [
+        {'from_version': '1.0.0', 'to_version': '1.0.1'},
+        {'from_version': '1.0.1', 'to_version': '1.0.2'},
+        {'from_version': '1.0.2', 'to_version': '1.1.0'},
+        {'from_version': '1.0.0', 'to_version': '1.0.2'}
+    ]
+    chain = FindDeltaChain(deltas, '1.0.0', '1.1.0')
+    assert [d['to_version'] for d in chain] == ['1.0.2', '1.1.0']
+    assert FindDeltaChain(deltas, '0.9.0', '1.1.0') is None
+    assert FindDeltaChain(deltas, '1.0.0', '1.1.0', max_length=1) is None
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# File: test_database_generations.py
+# Path: AndyGoogle/Source/Tests/test_database_generations.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-19  01:24AM
+"""
+Description: Tests for database generation files and hot swapping under load
+Readers hammer the connection pool while new generations are installed; no query may
+fail and superseded generations must disappear once their last connection closes
+"""
+
+import os
+import sys
+import json
+import tempfile
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Core.DatabaseGenerations import GenerationStore, GetConfiguredDatabasePath, DEFAULT_DATABASE_PATH
+from Core.DatabasePool import DatabasePool
+from Tests.benchmark_database_pool import build_sample_database
+
+def test_supervisor_and_workers_share_the_configured_path():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_path = os.path.join(temp_dir, "andygoogle_config.json")
+        assert GetConfiguredDatabasePath(config_path=config_path) == DEFAULT_DATABASE_PATH
+        assert GetConfiguredDatabasePath({}) == DEFAULT_DATABASE_PATH
+
+        with open(config_path, 'w') as f:
+            json.dump({'local_database_path': "/srv/library.db"}, f)
+        assert GetConfiguredDatabasePath(config_path=config_path) == "/srv/library.db"
+
+def test_legacy_path_until_first_install():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        base_path = os.path.join(temp_dir, "cached_library.db")
+        store = GenerationStore(base_path)
+        assert store.GetCurrentPath() == base_path
+        assert store.GetCurrentGeneration() is None
+
+        build_sample_database(base_path + ".tmp", 50)
+        installed = store.Install(base_path + ".tmp")
+        assert store.GetCurrentPath() == installed
+        assert store.GetCurrentGeneration() == 1
+        assert not os.path.exists(base_path + ".tmp")
+
+def test_generation_reclaimed_only_after_last_reader():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        base_path = os.path.join(temp_dir, "cached_library.db")
+        store = GenerationStore(base_path)
+        build_sample_database(base_path + ".tmp", 50)
+        first = store.Install(base_path + ".tmp")
+
+        pool = DatabasePool(first, pool_size=2, immutable=True, reference_tracker=store)
+        borrowed = pool.Acquire()
+
+        build_sample_database(base_path + ".tmp", 60)
+        second = store.Install(base_path + ".tmp")
+        pool.SwapDatabase(second)
+        store.Reclaim()
+
+        # Still in use by the borrowed connection
+        assert os.path.exists(first)
+        assert borrowed.execute("SELECT COUNT(*) FROM books").fetchone()[0] == 50
+
+        pool.Release(borrowed)
+        assert not os.path.exists(first)
+        assert store.ListGenerations() == [2]
+        pool.Close()
+
+def test_swaps_under_load_cause_no_errors():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        base_path = os.path.join(temp_dir, "cached_library.db")
+        store = GenerationStore(base_path)
+        build_sample_database(base_path + ".tmp", 200)
+        pool = DatabasePool(store.Install(base_path + ".tmp"), pool_size=4, immutable=True,
+                            reference_tracker=store)
+
+        errors = []
+        stop = threading.Event()
+
+        def reader():
+            while not stop.is_set():
+                try:
+                    conn = pool.Acquire()
+                    try:
+                        conn.execute("SELECT COUNT(*) FROM books").fetchone()
+                    finally:
+                        pool.Release(conn)
+                except Exception as e:
+                    errors.append(e)
+
+        threads = [threading.Thread(target=reader) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+
+        for book_count in range(201, 206):
+            build_sample_database(base_path + ".tmp", book_count)
+            pool.SwapDatabase(store.Install(base_path + ".tmp"))
+            store.Reclaim()
+
+        stop.set()
+        for thread in threads:
+            thread.join()
+        pool.Close()
+
+        assert errors == []
+        assert store.ListGenerations() == [6]
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# File: test_database_manifest.py
+# Path: AndyGoogle/Source/Tests/test_database_manifest.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  12:41AM
+"""
+Description: Tests for published database manifests and install-time verification
+Covers the appProperties round trip, manifest-driven record counts, and rejection of
+truncated, corrupted and wrong-schema downloads
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Core.DatabaseManifest import BuildManifest, ToAppProperties, FromAppProperties, VerifyDatabase
+
+def build_library(path, book_count=2000):
+    """Small database with the tables a published library must have"""
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE categories (id INTEGER PRIMARY KEY, category TEXT NOT NULL);
+        CREATE TABLE subjects (id INTEGER PRIMARY KEY, category_id INTEGER, subject TEXT NOT NULL);
+        CREATE TABLE books (id INTEGER PRIMARY KEY, title TEXT NOT NULL, category_id INTEGER);
+        CREATE INDEX idx_books_title ON books (title);
+    """)
+    conn.executemany("INSERT INTO categories VALUES (?, ?)", [(i, f"Category {i}") for i in range(1, 6)])
+    conn.executemany("INSERT INTO subjects VALUES (?, ?, ?)", [(i, i % 5 + 1, f"Subject {i}") for i in range(1, 21)])
+    conn.executemany("INSERT INTO books VALUES (?, ?, ?)",
+                     [(i, f"Book {i:05d} " + "x" * 200, i % 5 + 1) for i in range(1, book_count + 1)])
+    conn.commit()
+    conn.close()
+
+def test_manifest_survives_app_properties():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "library.db")
+        build_library(path)
+        manifest = BuildManifest(path)
+        assert manifest['record_count'] == 2000
+        assert manifest['table_counts'] == {'books': 2000, 'categories': 5, 'subjects': 20}
+
+        app_properties = ToAppProperties(manifest)
+        # Drive limits each appProperty to 124 bytes of key plus value
+        assert all(len(key) + len(value) <= 124 for key, value in app_properties.items())
+        assert FromAppProperties(dict(app_properties, content_md5="abc")) == manifest
+        assert FromAppProperties({'content_md5': "abc"}) is None
+        assert FromAppProperties(dict(app_properties, page_count="many")) is None
+
+def test_verification_counts_from_manifest_or_database():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "library.db")
+        build_library(path)
+        manifest = BuildManifest(path)
+
+        verification = VerifyDatabase(path, manifest)
+        assert verification['ok'] and verification['check'] == "quick_check"
+        assert verification['record_count'] == 2000
+
+        # Legacy file without a manifest: counted directly
+        assert VerifyDatabase(path)['record_count'] == 2000
+        assert VerifyDatabase(path, full_check=True)['check'] == "integrity_check"
+
+def test_wrong_schema_and_missing_tables_are_rejected():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "library.db")
+        build_library(path)
+        manifest = BuildManifest(path)
+
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE INDEX idx_books_category ON books (category_id)")
+        conn.commit()
+        conn.close()
+        manifest['page_count'] = BuildManifest(path)['page_count']
+        problems = VerifyDatabase(path, manifest)['problems']
+        assert problems == ["schema does not match the published manifest"]
+
+        other = os.path.join(temp_dir, "other.db")
+        conn = sqlite3.connect(other)
+        conn.execute("CREATE TABLE books (id INTEGER PRIMARY KEY)")
+        conn.close()
+        verification = VerifyDatabase(other)
+        assert not verification['ok']
+        assert "missing required tables" in verification['problems'][0]
+
+def test_truncated_and_corrupted_files_are_rejected():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "library.db")
+        build_library(path)
+        manifest = BuildManifest(path)
+
+        # Truncated download: the header's page count no longer matches the file
+        truncated = os.path.join(temp_dir, "truncated.db")
+        with open(path, 'rb') as source, open(truncated, 'wb') as target:
+            target.write(source.read(os.path.getsize(path) - manifest['page_size']))
+        assert not VerifyDatabase(truncated, manifest)['ok']
+
+        # Scribbled-over table pages: quick_check catches it
+        with open(path, 'r+b') as f:
+            f.seek(os.path.getsize(path) // 2)
+            f.write(b"\xff" * manifest['page_size'])
+        verification = VerifyDatabase(path, manifest)
+        assert not verification['ok']
+        assert verification['record_count'] is None
+
+        assert VerifyDatabase(os.path.join(temp_dir, "missing.db"))['problems'] == ["database file is missing"]
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# File: test_drive_batching.py
+# Path: AndyGoogle/Source/Tests/test_drive_batching.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-19  03:26AM
+"""
+Description: Tests for batched Drive metadata requests and fields-mask planning
+A fake Drive service counts HTTP round trips (a batch is one), so each high-level
+operation - cold update check, warm update check, download - reports what it costs
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from API.DriveBatch import DriveBatch, PlanFields, MAX_BATCH_SIZE
+from Utils.ResilientTransport import ResilientTransport, RetryPolicy, CircuitBreaker
+
+class FakeHttpError(Exception):
+    """Stands in for googleapiclient's HttpError (only .resp.status is read)"""
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.resp = type('Response', (), {'status': status})()
+
+def NotFound():
+    """googleapiclient's HttpError for a 404, as Drive raises for a deleted file or folder"""
+    from googleapiclient.errors import HttpError
+    import httplib2
+    return HttpError(httplib2.Response({'status': 404}), b'{"error": {"message": "File not found"}}')
+
+class FakeRequest:
+    def __init__(self, service, kind, params):
+        self.service = service
+        self.kind = kind
+        self.params = params
+
+    def Answer(self):
+        return self.service.Answer(self)
+
+    def execute(self):
+        self.service.round_trips += 1
+        self.service.calls.append(self.kind)
+        return self.Answer()
+
+class FakeBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.parts = []
+
+    def add(self, request, request_id):
+        self.parts.append((request_id, request))
+
+    def execute(self):
+        self.service.round_trips += 1
+        self.service.calls.append(tuple(request.kind for _, request in self.parts))
+        for request_id, request in self.parts:
+            try:
+                self.callback(request_id, request.Answer(), None)
+            except FakeHttpError as error:
+                self.callback(request_id, None, error)
+
+class FakeResource:
+    def __init__(self, service, prefix):
+        self.service = service
+        self.prefix = prefix
+
+    def __getattr__(self, method):
+        return lambda **params: FakeRequest(self.service, f"{self.prefix}.{method}", params)
+
+class FakeDriveService:
+    """Enough of the Drive v3 client for folder listing, changes and metadata"""
+
+    def __init__(self, files=(), folder_id="folder-1", page_size=1000):
+        self.files_in_folder = list(files)
+        self.folder_id = folder_id
+        self.page_size = page_size
+        self.round_trips = 0
+        self.calls = []
+        self.failures = {}       # kind -> statuses to answer before succeeding
+        self.deleted_folders = set()
+        self.deleted_listing = 'empty'   # How Drive answers a listing of a deleted folder: 'empty' or '404'
+
+    def files(self):
+        return FakeResource(self, 'files')
+
+    def changes(self):
+        return FakeResource(self, 'changes')
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+    def Answer(self, request):
+        if self.failures.get(request.kind):
+            raise FakeHttpError(self.failures[request.kind].pop(0))
+        params = request.params
+        if request.kind == 'changes.getStartPageToken':
+            return {'startPageToken': "token-1"}
+        if request.kind == 'changes.list':
+            return {'changes': [], 'newStartPageToken': "token-2"}
+        if request.kind == 'files.create':
+            self.folder_id = "folder-new"
+            return {'id': self.folder_id}
+        if request.kind == 'files.get':
+            if params['fileId'] in self.deleted_folders:
+                raise NotFound()
+            if params['fileId'] == self.folder_id:
+                return {'id': self.folder_id, 'trashed': False}
+            return next(file for file in self.files_in_folder if file['id'] == params['fileId'])
+        if request.kind == 'files.list':
+            if "mimeType=" in params['q']:
+                return {'files': [{'id': self.folder_id}] if self.folder_id else []}
+            if params['q'].split("'")[1] in self.deleted_folders:
+                if self.deleted_listing == '404':
+                    raise NotFound()
+                return {'files': []}
+            start = int(params.get('pageToken') or 0)
+            page = {'files': self.files_in_folder[start:start + self.page_size]}
+            if start + self.page_size < len(self.files_in_folder):
+                page['nextPageToken'] = str(start + self.page_size)
+            return page
+        raise AssertionError(f"unexpected request {request.kind}")
+
+def make_transport():
+    return ResilientTransport('drive', policy=RetryPolicy(max_attempts=3, base_delay=0.0),
+                              breaker=CircuitBreaker('drive', failure_threshold=100),
+                              transient_errors=(FakeHttpError,), sleep=lambda seconds: None)
+
+def database_files(count):
+    return [{'id': f"db-{n}", 'name': f"AndersonLibrary_v1_0_{n}.db", 'size': "1024",
+             'md5Checksum': f"md5-{n}", 'modifiedTime': "2026-10-18T12:00:00Z"} for n in range(count)]
+
+def test_plan_fields_takes_the_union_in_order():
+    assert PlanFields(('id', 'name'), ('name', 'size'), collection='files', paging=True) == \
+        "nextPageToken,files(id,name,size)"
+    assert PlanFields(('name', 'size'), ('size', 'md5Checksum')) == "name,size,md5Checksum"
+
+def test_batch_is_one_round_trip_and_retries_only_failed_parts():
+    service = FakeDriveService(database_files(3))
+    service.failures['changes.getStartPageToken'] = [429]
+    batch = DriveBatch(service, make_transport())
+    batch.Add('token', service.changes().getStartPageToken(fields='startPageToken'))
+    batch.Add('listing', service.files().list(q="'folder-1' in parents", fields="files(id)"))
+    results = batch.Execute()
+
+    assert results['token'] == {'startPageToken': "token-1"}
+    assert len(results['listing']['files']) == 3
+    # The 429'd part went again on its own; the listing was not re-fetched
+    assert service.calls == [('changes.getStartPageToken', 'files.list'), 'changes.getStartPageToken']
+    assert batch.round_trips == service.round_trips == 2
+
+def test_permanent_part_failure_raises_and_large_batches_split():
+    service = FakeDriveService()
+    service.failures['files.get'] = [404]
+    batch = DriveBatch(service, make_transport())
+    batch.Add('token', service.changes().getStartPageToken())
+    batch.Add('missing', service.files().get(fileId="gone"))
+    with pytest.raises(FakeHttpError):
+        batch.Execute()
+
+    service = FakeDriveService()
+    batch = DriveBatch(service)
+    for n in range(MAX_BATCH_SIZE + 1):
+        batch.Add(str(n), service.changes().getStartPageToken())
+    assert len(batch.Execute()) == MAX_BATCH_SIZE + 1
+    assert service.round_trips == 2
+
+def make_drive_api(service, temp_dir):
+    pytest.importorskip("googleapiclient")
+    from API.GoogleDriveAPI import GoogleDriveAPI
+    from API.DriveMetadataCache import DriveMetadataCache
+
+    drive_api = GoogleDriveAPI(os.path.join(temp_dir, "credentials.json"))
+    drive_api.service = service
+    drive_api.transport = make_transport()
+    drive_api.metadata_cache = DriveMetadataCache(os.path.join(temp_dir, "cache.json"), ttl_seconds=0)
+    return drive_api
+
+def test_update_check_round_trips():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service = FakeDriveService(database_files(3))
+        drive_api = make_drive_api(service, temp_dir)
+        from API.GoogleDriveAPI import FOLDER_LISTING_KEY
+
+        # Cold: folder search batched with the change token, then the listing
+        assert drive_api.GetLatestDatabaseVersion()['file_id'] == "db-0"
+        assert service.round_trips == 2
+
+        # Folder ID known, listing expired: one conditional changes.list
+        service.round_trips = 0
+        drive_api.GetLatestDatabaseVersion()
+        assert service.round_trips == 1
+
+        # Folder ID known, nothing to revalidate: the token strictly before the listing,
+        # so nothing published in between can hide behind it
+        service.round_trips = 0
+        service.calls = []
+        drive_api.metadata_cache.Invalidate(FOLDER_LISTING_KEY)
+        drive_api.GetLatestDatabaseVersion()
+        assert service.calls == ['changes.getStartPageToken', 'files.list']
+        assert service.round_trips == 2
+
+def test_first_run_creates_folder_without_listing_it():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service = FakeDriveService(folder_id=None)
+        drive_api = make_drive_api(service, temp_dir)
+        assert drive_api.ListFolderFiles() == []
+        assert service.calls == [('changes.getStartPageToken', 'files.list'), 'files.create']
+
+def test_listing_pages_and_download_metadata_come_from_the_listing():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service = FakeDriveService(database_files(5), page_size=2)
+        drive_api = make_drive_api(service, temp_dir)
+        drive_api.metadata_cache.ttl_seconds = 60
+        assert len(drive_api.ListFolderFiles()) == 5
+        assert service.round_trips == 1 + 3
+
+        service.round_trips = 0
+        assert drive_api.GetListedFile("db-4")['md5Checksum'] == "md5-4"
+        assert drive_api.GetListedFile("db-9") is None
+        assert service.round_trips == 0
+
+def test_deleted_folder_is_forgotten_and_searched_again():
+    for deleted_listing in ('404', 'empty'):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # The remembered folder was deleted and a new AndyLibrary folder made in its place
+            service = FakeDriveService(database_files(2), folder_id="folder-2")
+            service.deleted_folders.add("folder-1")
+            service.deleted_listing = deleted_listing
+            drive_api = make_drive_api(service, temp_dir)
+            from API.GoogleDriveAPI import FOLDER_ID_KEY
+            drive_api.RememberFolder("folder-1")
+
+            assert [file['id'] for file in drive_api.ListFolderFiles()] == ["db-0", "db-1"]
+            assert drive_api.andylibrary_folder_id == "folder-2"
+            assert drive_api.metadata_cache.Get(FOLDER_ID_KEY) == "folder-2"
+            assert service.calls[-2:] == [('changes.getStartPageToken', 'files.list'), 'files.list']
+
+def test_empty_folder_that_exists_is_kept():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service = FakeDriveService()
+        drive_api = make_drive_api(service, temp_dir)
+        drive_api.RememberFolder("folder-1")
+        assert drive_api.ListFolderFiles() == []
+        assert service.calls == ['changes.getStartPageToken', 'files.list', 'files.get']
+        assert drive_api.andylibrary_folder_id == "folder-1"
+
+def test_upload_into_a_folder_deleted_after_listing_retries_once(monkeypatch):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service = FakeDriveService(folder_id="folder-1")
+        drive_api = make_drive_api(service, temp_dir)
+        from API import GoogleDriveAPI
+        from API.ResumableUploader import UploadError
+
+        parents_seen = []
+
+        class FakeUploader:
+            def __init__(self, upload_url, **kwargs):
+                pass
+
+            def Upload(self, local_path, metadata, **kwargs):
+                parents_seen.append(metadata['parents'][0])
+                if metadata['parents'][0] == "folder-1":
+                    # Deleted (and recreated) between the listing and the upload
+                    service.deleted_folders.add("folder-1")
+                    service.folder_id = "folder-2"
+                    raise UploadError("Could not start upload session (HTTP 404)", status=404)
+                return {'file': {'id': "new-file", 'name': metadata['name'], 'size': "5"}, 'resumed_from': 0}
+
+        monkeypatch.setattr(GoogleDriveAPI, 'ResumableUploader', FakeUploader)
+        local_path = os.path.join(temp_dir, "AndersonLibrary_v1_0_0.db")
+        with open(local_path, 'wb') as f:
+            f.write(b"hello")
+
+        assert drive_api.UploadFile(local_path, "AndersonLibrary_v1_0_0.db", "test") == "new-file"
+        assert parents_seen == ["folder-1", "folder-2"]
+        assert drive_api.andylibrary_folder_id == "folder-2"
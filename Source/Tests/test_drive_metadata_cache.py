@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# File: test_drive_metadata_cache.py
+# Path: AndyGoogle/Source/Tests/test_drive_metadata_cache.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  02:40PM
+"""
+Description: Tests for the persistent Drive metadata cache
+Covers expiry, persistence across instances and revalidation of expired entries
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from API.DriveMetadataCache import DriveMetadataCache
+
+def test_entries_survive_restart_until_ttl():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_path = os.path.join(temp_dir, "drive_metadata_cache.json")
+        cache = DriveMetadataCache(cache_path, ttl_seconds=60)
+        cache.Put("listing", [{'id': 'abc', 'name': 'AndersonLibrary_v1_0_0.db'}], validator="token-1")
+
+        reloaded = DriveMetadataCache(cache_path, ttl_seconds=60)
+        assert reloaded.Get("listing") == [{'id': 'abc', 'name': 'AndersonLibrary_v1_0_0.db'}]
+        assert reloaded.GetValidator("listing") == "token-1"
+        assert reloaded.GetStats()['hits'] == 1
+
+def test_expired_entry_can_be_revalidated():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = DriveMetadataCache(os.path.join(temp_dir, "cache.json"), ttl_seconds=0.05)
+        cache.Put("listing", ["v1"], validator="token-1")
+        time.sleep(0.1)
+
+        assert cache.Get("listing") is None
+        assert cache.Get("listing", allow_expired=True) == ["v1"]
+
+        assert cache.Refresh("listing", validator="token-2", ttl_seconds=60)
+        assert cache.Get("listing") == ["v1"]
+        assert cache.GetValidator("listing") == "token-2"
+
+def test_invalidate_and_corrupt_file():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_path = os.path.join(temp_dir, "cache.json")
+        cache = DriveMetadataCache(cache_path)
+        cache.Put("folder", "folder-id")
+        cache.Invalidate("folder")
+        assert cache.Get("folder") is None
+        assert not cache.Refresh("folder")
+
+        with open(cache_path, 'w') as f:
+            f.write("{not json")
+        assert DriveMetadataCache(cache_path).Get("folder") is None
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# File: test_facet_index.py
+# Path: AndyGoogle/Source/Tests/test_facet_index.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-19  03:35AM
+"""
+Description: Tests for the FacetIndex bitmaps behind /api/books/filter
+Checks pages, totals and facet counts against the equivalent SQL queries
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Core.CatalogSnapshot import CatalogSnapshot
+from Core.FacetIndex import FacetIndex
+from Core.SearchIndex import UnsupportedFilterError
+from Tests.benchmark_database_pool import build_sample_database
+
+FILTER_QUERY = """
+    SELECT b.id FROM books b
+    LEFT JOIN categories c ON b.category_id = c.id
+    LEFT JOIN subjects s ON b.subject_id = s.id
+    WHERE (? IS NULL OR c.category = ?) AND (? IS NULL OR s.subject = ?) AND (? IS NULL OR b.rating >= ?)
+    ORDER BY b.title, b.id
+"""
+
+def build_index(temp_dir, book_count=3000):
+    db_path = os.path.join(temp_dir, "library.db")
+    build_sample_database(db_path, book_count)
+    conn = sqlite3.connect(db_path)
+    conn.execute("ALTER TABLE books ADD COLUMN rating INTEGER")
+    conn.execute("UPDATE books SET rating = CASE WHEN id % 7 = 0 THEN NULL ELSE id % 5 + 1 END")
+    conn.commit()
+    return conn, FacetIndex.Build(CatalogSnapshot.Build(db_path))
+
+def expected_ids(conn, category=None, subject=None, min_rating=None):
+    return [row[0] for row in conn.execute(FILTER_QUERY, (category, category, subject, subject, min_rating, min_rating))]
+
+def page_ids(index, **filters):
+    result = index.Filter(**filters)
+    return [index.snapshot.book_ids[position] for position in result['positions']], result
+
+def test_pages_match_sql_ordering():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        conn, index = build_index(temp_dir)
+        for filters in ({}, {'category': "Category 3"}, {'category': "Category 3", 'min_rating': 4},
+                        {'subject': "Subject 29"}, {'category': "Category 4", 'subject': "Subject 29"}):
+            expected = expected_ids(conn, **filters)
+            ids, result = page_ids(index, offset=10, limit=25, **filters)
+            assert result['total'] == len(expected)
+            assert ids == expected[10:35]
+        conn.close()
+
+def test_deep_page_and_past_the_end():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        conn, index = build_index(temp_dir)
+        expected = expected_ids(conn, min_rating=2)
+        ids, _ = page_ids(index, min_rating=2, offset=len(expected) - 5, limit=50)
+        assert ids == expected[-5:]
+        ids, _ = page_ids(index, min_rating=2, offset=len(expected), limit=50)
+        assert ids == []
+        conn.close()
+
+def test_facet_counts_exclude_their_own_filter():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        conn, index = build_index(temp_dir)
+        result = index.Filter(category="Category 5", min_rating=3, limit=0)
+
+        category_counts = dict(result['facets']['categories'])
+        sql_counts = dict(conn.execute("""
+            SELECT c.category, COUNT(*) FROM books b JOIN categories c ON b.category_id = c.id
+            WHERE b.rating >= 3 GROUP BY c.category
+        """).fetchall())
+        assert category_counts == sql_counts
+
+        subject_counts = dict(result['facets']['subjects'])
+        assert sum(subject_counts.values()) == result['total']
+
+        rating_counts = dict(result['facets']['ratings'])
+        assert rating_counts == dict(conn.execute("""
+            SELECT rating, COUNT(*) FROM books WHERE category_id = 5 AND rating IS NOT NULL GROUP BY rating
+        """).fetchall())
+        conn.close()
+
+def test_text_bitmap_combines_with_facets():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        conn, index = build_index(temp_dir)
+        matching = [row[0] for row in conn.execute("SELECT id FROM books WHERE title LIKE '%00012%'")]
+        ids, result = page_ids(index, category="Category 2", text_bitmap=index.BitmapFromBookIds(matching + [999999]))
+
+        expected = [book_id for book_id in expected_ids(conn, category="Category 2") if book_id in set(matching)]
+        assert ids == expected
+        assert result['total'] == len(expected)
+        conn.close()
+
+def test_unknown_facet_value_matches_nothing():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        conn, index = build_index(temp_dir)
+        ids, result = page_ids(index, category="No Such Category")
+        assert ids == [] and result['total'] == 0
+        conn.close()
+
+def test_rating_filter_without_ratings_is_rejected():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "library.db")
+        build_sample_database(db_path, 200)
+        index = FacetIndex.Build(CatalogSnapshot.Build(db_path))
+        with pytest.raises(UnsupportedFilterError):
+            index.Filter(category="Category 3", min_rating=3)
+        assert index.Filter(category="Category 3")['total'] > 0
+
+        # Column names are matched case-insensitively, as SearchIndex does
+        conn = sqlite3.connect(db_path)
+        conn.execute("ALTER TABLE books ADD COLUMN Rating INTEGER")
+        conn.execute("UPDATE books SET Rating = id % 5 + 1")
+        conn.commit()
+        conn.close()
+        index = FacetIndex.Build(CatalogSnapshot.Build(db_path))
+        assert index.Filter(min_rating=5)['total'] == 40
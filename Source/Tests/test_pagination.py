@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# File: test_pagination.py
+# Path: AndyGoogle/Source/Tests/test_pagination.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  04:06AM
+"""
+Description: Tests for the keyset pagination cursors behind /api/books
+Covers the cursor round trip, rejection of malformed cursors (mapped to 400 by the
+endpoint) and seeking page after page through repeated titles
+"""
+
+import os
+import sys
+import json
+import base64
+import sqlite3
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Core.Pagination import InvalidCursorError, EncodeCursor, DecodeCursor, BuildSeekClause, GetNextCursor
+
+def encode_payload(payload):
+    """Cursor-shaped token around arbitrary JSON, as a tampering client would build it"""
+    return base64.urlsafe_b64encode(json.dumps(payload).encode('utf-8')).decode('ascii').rstrip('=')
+
+def test_cursor_round_trip():
+    for title, book_id in (("Algebra", 1), ("", 0), ("Ünïcødé — 書名 \"quoted\"", 2 ** 40), ("a=b&c", 7)):
+        cursor = EncodeCursor(title, book_id)
+        assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+        assert DecodeCursor(cursor) == (title, book_id)
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor!",                                   # Not base64
+    "é",                                               # Non-ASCII token
+    base64.urlsafe_b64encode(b"\xff\xfe\xfd").decode(),  # Not UTF-8
+    base64.urlsafe_b64encode(b"{oops").decode(),       # Not JSON
+    encode_payload({'title': "Algebra", 'id': 1}),     # Wrong shape
+    encode_payload(["Algebra"]),                       # Too short
+    encode_payload(["Algebra", 1, 2]),                 # Too long
+    encode_payload([1, "Algebra"]),                    # Wrong types
+    encode_payload(["Algebra", "1"]),
+    encode_payload([None, 1]),
+])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        DecodeCursor(cursor)
+    with pytest.raises(InvalidCursorError):
+        BuildSeekClause(cursor, [])
+
+def test_seek_pages_through_repeated_titles():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("CREATE TABLE books (id INTEGER PRIMARY KEY, title TEXT NOT NULL)")
+    conn.execute("CREATE INDEX idx_books_title ON books (title)")
+    # Runs of identical titles longer than a page, with ids out of insertion order
+    titles = ["Atlas"] * 7 + ["Bible"] * 2 + ["Zoology"] * 5 + ["Cooking"] * 4
+    conn.executemany("INSERT INTO books (id, title) VALUES (?, ?)",
+                     [((n * 7) % 97 + 1, title) for n, title in enumerate(titles)])
+
+    expected = [row['id'] for row in conn.execute("SELECT id FROM books ORDER BY title, id")]
+
+    limit = 3
+    seen = []
+    cursor = None
+    for _ in range(len(titles)):
+        params = []
+        query = "SELECT b.id, b.title FROM books b WHERE 1=1" + BuildSeekClause(cursor, params)
+        rows = conn.execute(query + " ORDER BY b.title, b.id LIMIT ?", params + [limit]).fetchall()
+        seen.extend(row['id'] for row in rows)
+        cursor = GetNextCursor(rows, limit)
+        if cursor is None:
+            break
+
+    # Every book exactly once, in the same order as one unpaged query
+    assert seen == expected
+    assert BuildSeekClause(None, []) == ""
+    conn.close()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# File: test_parallel_download.py
+# Path: AndyGoogle/Source/Tests/test_parallel_download.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  09:06PM
+"""
+Description: Tests for the parallel multi-range ParallelDownloader
+Serves a payload from a local Range-capable stand-in that can drop a connection or
+fail with 503 on chosen ranges, to exercise per-range retries and resume
+"""
+
+import os
+import sys
+import json
+import hashlib
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from API.ChunkedDownloader import ChunkedDownloader, DownloadError
+from API.ParallelDownloader import ParallelDownloader
+
+PART_SIZE = 256 * 1024
+PAYLOAD = os.urandom(10 * PART_SIZE + 4321)
+PAYLOAD_MD5 = hashlib.md5(PAYLOAD).hexdigest()
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Range-capable media endpoint with per-range fault injection"""
+    drop_ranges = {}      # range start -> body bytes to send before cutting the connection (once)
+    fail_ranges = {}      # range start -> number of 503 answers before succeeding
+    ignore_range = False
+    requests_seen = []
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        range_header = self.headers.get('Range')
+        with RangeHandler.lock:
+            RangeHandler.requests_seen.append(range_header)
+
+        if not range_header or self.ignore_range:
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(PAYLOAD)))
+            self.end_headers()
+            self.wfile.write(PAYLOAD)
+            return
+
+        start_text, end_text = range_header.replace('bytes=', '').split('-')
+        start, end = int(start_text), min(int(end_text), len(PAYLOAD) - 1)
+
+        with RangeHandler.lock:
+            failures = RangeHandler.fail_ranges.get(start, 0)
+            if failures:
+                RangeHandler.fail_ranges[start] = failures - 1
+            drop_after = RangeHandler.drop_ranges.pop(start, None)
+        if failures:
+            self.send_response(503)
+            self.send_header('Content-Length', "0")
+            self.end_headers()
+            return
+
+        body = PAYLOAD[start:end + 1]
+        self.send_response(206)
+        self.send_header('Content-Range', f"bytes {start}-{end}/{len(PAYLOAD)}")
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if drop_after is not None:
+            self.wfile.write(body[:drop_after])
+            self.wfile.flush()
+            self.connection.shutdown(2)
+            return
+        self.wfile.write(body)
+
+def start_server():
+    """Start the stand-in on a free port"""
+    RangeHandler.drop_ranges = {}
+    RangeHandler.fail_ranges = {}
+    RangeHandler.ignore_range = False
+    RangeHandler.requests_seen = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RangeHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/drive/v3/files/abc?alt=media"
+
+def make_downloader(url, **kwargs):
+    options = {'part_size': PART_SIZE, 'max_connections': 4, 'retry_delay': 0.01}
+    options.update(kwargs)
+    return ParallelDownloader(url, **options)
+
+def test_ranges_are_written_in_place_and_hashed():
+    server, url = start_server()
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = os.path.join(temp_dir, "library.db.tmp")
+            progress = []
+            result = make_downloader(url).Download(target, source_key="abc", expected_size=len(PAYLOAD),
+                                                   expected_md5=PAYLOAD_MD5,
+                                                   progress_callback=lambda done, total: progress.append(done))
+
+            assert result['md5'] == PAYLOAD_MD5
+            assert result['ranges'] == 11
+            with open(target, 'rb') as f:
+                assert f.read() == PAYLOAD
+            assert not os.path.exists(target + ".part")
+            assert not os.path.exists(target + ".part.json")
+            assert sorted(RangeHandler.requests_seen)[0] == f"bytes=0-{PART_SIZE - 1}"
+            assert len(RangeHandler.requests_seen) == 11
+            assert progress[-1] == len(PAYLOAD)
+    finally:
+        server.shutdown()
+
+def test_failed_ranges_are_retried_individually():
+    server, url = start_server()
+    try:
+        RangeHandler.drop_ranges = {3 * PART_SIZE: 1000}
+        RangeHandler.fail_ranges = {7 * PART_SIZE: 2}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = os.path.join(temp_dir, "library.db.tmp")
+            result = make_downloader(url).Download(target, source_key="abc", expected_size=len(PAYLOAD),
+                                                   expected_md5=PAYLOAD_MD5)
+
+            assert result['md5'] == PAYLOAD_MD5
+            assert result['range_retries'] == 3
+            # The dropped range resumes from the last byte it received
+            assert f"bytes={3 * PART_SIZE + 1000}-{4 * PART_SIZE - 1}" in RangeHandler.requests_seen
+            assert len(RangeHandler.requests_seen) == 14
+    finally:
+        server.shutdown()
+
+def test_restart_fetches_only_missing_ranges():
+    server, url = start_server()
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = os.path.join(temp_dir, "library.db.tmp")
+
+            # First run: one range keeps failing, the rest finish and are recorded
+            RangeHandler.fail_ranges = {5 * PART_SIZE: 100}
+            try:
+                make_downloader(url, max_retries=1).Download(target, source_key="abc", expected_size=len(PAYLOAD))
+                assert False, "expected the first run to fail"
+            except DownloadError:
+                pass
+            with open(target + ".part.json") as f:
+                recorded = json.load(f)['completed_ranges']
+            assert 5 not in recorded and recorded
+
+            RangeHandler.fail_ranges = {}
+            RangeHandler.requests_seen = []
+            result = make_downloader(url).Download(target, source_key="abc", expected_size=len(PAYLOAD),
+                                                   expected_md5=PAYLOAD_MD5)
+            assert result['md5'] == PAYLOAD_MD5
+            assert result['resumed_from'] == sum(min(PART_SIZE, len(PAYLOAD) - index * PART_SIZE) for index in recorded)
+            assert len(RangeHandler.requests_seen) == 11 - len(recorded)
+    finally:
+        server.shutdown()
+
+def test_state_for_other_source_is_discarded():
+    server, url = start_server()
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = os.path.join(temp_dir, "library.db.tmp")
+            with open(target + ".part", 'wb') as f:
+                f.write(b"\0" * len(PAYLOAD))
+            with open(target + ".part.json", 'w') as f:
+                json.dump({'source_key': "old", 'total_size': len(PAYLOAD), 'part_size': PART_SIZE,
+                           'completed_ranges': list(range(11))}, f)
+
+            result = make_downloader(url).Download(target, source_key="new", expected_size=len(PAYLOAD),
+                                                   expected_md5=PAYLOAD_MD5)
+            assert result['resumed_from'] == 0
+            assert result['md5'] == PAYLOAD_MD5
+    finally:
+        server.shutdown()
+
+def test_sequential_downloader_ignores_parallel_part_file():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        target = os.path.join(temp_dir, "library.db.tmp")
+        with open(target + ".part.json", 'w') as f:
+            json.dump({'source_key': "abc", 'total_size': 10, 'part_size': 1, 'completed_ranges': [0]}, f)
+        assert not ChunkedDownloader("http://unused").LoadResumeState(target + ".part.json", "abc")
+
+def test_falls_back_when_range_is_ignored():
+    server, url = start_server()
+    try:
+        RangeHandler.ignore_range = True
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = os.path.join(temp_dir, "library.db.tmp")
+            result = make_downloader(url).Download(target, source_key="abc", expected_size=len(PAYLOAD),
+                                                   expected_md5=PAYLOAD_MD5)
+            assert result['md5'] == PAYLOAD_MD5
+            with open(target, 'rb') as f:
+                assert f.read() == PAYLOAD
+    finally:
+        server.shutdown()
+
+def test_md5_mismatch_is_rejected():
+    server, url = start_server()
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = os.path.join(temp_dir, "library.db.tmp")
+            try:
+                make_downloader(url).Download(target, expected_size=len(PAYLOAD), expected_md5="0" * 32)
+                assert False, "expected an MD5 mismatch"
+            except DownloadError:
+                pass
+            assert not os.path.exists(target)
+            assert not os.path.exists(target + ".part")
+    finally:
+        server.shutdown()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# File: test_resilient_transport.py
+# Path: AndyGoogle/Source/Tests/test_resilient_transport.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  11:18PM
+"""
+Description: Tests for the retry/backoff/circuit breaker transport used by Drive and Sheets
+Calls go to a local fault-injecting stand-in that answers from a script of statuses
+(503, 429 with Retry-After, dropped connections, ...) before succeeding
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Utils.ResilientTransport import (ResilientTransport, RetryPolicy, CircuitBreaker, CircuitOpenError,
+                                      DeadlineExceeded, BREAKER_CLOSED, BREAKER_OPEN, BREAKER_HALF_OPEN)
+
+class FaultHandler(BaseHTTPRequestHandler):
+    """Answers each request with the next scripted fault, then 200"""
+    script = []          # Entries: status int, ('retry_after', seconds) or 'drop'
+    hits = 0
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        with FaultHandler.lock:
+            FaultHandler.hits += 1
+            fault = FaultHandler.script.pop(0) if FaultHandler.script else 200
+
+        if fault == 'drop':
+            self.connection.shutdown(2)
+            return
+        headers = {}
+        if isinstance(fault, tuple):
+            headers['Retry-After'] = str(fault[1])
+            fault = 429
+        body = json.dumps({'ok': fault == 200}).encode()
+        self.send_response(fault)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def start_server(script=()):
+    """Start the stand-in on a free port"""
+    FaultHandler.script = list(script)
+    FaultHandler.hits = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FaultHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/drive/v3/files"
+    return server, lambda: json.loads(urllib.request.urlopen(url, timeout=5).read())
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def make_transport(clock=None, slept=None, **breaker_options):
+    clock = clock or FakeClock()
+    slept = slept if slept is not None else []
+
+    def fake_sleep(seconds):
+        slept.append(seconds)
+        clock.now += seconds
+
+    breaker = CircuitBreaker('drive', clock=clock, **breaker_options)
+    policy = RetryPolicy(max_attempts=5, base_delay=0.5, max_delay=8.0, rng=random.Random(7))
+    return ResilientTransport('drive', policy=policy, breaker=breaker, deadline_seconds=60,
+                              sleep=fake_sleep, clock=clock)
+
+def test_retries_server_errors_with_jittered_backoff():
+    server, call = start_server([503, 500, 'drop'])
+    try:
+        slept = []
+        transport = make_transport(slept=slept)
+        assert transport.Execute(call) == {'ok': True}
+        assert FaultHandler.hits == 4
+
+        metrics = transport.GetMetrics()
+        assert metrics['retries'] == 3
+        assert metrics['retries_by_status']['503'] == 1
+        assert metrics['successes'] == 1
+        assert metrics['breaker']['state'] == BREAKER_CLOSED
+        # Full jitter: each delay is within [0, base * 2^(n-1)]
+        assert all(0 <= delay <= 0.5 * 2 ** n for n, delay in enumerate(slept))
+    finally:
+        server.shutdown()
+
+def test_retry_after_is_honored():
+    server, call = start_server([('retry_after', 3)])
+    try:
+        slept = []
+        assert make_transport(slept=slept).Execute(call) == {'ok': True}
+        assert slept == [3.0]
+    finally:
+        server.shutdown()
+
+def test_client_errors_are_not_retried_and_do_not_trip_the_breaker():
+    server, call = start_server([404])
+    try:
+        transport = make_transport(failure_threshold=1)
+        with pytest.raises(urllib.error.HTTPError):
+            transport.Execute(call)
+        assert FaultHandler.hits == 1
+        assert transport.breaker.GetState() == BREAKER_CLOSED
+    finally:
+        server.shutdown()
+
+def test_non_idempotent_calls_only_retry_explicit_refusals():
+    server, call = start_server([503, 500])
+    try:
+        transport = make_transport()
+        with pytest.raises(urllib.error.HTTPError):
+            transport.Execute(call, idempotent=False)
+        # 503 was resent, the 500 (maybe applied) was not
+        assert FaultHandler.hits == 2
+    finally:
+        server.shutdown()
+
+def test_breaker_opens_then_half_open_probe_recovers():
+    server, call = start_server([503] * 6)
+    try:
+        clock = FakeClock()
+        transitions = []
+        transport = make_transport(clock=clock, failure_threshold=3, recovery_seconds=30)
+        transport.breaker.AddListener(lambda old, new: transitions.append(new))
+
+        # Three consecutive failures open the breaker mid-call
+        with pytest.raises(CircuitOpenError):
+            transport.Execute(call)
+        assert FaultHandler.hits == 3
+        assert transport.breaker.GetState() == BREAKER_OPEN
+
+        # While open, calls fail fast without touching the server
+        with pytest.raises(CircuitOpenError):
+            transport.Execute(call)
+        assert FaultHandler.hits == 3
+        assert transport.GetMetrics()['rejected_open'] == 2
+
+        # Recovery period over: one probe goes out; it fails, so the wait doubles
+        clock.now += 30
+        assert transport.breaker.GetState() == BREAKER_HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            transport.Execute(call)
+        assert FaultHandler.hits == 4
+        assert transport.breaker.recovery_seconds == 60
+
+        clock.now += 30
+        assert transport.breaker.GetState() == BREAKER_OPEN
+        clock.now += 30
+        FaultHandler.script = []
+        assert transport.Execute(call) == {'ok': True}
+        assert transport.breaker.GetState() == BREAKER_CLOSED
+        assert transport.breaker.recovery_seconds == 30
+        assert transitions == [BREAKER_OPEN, BREAKER_HALF_OPEN, BREAKER_OPEN, BREAKER_HALF_OPEN, BREAKER_CLOSED]
+    finally:
+        server.shutdown()
+
+def test_only_one_probe_while_half_open():
+    clock = FakeClock()
+    breaker = CircuitBreaker('sheets', failure_threshold=1, recovery_seconds=10, clock=clock)
+    breaker.RecordFailure()
+    assert not breaker.AllowRequest()
+    clock.now += 10
+    assert breaker.AllowRequest()
+    assert not breaker.AllowRequest()
+    breaker.ReleaseProbe()
+    assert breaker.AllowRequest()
+
+def test_deadline_stops_retrying():
+    server, call = start_server([503] * 100)
+    try:
+        transport = ResilientTransport('drive', policy=RetryPolicy(max_attempts=100, base_delay=0.05, max_delay=0.05),
+                                       breaker=CircuitBreaker('drive', failure_threshold=1000),
+                                       deadline_seconds=0.3)
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            transport.Execute(call)
+        assert time.monotonic() - started < 1.0
+        assert transport.GetMetrics()['deadline_exceeded'] == 1
+    finally:
+        server.shutdown()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# File: test_response_cache.py
+# Path: AndyGoogle/Source/Tests/test_response_cache.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-19  03:52AM
+"""
+Description: Tests for the generation-keyed ResponseCacheMiddleware
+Drives the middleware directly over ASGI with a counting stand-in endpoint
+"""
+
+import os
+import sys
+import asyncio
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from API.ResponseCache import ResponseCache, ResponseCacheMiddleware
+
+class CountingApp:
+    """ASGI endpoint that returns a JSON body and counts invocations"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        scope.setdefault('state', {})['usage_action'] = 'categories_list'
+        body = b'[{"id":1,"category":"Accounting"}]'
+        await send({'type': 'http.response.start', 'status': 200,
+                    'headers': [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]})
+        await send({'type': 'http.response.body', 'body': body})
+
+class NotFoundApp:
+    """ASGI endpoint for an unknown book"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        await send({'type': 'http.response.start', 'status': 404, 'headers': [(b"content-type", b"application/json")]})
+        await send({'type': 'http.response.body', 'body': b'{"detail":"Book not found"}'})
+
+def request(middleware, path="/api/categories", query=b"", headers=None, method="GET"):
+    """Send one request through the middleware; returns (status, headers, body, scope)"""
+    scope = {'type': 'http', 'method': method, 'path': path, 'query_string': query,
+             'headers': [(name.encode(), value.encode()) for name, value in (headers or {}).items()]}
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b"", 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(middleware(scope, receive, send))
+    start = messages[0]
+    body = b"".join(message.get('body', b"") for message in messages[1:])
+    return start['status'], {name.decode(): value.decode() for name, value in start['headers']}, body, scope
+
+def build(generation=("gen_000001.db:abc", 1700000000.0)):
+    app = CountingApp()
+    current = {'generation': generation}
+    middleware = ResponseCacheMiddleware(app, ResponseCache(), lambda: current['generation'])
+    return app, middleware, current
+
+def test_second_request_served_from_cache_with_same_etag():
+    app, middleware, _ = build()
+    status, headers, body, _ = request(middleware)
+    assert status == 200 and headers['cache-control'] == 'no-cache'
+
+    status_again, headers_again, body_again, scope = request(middleware)
+    assert app.calls == 1
+    assert (status_again, body_again) == (200, body)
+    assert headers_again['etag'] == headers['etag']
+    assert scope['state']['usage_action'] == 'categories_list'
+
+def test_if_none_match_returns_304_until_generation_changes():
+    app, middleware, current = build()
+    _, headers, _, _ = request(middleware)
+
+    status, _, body, _ = request(middleware, headers={'If-None-Match': headers['etag']})
+    assert (status, body) == (304, b"")
+
+    current['generation'] = ("gen_000002.db:def", 1700000100.0)
+    status, new_headers, _, _ = request(middleware, headers={'If-None-Match': headers['etag']})
+    assert status == 200
+    assert new_headers['etag'] != headers['etag']
+    assert app.calls == 2
+
+def test_query_order_is_normalized_and_streaming_paths_bypass():
+    app, middleware, _ = build()
+    _, first, _, _ = request(middleware, path="/api/subjects", query=b"category_id=1&x=2")
+    _, second, _, _ = request(middleware, path="/api/subjects", query=b"x=2&category_id=1")
+    assert first['etag'] == second['etag']
+    assert app.calls == 1
+
+    _, headers, _, _ = request(middleware, path="/api/books/export")
+    assert 'etag' not in headers
+    _, headers, _, _ = request(middleware, path="/api/stats")
+    assert 'etag' not in headers
+
+def test_no_generation_means_no_caching():
+    app, middleware, current = build(generation=None)
+    request(middleware)
+    _, headers, _, _ = request(middleware)
+    assert app.calls == 2
+    assert 'etag' not in headers
+
+def test_wildcard_and_if_modified_since_need_an_existing_representation():
+    app = NotFoundApp()
+    middleware = ResponseCacheMiddleware(app, ResponseCache(), lambda: ("gen_000001.db:abc", 1700000000.0))
+    for headers in ({'If-None-Match': '*'}, {'If-Modified-Since': "Fri, 01 Jan 2100 00:00:00 GMT"}):
+        status, _, body, _ = request(middleware, path="/api/books/999999", headers=headers)
+        assert status == 404 and b"not found" in body
+    assert app.calls == 2
+
+    # Once a 200 is cached, both validators revalidate without running the endpoint
+    app, middleware, _ = build()
+    request(middleware)
+    for headers in ({'If-None-Match': '*'}, {'If-Modified-Since': "Fri, 01 Jan 2100 00:00:00 GMT"}):
+        status, _, _, _ = request(middleware, headers=headers)
+        assert status == 304
+    status, _, _, _ = request(middleware, headers={'If-None-Match': '"someone-elses-etag"'})
+    assert status == 200
+    assert app.calls == 1
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# File: test_resumable_upload.py
+# Path: AndyGoogle/Source/Tests/test_resumable_upload.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  10:08PM
+"""
+Description: Tests for resumable Drive uploads and the transfer codecs
+Runs a local stand-in for the Drive resumable upload protocol that can fail chunks,
+drop connections and forget sessions, to exercise retries and persisted resume
+"""
+
+import os
+import sys
+import json
+import hashlib
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from API import TransferCodecs
+from API.ResumableUploader import ResumableUploader, UploadError, UPLOAD_GRANULARITY
+from API.TransferCodecs import (ResolveCodec, CompressFile, DecompressFile, CodecError,
+                                CODEC_GZIP, CODEC_ZSTD, CODEC_IDENTITY)
+
+CHUNK_SIZE = UPLOAD_GRANULARITY
+PAYLOAD = os.urandom(5 * CHUNK_SIZE + 777)
+PAYLOAD_MD5 = hashlib.md5(PAYLOAD).hexdigest()
+
+class FakeUploadHandler(BaseHTTPRequestHandler):
+    """Minimal Drive resumable upload endpoint"""
+    protocol_version = "HTTP/1.1"
+    sessions = {}           # session id -> {'metadata', 'data'}
+    fail_chunks = 0         # Answer this many chunk PUTs with 503
+    drop_chunks = 0         # Keep half of this many chunks, then cut the connection
+    expired = set()
+    requests_seen = []
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def Reply(self, status, headers=None, body=b""):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        with FakeUploadHandler.lock:
+            FakeUploadHandler.requests_seen.append(('POST', None))
+            session_id = str(len(FakeUploadHandler.sessions) + 1)
+            FakeUploadHandler.sessions[session_id] = {'metadata': json.loads(body), 'data': bytearray(),
+                                                      'total': int(self.headers['X-Upload-Content-Length'])}
+        self.Reply(200, {'Location': f"http://127.0.0.1:{self.server.server_address[1]}/upload/session/{session_id}"})
+
+    def do_PUT(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        session_id = self.path.rsplit('/', 1)[1]
+        content_range = self.headers['Content-Range']
+        with FakeUploadHandler.lock:
+            FakeUploadHandler.requests_seen.append(('PUT', content_range))
+            session = FakeUploadHandler.sessions.get(session_id)
+            if session is None or session_id in FakeUploadHandler.expired:
+                self.Reply(404)
+                return
+
+            if not content_range.startswith("bytes */") and body:
+                if FakeUploadHandler.fail_chunks:
+                    FakeUploadHandler.fail_chunks -= 1
+                    self.Reply(503)
+                    return
+                start = int(content_range.split(' ')[1].split('-')[0])
+                assert start == len(session['data']), "chunk does not continue the upload"
+                if FakeUploadHandler.drop_chunks:
+                    FakeUploadHandler.drop_chunks -= 1
+                    session['data'].extend(body[:len(body) // 2])
+                    self.close_connection = True
+                    self.connection.shutdown(2)
+                    return
+                session['data'].extend(body)
+
+            received = len(session['data'])
+            if received >= session['total']:
+                resource = {'id': f"file-{session_id}", 'name': session['metadata'].get('name'),
+                            'size': str(received), 'md5Checksum': hashlib.md5(session['data']).hexdigest()}
+                self.Reply(200, {'Content-Type': 'application/json'}, json.dumps(resource).encode())
+            elif received:
+                self.Reply(308, {'Range': f"bytes=0-{received - 1}"})
+            else:
+                self.Reply(308)
+
+def start_server():
+    """Start the stand-in on a free port"""
+    FakeUploadHandler.sessions = {}
+    FakeUploadHandler.fail_chunks = 0
+    FakeUploadHandler.drop_chunks = 0
+    FakeUploadHandler.expired = set()
+    FakeUploadHandler.requests_seen = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeUploadHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/upload/drive/v3/files?uploadType=resumable"
+
+def write_payload(temp_dir, payload=PAYLOAD):
+    path = os.path.join(temp_dir, "library.db")
+    with open(path, 'wb') as f:
+        f.write(payload)
+    return path
+
+def make_uploader(url, **kwargs):
+    options = {'chunk_size': CHUNK_SIZE, 'retry_delay': 0.01}
+    options.update(kwargs)
+    return ResumableUploader(url, headers_provider=lambda: {'Authorization': 'Bearer test'}, **options)
+
+def test_uploads_in_chunks():
+    server, url = start_server()
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = write_payload(temp_dir)
+            progress = []
+            result = make_uploader(url).Upload(path, {'name': "library.db"}, 'application/x-sqlite3', "key",
+                                               progress_callback=lambda done, total: progress.append(done))
+
+            assert result['file']['md5Checksum'] == PAYLOAD_MD5
+            assert result['resumed_from'] == 0
+            assert bytes(FakeUploadHandler.sessions['1']['data']) == PAYLOAD
+            assert FakeUploadHandler.sessions['1']['metadata'] == {'name': "library.db"}
+            assert len(FakeUploadHandler.requests_seen) == 1 + 6
+            assert progress == [CHUNK_SIZE * n for n in range(1, 6)]
+            assert not os.path.exists(path + ".upload.json")
+    finally:
+        server.shutdown()
+
+def test_failed_and_dropped_chunks_continue_from_drive_offset():
+    server, url = start_server()
+    try:
+        FakeUploadHandler.fail_chunks = 1
+        FakeUploadHandler.drop_chunks = 1
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = write_payload(temp_dir)
+            result = make_uploader(url).Upload(path, {'name': "library.db"}, 'application/x-sqlite3', "key")
+
+            assert result['file']['md5Checksum'] == PAYLOAD_MD5
+            # The dropped chunk is re-sent from the half Drive kept, after asking
+            queries = [content_range for method, content_range in FakeUploadHandler.requests_seen
+                       if content_range == f"bytes */{len(PAYLOAD)}"]
+            assert len(queries) == 2
+            assert any(content_range.startswith(f"bytes {CHUNK_SIZE // 2}-")
+                       for _, content_range in FakeUploadHandler.requests_seen if content_range)
+    finally:
+        server.shutdown()
+
+def test_saved_session_resumes_in_a_new_process():
+    server, url = start_server()
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = write_payload(temp_dir)
+
+            # First attempt: two chunks land, then Drive keeps failing
+            uploader = make_uploader(url, max_retries=0)
+            original_send = uploader.SendChunk
+            sent = []
+
+            def fail_after_two(*args):
+                if len(sent) == 2:
+                    FakeUploadHandler.fail_chunks = 100
+                sent.append(args)
+                return original_send(*args)
+
+            uploader.SendChunk = fail_after_two
+            with pytest.raises(UploadError):
+                uploader.Upload(path, {'name': "library.db"}, 'application/x-sqlite3', "key")
+            assert os.path.exists(path + ".upload.json")
+
+            FakeUploadHandler.fail_chunks = 0
+            FakeUploadHandler.requests_seen = []
+            result = make_uploader(url).Upload(path, {'name': "library.db"}, 'application/x-sqlite3', "key")
+
+            assert result['resumed_from'] == 2 * CHUNK_SIZE
+            assert result['file']['md5Checksum'] == PAYLOAD_MD5
+            assert ('POST', None) not in FakeUploadHandler.requests_seen
+            assert len(FakeUploadHandler.sessions) == 1
+    finally:
+        server.shutdown()
+
+def test_expired_or_foreign_session_starts_over():
+    server, url = start_server()
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = write_payload(temp_dir)
+            uploader = make_uploader(url)
+
+            # Session Drive has forgotten
+            session_uri = uploader.StartSession('POST', {'name': "library.db"}, 'application/x-sqlite3', len(PAYLOAD))
+            FakeUploadHandler.expired.add('1')
+            uploader.SaveSession(path + ".upload.json", "key", session_uri)
+            result = uploader.Upload(path, {'name': "library.db"}, 'application/x-sqlite3', "key")
+            assert result['file']['id'] == "file-2"
+            assert result['resumed_from'] == 0
+
+            # Session saved for different content is never resumed
+            uploader.SaveSession(path + ".upload.json", "old-content", session_uri)
+            result = uploader.Upload(path, {'name': "library.db"}, 'application/x-sqlite3', "key")
+            assert result['file']['id'] == "file-3"
+    finally:
+        server.shutdown()
+
+def test_gzip_round_trip_is_deterministic():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source = write_payload(temp_dir, b"AndyGoogle page " * 50000)
+        first, second = source + ".1.gz", source + ".2.gz"
+        size = CompressFile(source, first, CODEC_GZIP)
+        CompressFile(source, second, CODEC_GZIP)
+
+        assert size == os.path.getsize(first) < os.path.getsize(source) // 10
+        with open(first, 'rb') as f1, open(second, 'rb') as f2:
+            assert f1.read() == f2.read()
+
+        restored = source + ".restored"
+        with open(source, 'rb') as f:
+            assert DecompressFile(first, restored, CODEC_GZIP) == hashlib.md5(f.read()).hexdigest()
+
+def test_zstd_round_trip():
+    pytest.importorskip("zstandard")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source = write_payload(temp_dir, b"AndyGoogle page " * 50000)
+        CompressFile(source, source + ".zst", CODEC_ZSTD)
+        with open(source, 'rb') as f:
+            assert DecompressFile(source + ".zst", source + ".out", CODEC_ZSTD) == hashlib.md5(f.read()).hexdigest()
+
+def test_codec_resolution_and_corrupt_payloads(monkeypatch):
+    assert ResolveCodec(None) == CODEC_IDENTITY
+    assert ResolveCodec("none") == CODEC_IDENTITY
+    assert ResolveCodec("GZIP") == CODEC_GZIP
+    monkeypatch.setattr(TransferCodecs, "zstandard", None)
+    assert ResolveCodec("zstd") == CODEC_GZIP
+    with pytest.raises(CodecError):
+        ResolveCodec("brotli")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source = write_payload(temp_dir, b"not gzip at all")
+        with pytest.raises(CodecError):
+            DecompressFile(source, source + ".out", CODEC_GZIP)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# File: test_search_index.py
+# Path: AndyGoogle/Source/Tests/test_search_index.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  02:06AM
+"""
+Description: Tests for the FTS5 search sidecar and ranked search
+Covers quoting of FTS5 syntax in user input, BM25 ordering, prefix matching, filters
+shared with the unranked fallback, and rebuilding the sidecar when a generation is installed
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Core.SearchIndex import (SearchIndex, BuildMatchExpression, SearchBooks, SearchBooksByTitle, MatchBookIds,
+                              UnsupportedFilterError, SEARCH_SCHEMA)
+from Core.DatabaseGenerations import GenerationStore
+
+BOOKS = [
+    (1, "Astronomy for Beginners", "Carl Jones", 1, 1, 5),
+    (2, "Gardening Basics", "Astrid Berg", 2, 2, 3),
+    (3, "Cooking With Stars", "Bea Cook", 2, 3, 4),
+    (4, "The Astronomer's Notebook", "Dan Reed", 1, 1, 2),
+    (5, "Say \"Hello\" - NEAR and Far", "Eve Quote", 2, 2, 1),
+]
+
+def build_library(path, books=BOOKS, with_rating=True):
+    """Small catalog with categories, subjects and (optionally) ratings"""
+    conn = sqlite3.connect(path)
+    rating_column = ", rating INTEGER" if with_rating else ""
+    conn.executescript(f"""
+        CREATE TABLE categories (id INTEGER PRIMARY KEY, category TEXT NOT NULL);
+        CREATE TABLE subjects (id INTEGER PRIMARY KEY, category_id INTEGER, subject TEXT NOT NULL);
+        CREATE TABLE books (id INTEGER PRIMARY KEY, title TEXT NOT NULL, author TEXT,
+                            category_id INTEGER, subject_id INTEGER{rating_column});
+        INSERT INTO categories VALUES (1, 'Science'), (2, 'Home');
+        INSERT INTO subjects VALUES (1, 1, 'Astronomy'), (2, 2, 'Garden'), (3, 2, 'Kitchen');
+    """)
+    if with_rating:
+        conn.executemany("INSERT INTO books VALUES (?, ?, ?, ?, ?, ?)", books)
+    else:
+        conn.executemany("INSERT INTO books VALUES (?, ?, ?, ?, ?)", [book[:5] for book in books])
+    conn.commit()
+    conn.close()
+
+def open_with_index(db_path):
+    """Connection shaped like a pooled one: library in main, sidecar attached as search"""
+    assert SearchIndex(db_path).EnsureBuilt()
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"ATTACH DATABASE ? AS {SEARCH_SCHEMA}", (SearchIndex.GetIndexPath(db_path),))
+    return conn
+
+def test_match_expression_quotes_fts_syntax():
+    assert BuildMatchExpression('say "hi"') == '"say"* "hi"*'
+    assert BuildMatchExpression("astro* -garden") == '"astro"* "garden"*'
+    assert BuildMatchExpression("NEAR(a b)") == '"NEAR"* "a"* "b"*'
+    assert BuildMatchExpression(' "* - ') is None
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "library.db")
+        build_library(db_path)
+        conn = open_with_index(db_path)
+        try:
+            # Operators in user input are searched for as words, never parsed
+            for query in ('"Hello', 'hello*', '-near', 'NEAR', 'NEAR(say far)', 'AND OR NOT'):
+                SearchBooks(conn, query)
+            assert MatchBookIds(conn, 'say "hello" NEAR') == [5]
+        finally:
+            conn.close()
+
+def test_bm25_ranks_title_matches_first_and_prefixes_match():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "library.db")
+        build_library(db_path)
+        conn = open_with_index(db_path)
+        try:
+            # "astr" prefix-matches two titles (weighted 10) and an author (5)
+            rows, total = SearchBooks(conn, "astr")
+            assert total == 3
+            assert [row['id'] for row in rows][-1] == 2          # Author-only match ranks last
+            assert set(row['id'] for row in rows[:2]) == {1, 4}
+            assert rows[0]['score'] >= rows[-1]['score']
+            assert "<mark>" in rows[0]['title_highlight']
+
+            rows, total = SearchBooks(conn, "astr", limit=1, offset=1)
+            assert len(rows) == 1 and total == 3
+        finally:
+            conn.close()
+
+def test_filters_apply_to_ranked_and_fallback_search_alike():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "library.db")
+        build_library(db_path)
+        conn = open_with_index(db_path)
+        try:
+            for search in (SearchBooks, SearchBooksByTitle):
+                rows, total = search(conn, "astronom", category="Science", min_rating=4)
+                assert [row['id'] for row in rows] == [1] and total == 1
+                rows, _ = search(conn, "basics", subject="Garden")
+                assert [row['id'] for row in rows] == [2]
+        finally:
+            conn.close()
+
+        unrated_path = os.path.join(temp_dir, "unrated.db")
+        build_library(unrated_path, with_rating=False)
+        conn = open_with_index(unrated_path)
+        try:
+            for search in (SearchBooks, SearchBooksByTitle):
+                with pytest.raises(UnsupportedFilterError):
+                    search(conn, "basics", min_rating=3)
+                assert search(conn, "basics")[1] == 1
+        finally:
+            conn.close()
+
+def test_sidecar_is_rebuilt_for_each_installed_generation():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = GenerationStore(os.path.join(temp_dir, "cached_library.db"))
+
+        staged = os.path.join(temp_dir, "staged.db")
+        build_library(staged)
+        first = store.Install(staged)
+        assert SearchIndex(first).IsCurrent()
+
+        build_library(staged, BOOKS + [(6, "Astrophysics Now", "Fay Lee", 1, 1, 5)])
+        second = store.Install(staged)
+        assert SearchIndex(second).IsCurrent()
+        conn = open_with_index(second)
+        try:
+            assert 6 in MatchBookIds(conn, "astrophysics")
+        finally:
+            conn.close()
+
+        # A changed library file makes its sidecar stale until rebuilt
+        with sqlite3.connect(second) as conn:
+            conn.execute("INSERT INTO books VALUES (7, 'Late Addition', NULL, 1, 1, 1)")
+        conn.close()
+        assert not SearchIndex(second).IsCurrent()
+        assert SearchIndex(second).EnsureBuilt() and SearchIndex(second).IsCurrent()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# File: test_segment_log.py
+# Path: AndyGoogle/Source/Tests/test_segment_log.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  03:58AM
+"""
+Description: Tests for the rotated JSONL segment log behind SheetsLogger
+Covers rotation and pruning (including the upload cursor clamp), torn-line repair,
+range reads across segments, cursor persistence and legacy log migration
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Utils.SegmentLog import SegmentLog, CURSOR_FILENAME
+
+def entries(first, count):
+    return [{'n': n} for n in range(first, first + count)]
+
+def segment_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".jsonl"))
+
+def test_rotation_prunes_oldest_segment_and_clamps_cursor():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log = SegmentLog(temp_dir, max_segment_entries=2, max_segments=3)
+        assert log.Append(entries(0, 6)) == 6
+        assert segment_files(temp_dir) == ["000000000000.jsonl", "000000000002.jsonl", "000000000004.jsonl"]
+        assert log.GetPendingCount() == 6
+
+        # The fourth segment pushes out the first; its two entries were never uploaded
+        log.Append(entries(6, 1))
+        assert segment_files(temp_dir) == ["000000000002.jsonl", "000000000004.jsonl", "000000000006.jsonl"]
+        assert log.uploaded_seq == 2
+        assert log.GetPendingCount() == 5
+        with open(os.path.join(temp_dir, CURSOR_FILENAME)) as f:
+            assert json.load(f) == {'uploaded_seq': 2}
+        log.Close()
+
+def test_read_range_crosses_segments_and_honours_limit():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log = SegmentLog(temp_dir, max_segment_entries=3, max_segments=10)
+        log.Append(entries(0, 10))
+
+        assert log.ReadRange(2, limit=4) == (entries(2, 4), 6)
+        assert log.ReadRange(8) == (entries(8, 2), 10)
+        assert log.ReadRange(10) == ([], 10)
+        assert [entry['n'] for entry in log.IterateEntries()] == list(range(10))
+
+        pending, upto = log.ReadPending(limit=5)
+        assert pending == entries(0, 5)
+        log.CommitUploaded(upto)
+        assert log.ReadPending() == (entries(5, 5), 10)
+        log.Close()
+
+def test_cursor_and_sequence_survive_reopen():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log = SegmentLog(temp_dir, max_segment_entries=4)
+        log.Append(entries(0, 6))
+        log.CommitUploaded(log.ReadPending(limit=3)[1])
+        log.Close()
+
+        log = SegmentLog(temp_dir, max_segment_entries=4)
+        assert (log.next_seq, log.uploaded_seq, log.active_entries) == (6, 3, 2)
+        assert log.ReadPending() == (entries(3, 3), 6)
+
+        # New entries continue the sequence in the partly filled segment
+        assert log.Append(entries(6, 2)) == 8
+        assert segment_files(temp_dir) == ["000000000000.jsonl", "000000000004.jsonl"]
+        log.Close()
+
+        # A cursor ahead of the log (e.g. segments deleted by hand) is pulled back
+        with open(os.path.join(temp_dir, CURSOR_FILENAME), 'w') as f:
+            json.dump({'uploaded_seq': 999}, f)
+        log = SegmentLog(temp_dir, max_segment_entries=4)
+        assert log.uploaded_seq == 8 and log.GetPendingCount() == 0
+        log.Close()
+
+def test_torn_final_line_is_dropped_on_reopen():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log = SegmentLog(temp_dir, max_segment_entries=10)
+        log.Append(entries(0, 3))
+        log.Close()
+
+        segment_path = log.GetSegmentPath(0)
+        with open(segment_path, 'a') as f:
+            f.write('{"n": 3, "message": "cut sho')
+
+        log = SegmentLog(temp_dir, max_segment_entries=10)
+        assert log.next_seq == 3
+        with open(segment_path, 'rb') as f:
+            assert f.read().endswith(b"}\n")
+        assert log.RepairAndCountLines(segment_path) == 3
+
+        log.Append(entries(3, 1))
+        assert log.ReadRange(0) == (entries(0, 4), 4)
+        log.Close()
+
+def write_legacy_log(path, flags):
+    with open(path, 'w') as f:
+        json.dump({'entries': [{'n': n, 'uploaded': flag} for n, flag in enumerate(flags)]}, f)
+
+def test_migration_marks_only_the_uploaded_prefix():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        legacy_path = os.path.join(temp_dir, "sheets_log.json")
+        # The stray flag after the first pending entry does not count as uploaded
+        write_legacy_log(legacy_path, [True, True, False, True, False])
+
+        log = SegmentLog(os.path.join(temp_dir, "segments"))
+        assert log.MigrateLegacyLog(legacy_path) == 5
+        assert log.GetPendingCount() == 3
+        assert log.ReadPending() == (entries(2, 3), 5)
+        assert os.path.exists(legacy_path + ".migrated") and not os.path.exists(legacy_path)
+        assert log.MigrateLegacyLog(legacy_path) == 0
+        log.Close()
+
+def test_migration_behind_pending_entries_keeps_everything_pending():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        legacy_path = os.path.join(temp_dir, "sheets_log.json")
+        write_legacy_log(legacy_path, [True, True, False])
+
+        # The cursor cannot skip the legacy prefix without skipping the entry already waiting
+        log = SegmentLog(os.path.join(temp_dir, "segments"))
+        log.Append([{'n': 'new'}])
+        log.MigrateLegacyLog(legacy_path)
+        assert log.GetPendingCount() == 4
+        assert log.ReadPending()[0] == [{'n': 'new'}] + entries(0, 3)
+        log.Close()
+
+def test_unreadable_lines_are_skipped_but_counted():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log = SegmentLog(temp_dir, max_segment_entries=10)
+        log.Append(entries(0, 2))
+        log.Close()
+
+        # A garbled (but newline-terminated) line between two good ones
+        with open(log.GetSegmentPath(0), 'a') as f:
+            f.write('{"n": 2, "mess\n')
+
+        log = SegmentLog(temp_dir, max_segment_entries=10)
+        log.Append(entries(3, 1))
+        pending, upto = log.ReadPending()
+        assert pending == [{'n': 0}, {'n': 1}, {'n': 3}]
+        assert upto == 4
+        log.CommitUploaded(upto)
+        assert log.GetPendingCount() == 0
+        log.Close()
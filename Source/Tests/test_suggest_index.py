@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# File: test_suggest_index.py
+# Path: AndyGoogle/Source/Tests/test_suggest_index.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  06:15PM
+"""
+Description: Tests for the /api/suggest prefix index and superseded-request tracking
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Core.CatalogSnapshot import CatalogSnapshot
+from Core.SuggestIndex import SuggestIndex, SupersededRequestTracker, SCAN_LIMIT
+from Tests.benchmark_database_pool import build_sample_database
+
+def build_small_library(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE categories (id INTEGER PRIMARY KEY, category TEXT NOT NULL UNIQUE);
+        CREATE TABLE subjects (id INTEGER PRIMARY KEY, category_id INTEGER, subject TEXT NOT NULL);
+        CREATE TABLE books (id INTEGER PRIMARY KEY, title TEXT NOT NULL, category_id INTEGER, subject_id INTEGER);
+        INSERT INTO categories VALUES (1, 'Programming'), (2, 'Chess');
+        INSERT INTO subjects VALUES (1, 1, 'Python'), (2, 2, 'Openings');
+        INSERT INTO books VALUES
+            (1, 'Python Crash Course', 1, 1),
+            (2, 'Fluent Python', 1, 1),
+            (3, 'Programming Pearls', 1, NULL),
+            (4, 'Modern Chess Openings', 2, 2),
+            (5, 'Café Society', NULL, NULL);
+    """)
+    conn.commit()
+    conn.close()
+
+def build_index(temp_dir):
+    db_path = os.path.join(temp_dir, "library.db")
+    build_small_library(db_path)
+    return SuggestIndex.Build(CatalogSnapshot.Build(db_path))
+
+def test_prefix_matches_entry_starts_before_inner_words():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        index = build_index(temp_dir)
+        suggestions = index.Suggest("pyt")
+        texts = [suggestion['text'] for suggestion in suggestions]
+
+        assert texts[0] == "Python"                     # Subject covering two books
+        assert texts.index("Python Crash Course") < texts.index("Fluent Python")
+        assert suggestions[0]['kind'] == 'subject' and suggestions[0]['count'] == 2
+        assert next(s for s in suggestions if s['text'] == "Fluent Python")['book_id'] == 2
+
+def test_case_accents_and_multiword_prefixes():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        index = build_index(temp_dir)
+        assert [s['text'] for s in index.Suggest("CAFE")] == ["Café Society"]
+        assert [s['text'] for s in index.Suggest("chess op")] == ["Modern Chess Openings"]
+        assert index.Suggest("nothing like this") == []
+        assert index.Suggest("   ") == []
+
+def test_dense_prefixes_use_precomputed_lists_and_stay_fast():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "large.db")
+        build_sample_database(db_path, SCAN_LIMIT * 3)
+        index = SuggestIndex.Build(CatalogSnapshot.Build(db_path))
+        assert "b" in index.top_by_prefix
+
+        start = time.perf_counter()
+        for _ in range(100):
+            suggestions = index.Suggest("book", limit=5)
+        assert (time.perf_counter() - start) / 100 < 0.001
+        assert [s['text'] for s in suggestions] == [f"Book Title {i:07d}" for i in range(5)]
+
+def test_older_keystrokes_are_superseded():
+    tracker = SupersededRequestTracker(max_sessions=2)
+    assert tracker.Begin("tab-a", 1)
+    assert tracker.Begin("tab-a", 3)
+    assert not tracker.Begin("tab-a", 2)
+    assert not tracker.IsCurrent("tab-a", 1)
+    assert tracker.IsCurrent("tab-a", 3)
+
+    # Requests without a session are never superseded; old sessions are evicted
+    assert tracker.Begin(None, None)
+    tracker.Begin("tab-b", 1)
+    tracker.Begin("tab-c", 1)
+    assert "tab-a" not in tracker.latest
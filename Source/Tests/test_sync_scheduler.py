@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# File: test_sync_scheduler.py
+# Path: AndyGoogle/Source/Tests/test_sync_scheduler.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  03:04PM
+"""
+Description: Tests for the background SyncScheduler
+Uses a stand-in DriveManager whose sync blocks on an event, so concurrent requests
+can be shown to coalesce into a single job
+"""
+
+import os
+import sys
+import time
+import asyncio
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Core.SyncScheduler import SyncScheduler
+
+class FakeDriveManager:
+    """Just enough of DriveManager for the scheduler"""
+
+    def __init__(self, update_available=False, sync_result=True):
+        self.auto_sync_enabled = True
+        self.update_available = update_available
+        self.sync_result = sync_result
+        self.release_sync = threading.Event()
+        self.sync_calls = []
+        self.check_calls = 0
+
+    def CheckForUpdates(self):
+        self.check_calls += 1
+        return {'update_available': self.update_available, 'local_version': '1.0.0',
+                'remote_version': '1.0.1' if self.update_available else '1.0.0', 'offline_mode': False}
+
+    def SyncDatabaseFromDrive(self, force_download=False):
+        self.sync_calls.append(force_download)
+        self.release_sync.wait(5)
+        return self.sync_result
+
+    def GetLocalVersionInfo(self):
+        return {'last_sync': '2999-01-01T00:00:00'}
+
+def test_concurrent_requests_share_one_job():
+    async def scenario():
+        manager = FakeDriveManager()
+        scheduler = SyncScheduler(manager)
+
+        jobs = await asyncio.gather(*(scheduler.RequestSync(trigger='manual') for _ in range(5)))
+        assert len({job['job_id'] for job in jobs}) == 1
+        assert scheduler.GetStatus()['current_job']['coalesced_requests'] == 4
+
+        manager.release_sync.set()
+        finished = await scheduler.WaitForJob()
+        await scheduler.Stop()
+        return manager, finished
+
+    manager, finished = asyncio.run(scenario())
+    assert manager.sync_calls == [True]
+    assert finished['state'] == 'succeeded'
+
+def test_failed_sync_is_reported_and_next_request_starts_new_job():
+    async def scenario():
+        manager = FakeDriveManager(sync_result=False)
+        manager.release_sync.set()
+        scheduler = SyncScheduler(manager)
+
+        first = await scheduler.RequestSync()
+        failed = await scheduler.WaitForJob()
+        second = await scheduler.RequestSync()
+        await scheduler.WaitForJob()
+        await scheduler.Stop()
+        return first, failed, second
+
+    first, failed, second = asyncio.run(scenario())
+    assert failed['state'] == 'failed'
+    assert second['job_id'] == first['job_id'] + 1
+
+def test_periodic_check_triggers_sync_when_update_available():
+    async def scenario():
+        manager = FakeDriveManager(update_available=True)
+        manager.release_sync.set()
+        scheduler = SyncScheduler(manager, version_check_interval_hours=1, initial_delay_seconds=0.01)
+        await scheduler.Start()
+
+        deadline = time.monotonic() + 2
+        while scheduler.last_job is None and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+
+        status = scheduler.GetStatus()
+        await scheduler.Stop()
+        return manager, status
+
+    manager, status = asyncio.run(scenario())
+    assert manager.check_calls == 1
+    assert manager.sync_calls == [True]
+    assert status['last_job']['trigger'] == 'update_available'
+    assert status['last_check']['remote_version'] == '1.0.1'
+    assert status['scheduler_running']
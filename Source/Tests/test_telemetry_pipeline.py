@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# File: test_telemetry_pipeline.py
+# Path: AndyGoogle/Source/Tests/test_telemetry_pipeline.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  02:33AM
+"""
+Description: Tests for the bounded telemetry queue and its batching writer
+Covers the drop, sample and block backpressure policies, the dropped/flushed
+counters, and that Stop() flushes everything - including an event the drain task
+had already dequeued when it was cancelled
+"""
+
+import os
+import sys
+import asyncio
+import threading
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Utils.TelemetryPipeline import TelemetryPipeline
+
+class RecordingSink:
+    """Collects batches; optionally holds each write until released"""
+
+    def __init__(self, hold=False):
+        self.batches = []
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        if not hold:
+            self.release.set()
+
+    def __call__(self, batch):
+        self.entered.set()
+        self.release.wait(5)
+        self.batches.append(list(batch))
+
+    @property
+    def events(self):
+        return [event for batch in self.batches for event in batch]
+
+async def wait_until(condition):
+    for _ in range(500):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition never became true")
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        TelemetryPipeline(RecordingSink(), backpressure='queue')
+
+def test_drop_policy_counts_drops_and_stop_flushes():
+    sink = RecordingSink()
+    pipeline = TelemetryPipeline(sink, max_queue_size=2, batch_size=10)
+    assert not pipeline.Emit({'n': 'before start'})
+
+    async def scenario():
+        await pipeline.Start()
+        # No await between emits, so the drain task cannot make room
+        return [pipeline.Emit({'n': n}) for n in range(5)]
+
+    async def run():
+        accepted = await scenario()
+        await pipeline.Stop()
+        return accepted
+
+    assert asyncio.run(run()) == [True, True, False, False, False]
+    assert sink.events == [{'n': 0}, {'n': 1}]
+    counters = pipeline.GetCounters()
+    assert (counters['enqueued'], counters['dropped'], counters['flushed']) == (2, 4, 2)
+    assert not counters['running']
+
+def test_sample_policy_thins_events_above_high_water():
+    sink = RecordingSink()
+    pipeline = TelemetryPipeline(sink, max_queue_size=10, backpressure='sample',
+                                 sample_rate=0.0, sample_high_water=0.5)
+
+    async def run():
+        await pipeline.Start()
+        accepted = [pipeline.Emit({'n': n}) for n in range(8)]
+        await pipeline.Stop()
+        return accepted
+
+    assert asyncio.run(run()) == [True] * 5 + [False] * 3
+    counters = pipeline.GetCounters()
+    assert (counters['sampled_out'], counters['dropped'], counters['flushed']) == (3, 0, 5)
+
+def test_block_policy_waits_briefly_then_drops():
+    sink = RecordingSink(hold=True)
+    pipeline = TelemetryPipeline(sink, max_queue_size=1, batch_size=1, backpressure='block',
+                                 block_timeout_seconds=0.05)
+
+    async def run():
+        await pipeline.Start()
+        assert pipeline.Emit({'n': 0})
+        # Full queue: waits until the drain task takes event 0
+        assert await pipeline.EmitAsync({'n': 1})
+        await wait_until(sink.entered.is_set)
+        # The sink is stuck, so nothing frees the slot event 1 occupies
+        assert not await pipeline.EmitAsync({'n': 2})
+        sink.release.set()
+        await pipeline.Stop()
+
+    asyncio.run(run())
+    assert sink.events == [{'n': 0}, {'n': 1}]
+    counters = pipeline.GetCounters()
+    assert (counters['blocked'], counters['enqueued'], counters['dropped'], counters['flushed']) == (2, 2, 1, 2)
+
+def test_stop_during_burst_wait_keeps_the_dequeued_event():
+    sink = RecordingSink()
+    pipeline = TelemetryPipeline(sink, batch_size=10, flush_interval_seconds=2.0)
+
+    async def run():
+        await pipeline.Start()
+        pipeline.Emit({'n': 0})
+        # Let the drain task dequeue the event and start its burst sleep, then stop
+        await wait_until(lambda: pipeline.held_event is not None)
+        assert pipeline.queue.empty()
+        await pipeline.Stop()
+
+    asyncio.run(run())
+    assert sink.events == [{'n': 0}]
+    assert pipeline.GetCounters()['flushed'] == 1
+
+def test_sink_failures_count_as_dropped():
+    def failing_sink(batch):
+        raise OSError("disk full")
+
+    pipeline = TelemetryPipeline(failing_sink, batch_size=10)
+
+    async def run():
+        await pipeline.Start()
+        for n in range(3):
+            pipeline.Emit({'n': n})
+        await pipeline.Stop()
+
+    asyncio.run(run())
+    counters = pipeline.GetCounters()
+    assert (counters['sink_errors'], counters['dropped'], counters['flushed']) == (1, 3, 0)
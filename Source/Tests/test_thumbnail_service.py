@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# File: test_thumbnail_service.py
+# Path: AndyGoogle/Source/Tests/test_thumbnail_service.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-19  01:46AM
+"""
+Description: Tests for the thumbnail cache and the book file resolver
+Rendering is swapped for a counting stand-in so the cache, single-flight and
+failure handling can be checked without PyMuPDF or Pillow
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import asyncio
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Core.BookFiles import BookFileResolver
+from Core.ThumbnailService import ThumbnailService, ThumbnailUnavailable, RenderThumbnails
+
+class CountingRenderer:
+    """Stands in for RenderThumbnails; same-looking covers for every book"""
+
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+
+    def __call__(self, pdf_path, image_bytes, sizes, quality):
+        self.calls += 1
+        time.sleep(self.delay)
+        if pdf_path and pdf_path.endswith("broken.pdf"):
+            raise ThumbnailUnavailable("Document has no pages")
+        return {size: f"jpeg-{size}".encode() for size in sizes}
+
+def build_service(cache_directory, renderer):
+    return ThumbnailService(cache_directory, sizes=(120, 240), executor=ThreadPoolExecutor(2), renderer=renderer)
+
+def write_file(path, data=b"%PDF-1.7"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+def test_first_request_renders_all_sizes_then_hits_cache():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        renderer = CountingRenderer()
+        service = build_service(os.path.join(temp_dir, "cache"), renderer)
+        pdf_path = write_file(os.path.join(temp_dir, "books", "One.pdf"))
+
+        path, digest = asyncio.run(service.GetThumbnail(200, pdf_path=pdf_path))
+        with open(path, 'rb') as f:
+            assert f.read() == b"jpeg-240"
+
+        small_path, _ = asyncio.run(service.GetThumbnail(100, pdf_path=pdf_path))
+        assert asyncio.run(service.GetThumbnail(240, pdf_path=pdf_path)) == (path, digest)
+        assert renderer.calls == 1
+        assert service.GetStats()['hits'] == 2
+        assert small_path != path
+
+def test_identical_output_is_stored_once_and_changed_files_rerender():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        renderer = CountingRenderer()
+        service = build_service(os.path.join(temp_dir, "cache"), renderer)
+        first = write_file(os.path.join(temp_dir, "books", "A.pdf"))
+        second = write_file(os.path.join(temp_dir, "books", "B.pdf"))
+
+        path_a, _ = asyncio.run(service.GetThumbnail(120, pdf_path=first))
+        path_b, _ = asyncio.run(service.GetThumbnail(120, pdf_path=second))
+        assert path_a == path_b                      # Content-addressed
+        assert renderer.calls == 2
+
+        write_file(first, b"%PDF-1.7 revised")
+        asyncio.run(service.GetThumbnail(120, pdf_path=first))
+        assert renderer.calls == 3
+
+def test_concurrent_requests_share_one_render():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        renderer = CountingRenderer(delay=0.2)
+        service = build_service(os.path.join(temp_dir, "cache"), renderer)
+        pdf_path = write_file(os.path.join(temp_dir, "books", "Slow.pdf"))
+
+        async def run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while service.in_flight or ticks == 0:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            results = await asyncio.gather(
+                *(service.GetThumbnail(240, pdf_path=pdf_path) for _ in range(5)), ticker()
+            )
+            return results[:5], ticks
+
+        results, ticks = asyncio.run(run())
+        assert len(set(results)) == 1
+        assert renderer.calls == 1
+        assert ticks > 5                             # Event loop kept running during the render
+
+def test_unrenderable_sources_are_remembered():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        renderer = CountingRenderer()
+        service = build_service(os.path.join(temp_dir, "cache"), renderer)
+        pdf_path = write_file(os.path.join(temp_dir, "books", "broken.pdf"))
+
+        for _ in range(2):
+            with pytest.raises(ThumbnailUnavailable):
+                asyncio.run(service.GetThumbnail(120, pdf_path=pdf_path))
+        assert renderer.calls == 1
+
+def test_find_cached_never_renders():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        renderer = CountingRenderer()
+        service = build_service(os.path.join(temp_dir, "cache"), renderer)
+        pdf_path = write_file(os.path.join(temp_dir, "books", "One.pdf"))
+
+        assert service.FindCached(240, pdf_path=pdf_path) is None
+        assert renderer.calls == 0
+        rendered = asyncio.run(service.GetThumbnail(240, pdf_path=pdf_path))
+        assert service.FindCached(200, pdf_path=pdf_path) == rendered
+        assert renderer.calls == 1
+
+def test_corrupt_embedded_image_is_unavailable():
+    pytest.importorskip("PIL")
+    with pytest.raises(ThumbnailUnavailable):
+        RenderThumbnails(None, b"\x89PNG not really an image", (120,))
+
+def test_resolver_prefers_file_path_and_stays_inside_library():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        books_directory = os.path.join(temp_dir, "books")
+        by_category = write_file(os.path.join(books_directory, "Chess", "Endgames.pdf"))
+        by_file_name = write_file(os.path.join(books_directory, "endgames_v2.pdf"))
+        write_file(os.path.join(temp_dir, "secret.pdf"))
+        resolver = BookFileResolver(books_directory)
+
+        record = {'id': 1, 'title': "Endgames", 'category': "Chess", 'file_path': None}
+        assert resolver.ResolvePath(record) == os.path.realpath(by_category)
+
+        record['file_path'] = "/home/someone/Books/endgames_v2.pdf"
+        assert resolver.ResolvePath(record) == os.path.realpath(by_file_name)
+
+        assert resolver.ResolvePath({'title': "../secret", 'category': None, 'file_path': None}) is None
+        assert resolver.ResolvePath({'title': "x", 'category': None, 'file_path': "../secret.pdf"}) is None
+
+def test_resolver_reads_optional_columns():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        conn = sqlite3.connect(os.path.join(temp_dir, "library.db"))
+        conn.executescript("""
+            CREATE TABLE categories (id INTEGER PRIMARY KEY, category TEXT);
+            CREATE TABLE books (id INTEGER PRIMARY KEY, title TEXT, category_id INTEGER,
+                                FilePath TEXT, ThumbnailImage BLOB);
+            INSERT INTO categories VALUES (1, 'Chess');
+            INSERT INTO books VALUES (1, 'Endgames', 1, 'Chess/Endgames.pdf', x'FFD8FF');
+        """)
+        resolver = BookFileResolver(temp_dir)
+        record = resolver.GetBookRecord(conn, 1)
+        assert record == {'id': 1, 'title': 'Endgames', 'category': 'Chess',
+                          'file_path': 'Chess/Endgames.pdf', 'has_thumbnail': True}
+        assert resolver.GetEmbeddedThumbnail(conn, 1) == b"\xff\xd8\xff"
+        assert resolver.GetBookRecord(conn, 2) is None
+        conn.close()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# File: test_worker_supervisor.py
+# Path: AndyGoogle/Source/Tests/test_worker_supervisor.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  08:31PM
+"""
+Description: Tests for the multi-worker serving mode
+Runs a WorkerSupervisor over a tiny ASGI app that reports its worker pid, then checks
+rolling restarts (SIGHUP) replace every worker without the port going dark
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import signal
+import socket
+import types
+import threading
+import urllib.request
+import multiprocessing
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("uvicorn")
+
+from API.WorkerSupervisor import WorkerSupervisor, UsageRelay
+
+def build_main_api():
+    """Stand-in for API.MainAPI exposing the hooks the supervisor calls"""
+    settings = {}
+
+    async def app(scope, receive, send):
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    # MainAPI reports readiness at the end of its startup event
+                    os.write(settings['ready_fd'], b"1")
+                    os.close(settings['ready_fd'])
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message['type'] == 'lifespan.shutdown':
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+        body = json.dumps({'pid': os.getpid(), 'owner': settings['owns_background_duties']}).encode()
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [(b"content-type", b"application/json")]})
+        await send({'type': 'http.response.body', 'body': body})
+
+    def configure_worker(**kwargs):
+        settings.update(kwargs)
+
+    return types.SimpleNamespace(app=app, configure_worker=configure_worker, preload_catalog=lambda db_path: None)
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def fetch(port):
+    request = urllib.request.Request(f"http://127.0.0.1:{port}/", headers={'Connection': 'close'})
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return json.loads(response.read())
+
+def wait_until_serving(port, timeout=20.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            return fetch(port)
+        except OSError:
+            time.sleep(0.2)
+    raise AssertionError("supervisor never started serving")
+
+def collect_pids(port, requests=40):
+    return {fetch(port)['pid'] for _ in range(requests)}
+
+def run_supervisor(port):
+    WorkerSupervisor(build_main_api(), port=port, workers=2, graceful_timeout_seconds=5,
+                     log_level="warning", access_log=False).Run()
+
+def test_rolling_restart_replaces_workers_while_serving():
+    port = free_port()
+    supervisor = multiprocessing.get_context("fork").Process(target=run_supervisor, args=(port,))
+    supervisor.start()
+    try:
+        wait_until_serving(port)
+        first_pids = collect_pids(port)
+        assert supervisor.pid not in first_pids
+
+        # Keep requesting through the restart; every request must be answered
+        failures = []
+        stop = threading.Event()
+
+        def hammer():
+            while not stop.is_set():
+                try:
+                    fetch(port)
+                except OSError as e:
+                    failures.append(e)
+
+        client = threading.Thread(target=hammer)
+        client.start()
+        os.kill(supervisor.pid, signal.SIGHUP)
+
+        deadline = time.monotonic() + 30
+        new_pids = set()
+        while time.monotonic() < deadline:
+            new_pids = collect_pids(port, requests=10)
+            if not new_pids & first_pids:
+                break
+            time.sleep(0.2)
+        stop.set()
+        client.join()
+
+        assert new_pids and not new_pids & first_pids
+        assert failures == []
+    finally:
+        os.kill(supervisor.pid, signal.SIGTERM)
+        supervisor.join(20)
+        assert supervisor.exitcode is not None
+
+def test_usage_relay_hands_batches_to_the_sink():
+    relayed = []
+    usage_queue = queue.Queue()
+    relay = UsageRelay(usage_queue, relayed.append)
+    relay.Start()
+    usage_queue.put([{'action': 'books_list'}])
+    usage_queue.put([{'action': 'suggest'}, {'action': 'suggest'}])
+
+    deadline = time.monotonic() + 5
+    while len(relayed) < 2 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    relay.Stop()
+    assert [len(batch) for batch in relayed] == [1, 2]
+    assert relay.relayed_batches == 2
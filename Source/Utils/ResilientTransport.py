@@ -0,0 +1,289 @@
+# File: ResilientTransport.py
+# Path: AndyGoogle/Source/Utils/ResilientTransport.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-18  10:31PM
+"""
+Description: Retry, backoff and circuit breaker layer shared by the Drive and Sheets clients
+Every Google API call goes through ResilientTransport.Execute: 429/5xx answers and
+network errors are retried with capped exponential backoff and full jitter (or the
+server's Retry-After) inside a per-call deadline. Consecutive failures open a
+circuit breaker so callers fail fast while Google is unreachable; after a recovery
+period one probe call is let through and its outcome closes or re-opens the breaker.
+"""
+
+import time
+import random
+import threading
+import http.client
+from typing import Callable, Dict, List, Optional, Any, Tuple, TypeVar
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+RETRYABLE_STATUSES = (408, 429, 500, 502, 503, 504)
+REJECTED_STATUSES = (429, 503)     # Refused before any work was done - safe to resend anything
+
+T = TypeVar('T')
+
+class TransportError(Exception):
+    """Base for failures raised by the transport itself"""
+
+class CircuitOpenError(TransportError):
+    """The breaker is open - the call was not attempted"""
+
+class DeadlineExceeded(TransportError):
+    """Retrying further would overrun the call's deadline"""
+
+def GetErrorStatus(error: BaseException) -> Optional[int]:
+    """HTTP status of a googleapiclient HttpError or urllib HTTPError, if it has one"""
+    response = getattr(error, 'resp', None)
+    status = getattr(response, 'status', None) or getattr(error, 'code', None) or getattr(error, 'status_code', None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def GetRetryAfter(error: BaseException) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds form only)"""
+    headers = getattr(error, 'resp', None) or getattr(error, 'headers', None)
+    if headers is None:
+        return None
+    try:
+        value = headers.get('retry-after') or headers.get('Retry-After')
+        return max(0.0, float(value)) if value is not None else None
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+class RetryPolicy:
+    """Capped exponential backoff with full jitter"""
+
+    def __init__(self, max_attempts: int = 5, base_delay: float = 0.5, max_delay: float = 30.0,
+                 rng: Optional[random.Random] = None):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng or random.Random()
+
+    def ComputeDelay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Delay before retry number attempt (1-based); Retry-After wins when the server sends one"""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+class CircuitBreaker:
+    """Closed → open after consecutive failures → half-open probe after a recovery period"""
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_seconds: float = 60.0,
+                 max_recovery_seconds: float = 900.0, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_recovery_seconds = recovery_seconds
+        self.recovery_seconds = recovery_seconds
+        self.max_recovery_seconds = max_recovery_seconds
+        self.clock = clock
+
+        self.state = BREAKER_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.lock = threading.Lock()
+        self.listeners: List[Callable[[str, str], None]] = []
+        self.transitions: Dict[str, int] = {BREAKER_CLOSED: 0, BREAKER_OPEN: 0, BREAKER_HALF_OPEN: 0}
+
+    def AddListener(self, listener: Callable[[str, str], None]):
+        """Register a callback(old_state, new_state) run after each transition"""
+        self.listeners.append(listener)
+
+    def SetState(self, new_state: str) -> Optional[Tuple[str, str]]:
+        """Change state (lock held); returns the transition for NotifyListeners"""
+        if new_state == self.state:
+            return None
+        old_state, self.state = self.state, new_state
+        self.transitions[new_state] += 1
+        return old_state, new_state
+
+    def NotifyListeners(self, transition: Optional[Tuple[str, str]]):
+        """Run listeners outside the lock"""
+        if not transition:
+            return
+        old_state, new_state = transition
+        print(f"🔌 {self.name} circuit {old_state} → {new_state}")
+        for listener in list(self.listeners):
+            try:
+                listener(old_state, new_state)
+            except Exception as e:
+                print(f"Warning: Circuit breaker listener failed: {e}")
+
+    def GetState(self) -> str:
+        """Current state, moving open → half-open once the recovery period has passed"""
+        transition = None
+        with self.lock:
+            if self.state == BREAKER_OPEN and self.clock() - self.opened_at >= self.recovery_seconds:
+                transition = self.SetState(BREAKER_HALF_OPEN)
+            state = self.state
+        self.NotifyListeners(transition)
+        return state
+
+    def AllowRequest(self) -> bool:
+        """Whether a call may go out now (half-open lets a single probe through)"""
+        state = self.GetState()
+        with self.lock:
+            if state == BREAKER_CLOSED:
+                return True
+            if state == BREAKER_HALF_OPEN and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return True
+            return False
+
+    def RecordSuccess(self):
+        """A call reached the service - close the breaker"""
+        with self.lock:
+            self.consecutive_failures = 0
+            self.probe_in_flight = False
+            self.recovery_seconds = self.base_recovery_seconds
+            transition = self.SetState(BREAKER_CLOSED)
+        self.NotifyListeners(transition)
+
+    def ReleaseProbe(self):
+        """A probe ended without telling us anything about the service"""
+        with self.lock:
+            self.probe_in_flight = False
+
+    def RecordFailure(self):
+        """A call failed in a way that says the service is unavailable"""
+        transition = None
+        with self.lock:
+            self.consecutive_failures += 1
+            if self.state == BREAKER_HALF_OPEN:
+                # Failed probe: back off longer before the next one
+                self.probe_in_flight = False
+                self.recovery_seconds = min(self.recovery_seconds * 2, self.max_recovery_seconds)
+                self.opened_at = self.clock()
+                transition = self.SetState(BREAKER_OPEN)
+            elif self.state == BREAKER_CLOSED and self.consecutive_failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+                transition = self.SetState(BREAKER_OPEN)
+        self.NotifyListeners(transition)
+
+    def GetStatus(self) -> Dict[str, Any]:
+        """Breaker state for diagnostics"""
+        state = self.GetState()
+        with self.lock:
+            retry_in = max(0.0, self.opened_at + self.recovery_seconds - self.clock()) if state == BREAKER_OPEN else 0.0
+            return {
+                'state': state,
+                'consecutive_failures': self.consecutive_failures,
+                'recovery_seconds': self.recovery_seconds,
+                'probe_in': round(retry_in, 1),
+                'transitions': dict(self.transitions)
+            }
+
+class ResilientTransport:
+    """Run API calls with retries, a deadline and a shared circuit breaker"""
+
+    def __init__(self, name: str, policy: Optional[RetryPolicy] = None, breaker: Optional[CircuitBreaker] = None,
+                 deadline_seconds: Optional[float] = 120.0, transient_errors: Tuple[type, ...] = (),
+                 sleep: Callable[[float], None] = time.sleep, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.policy = policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker(name, clock=clock)
+        self.deadline_seconds = deadline_seconds
+        self.transient_errors = (OSError, http.client.HTTPException) + tuple(transient_errors)
+        self.sleep = sleep
+        self.clock = clock
+
+        self.lock = threading.Lock()
+        self.counters = {
+            'calls': 0,
+            'successes': 0,
+            'failures': 0,
+            'retries': 0,
+            'rejected_open': 0,
+            'deadline_exceeded': 0
+        }
+        self.retries_by_status: Dict[str, int] = {}
+
+    def Count(self, counter: str, amount: int = 1):
+        """Bump a metrics counter"""
+        with self.lock:
+            self.counters[counter] += amount
+
+    def IsRetryable(self, error: BaseException, idempotent: bool = True) -> bool:
+        """429/5xx/408 answers and network-level failures are worth another attempt
+
+        A call that is not idempotent (an append, a create) is only resent when the
+        server said it refused it; after a timeout it may already have been applied.
+        """
+        status = GetErrorStatus(error)
+        if status is not None:
+            return status in (RETRYABLE_STATUSES if idempotent else REJECTED_STATUSES)
+        return idempotent and isinstance(error, self.transient_errors)
+
+    def IsServiceFailure(self, error: BaseException) -> bool:
+        """Whether an error says the service is unavailable (what the breaker counts)"""
+        status = GetErrorStatus(error)
+        if status is not None:
+            return status in RETRYABLE_STATUSES
+        return isinstance(error, self.transient_errors)
+
+    def Execute(self, call: Callable[[], T], deadline_seconds: Optional[float] = None, description: str = "",
+                idempotent: bool = True) -> T:
+        """Run call() until it succeeds, fails permanently, or the deadline or attempts run out"""
+        deadline_seconds = self.deadline_seconds if deadline_seconds is None else deadline_seconds
+        deadline = self.clock() + deadline_seconds if deadline_seconds else None
+        label = f"{self.name} {description}".strip()
+        self.Count('calls')
+
+        attempt = 0
+        while True:
+            if not self.breaker.AllowRequest():
+                self.Count('rejected_open')
+                raise CircuitOpenError(f"{label}: circuit open - Google API unavailable")
+
+            attempt += 1
+            try:
+                result = call()
+            except Exception as error:
+                if self.IsServiceFailure(error):
+                    self.breaker.RecordFailure()
+                elif GetErrorStatus(error) is not None:
+                    # The service answered (e.g. 404/403) - it is up, the request was wrong
+                    self.breaker.RecordSuccess()
+                else:
+                    self.breaker.ReleaseProbe()
+
+                if not self.IsRetryable(error, idempotent):
+                    self.Count('failures')
+                    raise
+
+                status = GetErrorStatus(error)
+                if attempt >= self.policy.max_attempts:
+                    self.Count('failures')
+                    raise
+
+                delay = self.policy.ComputeDelay(attempt, GetRetryAfter(error))
+                if deadline is not None and self.clock() + delay >= deadline:
+                    self.Count('failures')
+                    self.Count('deadline_exceeded')
+                    raise DeadlineExceeded(f"{label}: gave up after {attempt} attempts ({error})") from error
+
+                with self.lock:
+                    self.counters['retries'] += 1
+                    key = str(status) if status is not None else type(error).__name__
+                    self.retries_by_status[key] = self.retries_by_status.get(key, 0) + 1
+                self.sleep(delay)
+                continue
+
+            self.breaker.RecordSuccess()
+            self.Count('successes')
+            return result
+
+    def GetMetrics(self) -> Dict[str, Any]:
+        """Retry counters and breaker state"""
+        with self.lock:
+            metrics = dict(self.counters)
+            metrics['retries_by_status'] = dict(self.retries_by_status)
+        metrics['breaker'] = self.breaker.GetStatus()
+        return metrics
@@ -0,0 +1,228 @@
+# File: SegmentLog.py
+# Path: AndyGoogle/Source/Utils/SegmentLog.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-19  03:57AM
+"""
+Description: Append-only, line-delimited JSON log store used by SheetsLogger
+Entries get sequence numbers and land in rotated segment files named after their first
+sequence number; a persisted upload cursor replaces per-entry 'uploaded' flags so
+appends are O(1) and pending counts need no file parsing
+"""
+
+import os
+import json
+import bisect
+import threading
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+
+SEGMENT_SUFFIX = ".jsonl"
+CURSOR_FILENAME = "upload_cursor.json"
+
+class SegmentLog:
+    """Rotated JSONL segments plus an upload cursor for one log stream"""
+
+    def __init__(self, directory: str, max_segment_entries: int = 1000, max_segments: int = 10):
+        self.directory = directory
+        self.max_segment_entries = max(1, max_segment_entries)
+        self.max_segments = max(1, max_segments)
+        self.cursor_path = os.path.join(directory, CURSOR_FILENAME)
+        self.lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+
+        self.segment_starts: List[int] = []   # First sequence number of each segment, ascending
+        self.active_entries = 0               # Entries in the newest segment
+        self.next_seq = 0
+        self.uploaded_seq = 0                 # Entries with seq < uploaded_seq have been uploaded
+        self.active_file = None
+
+        self.LoadState()
+
+    def GetSegmentPath(self, first_seq: int) -> str:
+        """Get the file path of the segment starting at first_seq"""
+        return os.path.join(self.directory, f"{first_seq:012d}{SEGMENT_SUFFIX}")
+
+    def LoadState(self):
+        """Recover sequence numbers and the upload cursor from disk"""
+        for filename in os.listdir(self.directory):
+            if filename.endswith(SEGMENT_SUFFIX):
+                try:
+                    self.segment_starts.append(int(filename[:-len(SEGMENT_SUFFIX)]))
+                except ValueError:
+                    continue
+        self.segment_starts.sort()
+
+        if self.segment_starts:
+            # Only the newest segment is scanned; older ones are full by construction
+            last_path = self.GetSegmentPath(self.segment_starts[-1])
+            self.active_entries = self.RepairAndCountLines(last_path)
+            self.next_seq = self.segment_starts[-1] + self.active_entries
+
+        try:
+            if os.path.exists(self.cursor_path):
+                with open(self.cursor_path, 'r') as f:
+                    self.uploaded_seq = int(json.load(f).get('uploaded_seq', 0))
+        except (ValueError, OSError) as e:
+            print(f"Warning: Could not read upload cursor {self.cursor_path}: {e}")
+
+        # Segments may have been pruned past the cursor, or the cursor may be ahead after a reset
+        first_seq = self.segment_starts[0] if self.segment_starts else self.next_seq
+        self.uploaded_seq = min(max(self.uploaded_seq, first_seq), self.next_seq)
+
+    def RepairAndCountLines(self, path: str) -> int:
+        """Count complete lines in a segment, dropping a torn final line from a crash"""
+        with open(path, 'rb+') as f:
+            data = f.read()
+            complete_length = data.rfind(b"\n") + 1
+            if complete_length != len(data):
+                f.truncate(complete_length)
+        return data.count(b"\n", 0, complete_length)
+
+    def Append(self, entries: List[Dict[str, Any]]) -> int:
+        """Append entries to the active segment, rotating as needed; returns the next sequence number"""
+        if not entries:
+            return self.next_seq
+
+        with self.lock:
+            index = 0
+            while index < len(entries):
+                if not self.segment_starts or self.active_entries >= self.max_segment_entries:
+                    self.RotateSegment()
+
+                room = self.max_segment_entries - self.active_entries
+                chunk = entries[index:index + room]
+                lines = "".join(json.dumps(entry, separators=(',', ':')) + "\n" for entry in chunk)
+
+                if self.active_file is None:
+                    self.active_file = open(self.GetSegmentPath(self.segment_starts[-1]), 'a', encoding='utf-8')
+                self.active_file.write(lines)
+
+                self.active_entries += len(chunk)
+                self.next_seq += len(chunk)
+                index += len(chunk)
+
+            self.active_file.flush()
+            return self.next_seq
+
+    def RotateSegment(self):
+        """Start a new segment and enforce the retention limit (caller holds the lock)"""
+        if self.active_file is not None:
+            self.active_file.close()
+            self.active_file = None
+
+        self.segment_starts.append(self.next_seq)
+        self.active_entries = 0
+        open(self.GetSegmentPath(self.next_seq), 'a').close()
+
+        while len(self.segment_starts) > self.max_segments:
+            oldest = self.segment_starts.pop(0)
+            try:
+                os.remove(self.GetSegmentPath(oldest))
+            except OSError:
+                pass
+
+        # Entries pruned before upload are gone for good, like the old 1000-entry cap
+        if self.uploaded_seq < self.segment_starts[0]:
+            self.uploaded_seq = self.segment_starts[0]
+            self.SaveCursor()
+
+    def GetPendingCount(self) -> int:
+        """Number of entries not yet uploaded"""
+        return self.next_seq - self.uploaded_seq
+
+    def ReadRange(self, start_seq: int, limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """Read up to limit entries starting at start_seq; returns (entries, next_seq_after)"""
+        entries: List[Dict[str, Any]] = []
+
+        with self.lock:
+            if self.active_file is not None:
+                self.active_file.flush()
+            segment_starts = list(self.segment_starts)
+            end_seq = self.next_seq
+
+        position = max(bisect.bisect_right(segment_starts, start_seq) - 1, 0)
+        seq = start_seq
+
+        for segment_index in range(position, len(segment_starts)):
+            first_seq = segment_starts[segment_index]
+            if first_seq > seq:
+                seq = first_seq
+            try:
+                with open(self.GetSegmentPath(first_seq), 'r', encoding='utf-8') as f:
+                    for line_number, line in enumerate(f):
+                        line_seq = first_seq + line_number
+                        if line_seq < seq:
+                            continue
+                        if line_seq >= end_seq or (limit is not None and len(entries) >= limit):
+                            return entries, seq
+                        try:
+                            entries.append(json.loads(line))
+                        except json.JSONDecodeError:
+                            # Skipped, not blanked: an empty entry would upload as an all-blank row
+                            print(f"Warning: Skipping unreadable log entry {line_seq} in {self.GetSegmentPath(first_seq)}")
+                        seq = line_seq + 1
+            except FileNotFoundError:
+                continue
+
+        return entries, seq
+
+    def ReadPending(self, limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """Read entries that have not been uploaded; pass the returned seq to CommitUploaded"""
+        return self.ReadRange(self.uploaded_seq, limit)
+
+    def CommitUploaded(self, upto_seq: int):
+        """Advance the upload cursor past everything before upto_seq"""
+        with self.lock:
+            if upto_seq > self.uploaded_seq:
+                self.uploaded_seq = min(upto_seq, self.next_seq)
+                self.SaveCursor()
+
+    def SaveCursor(self):
+        """Persist the upload cursor atomically"""
+        temp_path = self.cursor_path + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({'uploaded_seq': self.uploaded_seq}, f)
+        os.replace(temp_path, self.cursor_path)
+
+    def IterateEntries(self) -> Iterator[Dict[str, Any]]:
+        """Iterate every retained entry, uploaded or not, oldest first"""
+        first_seq = self.segment_starts[0] if self.segment_starts else self.next_seq
+        entries, _ = self.ReadRange(first_seq)
+        return iter(entries)
+
+    def MigrateLegacyLog(self, legacy_path: str) -> int:
+        """Import a legacy {'entries': [...]} JSON log once, then rename it to *.migrated"""
+        if not os.path.exists(legacy_path):
+            return 0
+
+        try:
+            with open(legacy_path, 'r') as f:
+                legacy_entries = json.load(f).get('entries', [])
+        except (ValueError, OSError) as e:
+            print(f"Warning: Could not migrate legacy log {legacy_path}: {e}")
+            return 0
+
+        # The legacy uploader flagged entries in order, so uploaded ones form a prefix
+        uploaded_prefix = 0
+        while uploaded_prefix < len(legacy_entries) and legacy_entries[uploaded_prefix].get('uploaded', False):
+            uploaded_prefix += 1
+
+        cleaned_entries = [{k: v for k, v in entry.items() if k != 'uploaded'} for entry in legacy_entries]
+
+        was_caught_up = self.GetPendingCount() == 0
+        self.Append(cleaned_entries[:uploaded_prefix])
+        if was_caught_up:
+            self.CommitUploaded(self.next_seq)
+        self.Append(cleaned_entries[uploaded_prefix:])
+
+        os.replace(legacy_path, legacy_path + ".migrated")
+        print(f"✅ Migrated {len(legacy_entries)} entries from {legacy_path}")
+        return len(legacy_entries)
+
+    def Close(self):
+        """Close the active segment file"""
+        with self.lock:
+            if self.active_file is not None:
+                self.active_file.close()
+                self.active_file = None
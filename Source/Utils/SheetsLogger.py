@@ -2,22 +2,28 @@
 # Path: AndyGoogle/Source/Utils/SheetsLogger.py
 # Standard: AIDEV-PascalCase-2.1
 # Created: 2025-07-12
-# Last Modified: 2025-07-12  07:32PM
+# Last Modified: 2026-10-19  04:01AM
 """
 Description: Google Sheets logging integration for AndyGoogle usage analytics
 Handles batch upload of user interactions and system events to Google Sheets
 """
 
 import os
-import json
 import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
 from google_auth_oauthlib.flow import Flow
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+import httplib2
+
+from Utils.SegmentLog import SegmentLog
+from Utils.ResilientTransport import ResilientTransport, TransportError, BREAKER_OPEN
+
+SHEETS_ERRORS = (HttpError, TransportError)
 
 class SheetsLogger:
     """Handle Google Sheets logging for AndyGoogle usage analytics"""
@@ -31,12 +37,28 @@ class SheetsLogger:
             'https://www.googleapis.com/auth/drive.file'
         ]
         self.usage_sheet_id = None
-        self.local_log_path = "AndyGoogle/Data/Logs/usage_log.json"
-        self.session_log_path = "AndyGoogle/Data/Logs/session_log.json"
+        self.log_directory = "AndyGoogle/Data/Logs"
+        
+        # Legacy single-file JSON logs (migrated into segment logs on startup)
+        self.local_log_path = os.path.join(self.log_directory, "usage_log.json")
+        self.session_log_path = os.path.join(self.log_directory, "session_log.json")
+        self.error_log_path = os.path.join(self.log_directory, "error_log.json")
         
-        # Ensure log directories exist
-        os.makedirs(os.path.dirname(self.local_log_path), exist_ok=True)
-        os.makedirs(os.path.dirname(self.session_log_path), exist_ok=True)
+        # Append-only segment logs (one directory per stream)
+        self.usage_log = SegmentLog(os.path.join(self.log_directory, "usage"))
+        self.session_log = SegmentLog(os.path.join(self.log_directory, "session"))
+        self.error_log = SegmentLog(os.path.join(self.log_directory, "error"))
+        
+        self.request_timeout_seconds = 60
+        self.transport = ResilientTransport('sheets', transient_errors=(httplib2.HttpLib2Error,))
+        
+        self.MigrateLegacyLogs()
+    
+    def MigrateLegacyLogs(self):
+        """Move entries from the old JSON log files into the segment logs"""
+        self.usage_log.MigrateLegacyLog(self.local_log_path)
+        self.session_log.MigrateLegacyLog(self.session_log_path)
+        self.error_log.MigrateLegacyLog(self.error_log_path)
     
     def Authenticate(self) -> bool:
         """Authenticate with Google Sheets API (reuse Drive credentials)"""
@@ -78,10 +100,15 @@ class SheetsLogger:
         with open(self.token_path, 'w') as token_file:
             token_file.write(creds.to_json())
         
-        # Build Sheets service
-        self.service = build('sheets', 'v4', credentials=creds)
+        # Build Sheets service (each attempt bounded; the transport bounds the whole call)
+        http = AuthorizedHttp(creds, http=httplib2.Http(timeout=self.request_timeout_seconds))
+        self.service = build('sheets', 'v4', http=http)
         return True
     
+    def Execute(self, request, description: str = "", idempotent: bool = True):
+        """Run an API request through the retrying, circuit-broken transport"""
+        return self.transport.Execute(request.execute, description=description, idempotent=idempotent)
+    
     def GetOrCreateUsageSheet(self) -> Optional[str]:
         """Get or create the AndyGoogle Usage Log spreadsheet"""
         if self.usage_sheet_id:
@@ -130,7 +157,8 @@ class SheetsLogger:
                 ]
             }
             
-            spreadsheet = self.service.spreadsheets().create(body=spreadsheet_body).execute()
+            spreadsheet = self.Execute(self.service.spreadsheets().create(body=spreadsheet_body),
+                                       "create spreadsheet", idempotent=False)
             self.usage_sheet_id = spreadsheet.get('spreadsheetId')
             
             print(f"Created usage analytics spreadsheet: {self.usage_sheet_id}")
@@ -140,7 +168,7 @@ class SheetsLogger:
             
             return self.usage_sheet_id
             
-        except HttpError as e:
+        except SHEETS_ERRORS as e:
             print(f"Error creating usage spreadsheet: {e}")
             return None
     
@@ -226,23 +254,24 @@ class SheetsLogger:
                 }
             ]
             
-            self.service.spreadsheets().batchUpdate(
+            self.Execute(self.service.spreadsheets().batchUpdate(
                 spreadsheetId=self.usage_sheet_id,
                 body={'requests': requests}
-            ).execute()
+            ), "format headers")
             
             print("✅ Sheet headers configured successfully")
             
-        except HttpError as e:
+        except SHEETS_ERRORS as e:
             print(f"Error setting up sheet headers: {e}")
     
-    def LogUsage(self, action: str, book_id: int = None, book_title: str = None, 
-                 action_details: str = None, user_email: str = None, 
-                 session_id: str = None, client_ip: str = None, 
-                 user_agent: str = None, duration: float = None):
-        """Log a user action locally (for batch upload later)"""
-        usage_entry = {
-            'timestamp': datetime.now().isoformat(),
+    def BuildUsageEntry(self, action: str, book_id: int = None, book_title: str = None, 
+                        action_details: str = None, user_email: str = None, 
+                        session_id: str = None, client_ip: str = None, 
+                        user_agent: str = None, duration: float = None,
+                        timestamp: str = None) -> Dict[str, Any]:
+        """Build a usage log entry"""
+        return {
+            'timestamp': timestamp or datetime.now().isoformat(),
             'session_id': session_id or f"session_{int(time.time())}",
             'user_email': user_email or 'anonymous',
             'action': action,
@@ -253,11 +282,33 @@ class SheetsLogger:
             'user_agent': user_agent or '',
             'duration': duration or 0.0
         }
+    
+    def LogUsage(self, action: str, book_id: int = None, book_title: str = None, 
+                 action_details: str = None, user_email: str = None, 
+                 session_id: str = None, client_ip: str = None, 
+                 user_agent: str = None, duration: float = None):
+        """Log a user action locally (for batch upload later)"""
+        usage_entry = self.BuildUsageEntry(
+            action=action, book_id=book_id, book_title=book_title,
+            action_details=action_details, user_email=user_email,
+            session_id=session_id, client_ip=client_ip,
+            user_agent=user_agent, duration=duration
+        )
         
-        # Append to local log file
-        self.AppendToLocalLog(self.local_log_path, usage_entry)
+        # Append to local log
+        self.usage_log.Append([usage_entry])
         
         # Auto-upload if we have many pending entries
+        self.UploadIfPending()
+    
+    def LogUsageBatch(self, events: List[Dict[str, Any]]):
+        """Log several usage events (LogUsage keyword dicts) with a single local write"""
+        usage_entries = [self.BuildUsageEntry(**event) for event in events]
+        self.usage_log.Append(usage_entries)
+        self.UploadIfPending()
+    
+    def UploadIfPending(self):
+        """Batch upload once enough entries are waiting"""
         pending_count = self.GetPendingLogCount()
         if pending_count >= 50:  # Batch upload every 50 entries
             self.BatchUploadLogs()
@@ -283,8 +334,8 @@ class SheetsLogger:
             'client_info': client_info or ''
         }
         
-        # Append to session log file
-        self.AppendToLocalLog(self.session_log_path, session_entry)
+        # Append to session log
+        self.session_log.Append([session_entry])
     
     def LogError(self, error_type: str, error_message: str, user_email: str = None, 
                  context: str = None, severity: str = 'ERROR'):
@@ -295,61 +346,26 @@ class SheetsLogger:
             'error_message': error_message,
             'user_email': user_email or 'system',
             'context': context or '',
-            'severity': severity,
-            'uploaded': False
+            'severity': severity
         }
         
         # Store in a separate error log for immediate upload if severe
-        error_log_path = "AndyGoogle/Data/Logs/error_log.json"
-        self.AppendToLocalLog(error_log_path, error_entry)
+        self.error_log.Append([error_entry])
         
         # Upload immediately for critical errors
         if severity in ['CRITICAL', 'FATAL']:
             self.UploadErrorLogs()
     
-    def AppendToLocalLog(self, log_path: str, entry: Dict[str, Any]):
-        """Append an entry to a local JSON log file"""
-        try:
-            # Load existing log
-            if os.path.exists(log_path):
-                with open(log_path, 'r') as f:
-                    log_data = json.load(f)
-            else:
-                log_data = {'entries': []}
-            
-            # Add new entry
-            entry['uploaded'] = False
-            log_data['entries'].append(entry)
-            
-            # Keep only last 1000 entries to prevent file bloat
-            if len(log_data['entries']) > 1000:
-                log_data['entries'] = log_data['entries'][-1000:]
-            
-            # Save back to file
-            with open(log_path, 'w') as f:
-                json.dump(log_data, f, indent=2)
-                
-        except Exception as e:
-            print(f"Error appending to local log {log_path}: {e}")
-    
     def GetPendingLogCount(self) -> int:
-        """Get count of pending (not uploaded) log entries"""
-        try:
-            if not os.path.exists(self.local_log_path):
-                return 0
-            
-            with open(self.local_log_path, 'r') as f:
-                log_data = json.load(f)
-            
-            pending_entries = [entry for entry in log_data.get('entries', []) if not entry.get('uploaded', False)]
-            return len(pending_entries)
-            
-        except Exception as e:
-            print(f"Error getting pending log count: {e}")
-            return 0
+        """Get count of pending (not uploaded) usage log entries"""
+        return self.usage_log.GetPendingCount()
     
     def BatchUploadLogs(self) -> bool:
         """Upload all pending log entries to Google Sheets"""
+        if self.transport.breaker.GetState() == BREAKER_OPEN:
+            # Entries stay in the segment logs until Sheets is reachable again
+            return False
+        
         if not self.service:
             if not self.Authenticate():
                 return False
@@ -360,12 +376,12 @@ class SheetsLogger:
         
         try:
             # Upload usage logs
-            success = self.UploadLogFile(self.local_log_path, 'Usage Log')
+            success = self.UploadLogFile(self.usage_log, 'Usage Log')
             if success:
                 print("✅ Usage logs uploaded successfully")
             
             # Upload session logs
-            success = self.UploadLogFile(self.session_log_path, 'Session Log')
+            success = self.UploadLogFile(self.session_log, 'Session Log')
             if success:
                 print("✅ Session logs uploaded successfully")
             
@@ -380,103 +396,104 @@ class SheetsLogger:
             print(f"Error during batch upload: {e}")
             return False
     
-    def UploadLogFile(self, log_path: str, sheet_name: str) -> bool:
-        """Upload a specific log file to a sheet"""
-        if not os.path.exists(log_path):
-            return True  # No file to upload
+    def UploadLogFile(self, segment_log: SegmentLog, sheet_name: str, batch_size: int = 500) -> bool:
+        """Upload pending entries of a segment log to a sheet and advance its cursor"""
+        if not self.service or not self.usage_sheet_id:
+            return False  # Not connected - entries stay pending
         
         try:
-            with open(log_path, 'r') as f:
-                log_data = json.load(f)
-            
-            # Get pending entries
-            pending_entries = [entry for entry in log_data.get('entries', []) if not entry.get('uploaded', False)]
-            
-            if not pending_entries:
-                return True  # Nothing to upload
-            
-            # Convert entries to rows
-            rows = []
-            for entry in pending_entries:
-                if sheet_name == 'Usage Log':
-                    row = [
-                        entry.get('timestamp', ''),
-                        entry.get('session_id', ''),
-                        entry.get('user_email', ''),
-                        entry.get('action', ''),
-                        str(entry.get('book_id', '')),
-                        entry.get('book_title', ''),
-                        entry.get('action_details', ''),
-                        entry.get('client_ip', ''),
-                        entry.get('user_agent', ''),
-                        str(entry.get('duration', ''))
-                    ]
-                elif sheet_name == 'Session Log':
-                    row = [
-                        entry.get('session_start', ''),
-                        entry.get('session_end', ''),
-                        entry.get('user_email', ''),
-                        str(entry.get('total_actions', '')),
-                        str(entry.get('books_viewed', '')),
-                        str(entry.get('searches_performed', '')),
-                        str(entry.get('duration', '')),
-                        entry.get('client_info', '')
-                    ]
-                else:
-                    continue
-                
-                rows.append(row)
+            uploaded_count = 0
             
-            if rows:
-                # Append to sheet
-                range_name = f"{sheet_name}!A:Z"
-                body = {
-                    'values': rows
-                }
+            while True:
+                # Get pending entries
+                pending_entries, next_seq = segment_log.ReadPending(limit=batch_size)
                 
-                self.service.spreadsheets().values().append(
-                    spreadsheetId=self.usage_sheet_id,
-                    range=range_name,
-                    valueInputOption='RAW',
-                    body=body
-                ).execute()
+                if not pending_entries:
+                    # Nothing (more) to upload - step past any unreadable lines that were skipped
+                    segment_log.CommitUploaded(next_seq)
+                    break
                 
-                # Mark entries as uploaded
-                for entry in log_data.get('entries', []):
-                    if not entry.get('uploaded', False):
-                        entry['uploaded'] = True
+                # Convert entries to rows
+                rows = []
+                for entry in pending_entries:
+                    if sheet_name == 'Usage Log':
+                        row = [
+                            entry.get('timestamp', ''),
+                            entry.get('session_id', ''),
+                            entry.get('user_email', ''),
+                            entry.get('action', ''),
+                            str(entry.get('book_id', '')),
+                            entry.get('book_title', ''),
+                            entry.get('action_details', ''),
+                            entry.get('client_ip', ''),
+                            entry.get('user_agent', ''),
+                            str(entry.get('duration', ''))
+                        ]
+                    elif sheet_name == 'Session Log':
+                        row = [
+                            entry.get('session_start', ''),
+                            entry.get('session_end', ''),
+                            entry.get('user_email', ''),
+                            str(entry.get('total_actions', '')),
+                            str(entry.get('books_viewed', '')),
+                            str(entry.get('searches_performed', '')),
+                            str(entry.get('duration', '')),
+                            entry.get('client_info', '')
+                        ]
+                    elif sheet_name == 'Error Log':
+                        row = [
+                            entry.get('timestamp', ''),
+                            entry.get('error_type', ''),
+                            entry.get('error_message', ''),
+                            entry.get('user_email', ''),
+                            entry.get('context', ''),
+                            entry.get('severity', '')
+                        ]
+                    else:
+                        continue
+                    
+                    rows.append(row)
                 
-                # Save updated log file
-                with open(log_path, 'w') as f:
-                    json.dump(log_data, f, indent=2)
+                if rows:
+                    # Append to sheet
+                    range_name = f"{sheet_name}!A:Z"
+                    body = {
+                        'values': rows
+                    }
+                    
+                    # Appends are not idempotent: only resent when Sheets refused them outright
+                    self.Execute(self.service.spreadsheets().values().append(
+                        spreadsheetId=self.usage_sheet_id,
+                        range=range_name,
+                        valueInputOption='RAW',
+                        body=body
+                    ), "append rows", idempotent=False)
                 
-                print(f"Uploaded {len(rows)} entries to {sheet_name}")
+                # Advance the upload cursor past this batch
+                segment_log.CommitUploaded(next_seq)
+                uploaded_count += len(rows)
+            
+            if uploaded_count:
+                print(f"Uploaded {uploaded_count} entries to {sheet_name}")
             
             return True
             
-        except HttpError as e:
+        except SHEETS_ERRORS as e:
             print(f"Error uploading to {sheet_name}: {e}")
             return False
     
     def UploadErrorLogs(self) -> bool:
         """Upload error logs to Error Log sheet"""
-        error_log_path = "AndyGoogle/Data/Logs/error_log.json"
-        return self.UploadLogFile(error_log_path, 'Error Log')
+        return self.UploadLogFile(self.error_log, 'Error Log')
     
     def GetAnalyticsSummary(self, days: int = 7) -> Optional[Dict[str, Any]]:
         """Get usage analytics summary from local logs"""
         try:
-            if not os.path.exists(self.local_log_path):
-                return None
-            
-            with open(self.local_log_path, 'r') as f:
-                log_data = json.load(f)
-            
             # Filter entries from last N days
             cutoff_date = datetime.now() - timedelta(days=days)
             recent_entries = []
             
-            for entry in log_data.get('entries', []):
+            for entry in self.usage_log.IterateEntries():
                 try:
                     entry_date = datetime.fromisoformat(entry['timestamp'])
                     if entry_date >= cutoff_date:
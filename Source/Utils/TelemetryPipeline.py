@@ -0,0 +1,186 @@
+# File: TelemetryPipeline.py
+# Path: AndyGoogle/Source/Utils/TelemetryPipeline.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-18
+# Last Modified: 2026-10-19  02:31AM
+"""
+Description: Non-blocking usage telemetry pipeline for the AndyGoogle API
+Request middleware drops events into a bounded in-memory queue; a background task
+drains it in batches to a blocking sink (SheetsLogger) on a worker thread
+"""
+
+import asyncio
+import random
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Any
+
+BACKPRESSURE_POLICIES = ('drop', 'sample', 'block')
+
+class TelemetryPipeline:
+    """Bounded event queue with a batching background writer"""
+
+    def __init__(self, sink: Callable[[List[Dict[str, Any]]], None],
+                 max_queue_size: int = 10000, batch_size: int = 200,
+                 flush_interval_seconds: float = 2.0, backpressure: str = 'drop',
+                 sample_rate: float = 0.1, sample_high_water: float = 0.75,
+                 block_timeout_seconds: float = 0.05):
+        if backpressure not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown backpressure policy '{backpressure}' (use one of {BACKPRESSURE_POLICIES})")
+
+        self.sink = sink
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.backpressure = backpressure
+        self.sample_rate = sample_rate
+        self.sample_threshold = int(max_queue_size * sample_high_water)
+        self.block_timeout_seconds = block_timeout_seconds
+
+        self.queue: Optional[asyncio.Queue] = None
+        self.drain_task: Optional[asyncio.Task] = None
+        self.inflight_write: Optional[asyncio.Future] = None
+        self.held_event: Optional[Dict[str, Any]] = None   # Dequeued but not yet in a batch
+        self.counters = {
+            'enqueued': 0,
+            'dropped': 0,
+            'sampled_out': 0,
+            'flushed': 0,
+            'batches': 0,
+            'sink_errors': 0,
+            'blocked': 0
+        }
+
+    async def Start(self):
+        """Create the queue and start the background drain task on the running loop"""
+        if self.drain_task:
+            return
+        self.queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self.drain_task = asyncio.create_task(self.RunDrainLoop())
+
+    async def Stop(self, timeout: float = 10.0):
+        """Stop the drain task after flushing whatever is still queued"""
+        if not self.drain_task:
+            return
+
+        self.drain_task.cancel()
+        try:
+            await self.drain_task
+        except asyncio.CancelledError:
+            pass
+        self.drain_task = None
+
+        # A batch handed to the sink before cancellation still gets counted
+        if self.inflight_write:
+            await self.inflight_write
+
+        await asyncio.wait_for(self.FlushRemaining(), timeout)
+
+    def Emit(self, event: Dict[str, Any]) -> bool:
+        """Queue an event without ever waiting (block policy degrades to drop)"""
+        if self.queue is None:
+            self.counters['dropped'] += 1
+            return False
+
+        if self.backpressure == 'sample' and self.queue.qsize() >= self.sample_threshold:
+            if random.random() >= self.sample_rate:
+                self.counters['sampled_out'] += 1
+                return False
+
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.counters['dropped'] += 1
+            return False
+
+        self.counters['enqueued'] += 1
+        return True
+
+    async def EmitAsync(self, event: Dict[str, Any]) -> bool:
+        """Queue an event, waiting briefly for space when the policy is 'block'"""
+        if self.backpressure != 'block' or self.queue is None or not self.queue.full():
+            return self.Emit(event)
+
+        self.counters['blocked'] += 1
+        try:
+            await asyncio.wait_for(self.queue.put(event), self.block_timeout_seconds)
+        except asyncio.TimeoutError:
+            self.counters['dropped'] += 1
+            return False
+
+        self.counters['enqueued'] += 1
+        return True
+
+    def TakeBatch(self, first_event: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Pull up to batch_size queued events without waiting"""
+        batch = [first_event] if first_event is not None else []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def WriteBatch(self, batch: List[Dict[str, Any]]):
+        """Hand a batch to the sink on a worker thread so file I/O never blocks the loop"""
+        if not batch:
+            return
+        try:
+            await asyncio.to_thread(self.sink, batch)
+            self.counters['flushed'] += len(batch)
+            self.counters['batches'] += 1
+        except Exception as e:
+            self.counters['sink_errors'] += 1
+            self.counters['dropped'] += len(batch)
+            print(f"Warning: Telemetry sink failed for {len(batch)} events: {e}")
+
+    async def RunDrainLoop(self):
+        """Drain the queue whenever a batch fills or the flush interval passes"""
+        while True:
+            try:
+                first_event = await asyncio.wait_for(self.queue.get(), self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                continue
+
+            # Held where FlushRemaining can find it if Stop() cancels the sleep below
+            self.held_event = first_event
+
+            # Give bursts a moment to accumulate into one write
+            if self.queue.qsize() < self.batch_size - 1:
+                await asyncio.sleep(min(0.05, self.flush_interval_seconds))
+
+            # Shielded so Stop() cannot abandon a batch half way through the sink
+            batch = self.TakeBatch(self.held_event)
+            self.held_event = None
+            self.inflight_write = asyncio.ensure_future(self.WriteBatch(batch))
+            await asyncio.shield(self.inflight_write)
+            self.inflight_write = None
+
+    async def FlushRemaining(self):
+        """Write out everything left in the queue, starting with any event the drain task held"""
+        while self.queue is not None and (self.held_event is not None or not self.queue.empty()):
+            first_event, self.held_event = self.held_event, None
+            await self.WriteBatch(self.TakeBatch(first_event))
+
+    def GetCounters(self) -> Dict[str, Any]:
+        """Get pipeline counters and current queue depth"""
+        return {
+            **self.counters,
+            'queue_depth': self.queue.qsize() if self.queue is not None else 0,
+            'max_queue_size': self.max_queue_size,
+            'backpressure': self.backpressure,
+            'running': self.drain_task is not None
+        }
+
+def BuildUsageEvent(action: str, details: Optional[str], client_ip: str,
+                    user_agent: str, duration: float) -> Dict[str, Any]:
+    """Build the keyword arguments SheetsLogger.LogUsage expects for one request"""
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'action': action,
+        'action_details': details,
+        'client_ip': client_ip,
+        'user_agent': user_agent,
+        'session_id': f"api_{int(time.time())}",
+        'duration': duration
+    }
@@ -3,7 +3,7 @@
 # Path: AndyGoogle/StartAndyGoogle.py
 # Standard: AIDEV-PascalCase-2.1
 # Created: 2025-07-12
-# Last Modified: 2025-07-12  07:40PM
+# Last Modified: 2026-10-19  01:21AM
 """
 Description: AndyGoogle startup script with smart port detection and environment checks
 Main entry point for the AndyGoogle cloud-synchronized digital library system
@@ -167,8 +167,8 @@ class AndyGoogleStarter:
             # lsof not available
             pass
     
-    def start_server(self, host="127.0.0.1", port=None, check_only=False):
-        """Start the AndyGoogle server"""
+    def start_server(self, host="127.0.0.1", port=None, check_only=False, workers=None):
+        """Start the AndyGoogle server (workers > 1 runs the multi-process mode)"""
         
         # Environment check
         print("🔍 Checking environment...")
@@ -234,11 +234,29 @@ class AndyGoogleStarter:
         print(f"⏰ Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("=" * 60)
         
+        if workers is None:
+            workers = self.config.get('server_workers', 1)
+        
         # Import and start the FastAPI app
         try:
+            from Source.API import MainAPI
             from Source.API.MainAPI import app
             import uvicorn
             
+            if workers > 1:
+                # One socket, preloaded catalog, N forked workers; worker 0 owns sync and log flushing
+                from API.WorkerSupervisor import WorkerSupervisor
+                from Core.DatabaseGenerations import GetConfiguredDatabasePath
+                WorkerSupervisor(
+                    MainAPI,
+                    host=host,
+                    port=available_port,
+                    workers=workers,
+                    database_path=GetConfiguredDatabasePath(self.config),
+                    generation_check_seconds=self.config.get('worker_generation_check_seconds', 30)
+                ).Run()
+                return True
+            
             uvicorn.run(
                 app,
                 host=host,
@@ -266,6 +284,7 @@ Examples:
   python StartAndyGoogle.py --port 3000       # Use alternative port (good for development)
   python StartAndyGoogle.py --check           # Check environment only
   python StartAndyGoogle.py --host 0.0.0.0    # Allow external connections
+  python StartAndyGoogle.py --workers 4       # Serve with 4 worker processes
 
 Port Selection:
   AndyGoogle automatically finds available ports starting from 8000.
@@ -280,6 +299,8 @@ Port Selection:
                        help='Port to use (default: from config or 8000)')
     parser.add_argument('--check', action='store_true',
                        help='Check environment and exit')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Worker processes sharing the port (default: from config or 1)')
     
     args = parser.parse_args()
     
@@ -290,7 +311,8 @@ Port Selection:
     success = starter.start_server(
         host=args.host,
         port=args.port,
-        check_only=args.check
+        check_only=args.check,
+        workers=args.workers
     )
     
     if not success:
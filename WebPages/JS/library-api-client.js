@@ -8,7 +8,7 @@
 // Constants: UPPER_SNAKE_CASE per JavaScript ecosystem standards
 // API Integration: FastAPI backend with Design Standard v2.0 compliance
 // Created: 2025-07-07
-// Last Modified: 2025-07-11  03:50PM
+// Last Modified: 2026-10-18  07:31PM
 /**
  * Description: Anderson's Library API Client - Design Standard v2.0
  * Connects desktop web twin and mobile app to FastAPI backend
@@ -51,6 +51,11 @@ class AndersonLibraryAPI {
         this.cacheTimeout = 5 * 60 * 1000; // 5 minutes
         this.requestTimeouts = new Map();
         
+        // Autocomplete - newest keystroke wins
+        this.suggestSession = Math.random().toString(36).slice(2);
+        this.suggestSequence = 0;
+        this.suggestController = null;
+        
         // Event Handling
         this.eventListeners = new Map();
         
@@ -146,6 +151,55 @@ class AndersonLibraryAPI {
         }
     }
 
+    /**
+     * Get Suggestions - Prefix autocomplete for the search box
+     * Aborts the previous keystroke's request; resolves to null when superseded
+     */
+    async getSuggestions(prefix, limit = 8) {
+        const sequence = ++this.suggestSequence;
+        if (this.suggestController) {
+            this.suggestController.abort();
+        }
+        this.suggestController = new AbortController();
+
+        try {
+            const params = new URLSearchParams({
+                q: prefix,
+                limit: limit.toString(),
+                session: this.suggestSession,
+                seq: sequence.toString()
+            });
+            const response = await this.makeRequest('GET', `/suggest?${params}`, null, this.suggestController.signal);
+            
+            if (response.superseded || sequence !== this.suggestSequence) {
+                return null;
+            }
+            return response;
+
+        } catch (error) {
+            if (error.name === 'AbortError' || sequence !== this.suggestSequence) {
+                return null;
+            }
+            console.error('Suggest error:', error);
+            this.emit('error', { operation: 'suggest', error: error.message });
+            return { query: prefix, suggestions: [] };
+        }
+    }
+
+    /**
+     * Get Books Batch - Resolve many book IDs in one round trip
+     * Results come back in request order; unknown IDs have found: false
+     */
+    async getBooksBatch(bookIds) {
+        try {
+            return await this.makeRequest('POST', '/books/batch', { ids: bookIds });
+        } catch (error) {
+            console.error('Batch lookup error:', error);
+            this.emit('error', { operation: 'getBooksBatch', error: error.message });
+            return { results: [], found: 0, missing: bookIds };
+        }
+    }
+
     /**
      * Filter Books by Category/Subject/Rating
      * Maintains exact desktop filter behavior
@@ -295,6 +349,15 @@ class AndersonLibraryAPI {
         }
     }
 
+    /**
+     * Book File URL - Direct link for viewers and downloads
+     * The server answers Range requests, so PDF viewers can page through
+     * large books and interrupted downloads can resume
+     */
+    getBookFileUrl(bookId, download = false) {
+        return `${this.apiBase}/books/${bookId}/file${download ? '?download=true' : ''}`;
+    }
+
     /**
      * Get Book Thumbnail
      * Returns blob URL for display
@@ -346,7 +409,7 @@ class AndersonLibraryAPI {
      * Generic HTTP request handler with error handling
      * Follows REST API best practices
      */
-    async makeRequest(method, endpoint, body = null) {
+    async makeRequest(method, endpoint, body = null, signal = null) {
         const url = `${this.apiBase}${endpoint}`;
         
         const requestConfig = {
@@ -364,6 +427,11 @@ class AndersonLibraryAPI {
         const timeoutId = setTimeout(() => controller.abort(), 30000); // 30 second timeout
         requestConfig.signal = controller.signal;
         
+        // Caller-side cancellation shares the same controller
+        if (signal) {
+            signal.addEventListener('abort', () => controller.abort());
+        }
+        
         try {
             const response = await fetch(url, requestConfig);
             clearTimeout(timeoutId);
@@ -379,6 +447,10 @@ class AndersonLibraryAPI {
         } catch (error) {
             clearTimeout(timeoutId);
             
+            if (error.name === 'AbortError' && signal && signal.aborted) {
+                throw error;
+            }
+            
             if (error.name === 'AbortError') {
                 throw new Error('Request timeout - please try again');
             }